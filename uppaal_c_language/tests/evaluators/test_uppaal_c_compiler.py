@@ -0,0 +1,173 @@
+import pytest
+
+from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import (
+    UppaalCLanguageParser
+)
+from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import (
+    UppaalCLanguageSemantics
+)
+from uppaal_c_language.backend.evaluators.uppaal_c_compiler import (
+    UppaalCCompiler, UppaalCCompilerError, UppaalCRuntimeError
+)
+
+test_decls = """
+const int N = 3;
+typedef int[0,N-1] id_t;
+typedef struct { int a; bool b[2]; } rec_t;
+clock x;
+chan c;
+int i = 1;
+int[0,5] k;
+int arr[N] = {1, 2, 3};
+int mat[2][N];
+rec_t r = {7, {true, false}};
+rec_t rs[2];
+meta int m;
+
+int sum(int &v[N]) {
+    int s = 0;
+    for (j : id_t) {
+        s += v[j];
+    }
+    return s;
+}
+
+void swap(int &p, int &q) {
+    int tmp = p;
+    p = q;
+    q = tmp;
+}
+
+int fac(int n) {
+    if (n <= 1) return 1;
+    return n * fac(n - 1);
+}
+
+int first(rec_t s) {
+    s.a = 0;
+    return s.a;
+}
+"""
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+
+
+@pytest.fixture
+def compiler(parser):
+    return UppaalCCompiler(decls=parser.parse(test_decls, rule_name="UppaalDeclaration")["decls"])
+
+
+def evaluate(parser, compiler, slots, text, bound_vars=None, bound_values=()):
+    ast = parser.parse(text, rule_name="Expression")
+    return compiler.compile_expression(ast, bound_vars=bound_vars)(slots, *bound_values)
+
+
+def test_slot_layout(compiler):
+    assert compiler.slot_names == [
+        "i", "k", "arr[0]", "arr[1]", "arr[2]",
+        "mat[0][0]", "mat[0][1]", "mat[0][2]", "mat[1][0]", "mat[1][1]", "mat[1][2]",
+        "r.a", "r.b[0]", "r.b[1]", "rs[0].a", "rs[0].b[0]", "rs[0].b[1]", "rs[1].a", "rs[1].b[0]", "rs[1].b[1]",
+        "m"]
+    assert compiler.get_values(compiler.new_slots())["r.b[0]"] is True
+    assert compiler.clocks == {"x": []}
+    assert compiler.channels == {"c": {"dims": [], "broadcast": False, "urgent": False}}
+    assert compiler.constant_names == {"N"}
+
+
+def test_clock_and_channel_arrays(parser):
+    compiler = UppaalCCompiler(decls=parser.parse(
+        "const int N = 2; typedef int[0,N] id_t; clock y[N][3]; urgent broadcast chan b[id_t];",
+        rule_name="UppaalDeclaration")["decls"])
+    assert compiler.clocks == {"y": [2, 3]}
+    assert compiler.channels == {"b": {"dims": [3], "broadcast": True, "urgent": True}}
+    assert compiler.int_range(parser.parse("id_t", rule_name="Type")) == (0, 2)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("N * 2 - 1", 5),
+    ("N > 2 ? -N : N", -3),
+    ("-7 / 2 + -7 % 2", -4),
+])
+def test_constant_evaluation(parser, compiler, text, expected):
+    assert compiler.evaluate_constant(parser.parse(text, rule_name="Expression")) == expected
+
+
+@pytest.mark.parametrize("text", ["i + 1", "N / 0", "sum(arr)"])
+def test_constant_evaluation_of_non_constant_expression(parser, compiler, text):
+    with pytest.raises(UppaalCCompilerError):
+        compiler.evaluate_constant(parser.parse(text, rule_name="Expression"))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1 + 2 * 3", 7),
+    ("N * 2", 6),
+    ("-7 / 2", -3),
+    ("-7 % 2", -1),
+    ("arr[i] + arr[N-1]", 5),
+    ("r.a + r.b[0]", 8),
+    ("i == 1 && !r.b[1]", True),
+    ("i > 1 ? 10 : 20", 20),
+    ("3 <? 2", 2),
+    ("forall (j : id_t) arr[j] > 0", True),
+    ("exists (j : int[0,2]) arr[j] == 4", False),
+    ("sum (j : id_t) arr[j]", 6),
+    ("sum(arr)", 6),
+    ("fac(5)", 120),
+    ("first(r) + r.a", 7),
+    ("abs(-3)", 3),
+])
+def test_expressions(parser, compiler, text, expected):
+    assert evaluate(parser, compiler, compiler.new_slots(), text) == expected
+
+
+@pytest.mark.parametrize("text, name, expected", [
+    ("i = 4", "i", 4),
+    ("i += 2", "i", 3),
+    ("i++", "i", 2),
+    ("--i", "i", 0),
+    ("mat[1][i] = 9", "mat[1][1]", 9),
+    ("rs[i].b[1] = true", "rs[1].b[1]", True),
+    ("rs[0] = r", "rs[0].a", 7),
+    ("swap(arr[0], arr[2])", "arr[0]", 3),
+    ("swap(arr[0], arr[2])", "arr[2]", 1),
+])
+def test_updates(parser, compiler, text, name, expected):
+    slots = compiler.new_slots()
+    evaluate(parser, compiler, slots, text)
+    assert slots[compiler.slot_index(name)] == expected
+
+
+def test_bound_variables(parser, compiler):
+    slots = compiler.new_slots()
+    evaluate(parser, compiler, slots, "arr[e] = arr[e] + 10", bound_vars=["e"], bound_values=(2,))
+    assert slots[compiler.slot_index("arr[2]")] == 13
+
+
+def test_compiled_function(compiler):
+    assert compiler.compile_function("fac")(compiler.new_slots(), 4) == 24
+
+
+@pytest.mark.parametrize("text", [
+    "arr[i + 5]",
+    "k = 6",
+    "i = 32768",
+    "i / (i - 1)",
+])
+def test_runtime_errors(parser, compiler, text):
+    with pytest.raises(UppaalCRuntimeError):
+        evaluate(parser, compiler, compiler.new_slots(), text)
+
+
+@pytest.mark.parametrize("text", [
+    "x > 2",
+    "undeclared + 1",
+    "arr[3]",
+    "N = 2",
+    "arr + 1",
+])
+def test_compile_errors(parser, compiler, text):
+    with pytest.raises(UppaalCCompilerError):
+        evaluate(parser, compiler, compiler.new_slots(), text)
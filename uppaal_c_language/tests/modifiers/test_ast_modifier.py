@@ -0,0 +1,144 @@
+import copy
+import pprint
+
+import pytest
+from uppaal_c_language.backend.modifiers.ast_modifier import (
+    apply_func_to_ast, ASTVisitor, visit_ast, replace_variables_in_ast
+)
+from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
+from uppaal_c_language.backend.printers.uppaal_c_language_printer import UppaalCPrinter
+from tests.uppaal_c_language_test_data import test_declaration_data, test_expr_data
+
+pp = pprint.PrettyPrinter(indent=4, compact=True)
+
+
+@pytest.fixture
+def parser():
+    return UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+
+
+@pytest.fixture
+def printer():
+    return UppaalCPrinter()
+
+
+def _collect_types(ast, acc):
+    if isinstance(ast, dict):
+        acc.append(ast["astType"])
+    return ast
+
+
+###############
+# AST Visitor #
+###############
+@pytest.mark.parametrize("data", test_declaration_data.values(),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}', test_declaration_data.items())))
+def test_visitor_finds_same_elements_as_recursive_walk(data):
+    ast = copy.deepcopy(data["ast"])
+    _, expected = apply_func_to_ast(ast=ast, func=_collect_types)
+
+    visitor = ASTVisitor()
+    for ast_type in set(expected):
+        visitor.register(ast_type=ast_type, handler=lambda elem, acc: acc.append(elem["astType"]))
+    _, res = visitor.visit(ast=ast)
+
+    assert sorted(res) == sorted(expected)
+    assert ast == data["ast"]
+
+
+def test_visitor_visits_in_document_order(parser):
+    ast = parser.parse(text="int a = b + c * d;", rule_name="UppaalDeclaration")
+    _, res = visit_ast(ast, {"Variable": lambda elem, acc: acc.append(elem["name"])})
+    assert res == ["b", "c", "d"]
+
+
+def test_visitor_skips_subtree(parser):
+    ast = parser.parse(text="int a = b + f(c, d) + e;", rule_name="UppaalDeclaration")
+    _, res = visit_ast(ast, {
+        "Variable": lambda elem, acc: acc.append(elem["name"]),
+        "FuncCallExpr": lambda elem, acc: ASTVisitor.SKIP,
+    })
+    assert res == ["b", "e"]
+
+
+def test_visitor_stops_early(parser):
+    ast = parser.parse(text="int a = b + c + d;", rule_name="UppaalDeclaration")
+
+    def _find_first(elem, acc):
+        acc.append(elem["name"])
+        return ASTVisitor.STOP
+
+    _, res = visit_ast(ast, {"Variable": _find_first})
+    assert res == ["b"]
+
+
+def test_visitor_replaces_elements(parser, printer):
+    ast = parser.parse(text="x = y + 1", rule_name="Expression")
+    const_ast = parser.parse(text="2", rule_name="Expression")
+    res_ast, _ = visit_ast(ast, {"Integer": lambda elem, acc: copy.deepcopy(const_ast)})
+    assert printer.ast_to_string(res_ast) == printer.ast_to_string(parser.parse(text="x = y + 2",
+                                                                                rule_name="Expression"))
+
+
+def test_visitor_replaces_root(parser):
+    ast = parser.parse(text="x", rule_name="Expression")
+    new_ast = {"astType": "Variable", "name": "y"}
+    res_ast, _ = visit_ast(ast, {"Variable": lambda elem, acc: new_ast})
+    assert res_ast is new_ast
+
+
+def test_visitor_modifies_in_place(parser, printer):
+    ast = parser.parse(text="x + x * y", rule_name="Expression")
+
+    def _rename(elem, _acc):
+        if elem["name"] == "x":
+            elem["name"] = "z"
+
+    res_ast, _ = visit_ast(ast, {"Variable": _rename})
+    assert res_ast is ast
+    assert ''.join(printer.ast_to_string(res_ast).split()) == "z+z*y"
+
+
+def test_visitor_handles_deep_asts(parser):
+    depth = 5000
+    ast = {"astType": "Variable", "name": "x"}
+    for _ in range(depth):
+        ast = {"astType": "UnaryExpr", "op": "Minus", "expr": ast}
+    _, res = visit_ast(ast, {"Variable": lambda elem, acc: acc.append(elem["name"])})
+    assert res == ["x"]
+
+
+@pytest.mark.parametrize("data", test_expr_data.values(),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}', test_expr_data.items())))
+def test_visitor_counts_variables(data):
+    _, expected = apply_func_to_ast(ast=copy.deepcopy(data["ast"]), func=_collect_types)
+    _, res = visit_ast(copy.deepcopy(data["ast"]), {"Variable": lambda elem, acc: acc.append("Variable")})
+    assert len(res) == expected.count("Variable")
+
+
+######################
+# Variable Replacing #
+######################
+def test_replace_variables_simultaneously(parser, printer):
+    ast = parser.parse(text="a = b + a * c", rule_name="Expression")
+    res_ast, replaced = replace_variables_in_ast(ast, {"a": "b", "b": "a"})
+    assert ''.join(printer.ast_to_string(res_ast).split()) == "b=a+b*c"
+    assert replaced == ["a", "b", "a"]
+
+
+def test_replace_variables_by_asts(parser, printer):
+    ast = parser.parse(text="x < N && y == N", rule_name="Expression")
+    rep_ast = parser.parse(text="arr[2]", rule_name="Expression")
+    res_ast, replaced = replace_variables_in_ast(ast, {"N": rep_ast})
+    assert ''.join(printer.ast_to_string(res_ast).split()) == "x<arr[2]&&y==arr[2]"
+    assert replaced == ["N", "N"]
+    assert res_ast["left"]["right"] is not res_ast["right"]["right"]
+
+
+def test_replace_variables_without_matches(parser):
+    ast = parser.parse(text="x + y", rule_name="Expression")
+    expected = copy.deepcopy(ast)
+    res_ast, replaced = replace_variables_in_ast(ast, {"z": "w"})
+    assert res_ast == expected
+    assert replaced == []
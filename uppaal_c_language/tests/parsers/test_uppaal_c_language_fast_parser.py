@@ -0,0 +1,185 @@
+import json
+import random
+
+import pytest
+from tatsu.exceptions import FailedParse
+
+from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import (
+    UppaalCLanguageParser
+)
+from uppaal_c_language.backend.parsers.uppaal_c_language_fast_parser import (
+    UppaalCLanguageFastParser
+)
+from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import (
+    UppaalCLanguageSemantics
+)
+from tests.uppaal_c_language_test_data import (
+    test_expr_data, test_assign_data
+)
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+
+
+@pytest.fixture(scope="module")
+def fast_parser():
+    return UppaalCLanguageFastParser()
+
+
+def assert_identical_ast(fast_parser, parser, text, rule_name):
+    """Checks that the fast path (if taken) yields exactly the AST of the TatSu parser (including key order)."""
+    fast_res = fast_parser.try_parse(text=text, rule_name=rule_name)
+    if fast_res is None:
+        return False
+    res = parser.parse(text, rule_name=rule_name)
+    assert json.dumps(fast_res) == json.dumps(res), text
+    return True
+
+
+###############
+# Expressions #
+###############
+expr_test_data = dict((key, val) for key, val in {**test_expr_data, **test_assign_data}.items()
+                      if val["rule"] == "Expression")
+
+
+@pytest.mark.parametrize("data", expr_test_data.values(),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}', expr_test_data.items())))
+def test_fast_expression(fast_parser, parser, data):
+    res = fast_parser.parse(text=data["text"], rule_name=data["rule"])
+    assert res == data["ast"]
+    assert_identical_ast(fast_parser, parser, data["text"], data["rule"])
+
+
+##########
+# Labels #
+##########
+label_data = [
+    ("Guards", "x >= 5 && y < 3 && !flag"),
+    ("Guards", "(x > 1 || y > 2) and c == N-1"),
+    ("Invariants", "x <= 10 && y <= T[id]"),
+    ("Invariant", "x <= 10"),
+    ("Guard", "id == 0 ? a[i][j+1] > 2 : b != 3"),
+    ("Updates", "x = 0, y := 0, i++, --j, arr[i] = f(i, 2) + 1"),
+    ("Updates", ""),
+    ("Updates", "a += b <? c, d = e >? 2, k <<= 1, m %= -n"),
+    ("Update", "s.val = s.val * 2"),
+    ("Update", "flag = !flag"),
+    ("Update", "x = y = z = 0"),
+    ("Update", "d = 1.5e-3 * 2.0"),
+    ("Sync", "go!"),
+    ("Sync", "msg[id][0]?"),
+    ("Select", "i : int[0,N-1]"),
+    ("Select", "e : id_t"),
+    ("Selects", "i : int[0,3], j : id_t"),
+    ("Expression", "a - -b + +c"),
+    ("Expression", "a ? b ? c : d : e ? f : g"),
+    ("Expression", "1 << 2 >> 3 & 4 ^ 5 | 6"),
+    ("Expression", "x++ + ++y"),
+    ("Expression", "f()"),
+]
+
+
+@pytest.mark.parametrize("rule_name, text", label_data, ids=[f'{rule}: {text}' for rule, text in label_data])
+def test_fast_labels(fast_parser, parser, rule_name, text):
+    assert assert_identical_ast(fast_parser, parser, text, rule_name)
+
+
+fallback_data = [
+    ("Guards", "forall (i : int[0,3]) a[i] > 0"),
+    ("Guards", "a imply b"),
+    ("Guards", "x > 0 /* comment */"),
+    ("Invariants", "x' == 2"),
+    ("Guard", "notify > 0"),
+    ("Guard", "trueish"),
+    ("Update", "(a) = 1"),
+    ("Select", "c : const_t"),
+    ("Expression", "sum (i : int[0,3]) a[i]"),
+]
+
+
+@pytest.mark.parametrize("rule_name, text", fallback_data, ids=[f'{rule}: {text}' for rule, text in fallback_data])
+def test_fast_fallback(fast_parser, parser, rule_name, text):
+    assert fast_parser.try_parse(text=text, rule_name=rule_name) is None
+    try:
+        expected = parser.parse(text, rule_name=rule_name)
+    except FailedParse:
+        with pytest.raises(FailedParse):
+            fast_parser.parse(text=text, rule_name=rule_name)
+    else:
+        assert fast_parser.parse(text=text, rule_name=rule_name) == expected
+
+
+def test_fast_unsupported_rule(fast_parser, parser):
+    text = "int x = 2;"
+    assert fast_parser.try_parse(text=text, rule_name="VariableDecls") is None
+    assert fast_parser.parse(text=text, rule_name="VariableDecls") == parser.parse(text, rule_name="VariableDecls")
+
+
+########################
+# Random Differentials #
+########################
+class RandomExpressionGenerator:
+    """Generates random (mostly valid) Uppaal C expression texts."""
+
+    binary_ops = ["+", "-", "*", "/", "%", "<<", ">>", "&", "|", "^", "&&", "||", "and", "or",
+                  "<", "<=", ">", ">=", "==", "!=", "<?", ">?", "."]
+    assign_ops = ["=", ":=", "+=", "-=", "*=", "/=", "%=", "|=", "&=", "^=", "<<=", ">>="]
+    unary_ops = ["!", "not ", "-", "+"]
+    names = ["a", "b", "x1", "y_2", "arr", "ok"]
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+
+    def space(self):
+        return self.rng.choice(["", " ", " ", "  "])
+
+    def operand(self, depth):
+        rng = self.rng
+        choice = rng.randrange(12 if depth > 0 else 5)
+        if choice == 0:
+            return str(rng.randrange(100))
+        elif choice == 1:
+            return rng.choice(["0.5", "1.25", ".5", "2.0e3"])
+        elif choice == 2:
+            return rng.choice(["true", "false"])
+        elif choice in [3, 4]:
+            return rng.choice(self.names)
+        elif choice == 5:
+            return f'{rng.choice(self.names)}[{self.expr(depth - 1)}]'
+        elif choice == 6:
+            return f'({self.expr(depth - 1)})'
+        elif choice == 7:
+            args = ", ".join(self.expr(depth - 1) for _ in range(rng.randrange(3)))
+            return f'f{rng.randrange(2)}({args})'
+        elif choice == 8:
+            return f'{rng.choice(self.unary_ops)}{self.space()}{self.operand(depth - 1)}'
+        elif choice == 9:
+            return f'{rng.choice(["++", "--"])}{rng.choice(self.names)}'
+        elif choice == 10:
+            return f'{self.operand(depth - 1)}{rng.choice(["++", "--"])}'
+        return f'{self.expr(depth - 1)} ? {self.expr(depth - 1)} : {self.expr(depth - 1)}'
+
+    def expr(self, depth):
+        rng = self.rng
+        text = self.operand(depth)
+        for _ in range(rng.randrange(3)):
+            op = rng.choice(self.binary_ops)
+            text = f'{text}{self.space()}{op}{self.space()}{self.operand(depth)}'
+        if depth > 0 and rng.random() < 0.15:
+            op = rng.choice(self.assign_ops)
+            text = f'{rng.choice(self.names)}{self.space()}{op}{self.space()}{text}'
+        return text
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_fast_random_differential(fast_parser, parser, seed):
+    generator = RandomExpressionGenerator(seed=seed)
+    fast_count = 0
+    for _ in range(100):
+        text = generator.expr(depth=3)
+        if assert_identical_ast(fast_parser, parser, text, "Expression"):
+            fast_count += 1
+    assert fast_count > 0
@@ -0,0 +1,140 @@
+import pytest
+
+from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
+from uppaal_c_language.backend.printers.uppaal_c_language_printer import UppaalCPrinter
+from tests.uppaal_c_language_test_data import (
+    test_expr_data, test_statement_data, test_return_statement_data, test_assign_data, test_declaration_data,
+    test_system_declaration_data
+)
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+
+
+@pytest.fixture
+def printer():
+    return UppaalCPrinter()
+
+
+@pytest.fixture
+def fast_printer():
+    return UppaalCPrinter(fast=True)
+
+
+all_test_data = {
+    **test_expr_data, **test_assign_data, **test_declaration_data, **test_statement_data,
+    **test_return_statement_data, **test_system_declaration_data
+}
+
+
+#############
+# Test Data #
+#############
+@pytest.mark.parametrize("data", all_test_data.values(),
+                         ids=list(map(lambda kv: f'{kv[0]}: {kv[1]["text"]}', all_test_data.items())))
+def test_fast_printer_identical(printer, fast_printer, data):
+    assert fast_printer.ast_to_string(ast=data["ast"]) == printer.ast_to_string(ast=data["ast"])
+
+
+#################
+# Parsed Inputs #
+#################
+declaration_text = """
+const int N = 12;
+typedef int[0,N-1] id_t;
+typedef struct { int a; bool b[2]; struct { int c; } s; } rec_t;
+clock x, y;
+chan go[N];
+int v = 1, a[12] = {0,1,2,3,4,5,6,7,8,9,10,11};
+int m[2][3] = {{1,2,3},{4,5,6}};
+int big[3][12] = {{0,1,2,3,4,5,6,7,8,9,10,11},{0,1,2,3,4,5,6,7,8,9,10,11},{0,1,2,3,4,5,6,7,8,9,10,11}};
+chan priority go[0], go[1] < default < go[2];
+int f(id_t p, int &r) {
+    int j;
+    for (j = 0; j < N; j++) {
+        if (a[j] > p && v != j) {
+            r += a[j] * 2 - 1;
+        } else {
+            r = r > 0 ? r - 1 : 0;
+        }
+    }
+    for (i : id_t) {
+        while (r > 0) { r--; }
+        do { r++; } while (r < 3);
+    }
+    if (r == 2) return r;
+    return forall (i : id_t) a[i] > 0 ? r % N : -r;
+}
+void g() {
+    ;
+    return;
+}
+"""
+
+system_declaration_text = """
+P0 = P(0, v);
+Q(const id_t i) = P(i, 1);
+system P0, Q < R;
+"""
+
+
+@pytest.mark.parametrize("text, rule_name", [(declaration_text, "UppaalDeclaration"),
+                                             (system_declaration_text, "UppaalSystemDeclaration")],
+                         ids=["UppaalDeclaration", "UppaalSystemDeclaration"])
+def test_fast_printer_parsed_input(parser, printer, fast_printer, text, rule_name):
+    ast = parser.parse(text, rule_name=rule_name)
+    assert fast_printer.ast_to_string(ast=ast) == printer.ast_to_string(ast=ast)
+
+
+##############
+# Edge Cases #
+##############
+def test_fast_printer_none(fast_printer):
+    assert fast_printer.ast_to_string(ast=None) == ""
+
+
+def test_fast_printer_unsupported_type(fast_printer):
+    with pytest.raises(Exception, match="not supported by UppaalCPrinter"):
+        fast_printer.ast_to_string(ast={"astType": "Unknown"})
+
+
+def initialiser_array(vals):
+    return {"astType": "InitialiserArray", "vals": vals}
+
+
+def int_array(size):
+    return initialiser_array([{"astType": "Integer", "val": i} for i in range(size)])
+
+
+initialiser_array_data = {
+    "empty": initialiser_array([]),
+    "single": int_array(1),
+    "row": int_array(9),
+    "rows": int_array(1000),
+    "mixed": initialiser_array([{"astType": "Integer", "val": 1}, {"astType": "UnaryExpr", "op": "Minus",
+                                                                    "expr": {"astType": "Variable", "name": "N"}}]
+                               * 7),
+    "nested": initialiser_array([int_array(3), int_array(20), initialiser_array([int_array(12), int_array(2)])]),
+}
+
+
+@pytest.mark.parametrize("vals", initialiser_array_data.values(), ids=list(initialiser_array_data.keys()))
+def test_fast_printer_initialiser_array(printer, fast_printer, vals):
+    ast = {"astType": "UppaalDeclaration", "decls": [
+        {"astType": "VariableDecls",
+         "type": {"astType": "Type", "prefixes": ["const"], "typeId": {"astType": "CustomType", "type": "int"}},
+         "varData": [{"astType": "VariableID", "varName": "OBS_VALS", "arrayDecl": [], "initData": vals}]},
+    ]}
+    assert fast_printer.ast_to_string(ast=ast) == printer.ast_to_string(ast=ast)
+
+
+def test_fast_printer_deep_nesting(fast_printer):
+    depth = 2000
+    ast = {"astType": "Variable", "name": "x"}
+    for i in range(depth):
+        ast = {"astType": "BinaryExpr", "op": "Add", "left": ast, "right": {"astType": "Integer", "val": i}}
+    res = fast_printer.ast_to_string(ast=ast)
+    assert res == "x" + "".join(f' + {i}' for i in range(depth))
@@ -0,0 +1,1037 @@
+"""This module implements a compiler which turns Uppaal C ASTs into Python closures.
+
+All (non-constant) variables of the compiled declarations are stored in a flat list of slots, in which each scalar
+element (e.g., "a[1].f") has a fixed index. Variable accesses are resolved to slot indices (and strides for array
+indices) at compile time, so that each access at run time is a single list lookup. Scalar constants are folded into the
+compiled closures. Local variables of functions, statement blocks, quantifiers and bound variables (e.g., selects) are
+stored in a separate frame list.
+
+Each compiled closure has the signature "fn(g, l)", where "g" is the global slot list and "l" is the local frame.
+
+Example:
+    compiler = UppaalCCompiler(decls=parser.parse("int a[3]; int sum() { return a[0] + a[2]; }",
+                                                  rule_name="UppaalDeclaration")["decls"])
+    slots = compiler.new_slots()
+    update = compiler.compile_expression(parser.parse("a[i] = 5", rule_name="Expression"), bound_vars=["i"])
+    update(slots, 2)
+"""
+
+# The value range of the (unbounded) Uppaal type "int"
+INT_RANGE = (-32768, 32767)
+
+
+##########
+# Errors #
+##########
+class UppaalCCompilerError(Exception):
+    """An error raised if an AST cannot be compiled (e.g., due to an undeclared variable)."""
+    pass
+
+
+class UppaalCRuntimeError(Exception):
+    """An error raised during the evaluation of a compiled AST (e.g., due to an array index out of range)."""
+    pass
+
+
+#########
+# Types #
+#########
+class _Type:
+    """A compiled type (i.e., the slot layout of a value)."""
+
+    __slots__ = ("kind", "size", "lower", "upper", "elem", "length", "fields")
+
+    def __init__(self, kind, size=1, lower=None, upper=None, elem=None, length=None, fields=None):
+        self.kind = kind  # "int", "bool", "double", "array", or "struct"
+        self.size = size
+        self.lower = lower
+        self.upper = upper
+        self.elem = elem
+        self.length = length
+        self.fields = fields  # Dict mapping field names to (offset, type) pairs
+
+    @property
+    def is_scalar(self):
+        return self.kind in ["int", "bool", "double"]
+
+
+class _Symbol:
+    """A declared name (i.e., a global or local variable, a reference parameter, or a scalar constant)."""
+
+    __slots__ = ("kind", "index", "type", "value")
+
+    def __init__(self, kind, index=None, type_=None, value=None):
+        self.kind = kind  # "global", "local", "ref", or "const"
+        self.index = index
+        self.type = type_
+        self.value = value
+
+
+class _Place:
+    """A compiled storage location (e.g., of the variable access "a[i].f")."""
+
+    __slots__ = ("base", "offset", "dyn", "type", "ref")
+
+    def __init__(self, base, offset, dyn, type_, ref=None):
+        self.base = base  # "g" (global slots), "l" (local frame), or None (reference parameter)
+        self.offset = offset
+        self.dyn = dyn  # A closure computing the dynamic offset (e.g., of array indices), or None
+        self.type = type_
+        self.ref = ref  # The frame index of the (container, offset) pair of a reference parameter
+
+
+class _Context:
+    """A compilation context (i.e., the local scopes and the frame layout of a function or expression)."""
+
+    def __init__(self):
+        self.scopes = [{}]
+        self.size = 0
+
+    def allocate(self, size):
+        """Allocates local frame slots.
+
+        Args:
+            size: The number of slots.
+
+        Returns:
+            The index of the first allocated slot.
+        """
+        index = self.size
+        self.size += size
+        return index
+
+
+def _constant(val):
+    """Creates a closure returning a constant value (which can be folded)."""
+    def fn(g, l):
+        return val
+    fn.const = val
+    return fn
+
+
+def _c_div(left, right):
+    """Divides two integers with truncation towards zero (as in C)."""
+    if right == 0:
+        raise UppaalCRuntimeError("Division by zero.")
+    quotient = abs(left) // abs(right)
+    return quotient if (left >= 0) == (right >= 0) else -quotient
+
+
+def _c_mod(left, right):
+    """Calculates the remainder of a C integer division."""
+    return left - right * _c_div(left, right)
+
+
+def _reassociate_field_access(struct_ast, field_ast):
+    """Re-associates a struct field access whose field is itself an access (e.g., "s.(f[i])" to "(s.f)[i]")."""
+    if field_ast["astType"] == "BracketExpr":
+        return _reassociate_field_access(struct_ast, field_ast["expr"])
+    if field_ast["astType"] == "BinaryExpr" and field_ast["op"] in ["ArrayAccess", "Dot"]:
+        return {"left": _reassociate_field_access(struct_ast, field_ast["left"]), "op": field_ast["op"],
+                "right": field_ast["right"], "astType": "BinaryExpr"}
+    return {"left": struct_ast, "op": "Dot", "right": field_ast, "astType": "BinaryExpr"}
+
+
+_binary_funcs = {
+    "Add": lambda left, right: left + right,
+    "Sub": lambda left, right: left - right,
+    "Mult": lambda left, right: left * right,
+    "Div": _c_div,
+    "Mod": _c_mod,
+    "LShift": lambda left, right: left << right,
+    "RShift": lambda left, right: left >> right,
+    "BitAnd": lambda left, right: left & right,
+    "BitOr": lambda left, right: left | right,
+    "BitXor": lambda left, right: left ^ right,
+    "Minimum": min,
+    "Maximum": max,
+    "GreaterEqual": lambda left, right: left >= right,
+    "GreaterThan": lambda left, right: left > right,
+    "LessEqual": lambda left, right: left <= right,
+    "LessThan": lambda left, right: left < right,
+    "Equal": lambda left, right: left == right,
+    "NotEqual": lambda left, right: left != right,
+}
+
+# Specialized closures of frequent operators (avoiding the indirection of "_binary_funcs")
+_binary_closures = {
+    "Add": lambda a, b: lambda g, l: a(g, l) + b(g, l),
+    "Sub": lambda a, b: lambda g, l: a(g, l) - b(g, l),
+    "Mult": lambda a, b: lambda g, l: a(g, l) * b(g, l),
+    "GreaterEqual": lambda a, b: lambda g, l: a(g, l) >= b(g, l),
+    "GreaterThan": lambda a, b: lambda g, l: a(g, l) > b(g, l),
+    "LessEqual": lambda a, b: lambda g, l: a(g, l) <= b(g, l),
+    "LessThan": lambda a, b: lambda g, l: a(g, l) < b(g, l),
+    "Equal": lambda a, b: lambda g, l: a(g, l) == b(g, l),
+    "NotEqual": lambda a, b: lambda g, l: a(g, l) != b(g, l),
+    "LogAnd": lambda a, b: lambda g, l: bool(a(g, l)) and bool(b(g, l)),
+    "LogOr": lambda a, b: lambda g, l: bool(a(g, l)) or bool(b(g, l)),
+    "LogImply": lambda a, b: lambda g, l: (not a(g, l)) or bool(b(g, l)),
+}
+
+_assign_ops = {
+    "AddAssign": "Add", "SubAssign": "Sub", "MultAssign": "Mult", "DivAssign": "Div", "ModAssign": "Mod",
+    "LShiftAssign": "LShift", "RShiftAssign": "RShift", "BitAndAssign": "BitAnd", "BitOrAssign": "BitOr",
+    "BitXorAssign": "BitXor",
+}
+
+_incr_decr_steps = {
+    "PreIncrAssignExpr": 1,
+    "PostIncrAssignExpr": 1,
+    "PreDecrAssignExpr": -1,
+    "PostDecrAssignExpr": -1,
+}
+
+
+######################
+# Compiled Callables #
+######################
+class CompiledExpression:
+    """A compiled expression (e.g., a guard, invariant or update)."""
+
+    __slots__ = ("fn", "frame_size", "bound_count")
+
+    def __init__(self, fn, frame_size, bound_count):
+        self.fn = fn
+        self.frame_size = frame_size
+        self.bound_count = bound_count
+
+    def __call__(self, slots, *bound_values):
+        """Evaluates the expression (including its side effects on the slots).
+
+        Args:
+            slots: The global slot list.
+            *bound_values: The values of the bound variables (e.g., of selects).
+
+        Returns:
+            The value of the expression.
+        """
+        frame = list(bound_values) + [0] * (self.frame_size - self.bound_count) if self.frame_size else None
+        return self.fn(slots, frame)
+
+
+class CompiledFunction:
+    """A compiled function."""
+
+    __slots__ = ("name", "frame_size", "params", "body")
+
+    def __init__(self, name):
+        self.name = name
+        self.frame_size = 0
+        self.params = []  # List of (frame index, type, is reference) tuples
+        self.body = None
+
+    def __call__(self, slots, *args):
+        """Calls the function with scalar value arguments.
+
+        Args:
+            slots: The global slot list.
+            *args: The argument values.
+
+        Returns:
+            The return value (or None for void functions).
+        """
+        frame = [0] * self.frame_size
+        for (index, type_, is_ref), arg in zip(self.params, args):
+            if is_ref or not type_.is_scalar:
+                raise UppaalCRuntimeError(f'Function "{self.name}" requires non-scalar or reference arguments.')
+            frame[index] = arg
+        res = self.body(slots, frame)
+        return res[0] if res is not None else None
+
+
+############
+# Compiler #
+############
+class UppaalCCompiler:
+    """A compiler which turns Uppaal C ASTs into Python closures operating on a flat list of variable slots."""
+
+    def __init__(self, decls=None):
+        """Initializes UppaalCCompiler.
+
+        Args:
+            decls: The declaration ASTs (e.g., of the global declaration) which are added initially.
+        """
+        self.types = {}
+        self.function_asts = {}
+        self.functions = {}
+        self.clocks = {}  # Dict mapping clock names to array dimensions
+        self.channels = {}  # Dict mapping channel names to array dimensions and "broadcast" and "urgent" flags
+        self.constant_names = set()
+        self.symbols = {}
+        self.slot_names = []
+        self.slot_types = []
+        self.initial_slots = []
+        self.slot_indices = {}
+
+        if decls:
+            self.add_declarations(decls)
+
+    #########
+    # Slots #
+    #########
+    def new_slots(self):
+        """Creates a new slot list holding the initial values of all variables.
+
+        Returns:
+            The slot list.
+        """
+        return list(self.initial_slots)
+
+    def slot_index(self, name):
+        """Gets the slot index of a scalar variable element.
+
+        Args:
+            name: The element name (e.g., "x", "a[1]", "s.f").
+
+        Returns:
+            The slot index.
+        """
+        if name not in self.slot_indices:
+            raise UppaalCCompilerError(f'Variable element "{name}" does not exist.')
+        return self.slot_indices[name]
+
+    def get_values(self, slots):
+        """Gets the values of all scalar variable elements.
+
+        Args:
+            slots: The slot list.
+
+        Returns:
+            The dict mapping element names to values.
+        """
+        return dict(zip(self.slot_names, slots))
+
+    ################
+    # Declarations #
+    ################
+    def add_declarations(self, decls):
+        """Adds declarations (i.e., types, functions, constants, variables, clocks, and channels).
+
+        Args:
+            decls: The declaration ASTs.
+        """
+        for decl in decls:
+            decl_type = decl["astType"]
+            if decl_type == "VariableDecls":
+                self._add_variable_decls(decl)
+            elif decl_type == "TypeDecls":
+                for name in decl["names"]:
+                    type_id = decl["type"]["typeId"]
+                    if name["arrayDecl"]:
+                        type_id = {"astType": "ArrayType", "elemType": type_id, "arrayDecl": name["arrayDecl"]}
+                    self.types[name["varName"]] = type_id
+            elif decl_type == "FunctionDef":
+                self.function_asts[decl["name"]] = decl
+            elif decl_type == "ChanPriority":
+                raise UppaalCCompilerError("Channel priorities are not supported by the compiler.")
+
+    def _add_variable_decls(self, decl):
+        """Adds global variable declarations.
+
+        Args:
+            decl: The VariableDecls AST.
+        """
+        prefixes = decl["type"]["prefixes"]
+        type_id = self._resolve_type_id(decl["type"]["typeId"])
+        elem_type_id, type_array_decl = type_id, []
+        if type_id["astType"] == "ArrayType":
+            elem_type_id, type_array_decl = self._resolve_type_id(type_id["elemType"]), type_id["arrayDecl"]
+        base_type = elem_type_id.get("type") if elem_type_id["astType"] == "CustomType" else None
+        ctx = _Context()
+        for var_data in decl["varData"]:
+            name = var_data["varName"]
+            if base_type in ["clock", "chan"]:
+                dims = [self._array_size(dim, ctx) for dim in list(var_data["arrayDecl"]) + list(type_array_decl)]
+                if base_type == "clock":
+                    self.clocks[name] = dims
+                else:
+                    self.channels[name] = {"dims": dims, "broadcast": "broadcast" in prefixes,
+                                           "urgent": "urgent" in prefixes}
+                continue
+
+            type_ = self._compile_type(type_id, var_data["arrayDecl"], ctx)
+            init_fns = self._compile_initializer(type_, var_data.get("initData"), ctx)
+            vals = [init_fn(self.initial_slots, None) for init_fn in init_fns]
+            if "const" in prefixes:
+                self.constant_names.add(name)
+            if "const" in prefixes and type_.is_scalar:
+                self.symbols[name] = _Symbol("const", type_=type_, value=vals[0])
+                continue
+
+            index = len(self.initial_slots)
+            self.symbols[name] = _Symbol("global", index=index, type_=type_)
+            self.initial_slots.extend(vals)
+            for elem_name, elem_type in self._element_names(name, type_):
+                self.slot_indices[elem_name] = len(self.slot_names)
+                self.slot_names.append(elem_name)
+                self.slot_types.append(elem_type)
+            if "const" not in prefixes:
+                self._check_ranges(type_, vals, name)
+
+    def _element_names(self, name, type_):
+        """Gets the names and types of all scalar elements of a value (in slot order)."""
+        if type_.kind == "array":
+            return [elem for i in range(type_.length) for elem in self._element_names(f'{name}[{i}]', type_.elem)]
+        if type_.kind == "struct":
+            return [elem for field_name, (_, field_type) in type_.fields.items()
+                    for elem in self._element_names(f'{name}.{field_name}', field_type)]
+        return [(name, type_)]
+
+    def _check_ranges(self, type_, vals, name):
+        """Checks that the initial values of a variable are within the ranges of their types."""
+        for (elem_name, elem_type), val in zip(self._element_names(name, type_), vals):
+            if elem_type.kind == "int" and not elem_type.lower <= val <= elem_type.upper:
+                raise UppaalCRuntimeError(f'Initial value {val} of "{elem_name}" is out of range '
+                                          f'[{elem_type.lower}, {elem_type.upper}].')
+
+    #########
+    # Types #
+    #########
+    def _resolve_type_id(self, type_id):
+        """Resolves type names (i.e., typedefs) to the underlying type id AST."""
+        seen_types = set()
+        while type_id["astType"] == "CustomType" and type_id["type"] in self.types:
+            if type_id["type"] in seen_types:
+                raise UppaalCCompilerError(f'Type "{type_id["type"]}" is defined cyclically.')
+            seen_types.add(type_id["type"])
+            type_id = self.types[type_id["type"]]
+        return type_id
+
+    def _compile_type(self, type_id, array_decl, ctx):
+        """Compiles a type (with optional array dimensions) into its slot layout.
+
+        Args:
+            type_id: The type id AST (or a Type AST).
+            array_decl: The list of array dimension ASTs (e.g., of the variable declaration).
+            ctx: The compilation context.
+
+        Returns:
+            The compiled type.
+        """
+        if type_id["astType"] == "Type":
+            type_id = type_id["typeId"]
+        type_id = self._resolve_type_id(type_id)
+        if type_id["astType"] == "ArrayType":
+            return self._compile_type(type_id["elemType"], list(array_decl) + list(type_id["arrayDecl"]), ctx)
+        if array_decl:
+            elem_type = self._compile_type(type_id, array_decl[1:], ctx)
+            length = self._array_size(array_decl[0], ctx)
+            return _Type("array", size=length * elem_type.size, elem=elem_type, length=length)
+
+        if type_id["astType"] == "BoundedIntType":
+            lower, upper = self._int_range(type_id, ctx)
+            return _Type("int", lower=lower, upper=upper)
+        if type_id["astType"] == "StructType":
+            fields = {}
+            offset = 0
+            for field in type_id["fields"]:
+                for var_data in field["varData"]:
+                    field_type = self._compile_type(field["type"]["typeId"], var_data["arrayDecl"], ctx)
+                    fields[var_data["varName"]] = (offset, field_type)
+                    offset += field_type.size
+            return _Type("struct", size=offset, fields=fields)
+        if type_id["astType"] == "CustomType":
+            if type_id["type"] == "int":
+                return _Type("int", lower=INT_RANGE[0], upper=INT_RANGE[1])
+            if type_id["type"] == "bool":
+                return _Type("bool", lower=0, upper=1)
+            if type_id["type"] == "double":
+                return _Type("double")
+        raise UppaalCCompilerError(f'Type "{type_id}" is not supported by the compiler.')
+
+    def int_range(self, type_ast):
+        """Evaluates the (inclusive) value range of a bounded integer type (e.g., of a select or quantifier).
+
+        Args:
+            type_ast: The type AST (or type id AST).
+
+        Returns:
+            The lower and upper bound of the range.
+        """
+        return self._int_range(type_ast, _Context())
+
+    def evaluate_constant(self, ast):
+        """Evaluates a constant expression (e.g., an array size or a template argument) at compile time.
+
+        Args:
+            ast: The expression AST.
+
+        Returns:
+            The value of the expression.
+
+        Raises:
+            UppaalCCompilerError: If the expression is not constant (e.g., refers to a variable).
+        """
+        return self._const_eval(ast, _Context())
+
+    def _int_range(self, type_id, ctx):
+        """Evaluates the (inclusive) value range of a bounded integer type."""
+        if type_id["astType"] == "Type":
+            type_id = type_id["typeId"]
+        type_id = self._resolve_type_id(type_id)
+        if type_id["astType"] == "BoundedIntType":
+            return self._const_eval(type_id["lower"], ctx), self._const_eval(type_id["upper"], ctx)
+        if type_id["astType"] == "CustomType" and type_id["type"] == "bool":
+            return 0, 1
+        raise UppaalCCompilerError(f'Type "{type_id}" is not a bounded integer type.')
+
+    def _array_size(self, dim_ast, ctx):
+        """Evaluates the size of an array dimension (given as expression or as bounded integer type)."""
+        if dim_ast["astType"] == "Variable" and dim_ast["name"] in self.types:
+            dim_ast = {"astType": "CustomType", "type": dim_ast["name"]}
+        if dim_ast["astType"] in ["CustomType", "BoundedIntType", "Type"]:
+            lower, upper = self._int_range(dim_ast, ctx)
+            if lower != 0:
+                raise UppaalCCompilerError("Arrays indexed by integer ranges not starting at 0 are not supported.")
+            return upper + 1
+        return self._const_eval(dim_ast, ctx)
+
+    def _const_eval(self, ast, ctx):
+        """Evaluates a constant expression at compile time."""
+        fn = self._compile_expr(ast, ctx)
+        if not hasattr(fn, "const"):
+            raise UppaalCCompilerError(f'Expression "{ast}" is not constant.')
+        return fn.const
+
+    def _compile_initializer(self, type_, init_ast, ctx):
+        """Compiles the initializer of a variable into one closure per scalar element (in slot order).
+
+        Args:
+            type_: The compiled type of the variable.
+            init_ast: The initializer AST (or None for the default value).
+            ctx: The compilation context.
+
+        Returns:
+            The list of closures.
+        """
+        if type_.kind == "array":
+            if init_ast is None:
+                return [fn for _ in range(type_.length) for fn in self._compile_initializer(type_.elem, None, ctx)]
+            if init_ast["astType"] != "InitialiserArray" or len(init_ast["vals"]) != type_.length:
+                raise UppaalCCompilerError(f'Array initializer does not match the array size {type_.length}.')
+            return [fn for val in init_ast["vals"] for fn in self._compile_initializer(type_.elem, val, ctx)]
+        if type_.kind == "struct":
+            field_types = [field_type for _, field_type in type_.fields.values()]
+            if init_ast is None:
+                return [fn for field_type in field_types for fn in self._compile_initializer(field_type, None, ctx)]
+            if init_ast["astType"] != "InitialiserArray" or len(init_ast["vals"]) != len(field_types):
+                raise UppaalCCompilerError("Struct initializer does not match the struct fields.")
+            return [fn for field_type, val in zip(field_types, init_ast["vals"])
+                    for fn in self._compile_initializer(field_type, val, ctx)]
+
+        if init_ast is not None:
+            return [self._compile_expr(init_ast, ctx)]
+        if type_.kind == "double":
+            return [_constant(0.0)]
+        if type_.kind == "bool":
+            return [_constant(False)]
+        return [_constant(0 if type_.lower <= 0 <= type_.upper else type_.lower)]
+
+    ###############
+    # Compilation #
+    ###############
+    def compile_expression(self, ast, bound_vars=None):
+        """Compiles an expression (or a guard, invariant or update).
+
+        Args:
+            ast: The expression AST.
+            bound_vars: The names of bound integer variables (e.g., of selects), whose values are passed on evaluation.
+
+        Returns:
+            The compiled expression.
+        """
+        ctx = _Context()
+        for name in bound_vars or []:
+            ctx.scopes[-1][name] = _Symbol("local", index=ctx.allocate(1), type_=_Type("int", lower=INT_RANGE[0],
+                                                                                         upper=INT_RANGE[1]))
+        fn = self._compile_expr(ast, ctx)
+        return CompiledExpression(fn=fn, frame_size=ctx.size, bound_count=len(bound_vars or []))
+
+    def compile_function(self, name):
+        """Compiles a declared function (which is compiled only once).
+
+        Args:
+            name: The function name.
+
+        Returns:
+            The compiled function.
+        """
+        if name in self.functions:
+            return self.functions[name]
+        if name not in self.function_asts:
+            raise UppaalCCompilerError(f'Function "{name}" is not declared.')
+
+        func_ast = self.function_asts[name]
+        func = CompiledFunction(name=name)
+        # The function is registered before its body is compiled to support recursion
+        self.functions[name] = func
+        ctx = _Context()
+        for param in func_ast["params"]:
+            param_name = param["varData"]["varName"]
+            param_type = self._compile_type(param["type"]["typeId"], param["varData"]["arrayDecl"], ctx)
+            if param["isRef"]:
+                index = ctx.allocate(1)
+                ctx.scopes[-1][param_name] = _Symbol("ref", index=index, type_=param_type)
+            else:
+                index = ctx.allocate(param_type.size)
+                ctx.scopes[-1][param_name] = _Symbol("local", index=index, type_=param_type)
+            func.params.append((index, param_type, bool(param["isRef"])))
+        func.body = self._compile_stmt(func_ast["body"], ctx)
+        func.frame_size = ctx.size
+        return func
+
+    def _lookup(self, name, ctx):
+        """Looks up a declared name in the local scopes and the global scope."""
+        for scope in reversed(ctx.scopes):
+            if name in scope:
+                return scope[name]
+        if name in self.symbols:
+            return self.symbols[name]
+        if name in self.clocks:
+            raise UppaalCCompilerError(f'Clock "{name}" cannot be used in a data expression.')
+        if name in self.channels:
+            raise UppaalCCompilerError(f'Channel "{name}" cannot be used in a data expression.')
+        raise UppaalCCompilerError(f'Variable "{name}" is not declared.')
+
+    ##########
+    # Places #
+    ##########
+    def _compile_place(self, ast, ctx):
+        """Compiles an assignable expression (e.g., "a[i].f") into a storage location."""
+        ast_type = ast["astType"]
+        if ast_type == "BracketExpr":
+            return self._compile_place(ast["expr"], ctx)
+        if ast_type == "Variable":
+            symbol = self._lookup(ast["name"], ctx)
+            if symbol.kind == "global":
+                return _Place("g", symbol.index, None, symbol.type)
+            if symbol.kind == "local":
+                return _Place("l", symbol.index, None, symbol.type)
+            if symbol.kind == "ref":
+                return _Place(None, 0, None, symbol.type, ref=symbol.index)
+            raise UppaalCCompilerError(f'Constant "{ast["name"]}" is not assignable.')
+        if ast_type == "BinaryExpr" and ast["op"] == "ArrayAccess":
+            place = self._compile_place(ast["left"], ctx)
+            if place.type.kind != "array":
+                raise UppaalCCompilerError(f'Expression "{ast["left"]}" is not an array.')
+            index_fn = self._compile_expr(ast["right"], ctx)
+            stride, length = place.type.elem.size, place.type.length
+            if hasattr(index_fn, "const"):
+                index = index_fn.const
+                if not 0 <= index < length:
+                    raise UppaalCCompilerError(f'Array index {index} is out of range [0, {length - 1}].')
+                return _Place(place.base, place.offset + index * stride, place.dyn, place.type.elem, place.ref)
+            return _Place(place.base, place.offset, self._index_offset(place.dyn, index_fn, stride, length),
+                          place.type.elem, place.ref)
+        if ast_type == "BinaryExpr" and ast["op"] == "Dot":
+            if ast["right"]["astType"] != "Variable":
+                # The parser binds "s.f[i]" as "s.(f[i])", which is re-associated to "(s.f)[i]"
+                return self._compile_place(_reassociate_field_access(ast["left"], ast["right"]), ctx)
+            place = self._compile_place(ast["left"], ctx)
+            if place.type.kind != "struct" or ast["right"]["name"] not in place.type.fields:
+                raise UppaalCCompilerError(f'Struct field "{ast["right"]["name"]}" does not exist.')
+            field_offset, field_type = place.type.fields[ast["right"]["name"]]
+            return _Place(place.base, place.offset + field_offset, place.dyn, field_type, place.ref)
+        raise UppaalCCompilerError(f'Expression of type "{ast_type}" is not assignable.')
+
+    @staticmethod
+    def _index_offset(prev_dyn, index_fn, stride, length):
+        """Creates the closure of a dynamic offset of an array access (with range check)."""
+        def dyn(g, l):
+            index = index_fn(g, l)
+            if not 0 <= index < length:
+                raise UppaalCRuntimeError(f'Array index {index} is out of range [0, {length - 1}].')
+            return index * stride
+
+        if prev_dyn is None:
+            return dyn
+
+        def nested_dyn(g, l):
+            return prev_dyn(g, l) + dyn(g, l)
+        return nested_dyn
+
+    @staticmethod
+    def _reader(place):
+        """Creates the closure reading a scalar storage location."""
+        offset, dyn = place.offset, place.dyn
+        if place.ref is not None:
+            ref = place.ref
+
+            def read_ref(g, l):
+                container, base = l[ref]
+                return container[base + offset + (dyn(g, l) if dyn is not None else 0)]
+            return read_ref
+        if place.base == "g":
+            if dyn is None:
+                return lambda g, l: g[offset]
+            return lambda g, l: g[offset + dyn(g, l)]
+        if dyn is None:
+            return lambda g, l: l[offset]
+        return lambda g, l: l[offset + dyn(g, l)]
+
+    @staticmethod
+    def _locator(place):
+        """Creates the closure locating a storage location, i.e., returning its (container, index) pair."""
+        offset, dyn = place.offset, place.dyn
+        if place.ref is not None:
+            ref = place.ref
+
+            def locate_ref(g, l):
+                container, base = l[ref]
+                return container, base + offset + (dyn(g, l) if dyn is not None else 0)
+            return locate_ref
+        if place.base == "g":
+            if dyn is None:
+                return lambda g, l: (g, offset)
+            return lambda g, l: (g, offset + dyn(g, l))
+        if dyn is None:
+            return lambda g, l: (l, offset)
+        return lambda g, l: (l, offset + dyn(g, l))
+
+    @staticmethod
+    def _range_checked(value_fn, type_):
+        """Wraps a value closure with a range check of an integer type."""
+        if type_.kind != "int":
+            return value_fn
+        lower, upper = type_.lower, type_.upper
+
+        def checked(g, l):
+            val = value_fn(g, l)
+            if not lower <= val <= upper:
+                raise UppaalCRuntimeError(f'Value {val} is out of range [{lower}, {upper}].')
+            return val
+        return checked
+
+    ###############
+    # Expressions #
+    ###############
+    def _compile_expr(self, ast, ctx):
+        """Compiles an expression into a closure "fn(g, l)" returning its value."""
+        ast_type = ast["astType"]
+        if ast_type in ["Integer", "Boolean", "Double"]:
+            return _constant(ast["val"])
+        if ast_type in ["Guard", "Invariant", "Update", "BracketExpr"]:
+            return self._compile_expr(ast["expr"], ctx)
+        if ast_type == "Variable":
+            symbol = self._lookup(ast["name"], ctx)
+            if symbol.kind == "const":
+                return _constant(symbol.value)
+        if ast_type == "Variable" or (ast_type == "BinaryExpr" and ast["op"] in ["ArrayAccess", "Dot"]):
+            place = self._compile_place(ast, ctx)
+            if not place.type.is_scalar:
+                raise UppaalCCompilerError(f'Non-scalar value "{ast}" cannot be used in an expression.')
+            return self._reader(place)
+        if ast_type == "UnaryExpr":
+            return self._compile_unary(ast, ctx)
+        if ast_type == "BinaryExpr":
+            return self._compile_binary(ast, ctx)
+        if ast_type == "TernaryExpr":
+            cond_fn = self._compile_expr(ast["left"], ctx)
+            then_fn = self._compile_expr(ast["middle"], ctx)
+            else_fn = self._compile_expr(ast["right"], ctx)
+            if hasattr(cond_fn, "const"):
+                return then_fn if cond_fn.const else else_fn
+            return lambda g, l: then_fn(g, l) if cond_fn(g, l) else else_fn(g, l)
+        if ast_type == "AssignExpr":
+            return self._compile_assign(ast, ctx)
+        if ast_type in _incr_decr_steps:
+            return self._compile_incr_decr(ast, ctx)
+        if ast_type == "FuncCallExpr":
+            return self._compile_call(ast, ctx)
+        if ast_type in ["ForAllExpr", "ExistsExpr", "SumExpr"]:
+            return self._compile_quantifier(ast, ctx)
+        raise UppaalCCompilerError(f'Expression of type "{ast_type}" is not supported by the compiler.')
+
+    def _compile_unary(self, ast, ctx):
+        """Compiles a unary expression."""
+        fn = self._compile_expr(ast["expr"], ctx)
+        op = ast["op"]
+        if op == "Plus":
+            return fn
+        if op == "Minus":
+            if hasattr(fn, "const"):
+                return _constant(-fn.const)
+            return lambda g, l: -fn(g, l)
+        if op == "LogNot":
+            if hasattr(fn, "const"):
+                return _constant(not fn.const)
+            return lambda g, l: not fn(g, l)
+        raise UppaalCCompilerError(f'Unary operator "{op}" is not supported by the compiler.')
+
+    def _compile_binary(self, ast, ctx):
+        """Compiles a binary expression (with constant folding)."""
+        op = ast["op"]
+        left_fn = self._compile_expr(ast["left"], ctx)
+        right_fn = self._compile_expr(ast["right"], ctx)
+        if op in _binary_closures:
+            fn = _binary_closures[op](left_fn, right_fn)
+        elif op in _binary_funcs:
+            func = _binary_funcs[op]
+
+            def fn(g, l):
+                return func(left_fn(g, l), right_fn(g, l))
+        else:
+            raise UppaalCCompilerError(f'Binary operator "{op}" is not supported by the compiler.')
+
+        if hasattr(left_fn, "const") and hasattr(right_fn, "const"):
+            try:
+                return _constant(fn(None, None))
+            except UppaalCRuntimeError:
+                return fn
+        return fn
+
+    def _compile_assign(self, ast, ctx):
+        """Compiles an assignment (e.g., "a[i] = 5", "x += 2", or "arr1 = arr2")."""
+        place = self._compile_place(ast["left"], ctx)
+        op = ast["op"]
+        if not place.type.is_scalar:
+            if op != "Assign":
+                raise UppaalCCompilerError(f'Operator "{op}" cannot be applied to non-scalar values.')
+            src_place = self._compile_place(ast["right"], ctx)
+            if src_place.type.size != place.type.size:
+                raise UppaalCCompilerError("Assigned values have different types.")
+            dst_locator, src_locator, size = self._locator(place), self._locator(src_place), place.type.size
+
+            def assign_all(g, l):
+                dst, dst_index = dst_locator(g, l)
+                src, src_index = src_locator(g, l)
+                dst[dst_index:dst_index + size] = src[src_index:src_index + size]
+            return assign_all
+
+        right_fn = self._compile_expr(ast["right"], ctx)
+        if op == "Assign":
+            value_fn = self._range_checked(right_fn, place.type)
+            offset, dyn = place.offset, place.dyn
+            if place.ref is None and dyn is None:
+                if place.base == "g":
+                    def assign_global(g, l):
+                        val = g[offset] = value_fn(g, l)
+                        return val
+                    return assign_global
+
+                def assign_local(g, l):
+                    val = l[offset] = value_fn(g, l)
+                    return val
+                return assign_local
+
+            locator = self._locator(place)
+
+            def assign(g, l):
+                container, index = locator(g, l)
+                val = container[index] = value_fn(g, l)
+                return val
+            return assign
+
+        if op not in _assign_ops:
+            raise UppaalCCompilerError(f'Assignment operator "{op}" is not supported by the compiler.')
+        func = _binary_funcs[_assign_ops[op]]
+        locator = self._locator(place)
+        check_fn = self._range_checked(lambda g, l: l, place.type)
+
+        def compound_assign(g, l):
+            container, index = locator(g, l)
+            val = container[index] = check_fn(None, func(container[index], right_fn(g, l)))
+            return val
+        return compound_assign
+
+    def _compile_incr_decr(self, ast, ctx):
+        """Compiles an increment or decrement (e.g., "i++", "--i")."""
+        place = self._compile_place(ast["expr"], ctx)
+        locator = self._locator(place)
+        step = _incr_decr_steps[ast["astType"]]
+        check_fn = self._range_checked(lambda g, l: l, place.type)
+        is_pre = ast["astType"].startswith("Pre")
+
+        def incr_decr(g, l):
+            container, index = locator(g, l)
+            old_val = container[index]
+            new_val = container[index] = check_fn(None, old_val + step)
+            return new_val if is_pre else old_val
+        return incr_decr
+
+    def _compile_call(self, ast, ctx):
+        """Compiles a function call (of a declared function, or the built-in function "abs")."""
+        name = ast["funcName"]
+        args = ast["args"]
+        if name not in self.function_asts:
+            if name == "abs" and len(args) == 1:
+                arg_fn = self._compile_expr(args[0], ctx)
+                return lambda g, l: abs(arg_fn(g, l))
+            raise UppaalCCompilerError(f'Function "{name}" is not declared.')
+
+        func = self.compile_function(name)
+        setters = []
+        for (index, param_type, is_ref), arg in zip(func.params, args):
+            setters.append(self._compile_arg_setter(index, param_type, is_ref, arg, ctx))
+
+        def call(g, l):
+            frame = [0] * func.frame_size
+            for setter in setters:
+                setter(g, l, frame)
+            res = func.body(g, frame)
+            return res[0] if res is not None else None
+        return call
+
+    def _compile_arg_setter(self, index, param_type, is_ref, arg, ctx):
+        """Compiles the closure passing an argument to the frame of a called function."""
+        if is_ref:
+            locator = self._locator(self._compile_place(arg, ctx))
+
+            def set_ref(g, l, frame):
+                frame[index] = locator(g, l)
+            return set_ref
+        if not param_type.is_scalar:
+            locator = self._locator(self._compile_place(arg, ctx))
+            size = param_type.size
+
+            def set_copy(g, l, frame):
+                container, src_index = locator(g, l)
+                frame[index:index + size] = container[src_index:src_index + size]
+            return set_copy
+        arg_fn = self._range_checked(self._compile_expr(arg, ctx), param_type)
+
+        def set_value(g, l, frame):
+            frame[index] = arg_fn(g, l)
+        return set_value
+
+    def _compile_quantifier(self, ast, ctx):
+        """Compiles a quantifier expression ("forall", "exists", or "sum")."""
+        lower, upper = self._int_range(ast["type"], ctx)
+        values = range(lower, upper + 1)
+        index = ctx.allocate(1)
+        ctx.scopes.append({ast["varName"]: _Symbol("local", index=index, type_=_Type("int", lower=lower, upper=upper))})
+        body_fn = self._compile_expr(ast["expr"], ctx)
+        ctx.scopes.pop()
+
+        if ast["astType"] == "ForAllExpr":
+            def forall(g, l):
+                for val in values:
+                    l[index] = val
+                    if not body_fn(g, l):
+                        return False
+                return True
+            return forall
+        if ast["astType"] == "ExistsExpr":
+            def exists(g, l):
+                for val in values:
+                    l[index] = val
+                    if body_fn(g, l):
+                        return True
+                return False
+            return exists
+
+        def sum_(g, l):
+            total = 0
+            for val in values:
+                l[index] = val
+                total += body_fn(g, l)
+            return total
+        return sum_
+
+    ##############
+    # Statements #
+    ##############
+    def _compile_stmt(self, stmt, ctx):
+        """Compiles a statement into a closure "fn(g, l)" returning None, or a (return value,) tuple on return."""
+        stmt_type = stmt["astType"]
+        if stmt_type == "ExprStatement":
+            expr_fn = self._compile_expr(stmt["expr"], ctx)
+
+            def expr_stmt(g, l):
+                expr_fn(g, l)
+            return expr_stmt
+        if stmt_type == "StatementBlock":
+            return self._compile_block(stmt, ctx)
+        if stmt_type == "IfStatement":
+            cond_fn = self._compile_expr(stmt["cond"], ctx)
+            then_fn = self._compile_stmt(stmt["thenBody"], ctx)
+            else_fn = self._compile_stmt(stmt["elseBody"], ctx) if stmt.get("elseBody") is not None else None
+
+            def if_stmt(g, l):
+                if cond_fn(g, l):
+                    return then_fn(g, l)
+                if else_fn is not None:
+                    return else_fn(g, l)
+            return if_stmt
+        if stmt_type == "ForLoop":
+            init_fn = self._compile_expr(stmt["init"], ctx) if stmt.get("init") is not None else None
+            cond_fn = self._compile_expr(stmt["cond"], ctx) if stmt.get("cond") is not None else _constant(True)
+            after_fn = self._compile_expr(stmt["after"], ctx) if stmt.get("after") is not None else None
+            body_fn = self._compile_stmt(stmt["body"], ctx)
+
+            def for_loop(g, l):
+                if init_fn is not None:
+                    init_fn(g, l)
+                while cond_fn(g, l):
+                    res = body_fn(g, l)
+                    if res is not None:
+                        return res
+                    if after_fn is not None:
+                        after_fn(g, l)
+            return for_loop
+        if stmt_type == "Iteration":
+            lower, upper = self._int_range(stmt["type"], ctx)
+            values = range(lower, upper + 1)
+            index = ctx.allocate(1)
+            ctx.scopes.append({stmt["name"]: _Symbol("local", index=index,
+                                                     type_=_Type("int", lower=lower, upper=upper))})
+            body_fn = self._compile_stmt(stmt["body"], ctx)
+            ctx.scopes.pop()
+
+            def iteration(g, l):
+                for val in values:
+                    l[index] = val
+                    res = body_fn(g, l)
+                    if res is not None:
+                        return res
+            return iteration
+        if stmt_type in ["WhileLoop", "DoWhileLoop"]:
+            cond_fn = self._compile_expr(stmt["cond"], ctx)
+            body_fn = self._compile_stmt(stmt["body"], ctx)
+            is_do_while = stmt_type == "DoWhileLoop"
+
+            def while_loop(g, l):
+                if is_do_while:
+                    res = body_fn(g, l)
+                    if res is not None:
+                        return res
+                while cond_fn(g, l):
+                    res = body_fn(g, l)
+                    if res is not None:
+                        return res
+            return while_loop
+        if stmt_type == "ReturnStatement":
+            if stmt.get("expr") is None:
+                return lambda g, l: (None,)
+            expr_fn = self._compile_expr(stmt["expr"], ctx)
+            return lambda g, l: (expr_fn(g, l),)
+        if stmt_type == "EmptyStatement":
+            return lambda g, l: None
+        raise UppaalCCompilerError(f'Statement of type "{stmt_type}" is not supported by the compiler.')
+
+    def _compile_block(self, stmt, ctx):
+        """Compiles a statement block (with local variable declarations)."""
+        ctx.scopes.append({})
+        init_fns = []
+        for decl in stmt["decls"]:
+            if decl["astType"] != "VariableDecls":
+                raise UppaalCCompilerError(f'Local declaration of type "{decl["astType"]}" is not supported.')
+            for var_data in decl["varData"]:
+                type_ = self._compile_type(decl["type"]["typeId"], var_data["arrayDecl"], ctx)
+                elem_fns = self._compile_initializer(type_, var_data.get("initData"), ctx)
+                index = ctx.allocate(type_.size)
+                ctx.scopes[-1][var_data["varName"]] = _Symbol("local", index=index, type_=type_)
+                init_fns.append((index, elem_fns))
+        stmt_fns = [self._compile_stmt(sub_stmt, ctx) for sub_stmt in stmt["stmts"]]
+        ctx.scopes.pop()
+
+        def block(g, l):
+            for index, elem_fns in init_fns:
+                for i, elem_fn in enumerate(elem_fns):
+                    l[index + i] = elem_fn(g, l)
+            for stmt_fn in stmt_fns:
+                res = stmt_fn(g, l)
+                if res is not None:
+                    return res
+        return block
@@ -1,4 +1,5 @@
 """This module implements modifiers for Uppaal C ASTs."""
+import copy
 import re
 
 
@@ -180,3 +181,137 @@ def apply_funcs_to_ast(ast, funcs):
         return ast_
 
     return apply_func_to_ast(ast, helper_func)
+
+
+########################################################################################################################
+
+class ASTVisitor:
+    """An iterative visitor for Uppaal C ASTs, which dispatches AST elements to handlers based on their "astType".
+
+    The AST is traversed in pre-order via an explicit stack (i.e., without recursion depth limits), and modified in
+    place. A handler is called as handler(ast, acc) and may return:
+    - None to continue the traversal with the children of the AST element,
+    - ASTVisitor.SKIP to skip the children of the AST element,
+    - ASTVisitor.STOP to stop the traversal completely,
+    - a new AST dict which replaces the AST element in its parent (the new AST element is not traversed).
+    """
+
+    SKIP = object()
+    STOP = object()
+
+    def __init__(self, handlers=None):
+        """Initializes ASTVisitor.
+
+        Args:
+            handlers: An optional dict mapping AST types to handler functions.
+        """
+        self.handlers = {}
+        if handlers:
+            for ast_type, handler in handlers.items():
+                self.register(ast_type=ast_type, handler=handler)
+
+    def register(self, ast_type, handler):
+        """Registers a handler function for a given AST type.
+
+        Args:
+            ast_type: The AST type (e.g., "Variable").
+            handler: The handler function.
+        """
+        self.handlers[ast_type] = handler
+
+    def visit(self, ast, acc=None):
+        """Visits all (nested) elements of an AST, and calls the registered handlers on the matching elements.
+
+        Args:
+            ast: The AST instance.
+            acc: An optional list of values accumulated during the traversal.
+
+        Returns:
+            The (potentially replaced) AST and the values accumulated during the traversal.
+        """
+        acc = [] if acc is None else acc
+        handlers = self.handlers
+        root = [ast]
+        stack = [(root, 0)]
+        while stack:
+            container, key = stack.pop()
+            elem = container[key]
+            if isinstance(elem, dict):
+                handler = handlers.get(elem.get("astType"))
+                if handler is not None:
+                    res = handler(elem, acc)
+                    if res is ASTVisitor.STOP:
+                        break
+                    if res is ASTVisitor.SKIP:
+                        continue
+                    if res is not None and res is not elem:
+                        container[key] = res
+                        continue
+                for prop_name in reversed(list(elem.keys())):
+                    if isinstance(elem[prop_name], (dict, list)):
+                        stack.append((elem, prop_name))
+            elif isinstance(elem, list):
+                for i in range(len(elem) - 1, -1, -1):
+                    if isinstance(elem[i], (dict, list)):
+                        stack.append((elem, i))
+        return root[0], acc
+
+
+def visit_ast(ast, handlers, acc=None):
+    """Visits all (nested) elements of an AST iteratively, applying handlers based on the AST type of the elements.
+
+    Args:
+        ast: The AST instance.
+        handlers: A dict mapping AST types to handler functions (see ASTVisitor).
+        acc: An optional list of values accumulated during the traversal.
+
+    Returns:
+        The adapted AST and values accumulated during the traversal.
+    """
+    return ASTVisitor(handlers=handlers).visit(ast=ast, acc=acc)
+
+
+def variable_replacement_visitor(replacements):
+    """Creates a visitor which replaces multiple variables simultaneously in a single traversal.
+
+    Args:
+        replacements: A dict mapping variable names to either new variable names (str) or replacement ASTs (dict,
+            copied for each replaced occurrence).
+
+    Returns:
+        The ASTVisitor, whose visit() returns the adapted AST and the names of all replaced variables.
+    """
+
+    def replace_variable(ast, acc):
+        """Helper function which replaces a variable if it is contained in the replacements.
+
+        Args:
+            ast: The Variable AST element.
+            acc: The list of replaced variable names.
+
+        Returns:
+            The replacement AST, or None if the AST is kept (or adapted in place).
+        """
+        replacement = replacements.get(ast["name"])
+        if replacement is None:
+            return None
+        acc.append(ast["name"])
+        if isinstance(replacement, str):
+            ast["name"] = replacement
+            return None
+        return copy.deepcopy(replacement)
+
+    return ASTVisitor(handlers={"Variable": replace_variable})
+
+
+def replace_variables_in_ast(ast, replacements):
+    """Replaces multiple variables simultaneously in an AST.
+
+    Args:
+        ast: The AST instance.
+        replacements: A dict mapping variable names to either new variable names (str) or replacement ASTs (dict).
+
+    Returns:
+        The adapted AST and the names of all replaced variables.
+    """
+    return variable_replacement_visitor(replacements).visit(ast=ast)
@@ -0,0 +1,433 @@
+"""This module implements a fast-path parser for short Uppaal C label expressions (e.g., guards, updates, syncs).
+
+The fast-path parser is a precedence-climbing parser which produces the same ASTs as the TatSu-generated
+UppaalCLanguageParser in combination with UppaalCLanguageSemantics. Any input it does not handle (e.g., quantifiers,
+comments, or constructs for which the PEG grammar behaves irregularly) is passed on to the TatSu parser.
+"""
+
+import re
+
+from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import (
+    UppaalCLanguageSemantics, all_op_data, split_logic_conjunction
+)
+
+
+class FastParseUnsupported(Exception):
+    """Raised if an input is not handled by the fast-path parser."""
+
+
+#################
+# Token Classes #
+#################
+_token_re = re.compile(r'''
+    \s*(?:
+        (?P<num>[0-9]*\.[0-9]+(?:[Ee][-+]?[0-9]+)?|[0-9]+)
+      | (?P<id>[a-zA-Z_][a-zA-Z0-9_]*)
+      | (?P<op><<=|>>=|\+\+|--|&&|\|\||<<|>>|<\?|>\?|<=|>=|==|!=|:=|\+=|-=|\*=|/=|%=|\|=|&=|\^=|[-+*/%<>=!&|^.?:,()\[\]])
+      | (?P<end>$)
+    )''', re.VERBOSE)
+
+_reserved_keywords = {
+    'chan', 'clock', 'double', 'bool', 'int', 'scalar', 'struct', 'void', 'typedef',
+    'commit', 'const', 'urgent', 'broadcast', 'meta', 'init',
+    'and', 'or', 'not', 'imply', 'true', 'false', 'forall', 'exists',
+    'while', 'do', 'if', 'else', 'return', 'for',
+    'deadlock', 'process', 'state', 'invariant', 'guard', 'sync', 'assign', 'select', 'before_update', 'after_update',
+    'location', 'system', 'trans', 'rate', 'priority', 'progress', 'default',
+    'switch', 'case', 'continue', 'break', 'enum',
+    'sum',
+}
+
+# Keywords which the PEG grammar matches as prefixes of identifiers in operand position (e.g., "notify" as "not ify")
+_operand_keyword_prefixes = ('not', 'true', 'false', 'deadlock', 'forall', 'exists')
+
+# Keywords which the PEG grammar matches as prefixes of type names (e.g., "constant_t" as "const ant_t")
+_type_keyword_prefixes = ('urgent', 'broadcast', 'meta', 'const', 'scalar', 'struct')
+
+_unary_ops = {
+    '!': 'LogNot',
+    'not': 'LogNot',
+    '+': 'Plus',
+    '-': 'Minus',
+}
+
+_binary_ops = {
+    '<<': 'LShift',
+    '>>': 'RShift',
+    '&&': 'LogAnd',
+    'and': 'LogAnd',
+    '||': 'LogOr',
+    'or': 'LogOr',
+    '&': 'BitAnd',
+    '|': 'BitOr',
+    '^': 'BitXor',
+    '<?': 'Minimum',
+    '>?': 'Maximum',
+    '<=': 'LessEqual',
+    '<': 'LessThan',
+    '==': 'Equal',
+    '!=': 'NotEqual',
+    '>=': 'GreaterEqual',
+    '>': 'GreaterThan',
+    '+': 'Add',
+    '-': 'Sub',
+    '*': 'Mult',
+    '/': 'Div',
+    '%': 'Mod',
+    '.': 'Dot',
+}
+
+_assign_ops = {
+    '=': 'Assign',
+    ':=': 'Assign',
+    '+=': 'AddAssign',
+    '-=': 'SubAssign',
+    '*=': 'MultAssign',
+    '/=': 'DivAssign',
+    '%=': 'ModAssign',
+    '|=': 'BitOrAssign',
+    '&=': 'BitAndAssign',
+    '^=': 'BitXorAssign',
+    '<<=': 'LShiftAssign',
+    '>>=': 'RShiftAssign',
+}
+
+_unary_precedence = all_op_data["Minus"]["precedence"]
+_ternary_precedence = all_op_data["Ternary"]["precedence"]
+_assign_precedence = all_op_data["Assign"]["precedence"]
+_binary_precedences = dict((tok, all_op_data[op]["precedence"]) for tok, op in _binary_ops.items())
+
+
+def _tokenize(text):
+    """Splits a text into (kind, value) tokens.
+
+    Args:
+        text: The input text.
+
+    Returns:
+        The list of tokens (terminated by an "end" token).
+    """
+    if "/*" in text or "//" in text or "'" in text:
+        raise FastParseUnsupported("Comments and derivatives are not supported.")
+    tokens = []
+    pos = 0
+    while True:
+        match = _token_re.match(text, pos)
+        if match is None:
+            raise FastParseUnsupported(f'Unsupported character at position {pos}.')
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        if kind == "end":
+            return tokens
+        pos = match.end()
+
+
+###########################
+# Uppaal C Fast Parser    #
+###########################
+class _FastParser:
+    """A single-use precedence-climbing parser for a tokenized text."""
+
+    def __init__(self, text):
+        """Initializes _FastParser.
+
+        Args:
+            text: The input text.
+        """
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.last_primary_assignable = False
+
+    def peek(self, offset=0):
+        """Gets an upcoming token without consuming it."""
+        return self.tokens[min(self.pos + offset, len(self.tokens) - 1)]
+
+    def next(self):
+        """Consumes the next token."""
+        token = self.tokens[self.pos]
+        if token[0] != "end":
+            self.pos += 1
+        return token
+
+    def expect(self, value):
+        """Consumes the next token if it is the given operator, or fails otherwise."""
+        kind, val = self.next()
+        if kind != "op" or val != value:
+            raise FastParseUnsupported(f'Expected "{value}".')
+
+    def expect_end(self):
+        """Fails if the whole input has not been consumed."""
+        if self.peek()[0] != "end":
+            raise FastParseUnsupported("Input not fully consumed.")
+
+    ##########
+    # Labels #
+    ##########
+    def parse_rule(self, rule_name):
+        """Parses the whole input with a given grammar rule.
+
+        Args:
+            rule_name: The grammar rule name.
+
+        Returns:
+            The AST.
+        """
+        if rule_name == "Expression":
+            ast = self.parse_expression()
+        elif rule_name in ["Guard", "Invariant", "Update"]:
+            ast = {"expr": self.parse_expression(), "astType": rule_name}
+        elif rule_name in ["Guards", "Invariants"]:
+            ast_type = rule_name[:-1]
+            exprs = split_logic_conjunction({"expr": self.parse_expression(), "astType": ast_type})
+            ast = [{"astType": ast_type, "expr": expr} for expr in exprs]
+        elif rule_name == "Updates":
+            ast = []
+            if self.peek()[0] != "end":
+                ast.append({"expr": self.parse_expression(), "astType": "Update"})
+                while self.peek() == ("op", ","):
+                    self.next()
+                    ast.append({"expr": self.parse_expression(), "astType": "Update"})
+        elif rule_name == "Sync":
+            channel = self.parse_variable(name=self.parse_id())
+            kind, val = self.next()
+            if kind != "op" or val not in ["!", "?"]:
+                raise FastParseUnsupported("Expected sync operator.")
+            ast = {"channel": channel, "op": val, "astType": "Sync"}
+        elif rule_name == "Select":
+            ast = self.parse_select()
+        elif rule_name == "Selects":
+            ast = []
+            if self.peek()[0] != "end":
+                ast.append(self.parse_select())
+                while self.peek() == ("op", ","):
+                    self.next()
+                    ast.append(self.parse_select())
+        else:
+            raise FastParseUnsupported(f'Rule "{rule_name}" is not supported.')
+        self.expect_end()
+        return ast
+
+    def parse_select(self):
+        """Parses a select statement (e.g., "i : int[0,3]")."""
+        name = self.parse_id()
+        self.expect(":")
+        return {"name": name, "type": self.parse_type(), "astType": "Select"}
+
+    def parse_type(self):
+        """Parses a (bounded integer or custom) type without prefixes."""
+        kind, val = self.next()
+        if kind != "id" or val.startswith(_type_keyword_prefixes):
+            raise FastParseUnsupported("Unsupported type.")
+        if val == "int" and self.peek() == ("op", "["):
+            self.next()
+            lower = self.parse_expression()
+            self.expect(",")
+            upper = self.parse_expression()
+            self.expect("]")
+            type_id = {"lower": lower, "upper": upper, "astType": "BoundedIntType"}
+        elif val in _reserved_keywords and val not in ["chan", "clock", "double", "bool", "int", "void", "typedef"]:
+            raise FastParseUnsupported(f'Unsupported type "{val}".')
+        else:
+            type_id = {"type": val, "astType": "CustomType"}
+        return {"prefixes": [], "typeId": type_id, "astType": "Type"}
+
+    def parse_id(self):
+        """Parses an identifier which is not a reserved keyword."""
+        kind, val = self.next()
+        if kind != "id" or val in _reserved_keywords or val.startswith(_operand_keyword_prefixes):
+            raise FastParseUnsupported("Expected identifier.")
+        return val
+
+    ###############
+    # Expressions #
+    ###############
+    def parse_expression(self, max_prec=_assign_precedence):
+        """Parses an expression containing only infix operators with a precedence value of at most max_prec.
+
+        Args:
+            max_prec: The maximum precedence value (i.e., the loosest binding operator) accepted.
+
+        Returns:
+            The expression AST.
+        """
+        left = self.parse_unary()
+        while True:
+            kind, val = self.peek()
+            if kind == "end":
+                return left
+            if val in _binary_precedences and (kind == "op" or val in ["and", "or"]):
+                prec = _binary_precedences[val]
+                if prec > max_prec:
+                    return left
+                self.next()
+                if val == "." and self.peek()[1] in _unary_ops:
+                    raise FastParseUnsupported("Unary operator after member access.")
+                right = self.parse_expression(max_prec=prec - 1)
+                left = {"left": left, "op": _binary_ops[val], "right": right, "astType": "BinaryExpr"}
+            elif kind == "op" and val == "?":
+                if _ternary_precedence > max_prec:
+                    return left
+                self.next()
+                middle = self.parse_expression()
+                self.expect(":")
+                right = self.parse_expression(max_prec=_ternary_precedence)
+                left = {"left": left, "middle": middle, "right": right, "op": "Ternary", "astType": "TernaryExpr"}
+            elif kind == "op" and val in _assign_ops:
+                if _assign_precedence > max_prec:
+                    return left
+                if not self.last_primary_assignable:
+                    raise FastParseUnsupported("Assignment to a non-variable expression.")
+                self.next()
+                right = self.parse_expression(max_prec=_assign_precedence)
+                left = {"left": left, "op": _assign_ops[val], "right": right, "astType": "AssignExpr"}
+            elif kind == "id" and val == "imply":
+                raise FastParseUnsupported("The imply operator is not supported.")
+            else:
+                return left
+
+    def parse_unary(self):
+        """Parses a (possibly prefixed) operand."""
+        kind, val = self.peek()
+        if (kind == "op" and val in _unary_ops) or (kind == "id" and val == "not"):
+            self.next()
+            if val in ["+", "-"] and self.peek()[0] == "num" and self.peek(1)[1] in ["++", "--"]:
+                raise FastParseUnsupported("Signed number with postfix operator.")
+            expr = self.parse_expression(max_prec=_unary_precedence - 1)
+            return {"op": _unary_ops[val], "expr": expr, "astType": "UnaryExpr"}
+        if kind == "op" and val in ["++", "--"]:
+            self.next()
+            kind, operand = self.peek()
+            if kind == "num":
+                expr = self.parse_number()
+            elif kind == "id":
+                expr = self.parse_variable(name=self.parse_id())
+            else:
+                raise FastParseUnsupported("Unsupported pre-increment operand.")
+            self.last_primary_assignable = False
+            ast_type = "PreIncrAssignExpr" if val == "++" else "PreDecrAssignExpr"
+            return {"expr": expr, "astType": ast_type}
+        return self.parse_primary()
+
+    def parse_primary(self):
+        """Parses a primary expression (including postfix increments / decrements)."""
+        kind, val = self.peek()
+        postfix_allowed = True
+        if kind == "num":
+            ast = self.parse_number()
+            self.last_primary_assignable = False
+        elif kind == "op" and val == "(":
+            self.next()
+            expr = self.parse_expression()
+            self.expect(")")
+            ast = {"expr": expr, "astType": "BracketExpr"}
+            self.last_primary_assignable = False
+            postfix_allowed = False
+        elif kind == "id" and val in ["true", "false"]:
+            self.next()
+            ast = {"val": val == "true", "astType": "Boolean"}
+            self.last_primary_assignable = False
+            postfix_allowed = False
+        elif kind == "id":
+            name = self.parse_id()
+            if self.peek() == ("op", "("):
+                self.next()
+                args = []
+                if self.peek() != ("op", ")"):
+                    args.append(self.parse_expression())
+                    while self.peek() == ("op", ","):
+                        self.next()
+                        args.append(self.parse_expression())
+                self.expect(")")
+                ast = {"funcName": name, "args": args, "astType": "FuncCallExpr"}
+                self.last_primary_assignable = False
+                postfix_allowed = False
+            else:
+                ast = self.parse_variable(name=name)
+                self.last_primary_assignable = True
+        else:
+            raise FastParseUnsupported("Expected operand.")
+
+        if self.peek() in [("op", "++"), ("op", "--")]:
+            if not postfix_allowed:
+                raise FastParseUnsupported("Postfix operator after non-variable operand.")
+            ast_type = "PostIncrAssignExpr" if self.next()[1] == "++" else "PostDecrAssignExpr"
+            ast = {"expr": ast, "astType": ast_type}
+            self.last_primary_assignable = False
+        return ast
+
+    def parse_variable(self, name):
+        """Parses the (optional) array indices of a variable."""
+        ast = {"name": name, "astType": "Variable"}
+        while self.peek() == ("op", "["):
+            self.next()
+            index = self.parse_expression()
+            self.expect("]")
+            ast = {"left": ast, "op": "ArrayAccess", "right": index, "astType": "BinaryExpr"}
+        return ast
+
+    def parse_number(self):
+        """Parses an integer or double value."""
+        _kind, val = self.next()
+        if self.peek()[0] == "id":
+            raise FastParseUnsupported("Number directly followed by identifier.")
+        if "." in val:
+            return {"val": float(val), "astType": "Double"}
+        return {"val": int(val), "astType": "Integer"}
+
+
+class UppaalCLanguageFastParser:
+    """A parser for Uppaal C code which handles short label expressions via a fast path, and everything else via
+    the TatSu-generated UppaalCLanguageParser."""
+
+    fast_rules = {"Expression", "Guard", "Guards", "Invariant", "Invariants", "Update", "Updates", "Sync", "Select",
+                  "Selects"}
+
+    def __init__(self, fallback_parser=None):
+        """Initializes UppaalCLanguageFastParser.
+
+        Args:
+            fallback_parser: The parser used for inputs not handled by the fast path (by default, an
+                UppaalCLanguageParser with UppaalCLanguageSemantics, created on first use).
+        """
+        self._fallback_parser = fallback_parser
+
+    @property
+    def fallback_parser(self):
+        """The parser used for inputs not handled by the fast path."""
+        if self._fallback_parser is None:
+            from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+            self._fallback_parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        return self._fallback_parser
+
+    def try_parse(self, text, rule_name):
+        """Parses a text via the fast path only.
+
+        Args:
+            text: The input text.
+            rule_name: The grammar rule name.
+
+        Returns:
+            The AST, or None if the input is not handled by the fast path.
+        """
+        if rule_name not in self.fast_rules:
+            return None
+        try:
+            return _FastParser(text).parse_rule(rule_name)
+        except (FastParseUnsupported, RecursionError):
+            return None
+
+    def parse(self, text, rule_name, **kwargs):
+        """Parses a text, using the fast path if possible.
+
+        Args:
+            text: The input text.
+            rule_name: The grammar rule name.
+            **kwargs: Additional arguments passed to the fallback parser.
+
+        Returns:
+            The AST.
+        """
+        ast = self.try_parse(text, rule_name)
+        if ast is None:
+            ast = self.fallback_parser.parse(text, rule_name=rule_name, **kwargs)
+        return ast
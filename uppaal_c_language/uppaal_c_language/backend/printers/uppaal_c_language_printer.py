@@ -12,14 +12,17 @@ from uppaal_c_language.backend.helper import indent
 class UppaalCPrinter(ASTCodePrinter):
     """The Uppaal C code printer class."""
 
-    def __init__(self, do_log_details=False):
+    def __init__(self, do_log_details=False, fast=False):
         """Initializes UppaalCPrinter.
 
         Args:
             do_log_details: Choose whether intermediate details of the string generation should be printed.
+            fast: Choose whether the iterative, buffer-based printer should be used (which produces identical
+                  strings, but does not support detail logging).
         """
         super().__init__()
         self.do_log_details = do_log_details
+        self.fast = fast and not do_log_details
 
     def ast_to_string(self, ast):
         """Generates a string from a given AST.
@@ -30,6 +33,8 @@ class UppaalCPrinter(ASTCodePrinter):
         Returns:
             The generated string.
         """
+        if self.fast:
+            return fast_ast_to_string(ast)
         if ast is None:
             return ""
         assert isinstance(ast, dict), f'The given AST is not a dictionary:\n{ast}'
@@ -820,3 +825,251 @@ to_string_funcs = {
     "Sync": sync,
     "Update": update,
 }
+
+
+#################
+# Fast printing #
+#################
+# In the fast printer mode, each AST node is expanded into a sequence of items (i.e., literal strings, child nodes,
+# and indentation markers) which are processed via an explicit stack and written into a single string buffer.
+_INDENT = object()
+_DEDENT = object()
+
+
+def fast_ast_to_string(ast):
+    """Generates a string from a given AST iteratively (i.e., without recursion and intermediate strings).
+
+    Args:
+        ast: The AST that is printed.
+
+    Returns:
+        The generated string.
+    """
+    buffer = []
+    indent_level = 0
+    stack = [ast]
+    while stack:
+        item = stack.pop()
+        if item.__class__ is str:
+            if indent_level and "\n" in item:
+                item = item.replace("\n", "\n" + " " * indent_level)
+            buffer.append(item)
+        elif isinstance(item, dict):
+            leaf_func = leaf_funcs.get(item["astType"])
+            if leaf_func is not None:
+                buffer.append(leaf_func(item))
+                continue
+            emit_func = emit_funcs.get(item["astType"])
+            if emit_func is None:
+                raise Exception("AST type \"" + item["astType"] + "\" not supported by UppaalCPrinter.")
+            stack.extend(reversed(emit_func(item)))
+        elif item.__class__ is tuple:
+            marker, space_num = item
+            if marker is _INDENT:
+                buffer.append(" " * space_num)
+                indent_level += space_num
+            else:
+                indent_level -= space_num
+        else:
+            assert item is None, f'The given AST is not a dictionary:\n{item}'
+    return "".join(buffer)
+
+
+def _join(elems, sep):
+    """Interleaves the given items with a separator item."""
+    items = []
+    for elem in elems:
+        if items:
+            items.append(sep)
+        items.append(elem)
+    return items
+
+
+def _join_groups(groups, sep):
+    """Interleaves the given groups of items with a separator item, and flattens the result."""
+    items = []
+    for i, group in enumerate(groups):
+        if i > 0:
+            items.append(sep)
+        items.extend(group)
+    return items
+
+
+def _indented(items, space_num):
+    """Encloses the given items in indentation markers."""
+    return [(_INDENT, space_num), *items, (_DEDENT, space_num)]
+
+
+def _emit_initialiser_array(ast):
+    """Emits initial values "= { ... }"."""
+    vals = ast["vals"]
+    if all(val["astType"] in leaf_funcs for val in vals):  # Print value lists (e.g., of observations) directly
+        vals = [leaf_funcs[val["astType"]](val) for val in vals]
+        chunk_size = 9
+        if len(vals) > chunk_size:
+            return ['{\n', ',\n'.join(f'    {",".join(vals[i:i + chunk_size])}'
+                                      for i in range(0, len(vals), chunk_size)), '\n}']
+        return [f'{{ {",".join(vals)} }}']
+    if len(vals) > 0 and vals[0]["astType"] == "InitialiserArray":  # Print sub-arrays in individual lines
+        return ['{\n', *_join_groups([_indented([val], 4) for val in vals], ',\n'), '\n}']
+    chunk_size = 9
+    if len(vals) > chunk_size:  # Print 9 entries per row if more than 9 entries exist
+        chunks = [vals[i:i + chunk_size] for i in range(0, len(vals), chunk_size)]
+        return ['{\n', *_join_groups([_indented(_join(chunk, ','), 4) for chunk in chunks], ',\n'), '\n}']
+    return ['{ ', *_join(vals, ','), ' }']
+
+
+def _emit_statement_block(ast):
+    """Emits statement block "{ ... }"."""
+    items = ['{ \n']
+    for elem in ast["decls"] + ast["stmts"]:
+        items.extend(_indented([elem], 2))
+        items.append('\n')
+    items.append('}')
+    return items
+
+
+def _emit_instantiation(ast):
+    """Emits "Inst(params) = Tmpl(args)"."""
+    params_items = ['(', *_join(ast["params"], ', '), ')'] if ast.get("params") else []
+    return [ast["instanceName"], *params_items, ' = ', ast["templateName"], '(', *_join(ast["args"], ', '), ');']
+
+
+def _emit_chan_priority(ast):
+    """Emits a channel priority."""
+    return ['chan priority ', *_join_groups([_join(block, ', ') for block in ast["channels"]], ' < '), ';']
+
+
+def _emit_binary_expr(ast):
+    """Emits a binary expression."""
+    op = ast["op"]
+    if op == "Dot":
+        return [ast["left"], '.', ast["right"]]
+    if op == "ArrayAccess":
+        return [ast["left"], '[', ast["right"], ']']
+    return [ast["left"], binary_op_strs[op], ast["right"]]
+
+
+def _emit_quantifier_expr(keyword):
+    """Creates an emit function for expression "keyword (name:type) expr"."""
+    return lambda ast: [f'{keyword} (', ast["varName"], ' : ', ast["type"], ') ', ast["expr"]]
+
+
+unary_op_strs = {
+    "Plus": '+',
+    "Minus": '-',
+    "LogNot": '!',
+}
+
+binary_op_strs = {
+    "Add": ' + ',
+    "Sub": ' - ',
+    "Mult": ' * ',
+    "Div": ' / ',
+    "Mod": ' % ',
+    "LShift": ' << ',
+    "RShift": ' >> ',
+
+    "LogAnd": ' && ',
+    "LogOr": ' || ',
+    "LogImply": ' imply ',
+    "BitAnd": ' & ',
+    "BitOr": ' | ',
+    "BitXor": ' ^ ',
+
+    "Minimum": ' <? ',
+    "Maximum": ' >? ',
+    "GreaterEqual": ' >= ',
+    "GreaterThan": ' > ',
+    "LessEqual": ' <= ',
+    "LessThan": ' < ',
+    "Equal": ' == ',
+    "NotEqual": ' != ',
+}
+
+assign_op_strs = {
+    "Assign": ' = ',
+    "AddAssign": ' += ',
+    "SubAssign": ' -= ',
+    "MultAssign": ' *= ',
+    "DivAssign": ' /= ',
+    "ModAssign": ' %= ',
+    "LShiftAssign": ' <<= ',
+    "RShiftAssign": ' >>= ',
+    "BitAndAssign": ' &= ',
+    "BitOrAssign": ' |= ',
+    "BitXorAssign": ' ^= ',
+}
+
+leaf_funcs = {
+    "CustomType": lambda ast: ast["type"],
+    "EmptyStatement": lambda ast: ';',
+    "System": lambda ast: system(None, ast),
+    "ChanDefault": lambda ast: 'default',
+    "Variable": lambda ast: ast["name"],
+    "Integer": lambda ast: f'{ast["val"]}',
+    "Double": lambda ast: double(None, ast),
+    "Boolean": lambda ast: 'true' if ast["val"] else 'false',
+    "DeadlockExpr": lambda ast: 'deadlock',
+}
+
+emit_funcs = {
+    "UppaalDeclaration": lambda ast: _join(ast["decls"], '\n'),
+    "UppaalSystemDeclaration": lambda ast: [*_join(ast["decls"], '\n'), '\n', ast["systemDecl"]],
+
+    "VariableDecls": lambda ast: [ast["type"], ' ', *_join(ast["varData"], ', '), ';'],
+    "VariableID": lambda ast: [ast["varName"], *_join_groups([['[', decl, ']'] for decl in ast["arrayDecl"]], ''),
+                               *([' = ', ast["initData"]] if ast.get("initData") else [])],
+    "InitialiserArray": _emit_initialiser_array,
+    "TypeDecls": lambda ast: ['typedef ', ast["type"], ' ', *_join(ast["names"], ', '), ';'],
+
+    "Type": lambda ast: [*(f'{prefix} ' for prefix in ast["prefixes"]), ast["typeId"]],
+    "BoundedIntType": lambda ast: ['int[', ast["lower"], ', ', ast["upper"], ']'],
+    "ScalarType": lambda ast: ['scalar[', ast["expr"], ']'],
+    "StructType": lambda ast: ['struct { \n', *_join_groups([_indented([field], 2) for field in ast["fields"]],
+                                                             '\n'), '\n}'],
+    "FieldDecl": lambda ast: [ast["type"], ' ', *_join(ast["varData"], ', '), ';'],
+
+    "FunctionDef": lambda ast: ['\n', ast["type"], ' ', ast["name"], '(', *_join(ast["params"], ', '), ') ',
+                                ast["body"]],
+    "StatementBlock": _emit_statement_block,
+    "ExprStatement": lambda ast: [ast["expr"], ';'],
+    "ForLoop": lambda ast: ['for (', ast["init"], '; ', ast["cond"], '; ', ast["after"], ') ', ast["body"]],
+    "Iteration": lambda ast: ['for (', ast["name"], ' : ', ast["type"], ') ', ast["body"]],
+    "WhileLoop": lambda ast: ['while (', ast["cond"], ') ', ast["body"]],
+    "DoWhileLoop": lambda ast: ['do ', ast["body"], ' while (', ast["cond"], ');'],
+    "IfStatement": lambda ast: ['if (', ast["cond"], ') ', ast["thenBody"], ' ',
+                                *(['else ', ast["elseBody"]] if ast.get("elseBody") else [])],
+    "ReturnStatement": lambda ast: ['return ', ast["expr"], ';'],
+
+    "Parameter": lambda ast: [ast["type"], ' ', '&' if ast["isRef"] else '', ast["varData"]],
+    "Process": lambda ast: [ast["name"], '(', *_join(ast["args"], ', '), ')'],
+    "Instantiation": _emit_instantiation,
+
+    "ChanPriority": _emit_chan_priority,
+    "ChanExpr": lambda ast: [ast["name"], *_join_groups([['[', index, ']'] for index in ast["indices"]], '')],
+
+
+    "BracketExpr": lambda ast: ['(', ast["expr"], ')'],
+    "DerivativeExpr": lambda ast: [ast["expr"], "'"],
+    "PostIncrAssignExpr": lambda ast: [ast["expr"], '++'],
+    "PostDecrAssignExpr": lambda ast: [ast["expr"], '--'],
+    "PreIncrAssignExpr": lambda ast: ['++', ast["expr"]],
+    "PreDecrAssignExpr": lambda ast: ['--', ast["expr"]],
+    "AssignExpr": lambda ast: [ast["left"], assign_op_strs[ast["op"]], ast["right"]],
+    "FuncCallExpr": lambda ast: [ast["funcName"], '(', *_join(ast["args"], ', '), ')'],
+
+    "UnaryExpr": lambda ast: [unary_op_strs[ast["op"]], ast["expr"]],
+    "BinaryExpr": _emit_binary_expr,
+    "TernaryExpr": lambda ast: [ast["left"], ' ? ', ast["middle"], ' : ', ast["right"]],
+
+    "ForAllExpr": _emit_quantifier_expr("forall"),
+    "ExistsExpr": _emit_quantifier_expr("exists"),
+    "SumExpr": _emit_quantifier_expr("sum"),
+
+    "Invariant": lambda ast: [ast["expr"]],
+    "Select": lambda ast: [ast["name"], ' : ', ast["type"]],
+    "Guard": lambda ast: [ast["expr"]],
+    "Sync": lambda ast: [ast["channel"], ast["op"]],
+    "Update": lambda ast: [ast["expr"]],
+}
@@ -0,0 +1,300 @@
+"""Benchmark of the parse throughput of the fast-path parser compared to the TatSu parser.
+
+Two kinds of inputs are parsed by both parsers (whose ASTs must be identical):
+    - labels: a mix of typical edge and location labels (as found in industrial models), most of which are handled by
+      the fast path of UppaalCLanguageFastParser,
+    - synthetic: synthetic Uppaal C code of scaled size per grammar rule (declarations, system declarations, guards,
+      updates, expressions and queries), of which the declarations and queries are parsed by the TatSu fallback.
+
+Usage:
+    python -m uppaal_c_language.benchmark.parser_throughput --labels 1000 --sizes 10 100 --output results.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+from uppaal_c_language.backend.parsers.uppaal_c_language_fast_parser import UppaalCLanguageFastParser
+from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
+
+
+##########
+# Labels #
+##########
+def generate_labels(label_count, seed=0):
+    """Generates typical edge and location labels (as found in industrial models).
+
+    Args:
+        label_count: The number of labels.
+        seed: The random seed.
+
+    Returns:
+        The list of (label text, rule name) pairs.
+    """
+    rng = random.Random(seed)
+    names = ["x", "y", "id", "count", "mode", "buf", "flag", "pos"]
+    label_templates = [
+        ("{c} >= {n} && {c} <= {m}", "Guards"),
+        ("{v} == {n} && {a}[{v}] != {m}", "Guards"),
+        ("{c} <= {m}", "Invariants"),
+        ("{c} = 0, {v} = ({v} + 1) % {m}, {a}[{w}] := {n}", "Updates"),
+        ("{v}++, {w} -= {n}", "Updates"),
+        ("go[{v}]!", "Sync"),
+        ("ack?", "Sync"),
+        ("e : int[0,{m}]", "Select"),
+        ("{v} > 0 ? {w} * {n} : -{w}", "Expression"),
+        ("f({v}, {a}[{w}+1]) || !{v}", "Expression"),
+    ]
+    labels = []
+    for i in range(label_count):
+        text, rule_name = label_templates[i % len(label_templates)]
+        text = text.format(c=f'c{rng.randrange(4)}', v=rng.choice(names), w=rng.choice(names),
+                           a=f'arr{rng.randrange(3)}', n=rng.randrange(100), m=rng.randrange(100, 1000))
+        labels.append((text, rule_name))
+    return labels
+
+
+#####################
+# Synthetic Sources #
+#####################
+def generate_declaration(size):
+    """Generates a global declaration with constants, types, variables and functions.
+
+    Args:
+        size: The number of variable declarations (one function is generated per 10 variables).
+
+    Returns:
+        The declaration text.
+    """
+    lines = [f'const int N = {max(size, 2)};', 'typedef int[0,N-1] id_t;', 'clock c0, c1;']
+    for i in range(size):
+        lines.append(f'int v{i} = {i % 7}, a{i}[N];')
+    for i in range(max(1, size // 10)):
+        lines.append(
+            f'int f{i}(id_t p, int &r) {{\n'
+            f'    int j;\n'
+            f'    for (j = 0; j < N; j++) {{\n'
+            f'        if (a{i}[j] > p && v{i} != j) {{\n'
+            f'            r += a{i}[j] * 2 - 1;\n'
+            f'        }} else {{\n'
+            f'            r = r > 0 ? r - 1 : 0;\n'
+            f'        }}\n'
+            f'    }}\n'
+            f'    return r % N;\n'
+            f'}}')
+    return "\n".join(lines)
+
+
+def generate_system_declaration(size):
+    """Generates a system declaration with template instantiations.
+
+    Args:
+        size: The number of instantiations.
+
+    Returns:
+        The system declaration text.
+    """
+    lines = [f'P{i} = P({i}, v{i});' for i in range(size)]
+    lines.append(f'system {", ".join(f"P{i}" for i in range(size))};')
+    return "\n".join(lines)
+
+
+def generate_guards(size):
+    """Generates a conjunction of guard expressions.
+
+    Args:
+        size: The number of conjuncts.
+
+    Returns:
+        The guard text.
+    """
+    return " && ".join(f'(c{i % 2} >= {i} || v{i} != a{i}[{i % 3}])' for i in range(size))
+
+
+def generate_updates(size):
+    """Generates a list of update expressions.
+
+    Args:
+        size: The number of updates.
+
+    Returns:
+        The update text.
+    """
+    return ", ".join(f'a{i}[v{i}] = f{i}(v{i} + 1, a{i}[0]) % N' if i % 2 else f'v{i}++' for i in range(size))
+
+
+def generate_expression(size):
+    """Generates a nested arithmetic / ternary expression.
+
+    Args:
+        size: The number of operands.
+
+    Returns:
+        The expression text.
+    """
+    ops = ["+", "*", "-", "<<", "/", "%"]
+    expr = "v0"
+    for i in range(1, size):
+        if i % 5 == 0:
+            expr = f'(v{i} > {i} ? {expr} : -v{i})'
+        else:
+            expr = f'{expr} {ops[i % len(ops)]} a{i}[{i % 3}]'
+    return expr
+
+
+def generate_query(size):
+    """Generates a reachability query with a state predicate.
+
+    Args:
+        size: The number of conjuncts in the predicate.
+
+    Returns:
+        The query text.
+    """
+    return "E<> " + " && ".join(f'P{i}.v{i} > {i}' for i in range(size))
+
+
+benchmark_cases = {
+    "declaration": ("UppaalDeclaration", generate_declaration),
+    "system_declaration": ("UppaalSystemDeclaration", generate_system_declaration),
+    "guards": ("Guards", generate_guards),
+    "updates": ("Updates", generate_updates),
+    "expression": ("Expression", generate_expression),
+    "query": ("UppaalProp", generate_query),
+}
+
+
+########
+# Runs #
+########
+def time_operation(func, repeat):
+    """Times a function call repeatedly.
+
+    Args:
+        func: The function to call.
+        repeat: The number of repetitions.
+
+    Returns:
+        The minimum and mean duration in seconds, and the result of the last call.
+    """
+    durations = []
+    res = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        res = func()
+        durations.append(time.perf_counter() - start_time)
+    return min(durations), sum(durations) / len(durations), res
+
+
+def run_parser(parser, labels):
+    """Parses all given labels once.
+
+    Args:
+        parser: The parser.
+        labels: The list of (label text, rule name) pairs.
+
+    Returns:
+        The parse time in seconds, and the list of resulting ASTs.
+    """
+    start_time = time.perf_counter()
+    asts = [parser.parse(text, rule_name=rule_name) for text, rule_name in labels]
+    duration = time.perf_counter() - start_time
+    return duration, asts
+
+
+def run_synthetic_case(case_name, size, repeat, parsers):
+    """Parses the synthetic input of a benchmark case and size with all given parsers.
+
+    Args:
+        case_name: The name of the benchmark case.
+        size: The scaling size of the synthetic input.
+        repeat: The number of repetitions per parser.
+        parsers: The dict of parsers by name.
+
+    Returns:
+        The list of result records.
+    """
+    rule_name, generate = benchmark_cases[case_name]
+    text = generate(size)
+
+    records = []
+    reference_ast = None
+    for parser_name, parser in parsers.items():
+        min_s, mean_s, ast = time_operation(lambda: parser.parse(text, rule_name=rule_name), repeat)
+        if reference_ast is None:
+            reference_ast = ast
+        elif json.dumps(ast) != json.dumps(reference_ast):
+            raise Exception(f'Parse result of parser "{parser_name}" differs from the reference result for case '
+                            f'"{case_name}".')
+        records.append({
+            "case": case_name,
+            "rule": rule_name,
+            "size": size,
+            "chars": len(text),
+            "parser": parser_name,
+            "min_s": min_s,
+            "mean_s": mean_s,
+            "chars_per_s": len(text) / min_s if min_s > 0 else None,
+        })
+    return records
+
+
+def main():
+    """The main function of the benchmark."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark of the Uppaal C parse throughput.")
+    arg_parser.add_argument('--labels', type=int, default=1000)
+    arg_parser.add_argument('--cases', nargs='+', choices=list(benchmark_cases), default=list(benchmark_cases))
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 100])
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--output', type=str, default=None,
+                            help="The JSON output file (default: standard output).")
+    args = arg_parser.parse_args()
+
+    labels = generate_labels(label_count=args.labels)
+    parsers = {
+        "tatsu": UppaalCLanguageParser(semantics=UppaalCLanguageSemantics()),
+        "fast": UppaalCLanguageFastParser(),
+    }
+
+    results = []
+    reference_asts = None
+    for parser_name, parser in parsers.items():
+        durations = []
+        for _ in range(args.repeat):
+            duration, asts = run_parser(parser=parser, labels=labels)
+            durations.append(duration)
+            if reference_asts is None:
+                reference_asts = asts
+            elif json.dumps(asts) != json.dumps(reference_asts):
+                raise Exception(f'Parse results of parser "{parser_name}" differ from the reference results.')
+        results.append({
+            "parser": parser_name,
+            "labels": len(labels),
+            "min_s": min(durations),
+            "labels_per_s": len(labels) / min(durations),
+        })
+
+    synthetic_results = []
+    for case_name in args.cases:
+        for size in args.sizes:
+            synthetic_results.extend(run_synthetic_case(case_name=case_name, size=size, repeat=args.repeat,
+                                                        parsers=parsers))
+
+    fast_parser = parsers["fast"]
+    fast_path_count = sum(1 for text, rule_name in labels if fast_parser.try_parse(text, rule_name) is not None)
+    report = {"benchmark": "parser_throughput", "python": sys.version.split()[0],
+              "fast_path_ratio": fast_path_count / len(labels), "results": results,
+              "synthetic_results": synthetic_results}
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
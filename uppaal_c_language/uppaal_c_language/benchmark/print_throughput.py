@@ -0,0 +1,112 @@
+"""Benchmark of the print and AST traversal throughput on synthetic Uppaal C code of scaled size.
+
+For each grammar rule and size, the synthetic input of the parse benchmark (see "parser_throughput") is parsed once,
+and the following operations are timed on the resulting AST:
+    - print: UppaalCPrinter.ast_to_string (UppaalQueryPrinter.ast_to_string for queries)
+    - print_fast: UppaalCPrinter.ast_to_string in fast mode (not applicable to queries)
+    - apply_func: apply_func_to_ast with an identity function
+
+Usage:
+    python -m uppaal_c_language.benchmark.print_throughput --sizes 10 100 --repeat 3 --output results.json
+"""
+
+import argparse
+import copy
+import json
+import sys
+
+from uppaal_c_language.backend.modifiers.ast_modifier import apply_func_to_ast
+from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
+from uppaal_c_language.backend.printers.uppaal_c_language_printer import UppaalCPrinter
+from uppaal_c_language.backend.printers.uppaal_query_language_printer import UppaalQueryPrinter
+from uppaal_c_language.benchmark.parser_throughput import benchmark_cases, time_operation
+
+
+def run_case(case_name, size, repeat, parser, printer, fast_printer, query_printer):
+    """Runs all operations for a single benchmark case and size.
+
+    Args:
+        case_name: The name of the benchmark case.
+        size: The scaling size of the synthetic input.
+        repeat: The number of repetitions per operation.
+        parser: The Uppaal C parser.
+        printer: The Uppaal C printer.
+        fast_printer: The Uppaal C printer in fast mode.
+        query_printer: The Uppaal query printer.
+
+    Returns:
+        The list of result records.
+    """
+    rule_name, generate = benchmark_cases[case_name]
+    text = generate(size)
+    case_printer = query_printer if rule_name == "UppaalProp" else printer
+    ast = parser.parse(text, rule_name=rule_name)
+
+    def print_ast(ast_printer):
+        if isinstance(ast, list):
+            return [ast_printer.ast_to_string(elem) for elem in ast]
+        return ast_printer.ast_to_string(ast)
+
+    def apply_identity():
+        return apply_func_to_ast(ast_copy, lambda elem, acc: elem)
+
+    print_min, print_mean, printed = time_operation(lambda: print_ast(case_printer), repeat)
+    operation_times = [("print", print_min, print_mean)]
+    if case_printer is printer:
+        print_fast_min, print_fast_mean, printed_fast = time_operation(lambda: print_ast(fast_printer), repeat)
+        if printed_fast != printed:
+            raise Exception(f'Fast printer result differs from the printer result for case "{case_name}".')
+        operation_times.append(("print_fast", print_fast_min, print_fast_mean))
+    ast_copy = copy.deepcopy(ast)
+    apply_min, apply_mean, _ = time_operation(apply_identity, repeat)
+    operation_times.append(("apply_func", apply_min, apply_mean))
+
+    records = []
+    for operation, min_s, mean_s in operation_times:
+        records.append({
+            "case": case_name,
+            "rule": rule_name,
+            "size": size,
+            "chars": len(text),
+            "operation": operation,
+            "min_s": min_s,
+            "mean_s": mean_s,
+            "chars_per_s": len(text) / min_s if min_s > 0 else None,
+        })
+    return records
+
+
+def main():
+    """The main function of the benchmark."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark of the Uppaal C print / traversal throughput.")
+    arg_parser.add_argument('--cases', nargs='+', choices=list(benchmark_cases), default=list(benchmark_cases))
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 100])
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--output', type=str, default=None,
+                            help="The JSON output file (default: standard output).")
+    args = arg_parser.parse_args()
+
+    parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+    printer = UppaalCPrinter()
+    fast_printer = UppaalCPrinter(fast=True)
+    query_printer = UppaalQueryPrinter()
+
+    results = []
+    for case_name in args.cases:
+        for size in args.sizes:
+            results.extend(run_case(case_name=case_name, size=size, repeat=args.repeat,
+                                    parser=parser, printer=printer, fast_printer=fast_printer,
+                                    query_printer=query_printer))
+
+    report = {"benchmark": "print_throughput", "python": sys.version.split()[0], "results": results}
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
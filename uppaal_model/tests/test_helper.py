@@ -0,0 +1,99 @@
+import multiprocessing
+
+import pytest
+
+from uppaal_model.backend.helper import unique_id, set_unique_id_seed
+from uppaal_model.backend.models.ta.ta import Template
+
+
+@pytest.fixture(autouse=True)
+def random_unique_ids():
+    yield
+    set_unique_id_seed()
+
+
+def create_template():
+    tmpl = Template("T")
+    loc_a = tmpl.new_location("A")
+    loc_b = tmpl.new_location("B")
+    tmpl.new_edge(loc_a, loc_b)
+    tmpl.new_edge(loc_b, loc_a)
+    return tmpl
+
+
+def generated_ids(tmpl):
+    ids = [tmpl.id]
+    for loc in tmpl.locations.values():
+        ids.extend([loc.id, loc.view["name_label"]["id"], loc.view["invariant_label"]["id"]])
+    for edge in tmpl.edges.values():
+        ids.extend([edge.id] + [edge.view[label]["id"] for label in ["guard_label", "update_label", "sync_label",
+                                                                        "select_label"]])
+    return ids
+
+
+def generate_ids_in_child(queue):
+    queue.put([unique_id("loc") for _ in range(100)])
+
+
+def test_unique_ids_are_distinct_across_copies():
+    tmpl = create_template()
+    copies = [tmpl.copy() for _ in range(5)]
+
+    # Copies keep the IDs of templates, locations and edges, but draw new IDs for their labels
+    label_ids = []
+    for copy_tmpl in [tmpl] + copies:
+        label_ids.extend(edge.view[label]["id"] for edge in copy_tmpl.edges.values()
+                         for label in ["guard_label", "update_label", "sync_label", "select_label"])
+    assert len(set(label_ids)) == len(label_ids)
+
+    ids = [unique_id("loc") for _ in range(1000)] + generated_ids(create_template())
+    assert len(set(ids)) == len(ids)
+
+
+def test_unique_ids_are_reproducible_with_seed():
+    set_unique_id_seed(42)
+    ids = generated_ids(create_template()) + [unique_id("loc", size=4) for _ in range(3)]
+    set_unique_id_seed(42)
+    assert generated_ids(create_template()) + [unique_id("loc", size=4) for _ in range(3)] == ids
+    set_unique_id_seed(43)
+    assert set(generated_ids(create_template())).isdisjoint(ids)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="Forking is not supported.")
+@pytest.mark.parametrize("seed", [None, 42])
+def test_unique_ids_are_distinct_across_forked_processes(seed):
+    set_unique_id_seed(seed)
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    processes = [ctx.Process(target=generate_ids_in_child, args=(queue,)) for _ in range(2)]
+    for process in processes:
+        process.start()
+    ids = [unique_id("loc") for _ in range(100)] + queue.get(timeout=60) + queue.get(timeout=60)
+    for process in processes:
+        process.join()
+    assert len(set(ids)) == len(ids)
+
+
+def fork_and_collect_ids(ctx, process_count):
+    queue = ctx.Queue()
+    ids = []
+    for _ in range(process_count):
+        process = ctx.Process(target=generate_ids_in_child, args=(queue,))
+        process.start()
+        ids.append(queue.get(timeout=60))
+        process.join()
+    return ids
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="Forking is not supported.")
+def test_unique_ids_are_reproducible_across_forked_processes_with_seed():
+    ctx = multiprocessing.get_context("fork")
+    set_unique_id_seed(42)
+    ids = fork_and_collect_ids(ctx, process_count=2)
+    assert ids[0] != ids[1]
+
+    # The child tokens depend on the fork order (and not on the process IDs)
+    set_unique_id_seed(42)
+    assert fork_and_collect_ids(ctx, process_count=2) == ids
+    set_unique_id_seed(43)
+    assert set(fork_and_collect_ids(ctx, process_count=2)[0]).isdisjoint(ids[0])
@@ -6,6 +6,8 @@ import abc
 class ASTCodeElement(abc.ABC):
     """An abstract AST code element."""
 
+    __slots__ = ("printer", "parser", "text", "ast")
+
     def __init__(self, data):
         """Initializes ASTCodeElement.
 
@@ -24,6 +26,30 @@ class ASTCodeElement(abc.ABC):
         else:
             self.set_ast(data)
 
+    def __getstate__(self):
+        """Gets the picklable state (parser and printer are excluded, and re-initialized on unpickling).
+
+        Returns:
+            The state dict.
+        """
+        state = {name: getattr(self, name) for cls in type(self).__mro__ for name in getattr(cls, "__slots__", ())
+                 if hasattr(self, name)}
+        state.update(getattr(self, "__dict__", {}))
+        state["parser"] = None
+        state["printer"] = None
+        return state
+
+    def __setstate__(self, state):
+        """Sets the state from a pickled state dict, and re-initializes parser and printer.
+
+        Args:
+            state: The state dict.
+        """
+        for name, val in state.items():
+            setattr(self, name, val)
+        self.init_parser()
+        self.init_printer()
+
     @abc.abstractmethod
     def init_parser(self):
         """Initializes the AST code parser.
@@ -1,7 +1,9 @@
 """A module with several helper functions."""
 
+import itertools
+import os
 import random
-import string
+import secrets
 
 
 def prepend_to_lines(text, prepend_str):
@@ -30,16 +32,82 @@ def indent(text, space_num):
     return prepend_to_lines(text, " " * space_num)
 
 
-# Unique ID (https://www.geeksforgeeks.org/generating-random-ids-python/)
-def unique_id(prefix, size=16, chars=string.ascii_lowercase + string.digits):
-    """Generates a unique ID of the form "prefix-..." (default: "prefix-[a-z0-9]{size}")
+#############
+# Unique ID #
+#############
+_unique_id_seed = None
+_unique_id_token = secrets.token_hex(4)
+_unique_id_counters = {}
+_unique_id_fork_count = 0
+
+
+def _draw_unique_id_token(seed=None):
+    """Draws a session token (which is derived from the seed if given)."""
+    if seed is None:
+        return secrets.token_hex(4)
+    return f'{random.Random(seed).getrandbits(32):08x}'
+
+
+def _count_unique_id_fork():
+    """Counts a fork of the current process (before the fork, so that the child inherits the new count)."""
+    global _unique_id_fork_count
+    _unique_id_fork_count += 1
+
+
+def _redraw_unique_id_token_after_fork():
+    """Draws a new session token in a forked child process.
+
+    The child inherits the session token and the counters of its parent, so that its IDs would otherwise collide with
+    the IDs generated by the parent and by other children (e.g., the workers of a process pool). With a seed, the
+    child token is derived from the parent token and the fork count of the parent, so that it only depends on the
+    order of the forks (and not on the process ID).
+    """
+    global _unique_id_token, _unique_id_fork_count
+    if _unique_id_seed is None:
+        _unique_id_token = _draw_unique_id_token()
+    else:
+        _unique_id_token = _draw_unique_id_token(f'{_unique_id_token}/{_unique_id_fork_count}')
+    _unique_id_fork_count = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_count_unique_id_fork, after_in_child=_redraw_unique_id_token_after_fork)
+
+
+def set_unique_id_seed(seed=None):
+    """Resets the unique ID generation, optionally making it deterministic.
+
+    All IDs generated afterwards are composed of a session token and a per-prefix counter. With a given seed, the
+    session token is derived from the seed, so that the same sequence of model operations yields the same IDs (e.g.,
+    for reproducible model XML). Without a seed, a new random session token is drawn. Forked child processes draw
+    their own session tokens; with a seed, the n-th child forked after this call derives its token from the seed and
+    n, so that seeded IDs are also reproducible across processes that are forked in the same order. Which child
+    handles which task (e.g., in a process pool) is up to the scheduling, though.
+
+    Args:
+        seed: An optional seed (e.g., an integer or string) from which the session token is derived.
+    """
+    global _unique_id_seed, _unique_id_token, _unique_id_fork_count
+    _unique_id_seed = seed
+    _unique_id_token = _draw_unique_id_token(seed)
+    _unique_id_counters.clear()
+    _unique_id_fork_count = 0
+
+
+def unique_id(prefix, size=16):
+    """Generates a unique ID of the form "prefix-..." (default: "prefix-[0-9a-f]{size}").
+
+    The ID consists of the session token followed by the zero-padded hex value of a counter kept per prefix, so that
+    IDs stay unique within a session (e.g., across model copies) without drawing random characters for every ID.
 
     Args:
         prefix: The prefix that is prepended to the ID.
-        size: The length of the ID (excluding prefix)
-        chars: The character list from which the ID characters are drawn.
+        size: The minimal length of the ID (excluding prefix).
 
     Returns:
         The generated ID.
     """
-    return f'{prefix}-{"".join(random.choice(chars) for _ in range(size))}'
+    counter = _unique_id_counters.get(prefix)
+    if counter is None:
+        counter = _unique_id_counters[prefix] = itertools.count()
+    return f'{prefix}-{_unique_id_token}{next(counter):0{max(size - len(_unique_id_token), 0)}x}'
@@ -288,6 +288,8 @@ class Automaton(Graph):
 class Location(Node):
     """An automaton location class."""
 
+    __slots__ = ()
+
     def __init__(self, name=None, parent=None, id_=None):
         """Initializes Location.
 
@@ -327,6 +329,8 @@ class Location(Node):
 class Edge(graph.Edge):
     """An automaton edge class."""
 
+    __slots__ = ()
+
     def __init__(self, source, target, parent=None, id_=None):
         """Initializes Edge.
 
@@ -3,8 +3,7 @@
 import copy
 
 from uppaal_model.backend.ast_code_element import ASTCodeElement
-from uppaal_c_language.backend.modifiers.ast_modifier import apply_func_to_ast
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+from uppaal_c_language.backend.modifiers.ast_modifier import ASTVisitor, visit_ast
 from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppaal_c_language.backend.printers.uppaal_c_language_printer import UppaalCPrinter
 
@@ -33,6 +32,7 @@ class Declaration(ASTCodeElement):
         Returns:
             None
         """
+        from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
         self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
 
     def init_printer(self):
@@ -41,7 +41,7 @@ class Declaration(ASTCodeElement):
         Returns:
             None
         """
-        self.printer = UppaalCPrinter()
+        self.printer = UppaalCPrinter(fast=True)
 
     def copy(self):
         """Copies the Declaration instance.
@@ -70,22 +70,34 @@ class Declaration(ASTCodeElement):
         return f'Declaration(\n{self.text}\n)'
 
     def _identify_clocks(self):
-        _, clocks = apply_func_to_ast(self.ast, _get_clock)
+        _, clocks = visit_ast(self.ast, {"VariableDecls": _get_clocks, "FunctionDef": _skip_subtree})
         self.clocks = clocks
 
 
-def _get_clock(ast, acc):
-    """Gets the AST element if it is a clock.
+def _get_clocks(ast, acc):
+    """Gets the declared variables if they are clocks.
 
     Args:
-        ast: The AST element.
+        ast: The VariableDecls AST element.
         acc: The list of accumulated clocks
 
     Returns:
+        ASTVisitor.SKIP, as variable declarations do not contain further clock declarations.
+    """
+    if ast["type"]["typeId"]["astType"] == "CustomType" and ast["type"]["typeId"]["type"] == "clock":
+        for single_var_data in ast["varData"]:
+            acc.append(single_var_data["varName"])
+    return ASTVisitor.SKIP
+
+
+def _skip_subtree(_ast, _acc):
+    """Skips an AST element and its children (e.g., function bodies, which cannot declare clocks).
 
+    Args:
+        _ast: The AST element.
+        _acc: The accumulator.
+
+    Returns:
+        ASTVisitor.SKIP
     """
-    if ast["astType"] == "VariableDecls":
-        if ast["type"]["typeId"]["astType"] == "CustomType" and ast["type"]["typeId"]["type"] == "clock":
-            for single_var_data in ast["varData"]:
-                acc.append(single_var_data["varName"])
-    return ast
+    return ASTVisitor.SKIP
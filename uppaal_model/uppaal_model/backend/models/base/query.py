@@ -3,7 +3,6 @@
 import copy
 
 from uppaal_model.backend.ast_code_element import ASTCodeElement
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
 from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppaal_c_language.backend.printers.uppaal_query_language_printer import UppaalQueryPrinter
 
@@ -69,6 +68,7 @@ class QueryFormula(ASTCodeElement):
         Returns:
             None
         """
+        from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
         self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
 
     def init_printer(self):
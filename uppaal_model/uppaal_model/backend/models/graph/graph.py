@@ -260,6 +260,8 @@ class Graph:
 class Node:
     """An graph node class."""
 
+    __slots__ = ("id", "name", "in_edges", "out_edges", "parent", "view")
+
     def __init__(self, name=None, parent=None, id_=None):
         """Initializes Node.
 
@@ -307,6 +309,8 @@ class Node:
 class Edge:
     """A graph edge class."""
 
+    __slots__ = ("id", "parent", "source", "target", "view")
+
     def __init__(self, source, target, parent=None, id_=None):
         """Initializes Edge.
 
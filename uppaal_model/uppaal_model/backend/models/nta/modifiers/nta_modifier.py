@@ -3,8 +3,7 @@
 import copy
 import pprint
 
-from uppaal_c_language.backend.modifiers.ast_modifier import apply_func_to_ast
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+from uppaal_c_language.backend.modifiers.ast_modifier import visit_ast
 from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppaal_c_language.backend.printers.uppaal_c_language_printer import UppaalCPrinter
 
@@ -136,6 +135,22 @@ class SystemModifier:
 
         return new_instance_data
 
+    @staticmethod
+    def replace_variables(system, replacements):
+        """Replace multiple variables simultaneously in all template labels of the system.
+
+        Args:
+            system: The system object.
+            replacements: A dict mapping variable names to either new variable names (str) or replacement ASTs (dict)
+
+        Returns:
+            The number of changed labels.
+        """
+        changed_count = 0
+        for tmpl in system.templates.values():
+            changed_count += TemplateModifier.replace_variables(tmpl=tmpl, replacements=replacements)
+        return changed_count
+
     @staticmethod
     def resolve_parameters(system, tmpl):
         SystemModifier.replace_call_by_reference_parameters(system=system, tmpl=tmpl)
@@ -194,60 +209,40 @@ class SystemModifier:
         # Copy local ast
         new_global_ast_part = copy.deepcopy(tmpl.declaration.ast)
 
-        # Replace all locally defined variables, types and functions with their global counterparts
-        for i in range(0, len(local_var_names)):
-            def local_var_adapt_func(ast, _acc):
-                """Helper function for variable name adaption."""
-                if ast["astType"] == 'VariableID' and ast["varName"] == local_var_names[i]:
-                    ast["varName"] = f'{tmpl.name}_{local_var_names[i]}'
-                elif ast["astType"] == 'Variable' and ast["name"] == local_var_names[i]:
-                    ast["name"] = f'{tmpl.name}_{local_var_names[i]}'
-                return ast
-
-            new_global_ast_part, _ = apply_func_to_ast(ast=new_global_ast_part, func=local_var_adapt_func)
-            # pprint.pprint(new_global_ast_part, indent=2)
-
-        for i in range(0, len(local_func_names)):
-            def local_func_adapt_func(ast, _acc):
-                """Helper function for function name adaption."""
-                if ast["astType"] == 'FuncDef' and ast["name"] == local_func_names[i]:
-                    ast["varName"] = f'{tmpl.name}_{local_func_names[i]}'
-                return ast
-
-            new_global_ast_part, _ = apply_func_to_ast(ast=new_global_ast_part, func=local_func_adapt_func)
-
-        for i in range(0, len(local_type_names)):
-            def local_type_adapt_func(ast, _acc):
-                """Helper function for type name adaption."""
-                if ast["astType"] == 'CustomType' and ast["type"] == local_type_names[i]:
-                    ast["type"] = f'{tmpl.name}_{local_type_names[i]}'
-                return ast
-
-            new_global_ast_part, _ = apply_func_to_ast(ast=new_global_ast_part, func=local_type_adapt_func)
+        # Replace all locally defined variables, types and functions with their global counterparts (in a single pass)
+        var_map = {name: f'{tmpl.name}_{name}' for name in local_var_names}
+        func_map = {name: f'{tmpl.name}_{name}' for name in local_func_names}
+        type_map = {name: f'{tmpl.name}_{name}' for name in local_type_names}
 
-        # Insert new global AST part into global declaration ast
-        system.declaration.ast["decls"].extend(new_global_ast_part["decls"])
+        def local_var_id_adapt_func(ast, _acc):
+            """Helper function for variable name adaption."""
+            ast["varName"] = var_map.get(ast["varName"], ast["varName"])
 
-        # Update variables inside model
-        var_replacements = []
-        for i in range(0, len(local_var_names)):
-            def model_var_adapt_func(old_name, new_name):
-                """Helper function for name adaption."""
+        def local_var_adapt_func(ast, _acc):
+            """Helper function for variable name adaption."""
+            ast["name"] = var_map.get(ast["name"], ast["name"])
 
-                def ast_func(ast, _acc):
-                    """Helper function for name adaption."""
-                    if ast["astType"] == 'Variable' and ast["name"] == old_name:
-                        ast["name"] = new_name
-                    return ast
+        def local_func_adapt_func(ast, _acc):
+            """Helper function for function name adaption."""
+            if ast["name"] in func_map:
+                ast["varName"] = func_map[ast["name"]]
 
-                return ast_func
+        def local_type_adapt_func(ast, _acc):
+            """Helper function for type name adaption."""
+            ast["type"] = type_map.get(ast["type"], ast["type"])
 
-            old_name_ = local_var_names[i]
-            new_name_ = f'{tmpl.name}_{old_name_}'
+        new_global_ast_part, _ = visit_ast(ast=new_global_ast_part, handlers={
+            "VariableID": local_var_id_adapt_func,
+            "Variable": local_var_adapt_func,
+            "FuncDef": local_func_adapt_func,
+            "CustomType": local_type_adapt_func,
+        })
 
-            var_replacements.append(model_var_adapt_func(old_name=old_name_, new_name=new_name_))
+        # Insert new global AST part into global declaration ast
+        system.declaration.ast["decls"].extend(new_global_ast_part["decls"])
 
-        TemplateModifier.adapt_asts(tmpl=tmpl, adaptions=var_replacements)
+        # Update variables inside model
+        TemplateModifier.replace_variables(tmpl=tmpl, replacements=var_map)
 
         # Clear local declaration
         tmpl.set_declaration("")
@@ -262,39 +257,18 @@ class SystemModifier:
         assert len(tmpl_instance_data) == 1, f'Exactly one single instances must exist for template "{tmpl.name}".'
 
         args = tmpl_instance_data[0]["args"]
-        var_replacements = []
+        var_replacements = {}
         shift = 0
         for idx, (param, arg) in enumerate(list(zip(tmpl.parameters, args))):
             if not param.ast["isRef"]:
                 continue
             param_name = param.ast["varData"]["varName"]
-            var_replacements.append((param_name, arg))
+            var_replacements[param_name] = arg
             del tmpl.parameters[idx - shift]
             del args[idx - shift]
             shift += 1
 
-        def model_var_adapt_func(var_replacements_):
-            """Helper function for name adaption."""
-
-            def ast_func(ast, _acc):
-                """Helper function for name adaption."""
-                for arg_name, rep_val_ast in var_replacements_:
-                    if ast["astType"] == 'Variable' and ast["name"] == arg_name:
-                        ast = copy.deepcopy(rep_val_ast)
-                        # if isinstance(rep_val, str):
-                        #     ast = {"astType": 'Variable', "name": rep_val}
-                        # elif isinstance(rep_val, int):
-                        #     ast = {"astType": 'Integer', "val": rep_val}
-                        # elif isinstance(rep_val, bool):
-                        #     ast = {"astType": 'Boolean', "val": rep_val}
-                        break
-                return ast
-
-            return ast_func
-
-        adaptions = [model_var_adapt_func(var_replacements_=var_replacements)]
-
-        TemplateModifier.adapt_asts(tmpl=tmpl, adaptions=adaptions)
+        TemplateModifier.replace_variables(tmpl=tmpl, replacements=var_replacements)
 
         system.system_declaration.update_text()
 
@@ -306,6 +280,7 @@ class SystemModifier:
         assert len(tmpl_instance_data) == 1, f'Exactly one single instances must exist for template "{tmpl.name}".'
 
         args = tmpl_instance_data[0]["args"]
+        from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
         uppaal_c_parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
         printer = UppaalCPrinter()
         shift = 0
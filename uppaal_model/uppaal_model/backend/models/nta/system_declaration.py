@@ -3,7 +3,6 @@
 import copy
 
 from uppaal_model.backend.ast_code_element import ASTCodeElement
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
 from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppaal_c_language.backend.printers.uppaal_c_language_printer import UppaalCPrinter
 
@@ -31,6 +30,7 @@ class SystemDeclaration(ASTCodeElement):
         Returns:
             None
         """
+        from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
         self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
 
     def init_printer(self):
@@ -39,7 +39,7 @@ class SystemDeclaration(ASTCodeElement):
          Returns:
              None
          """
-        self.printer = UppaalCPrinter()
+        self.printer = UppaalCPrinter(fast=True)
 
     def copy(self):
         """Copies the SystemDeclaration instance.
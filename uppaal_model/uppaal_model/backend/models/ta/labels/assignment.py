@@ -3,8 +3,7 @@
 import copy
 
 from uppaal_model.backend.ast_code_element import ASTCodeElement
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
-from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
+from uppaal_c_language.backend.parsers.uppaal_c_language_fast_parser import UppaalCLanguageFastParser
 from uppaal_c_language.backend.printers.uppaal_c_language_printer import UppaalCPrinter
 
 
@@ -17,6 +16,8 @@ class Update(ASTCodeElement):
     Via an update, a non-clock variable is re-assigned.
     """
 
+    __slots__ = ("autom",)
+
     def __init__(self, updt_data, autom=None):
         """Initializes Update.
 
@@ -32,7 +33,7 @@ class Update(ASTCodeElement):
         Returns:
             None
         """
-        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.parser = UppaalCLanguageFastParser()
 
     def init_printer(self):
         """Initializes the AST code printer.
@@ -71,6 +72,9 @@ class Reset(ASTCodeElement):
 
     Via a clock reset, a clock variable is re-assigned.
     """
+
+    __slots__ = ("autom",)
+
     def __init__(self, rst_data, autom=None):
         """Initializes Reset.
 
@@ -86,7 +90,7 @@ class Reset(ASTCodeElement):
         Returns:
             None
         """
-        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.parser = UppaalCLanguageFastParser()
 
     def init_printer(self):
         """Initializes the AST code printer.
@@ -3,8 +3,7 @@
 import copy
 
 from uppaal_model.backend.ast_code_element import ASTCodeElement
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
-from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
+from uppaal_c_language.backend.parsers.uppaal_c_language_fast_parser import UppaalCLanguageFastParser
 from uppaal_c_language.backend.printers.uppaal_c_language_printer import UppaalCPrinter
 
 
@@ -17,6 +16,8 @@ class VariableGuard(ASTCodeElement):
     Via a variable guard, a condition on a non-clock variable is enforced.
     """
 
+    __slots__ = ("autom",)
+
     def __init__(self, grd_data, autom=None):
         """Initializes VariableGuard.
 
@@ -32,7 +33,7 @@ class VariableGuard(ASTCodeElement):
         Returns:
             None
         """
-        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.parser = UppaalCLanguageFastParser()
 
     def init_printer(self):
         """Initializes the AST code printer.
@@ -72,6 +73,8 @@ class ClockGuard(ASTCodeElement):
     Via a clock guard, a condition on a clock variable is enforced.
     """
 
+    __slots__ = ("autom",)
+
     def __init__(self, grd_data, autom=None):
         """Initializes ClockGuard.
 
@@ -87,7 +90,7 @@ class ClockGuard(ASTCodeElement):
         Returns:
             None
         """
-        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.parser = UppaalCLanguageFastParser()
 
     def init_printer(self):
         """Initializes the AST code printer.
@@ -3,7 +3,6 @@
 import copy
 
 from uppaal_model.backend.ast_code_element import ASTCodeElement
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
 from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppaal_c_language.backend.printers.uppaal_c_language_printer import UppaalCPrinter
 
@@ -17,6 +16,8 @@ class Parameter(ASTCodeElement):
     The template parameters are used to assign individual values to the instance automata derived from a template.
     """
 
+    __slots__ = ("autom",)
+
     def __init__(self, param_data, autom=None):
         """Initializes Parameter.
 
@@ -32,6 +33,7 @@ class Parameter(ASTCodeElement):
         Returns:
             None
         """
+        from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
         self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
 
     def init_printer(self):
@@ -3,8 +3,7 @@
 import copy
 
 from uppaal_model.backend.ast_code_element import ASTCodeElement
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
-from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
+from uppaal_c_language.backend.parsers.uppaal_c_language_fast_parser import UppaalCLanguageFastParser
 from uppaal_c_language.backend.printers.uppaal_c_language_printer import UppaalCPrinter
 
 
@@ -17,6 +16,8 @@ class Select(ASTCodeElement):
     Via a select, a transition is split into individual transitions for each possible select value assignment.
     """
 
+    __slots__ = ("autom",)
+
     def __init__(self, sel_data, autom=None):
         """Initializes Select.
 
@@ -32,7 +33,7 @@ class Select(ASTCodeElement):
         Returns:
             None
         """
-        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.parser = UppaalCLanguageFastParser()
 
     def init_printer(self):
         """Initializes the AST code printer.
@@ -3,8 +3,7 @@
 import copy
 
 from uppaal_model.backend.ast_code_element import ASTCodeElement
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
-from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
+from uppaal_c_language.backend.parsers.uppaal_c_language_fast_parser import UppaalCLanguageFastParser
 from uppaal_c_language.backend.printers.uppaal_c_language_printer import UppaalCPrinter
 
 
@@ -17,6 +16,8 @@ class Synchronization(ASTCodeElement):
     Via a channel synchronization, multiple edge can be synchronized and triggered simultaneously.
     """
 
+    __slots__ = ("autom",)
+
     def __init__(self, sync_data, autom=None):
         """Initializes Synchronization.
 
@@ -32,7 +33,7 @@ class Synchronization(ASTCodeElement):
         Returns:
             None
         """
-        self.parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+        self.parser = UppaalCLanguageFastParser()
 
     def init_printer(self):
         """Initializes the AST code printer.
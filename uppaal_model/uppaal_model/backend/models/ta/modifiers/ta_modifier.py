@@ -1,6 +1,6 @@
 """This module implements modifiers for Uppaal TAs."""
 
-from uppaal_c_language.backend.modifiers.ast_modifier import apply_funcs_to_ast
+from uppaal_c_language.backend.modifiers.ast_modifier import apply_funcs_to_ast, variable_replacement_visitor
 
 
 ####################
@@ -75,30 +75,24 @@ class TemplateModifier:
 
     @staticmethod
     def replace_variables(tmpl, replacements):
-        """Replace multiple variables simultaneously.
+        """Replace multiple variables simultaneously in all labels of a template (in a single pass per label).
+
+        Only the labels which actually contain replaced variables are re-printed.
 
         Args:
             tmpl: The template object.
-            replacements: The list of search-replace functions
+            replacements: A dict mapping variable names to either new variable names (str) or replacement ASTs (dict)
 
         Returns:
-            None
+            The number of changed labels.
         """
-        pass
-
-    # replace_variable(var_name, new_ast) {
-    #     self.adapt_asts([
-    #     { "select_func": (ast) => ast.type == 'Variable' && ast.name == var_name,
-    #        "adapt_func":    (ast) => {return copy_ast(new_ast);} }
-    #     ]);
-    # }
-
-    # replace_variables(adaptions) {
-    #     for (var i=0; i<adaptions.length; i++) {
-    #         adaptions[i][0] = {"type": "Variable", "name": replacements[i][0]};
-    #     }
-    #     self.adapt_asts(replacements);
-    # }
+        visitor = variable_replacement_visitor(replacements)
+        labels = []
+        for loc in tmpl.locations.values():
+            labels.extend(_location_labels(loc))
+        for edge in tmpl.edges.values():
+            labels.extend(_edge_labels(edge))
+        return _replace_variables_in_labels(labels, visitor)
 
 
 ####################
@@ -125,6 +119,19 @@ class LocationModifier:
             inv.ast = apply_funcs_to_ast(inv.ast, adaptions)[0]
             inv.update_text()
 
+    @staticmethod
+    def replace_variables(loc, replacements):
+        """Replace multiple variables simultaneously in the labels of a location (in invariants).
+
+        Args:
+            loc: The location object.
+            replacements: A dict mapping variable names to either new variable names (str) or replacement ASTs (dict)
+
+        Returns:
+            The number of changed labels.
+        """
+        return _replace_variables_in_labels(_location_labels(loc), variable_replacement_visitor(replacements))
+
 
 ################
 # EdgeModifier #
@@ -174,3 +181,66 @@ class EdgeModifier:
             sel = edge.selects[i]
             sel.ast = apply_funcs_to_ast(sel.ast, adaptions)[0]
             sel.update_text()
+
+    @staticmethod
+    def replace_variables(edge, replacements):
+        """Replace multiple variables simultaneously in the labels of an edge.
+
+        Args:
+            edge: The edge object
+            replacements: A dict mapping variable names to either new variable names (str) or replacement ASTs (dict)
+
+        Returns:
+            The number of changed labels.
+        """
+        return _replace_variables_in_labels(_edge_labels(edge), variable_replacement_visitor(replacements))
+
+
+###########
+# Helpers #
+###########
+def _location_labels(loc):
+    """Gets all AST labels of a location.
+
+    Args:
+        loc: The location object.
+
+    Returns:
+        The list of labels.
+    """
+    return list(loc.invariants)
+
+
+def _edge_labels(edge):
+    """Gets all AST labels of an edge.
+
+    Args:
+        edge: The edge object.
+
+    Returns:
+        The list of labels.
+    """
+    labels = [*edge.clock_guards, *edge.variable_guards, *edge.updates, *edge.resets]
+    if edge.sync is not None:
+        labels.append(edge.sync)
+    labels.extend(edge.selects)
+    return labels
+
+
+def _replace_variables_in_labels(labels, visitor):
+    """Applies a variable replacement visitor to labels, and re-prints the labels which have been changed.
+
+    Args:
+        labels: The list of labels.
+        visitor: The variable replacement visitor.
+
+    Returns:
+        The number of changed labels.
+    """
+    changed_count = 0
+    for label in labels:
+        label.ast, replaced = visitor.visit(ast=label.ast)
+        if replaced:
+            label.update_text()
+            changed_count += 1
+    return changed_count
@@ -194,6 +194,8 @@ class Template(basic_automaton.Automaton):
 class Location(basic_automaton.Location):
     """An Uppaal automaton location class."""
 
+    __slots__ = ("invariants", "urgent", "committed", "testcode")
+
     def __init__(self, name=None, parent=None, id_=None):
         """Initializes Location.
 
@@ -339,6 +341,8 @@ class Edge(basic_automaton.Edge):
     @inner
     """
 
+    __slots__ = ("clock_guards", "variable_guards", "updates", "resets", "sync", "selects", "testcode", "controllable")
+
     def __init__(self, source, target, parent=None, id_=None):
         """Initializes Edge.
 
@@ -357,6 +361,7 @@ class Edge(basic_automaton.Edge):
         self.sync = None
         self.selects = []
         self.testcode = {}
+        self.controllable = None
 
         self.view = {"nails": OrderedDict()}
 
@@ -6,11 +6,10 @@ from copy import deepcopy
 from lxml import etree
 
 import uppaal_model.backend.models.nta.nta as nta
-from uppaal_c_language.backend.modifiers.ast_modifier import apply_func_to_ast
+from uppaal_c_language.backend.modifiers.ast_modifier import ASTVisitor
 from uppaal_model.backend.helper import unique_id
 from uppaal_model.backend.models.base.query import Query
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
-from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
+from uppaal_c_language.backend.parsers.uppaal_c_language_fast_parser import UppaalCLanguageFastParser
 
 
 ######################
@@ -253,7 +252,7 @@ def uppaal_dict_to_system(system_data):
     """
 
     system = nta.System()
-    uppaal_c_parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+    uppaal_c_parser = UppaalCLanguageFastParser()
 
     system.set_declaration(system_data["global_declaration"])
     system.set_system_declaration(system_data["system_declaration"])
@@ -277,20 +276,22 @@ def uppaal_dict_to_system(system_data):
         # Clock check function
         template_scope_clocks = system.declaration.clocks + template.declaration.clocks
 
-        def get_clocks(ast, acc):
-            """Adds the ast to acc if it is a clock variable.
+        def get_clock(ast, acc):
+            """Adds the ast to acc and stops the search if it is a clock variable.
 
             Args:
-                ast: The AST dict.
+                ast: The Variable AST dict.
                 acc: A list of values accumulated during search.
 
             Returns:
-                The original AST dict.
+                ASTVisitor.STOP if the variable is a clock, otherwise None.
             """
-            if ast["astType"] == "Variable":
-                if ast["name"] in template_scope_clocks:
-                    acc.append(ast["name"])
-            return ast
+            if ast["name"] in template_scope_clocks:
+                acc.append(ast["name"])
+                return ASTVisitor.STOP
+            return None
+
+        clock_visitor = ASTVisitor(handlers={"Variable": get_clock})
 
         ###################
         # Parse locations #
@@ -349,7 +350,7 @@ def uppaal_dict_to_system(system_data):
             if edge_data["guard"]:
                 guards = uppaal_c_parser.parse(edge_data["guard"], rule_name='Guards')
                 for guard in guards:
-                    if len(apply_func_to_ast(guard, get_clocks)[1]) > 0:
+                    if len(clock_visitor.visit(guard)[1]) > 0:
                         edge.new_clock_guard(guard)
                     else:
                         edge.new_variable_guard(guard)
@@ -366,7 +367,7 @@ def uppaal_dict_to_system(system_data):
             if edge_data["update"]:
                 updates = uppaal_c_parser.parse(edge_data["update"], rule_name='Updates')
                 for update in updates:
-                    if len(apply_func_to_ast(update, get_clocks)[1]) > 0:
+                    if len(clock_visitor.visit(update)[1]) > 0:
                         edge.new_reset(update)
                     else:
                         edge.new_update(update)
@@ -0,0 +1 @@
+"""The test suite module."""
@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+
+from uppyyl_observation_matcher.backend.data.columnar_trace import ColumnarTrace, NO_ORDINAL, NO_VALUE
+from uppyyl_observation_matcher.backend.data.trace import Trace
+from uppyyl_observation_matcher.backend.data.transition import Transition
+from uppyyl_observation_matcher.backend.matching import ObservationMatcher
+from tests.matcher_test_models import load_preprocessed_model, observation, validator_model
+
+
+@pytest.fixture(scope="module")
+def model_and_trace():
+    model, instance_data = load_preprocessed_model(validator_model)
+    matcher = ObservationMatcher(config={"allowed_deviations": {}}, model=model, instance_data=instance_data,
+                                 backend="native")
+    res = matcher.match([observation(t=0, locations={"P": "A"}), observation(t=1, locations={"P": "B"}),
+                         observation(t=3, variables={"k": 1}, locations={"P": "C"})], return_trace=True)
+    trace = res["matching_trace"]
+    for transition in trace.transitions:
+        transition.intermediate_states["delay_state"] = transition.source_state.copy()
+    return model, trace
+
+
+def assert_traces_equal(trace, other_trace):
+    assert len(trace.transitions) == len(other_trace.transitions)
+    for state, other_state in zip(trace.get_states(), other_trace.get_states()):
+        assert state.key() == other_state.key()
+        assert state.locs.keys() == other_state.locs.keys()
+        assert all(state.locs[proc_name] is other_state.locs[proc_name] for proc_name in state.locs)
+        assert state.vars == other_state.vars
+        assert state.dbm.clocks == other_state.dbm.clocks
+    for transition, other_transition in zip(trace.transitions, other_trace.transitions):
+        assert transition.triggered_edges.keys() == other_transition.triggered_edges.keys()
+        assert all(transition.triggered_edges[proc_name] is other_transition.triggered_edges[proc_name]
+                   for proc_name in transition.triggered_edges)
+        assert list(transition.intermediate_states) == list(other_transition.intermediate_states)
+
+
+def test_round_trip(model_and_trace):
+    model, trace = model_and_trace
+    columnar_trace = ColumnarTrace.from_trace(trace)
+    assert columnar_trace.transition_count == 2
+    assert columnar_trace.process_names == ["P"]
+    assert columnar_trace.locations[:3, 0].tolist() == [0, 1, 2]
+    assert columnar_trace.dbms.shape == (5, len(columnar_trace.clocks), len(columnar_trace.clocks))
+    assert columnar_trace.intermediate.tolist() == [[0, 0, 3], [1, 0, 4]]
+    assert columnar_trace.intermediate_names == ["delay_state"]
+
+    restored_trace = columnar_trace.to_trace(model)
+    assert_traces_equal(trace, restored_trace)
+    assert restored_trace.transitions[1].source_state is restored_trace.transitions[0].target_state
+    assert [loc.name for loc in (state.locs["P"] for state in restored_trace.get_states())] == \
+        ["A", "A", "B", "B", "C"]
+
+
+def test_round_trip_of_trace_without_transitions(model_and_trace):
+    model, trace = model_and_trace
+    init_only_trace = Trace(init_state=trace.init_state, transitions=[])
+    columnar_trace = ColumnarTrace.from_trace(init_only_trace)
+    assert columnar_trace.transition_count == 0
+    assert columnar_trace.edges.shape == (0, 1)
+    assert columnar_trace.intermediate.shape == (0, 3)
+
+    restored_trace = columnar_trace.to_trace(model)
+    assert restored_trace.transitions == []
+    assert restored_trace.init_state.key() == trace.init_state.key()
+
+
+def test_missing_variables_and_processes(model_and_trace):
+    model, trace = model_and_trace
+    final_state = trace.transitions[-1].target_state.copy()
+    del final_state.vars["sys.c"]
+    del final_state.locs["P"]
+    trace = Trace(init_state=trace.init_state, transitions=[
+        trace.transitions[0], Transition(source_state=trace.transitions[0].target_state, target_state=final_state,
+                                         triggered_edges={})])
+
+    columnar_trace = ColumnarTrace.from_trace(trace)
+    var_index = columnar_trace.var_names.index("sys.c")
+    assert columnar_trace.variables[2, var_index] == NO_VALUE
+    assert columnar_trace.variables[1, var_index] == 3
+    assert columnar_trace.locations[2].tolist() == [NO_ORDINAL]
+    assert columnar_trace.edges[1].tolist() == [NO_ORDINAL]
+
+    restored_trace = columnar_trace.to_trace(model)
+    restored_final_state = restored_trace.transitions[-1].target_state
+    assert "sys.c" not in restored_final_state.vars
+    assert restored_final_state.locs == {}
+    assert restored_trace.transitions[-1].triggered_edges == {}
+    assert restored_final_state.key() == final_state.key()
+
+
+def test_save_and_load(model_and_trace, tmp_path):
+    model, trace = model_and_trace
+    columnar_trace = ColumnarTrace.from_trace(trace)
+    file_path = tmp_path / "trace.npz"
+    columnar_trace.save(file_path)
+
+    # The file contains no pickled objects
+    with np.load(file_path, allow_pickle=False) as data:
+        assert all(data[name].dtype != object for name in data.files)
+
+    loaded_trace = ColumnarTrace.load(file_path)
+    for name in ["process_names", "template_names", "var_names", "clocks", "intermediate_names"]:
+        assert getattr(loaded_trace, name) == getattr(columnar_trace, name)
+    for name in ["locations", "variables", "dbms", "edges", "intermediate"]:
+        assert np.array_equal(getattr(loaded_trace, name), getattr(columnar_trace, name))
+        assert getattr(loaded_trace, name).dtype == getattr(columnar_trace, name).dtype
+    assert_traces_equal(trace, loaded_trace.to_trace(model))
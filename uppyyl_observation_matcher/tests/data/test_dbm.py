@@ -0,0 +1,200 @@
+import numpy as np
+import pytest
+
+from uppyyl_observation_matcher.backend.data.dbm import DBM, DBMConstraint
+
+
+def zone(constraints, clocks=("x", "y")):
+    """Creates the closed zone of all non-negative clock valuations which satisfy the given constraints."""
+    dbm = DBM(clocks=list(clocks))
+    constraints = [f'{clock} >= 0' for clock in clocks] + constraints
+    return dbm.conjugate_all([DBMConstraint(constraint) for constraint in constraints])
+
+
+#################
+# Extrapolation #
+#################
+extrapolation_zones = [
+    [],
+    ["x <= 2"],
+    ["x >= 4", "x <= 4"],
+    ["x > 7"],
+    ["x >= 12", "x <= 15"],
+    ["y >= 5", "x - y <= 1"],
+    ["x - y >= 9"],
+]
+
+max_bounds = {"x": 5, "y": 3}
+lower_bounds, upper_bounds = {"x": 5, "y": 1}, {"x": 2, "y": 3}
+
+
+def extrapolate(dbm, kind):
+    if kind == "max":
+        return dbm.extrapolate_max_bounds(max_bounds=max_bounds)
+    return dbm.extrapolate_lu_bounds(lower_bounds=lower_bounds, upper_bounds=upper_bounds)
+
+
+@pytest.mark.parametrize("kind", ["max", "lu"])
+@pytest.mark.parametrize("constraints", extrapolation_zones)
+def test_extrapolation_includes_original(kind, constraints):
+    dbm = zone(constraints)
+    extrapolated_dbm = extrapolate(dbm.copy(), kind)
+    assert extrapolated_dbm.includes(dbm)
+    assert not extrapolated_dbm.is_empty()
+
+
+@pytest.mark.parametrize("kind", ["max", "lu"])
+@pytest.mark.parametrize("constraints", extrapolation_zones)
+def test_extrapolation_is_idempotent(kind, constraints):
+    extrapolated_dbm = extrapolate(zone(constraints), kind)
+    assert extrapolate(extrapolated_dbm.copy(), kind).key() == extrapolated_dbm.key()
+
+
+@pytest.mark.parametrize("kind", ["max", "lu"])
+def test_zones_with_growing_constants_collapse_to_one_key(kind):
+    keys = {extrapolate(zone([f'x >= {c}', f'x <= {c}', "y <= 0"]), kind).key() for c in range(6, 30)}
+    assert len(keys) == 1
+
+    # Below the bounds, the zones are kept apart
+    keys = {extrapolate(zone([f'x >= {c}', f'x <= {c}', "y <= 0"]), kind).key() for c in range(3)}
+    assert len(keys) == 3
+
+
+def test_extrapolation_of_zone_below_bounds_is_identity():
+    dbm = zone(["x >= 1", "x <= 2", "y <= 1"])
+    assert extrapolate(dbm.copy(), "max") == dbm
+
+
+def test_max_bounds_relax_lower_bound_above_constant():
+    dbm = zone(["x >= 12", "x <= 15", "y <= 0"]).extrapolate_max_bounds(max_bounds=max_bounds)
+    interval = dbm.get_interval("x")
+    assert (interval.lower_val, interval.lower_incl, interval.upper_val) == (5, False, np.inf)
+    assert dbm.get_interval("y").upper_val == 0
+
+
+def test_clocks_without_bounds_are_not_extrapolated():
+    dbm = zone(["x >= 12", "x <= 15"])
+    assert dbm.copy().extrapolate_max_bounds(max_bounds={}) == dbm
+
+    # A clock which is never compared is unbounded
+    interval = dbm.copy().extrapolate_max_bounds(max_bounds={"x": -np.inf}).get_interval("x")
+    assert (interval.lower_val, interval.upper_val) == (0, np.inf)
+
+
+########
+# Keys #
+########
+def test_equal_closed_zones_have_equal_keys():
+    dbm = zone(["x >= 1", "x - y <= 2", "y <= 3"])
+    other_dbm = zone(["y <= 3", "x - y <= 2", "x >= 1", "x <= 5"])  # "x <= 5" is implied
+    assert dbm == other_dbm
+    assert dbm.key() == other_dbm.key()
+    assert dbm.copy().key() == dbm.key()
+
+
+@pytest.mark.parametrize("constraints", [["x > 1"], ["x >= 2"], ["x - y < 2"], ["y <= 3"], ["x >= 1", "x <= 1"]])
+def test_different_zones_have_different_keys(constraints):
+    assert zone(["x >= 1"]).key() != zone(constraints).key()
+
+
+def test_infinite_bounds_are_encoded():
+    key = zone([]).key()
+    dbm = zone([])
+    dbm.matrix[1][0].val = -np.inf
+    assert dbm.key() != key
+    assert zone(["x <= 1000000"]).key() != key
+
+
+def test_clock_order_and_names_are_part_of_key():
+    dbm = zone(["x >= 1"])
+    assert zone(["x >= 1"], clocks=("y", "x")).key() != dbm.key()
+    assert zone(["x >= 1"], clocks=("x", "z")).key() != dbm.key()
+
+    # The clock names are separated, e.g., "ab" and "c" differ from "a" and "bc"
+    assert zone([], clocks=("ab", "c")).key() != zone([], clocks=("a", "bc")).key()
+
+
+###############
+# Constraints #
+###############
+def assert_constraints_equal(constraint, other_constraint):
+    assert (constraint.clock1, constraint.clock2, constraint.rel, constraint.val) == \
+        (other_constraint.clock1, other_constraint.clock2, other_constraint.rel, other_constraint.val)
+
+
+@pytest.mark.parametrize("parts, text", [
+    (("x", None, "<=", 5), "x <= 5"),
+    (("x", None, "<", 5), "x < 5"),
+    (("x", None, ">=", 2), "x >= 2"),
+    (("x", None, ">", 2), "x > 2"),
+    (("x", "y", "<=", -3), "x - y <= -3"),
+    (("x", "y", ">", 1), "x - y > 1"),
+    (("P(0).x[1]", "sys.y", ">=", 0), "P(0).x[1] - sys.y >= 0"),
+])
+def test_constraint_from_parts_equals_parsed_constraint(parts, text):
+    assert_constraints_equal(DBMConstraint.from_parts(*parts), DBMConstraint(text))
+
+
+def test_constraint_from_parts_inverts_lower_bounds():
+    constraint = DBMConstraint.from_parts("x", None, ">", 2)
+    assert (constraint.clock1, constraint.clock2, constraint.rel, constraint.val) == ("T0_REF", "x", "<", -2)
+    constraint = DBMConstraint.from_parts("x", "y", ">=", 1)
+    assert (constraint.clock1, constraint.clock2, constraint.rel, constraint.val) == ("y", "x", "<=", -1)
+
+
+###############
+# Conjugation #
+###############
+@pytest.mark.parametrize("constraints", [
+    ["x >= 1", "x <= 4"],
+    ["x - y <= 1", "y >= 3", "x <= 10"],
+    ["x > 2", "y - x < -1", "y <= 5"],
+    ["x >= 3", "x <= 2"],
+])
+def test_conjugate_all_equals_conjugate_and_close(constraints):
+    dbm = DBM(clocks=["x", "y"])
+    for constraint in constraints:
+        dbm.conjugate(DBMConstraint(constraint))
+    dbm.close()
+
+    batch_dbm = DBM(clocks=["x", "y"]).conjugate_all([DBMConstraint(constraint) for constraint in constraints])
+    assert batch_dbm == dbm
+    assert batch_dbm.key() == dbm.key()
+    assert batch_dbm.is_empty() == dbm.is_empty()
+
+
+def test_conjugate_all_without_close():
+    constraints = [DBMConstraint("x - y <= 1"), DBMConstraint("y <= 3")]
+    dbm = DBM(clocks=["x", "y"]).conjugate_all(constraints, close=False)
+    assert dbm.get_interval("x").upper_val == np.inf
+    assert dbm.close().get_interval("x").upper_val == 4
+
+
+###############
+# Clock Index #
+###############
+def test_clock_index():
+    dbm = DBM(clocks=["x", "y"])
+    assert [dbm.clock_index(clock) for clock in ["T0_REF", "x", "y"]] == [0, 1, 2]
+    assert dbm.copy().clock_index("y") == 2
+
+
+def test_clock_index_of_missing_clock_raises_value_error():
+    dbm = DBM(clocks=["x"])
+    with pytest.raises(ValueError, match='Clock "y" is not contained in the DBM.'):
+        dbm.clock_index("y")
+    with pytest.raises(ValueError):
+        dbm.conjugate(DBMConstraint("y <= 1"))
+
+
+def test_clock_index_is_invalidated_by_update_clocks():
+    dbm = zone(["x <= 2", "y <= 5"])
+    assert dbm.clock_index("y") == 2
+    dbm.update_clocks(["T0_REF", "y", "z", "x"])
+    assert [dbm.clock_index(clock) for clock in ["T0_REF", "y", "z", "x"]] == [0, 1, 2, 3]
+    assert dbm.get_interval("x").upper_val == 2
+    assert dbm.get_interval("y").upper_val == 5
+
+    dbm.update_clocks(["T0_REF", "z"])
+    with pytest.raises(ValueError):
+        dbm.clock_index("x")
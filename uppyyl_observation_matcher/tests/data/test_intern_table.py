@@ -0,0 +1,40 @@
+from uppyyl_observation_matcher.backend.data.dbm import DBM, DBMConstraint
+from uppyyl_observation_matcher.backend.data.intern_table import InternTable
+
+
+def zone(*constraints):
+    return DBM(clocks=["x"]).conjugate_all([DBMConstraint("x >= 0")] + [DBMConstraint(c) for c in constraints])
+
+
+def test_intern_returns_shared_instance():
+    intern_table = InternTable()
+    dbm = zone("x <= 2")
+    assert intern_table.intern(dbm) is dbm
+    assert intern_table.intern(zone("x <= 2")) is dbm
+    assert intern_table.intern(zone("x <= 3")) is not dbm
+    assert len(intern_table) == 2
+
+
+def test_hits_and_misses_are_counted():
+    intern_table = InternTable()
+    for bound in [1, 2, 1, 1, 3, 2]:
+        intern_table.intern(zone(f'x <= {bound}'))
+    assert (intern_table.hits, intern_table.misses) == (3, 3)
+    assert str(intern_table) == "InternTable(objects=3, hits=3, misses=3)"
+
+
+def test_contains_does_not_intern():
+    intern_table = InternTable()
+    assert not intern_table.contains(zone("x <= 1"))
+    intern_table.intern(zone("x <= 1"))
+    assert intern_table.contains(zone("x <= 1"))
+    assert (len(intern_table), intern_table.hits, intern_table.misses) == (1, 0, 1)
+
+
+def test_clear():
+    intern_table = InternTable()
+    dbm = intern_table.intern(zone("x <= 1"))
+    intern_table.intern(zone("x <= 1"))
+    intern_table.clear()
+    assert (len(intern_table), intern_table.hits, intern_table.misses) == (0, 0, 0)
+    assert intern_table.intern(zone("x <= 1")) is not dbm
@@ -0,0 +1,80 @@
+import pytest
+
+from uppyyl_observation_matcher.backend.data.dbm import DBM, DBMConstraint
+from uppyyl_observation_matcher.backend.data.intern_table import InternTable
+from uppyyl_observation_matcher.backend.data.state import State
+from tests.matcher_test_models import load_preprocessed_model, validator_model
+
+
+@pytest.fixture(scope="module")
+def locations():
+    model, _ = load_preprocessed_model(validator_model)
+    tmpl = model.get_template_by_name("P_Tmpl")
+    return {loc.name: loc for loc in tmpl.locations.values()}
+
+
+def zone(*constraints):
+    return DBM(clocks=["x"]).conjugate_all([DBMConstraint("x >= 0")] + [DBMConstraint(c) for c in constraints])
+
+
+def state(locations, loc_name="A", variables=None, constraints=("x <= 2",)):
+    return State(locs={"P": locations[loc_name]}, dbm=zone(*constraints),
+                 variables={"sys.a": 0, "sys.k": 1} if variables is None else variables)
+
+
+########
+# Keys #
+########
+def test_equal_states_have_equal_keys(locations):
+    assert state(locations).key() == state(locations).key()
+    assert state(locations).copy().key() == state(locations).key()
+
+    # The key does not depend on the insertion order of variables
+    assert state(locations, variables={"sys.k": 1, "sys.a": 0}).key() == state(locations).key()
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"loc_name": "B"},
+    {"variables": {"sys.a": 1, "sys.k": 1}},
+    {"variables": {"sys.a": 0, "sys.c": 1}},
+    {"variables": {"sys.a": 0}},
+    {"constraints": ("x < 2",)},
+])
+def test_different_states_have_different_keys(locations, kwargs):
+    assert state(locations, **kwargs).key() != state(locations).key()
+
+
+def test_interned_states_are_shared(locations):
+    intern_table = InternTable()
+    shared_state = intern_table.intern(state(locations))
+    assert intern_table.intern(state(locations)) is shared_state
+    assert intern_table.intern(state(locations, loc_name="C")) is not shared_state
+
+
+#############
+# Inclusion #
+#############
+@pytest.mark.parametrize("constraints, other_constraints", [
+    (("x <= 2",), ("x <= 2",)),
+    (("x <= 2",), ("x <= 1",)),
+    (("x <= 1",), ("x <= 2",)),
+    (("x >= 1",), ("x > 1", "x <= 4")),
+])
+def test_includes_with_interned_dbms(locations, constraints, other_constraints):
+    this_state = state(locations, constraints=constraints)
+    other_state = state(locations, constraints=other_constraints)
+    expected = this_state.includes(other_state)
+    assert expected == this_state.dbm.includes(other_state.dbm)
+
+    # Interning shares the DBMs of equal zones, for which the DBM inclusion check is skipped
+    intern_table = InternTable()
+    this_state.dbm = intern_table.intern(this_state.dbm)
+    other_state.dbm = intern_table.intern(other_state.dbm)
+    assert (this_state.dbm is other_state.dbm) == (constraints == other_constraints)
+    assert this_state.includes(other_state) == expected
+
+
+def test_includes_checks_locations_and_variables(locations):
+    assert not state(locations).includes(state(locations, loc_name="B"))
+    assert not state(locations).includes(state(locations, variables={"sys.a": 1, "sys.k": 1}))
+    assert state(locations).includes(state(locations, variables={"sys.a": 0}))
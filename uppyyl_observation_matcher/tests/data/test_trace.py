@@ -0,0 +1,56 @@
+import pytest
+
+from uppyyl_observation_matcher.backend.data.dbm import DBM, DBMConstraint
+from uppyyl_observation_matcher.backend.data.intern_table import InternTable
+from uppyyl_observation_matcher.backend.data.state import State
+from uppyyl_observation_matcher.backend.data.trace import Trace
+from uppyyl_observation_matcher.backend.data.transition import Transition
+
+
+def state(n, upper=2):
+    dbm = DBM(clocks=["x"]).conjugate_all([DBMConstraint("x >= 0"), DBMConstraint(f'x <= {upper}')])
+    return State(locs={}, dbm=dbm, variables={"sys.n": n})
+
+
+def trace_of(states, intermediate_states=()):
+    transitions = [Transition(source_state=source_state, target_state=target_state, triggered_edges={})
+                   for source_state, target_state in zip(states, states[1:])]
+    for transition, intermediate_state in zip(transitions, intermediate_states):
+        transition.intermediate_states["delay_state"] = intermediate_state
+    return Trace(init_state=states[0], transitions=transitions)
+
+
+@pytest.fixture
+def trace():
+    # The counter values 0, 1, 0, 2, 1 (with intermediate states 5, 1, 5, 5)
+    return trace_of([state(0), state(1), state(0), state(2), state(1)],
+                    intermediate_states=[state(5), state(1), state(5), state(5)])
+
+
+def test_get_unique_states_keeps_first_occurrences(trace):
+    unique_states = trace.get_unique_states()
+    states = trace.get_states()
+    assert [s.vars["sys.n"] for s in unique_states] == [0, 5, 1, 2]
+    assert unique_states == [states[0], states[1], states[2], states[6]]
+
+    unique_states = trace.get_unique_states(include_intermediate_states=False)
+    assert [s.vars["sys.n"] for s in unique_states] == [0, 1, 2]
+
+
+def test_get_unique_states_distinguishes_zones():
+    trace = trace_of([state(0), state(0, upper=3), state(0)])
+    assert [s.dbm.get_interval("x").upper_val for s in trace.get_unique_states()] == [2, 3]
+
+
+def test_intern_dbms_shares_equal_zones(trace):
+    intern_table = InternTable()
+    assert trace.intern_dbms(intern_table) is trace
+    dbms = [s.dbm for s in trace.get_states()]
+    assert all(dbm is dbms[0] for dbm in dbms)
+    assert (len(intern_table), intern_table.hits, intern_table.misses) == (1, 8, 1)
+
+    # Zones are shared across traces
+    other_trace = trace_of([state(3), state(4, upper=3)]).intern_dbms(intern_table)
+    assert other_trace.init_state.dbm is dbms[0]
+    assert other_trace.transitions[0].target_state.dbm is not dbms[0]
+    assert len(intern_table) == 2
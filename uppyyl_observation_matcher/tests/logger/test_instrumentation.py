@@ -0,0 +1,68 @@
+import math
+import random
+
+import pytest
+
+from uppyyl_observation_matcher.backend.logger.instrumentation import SpanHistogram, Instrumentation
+
+
+def nearest_rank_percentile(durations, percent):
+    sorted_durations = sorted(durations)
+    return sorted_durations[max(1, math.ceil(percent / 100 * len(sorted_durations))) - 1]
+
+
+def test_empty_histogram():
+    assert SpanHistogram().summary() == {"count": 0, "total_s": 0.0, "mean_s": None, "min_s": None, "p50_s": None,
+                                         "p99_s": None, "max_s": None}
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_histogram_summary(seed):
+    rng = random.Random(seed)
+    durations = [rng.lognormvariate(-8, 2) for _ in range(5000)]
+    histogram = SpanHistogram()
+    for duration in durations:
+        histogram.add(duration)
+
+    summary = histogram.summary()
+    assert summary["count"] == len(durations)
+    assert summary["total_s"] == pytest.approx(sum(durations))
+    assert summary["mean_s"] == pytest.approx(sum(durations) / len(durations))
+    assert summary["min_s"] == min(durations)
+    assert summary["max_s"] == max(durations)
+    for percent in [1, 50, 90, 99]:
+        assert histogram.percentile(percent) == pytest.approx(nearest_rank_percentile(durations, percent), rel=0.06)
+    assert histogram.percentile(0) == pytest.approx(min(durations), rel=0.06)
+    assert histogram.percentile(100) == max(durations)
+
+
+def test_histogram_memory_is_bounded():
+    histogram = SpanHistogram()
+    bucket_count = len(histogram.buckets)
+    for i in range(100000):
+        histogram.add(i * 1e-7)
+    assert len(histogram.buckets) == bucket_count
+    assert sum(histogram.buckets) == histogram.count == 100000
+
+
+def test_histogram_clamps_durations_outside_of_bucket_range():
+    histogram = SpanHistogram()
+    for duration in [0.0, 1e-12, 1e6]:
+        histogram.add(duration)
+    assert histogram.buckets[0] == 2
+    assert histogram.buckets[-1] == 1
+    assert histogram.percentile(50) == histogram.min_bucket_duration
+    assert histogram.percentile(100) == 1e6
+
+
+def test_instrumentation_summary():
+    instrumentation = Instrumentation(record_spans=False)
+    for _ in range(3):
+        with instrumentation.span("outer"):
+            with instrumentation.span("inner"):
+                pass
+    summary = instrumentation.summary()
+    assert set(summary) == {"outer", "inner"}
+    assert summary["inner"]["count"] == 3
+    assert summary["inner"]["max_s"] <= summary["outer"]["max_s"]
+    assert instrumentation.spans == []
@@ -0,0 +1,75 @@
+import pstats
+import time
+
+from uppyyl_observation_matcher.backend.logger.profiler import profile_run, pause_profiling, get_profile_dir_path
+from uppyyl_observation_matcher.backend.matching import ObservationMatcher
+from tests.matcher_test_models import load_preprocessed_model, observation, counter_model
+
+
+def profiled_work():
+    return sum(range(1000))
+
+
+def paused_work():
+    time.sleep(0.2)
+
+
+def function_names(stats):
+    return {func_name for _, _, func_name in stats.stats}
+
+
+def test_match_writes_loadable_profile(tmp_path):
+    model, instance_data = load_preprocessed_model(counter_model)
+    matcher = ObservationMatcher(config={"allowed_deviations": {}}, model=model, instance_data=instance_data,
+                                 backend="native")
+    res = matcher.match([observation(t=t, variables={"n": t}) for t in range(3)], profile=tmp_path)
+    assert res["is_matching"] is True
+
+    prof_file_paths = list(tmp_path.glob("match_*.prof"))
+    assert len(prof_file_paths) == 1
+    assert prof_file_paths[0].with_suffix(".txt").exists()
+    stats = pstats.Stats(str(prof_file_paths[0]))
+    assert "match" in function_names(stats)
+
+
+def test_match_without_profile_writes_nothing(tmp_path):
+    model, instance_data = load_preprocessed_model(counter_model)
+    matcher = ObservationMatcher(config={"allowed_deviations": {}, "output_dir_path": tmp_path}, model=model,
+                                 instance_data=instance_data, backend="native")
+    matcher.match([observation(t=0, variables={"n": 0})])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_paused_time_is_not_attributed(tmp_path):
+    with profile_run("paused", profile=tmp_path) as profiler:
+        profiled_work()
+        with pause_profiling():
+            paused_work()
+        profiled_work()
+    assert profiler is not None
+
+    stats = pstats.Stats(str(next(tmp_path.glob("paused_*.prof"))))
+    assert "profiled_work" in function_names(stats)
+    assert "paused_work" not in function_names(stats)
+    assert "sleep" not in function_names(stats)
+    assert stats.total_tt < 0.2
+
+
+def test_pause_without_active_profiler():
+    with pause_profiling():
+        paused_work()
+
+
+def test_nested_runs_are_part_of_outer_profile(tmp_path):
+    with profile_run("outer", profile=tmp_path):
+        with profile_run("inner", profile=tmp_path) as inner_profiler:
+            profiled_work()
+    assert inner_profiler is None
+    assert [path.suffix for path in sorted(tmp_path.iterdir())] == [".prof", ".txt"]
+    stats = pstats.Stats(str(next(tmp_path.glob("outer_*.prof"))))
+    assert "profiled_work" in function_names(stats)
+
+
+def test_profile_dir_path(tmp_path):
+    assert get_profile_dir_path(profile=True, output_dir_path=tmp_path) == tmp_path / "profiles"
+    assert get_profile_dir_path(profile=tmp_path / "custom", output_dir_path=tmp_path) == tmp_path / "custom"
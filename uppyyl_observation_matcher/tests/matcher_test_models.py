@@ -0,0 +1,182 @@
+"""Small hand-built Uppaal models for the matcher tests."""
+
+from xml.sax.saxutils import escape
+
+from uppaal_model.backend.parsers.uppaal_xml_model_parser import uppaal_xml_to_system
+from uppyyl_observation_matcher.backend.helper import get_instance_data
+from uppyyl_observation_matcher.backend.transformer.model.concrete.preprocessed_model_transformer import \
+    PreprocessedModelTransformer
+
+
+def template_xml(name, locations, transitions, init=None, declaration="", parameters=""):
+    """Creates the XML of a template.
+
+    Args:
+        name: The template name.
+        locations: The list of (location id, name, invariant, kind) tuples, where name and invariant may be None, and
+                   kind is None, "urgent", or "committed".
+        transitions: The list of (source id, target id, labels) tuples, where labels is a dict mapping label kinds
+                     (e.g., "guard", "synchronisation", "assignment", "select") to label texts.
+        init: The id of the initial location (default: the first location).
+        declaration: The local declaration text.
+        parameters: The template parameter text (e.g., "const id_t pid").
+
+    Returns:
+        The template XML.
+    """
+    lines = [f'<template><name>{name}</name><parameter>{escape(parameters)}</parameter>'
+             f'<declaration>{escape(declaration)}</declaration>']
+    for loc_id, loc_name, invariant, kind in locations:
+        line = f'<location id="{loc_id}" x="0" y="0">'
+        if loc_name is not None:
+            line += f'<name x="0" y="0">{loc_name}</name>'
+        if invariant is not None:
+            line += f'<label kind="invariant" x="0" y="0">{escape(invariant)}</label>'
+        if kind is not None:
+            line += f'<{kind}/>'
+        lines.append(line + '</location>')
+    lines.append(f'<init ref="{init or locations[0][0]}"/>')
+    for source_id, target_id, labels in transitions:
+        line = f'<transition><source ref="{source_id}"/><target ref="{target_id}"/>'
+        for kind, text in labels.items():
+            line += f'<label kind="{kind}" x="0" y="0">{escape(text)}</label>'
+        lines.append(line + '</transition>')
+    lines.append('</template>')
+    return "\n".join(lines)
+
+
+def model_xml(declaration, templates, system):
+    """Creates the XML of a model.
+
+    Args:
+        declaration: The global declaration text.
+        templates: The list of template XMLs (see "template_xml").
+        system: The system declaration text.
+
+    Returns:
+        The model XML.
+    """
+    return (f'<?xml version="1.0" encoding="utf-8"?>\n<nta><declaration>{escape(declaration)}</declaration>\n' +
+            "\n".join(templates) + f'\n<system>{escape(system)}</system><queries/></nta>')
+
+
+def load_preprocessed_model(xml):
+    """Loads a model from its XML and preprocesses it.
+
+    Args:
+        xml: The model XML.
+
+    Returns:
+        The preprocessed model and its instance data.
+    """
+    model = uppaal_xml_to_system(xml)
+    instance_data = get_instance_data(model=model, config={})
+    transformer = PreprocessedModelTransformer()
+    transformer.set_instance_data(instance_data)
+    transformer.transform(model=model)
+    return model, instance_data
+
+
+def observation(t, variables=None, locations=None):
+    """Creates an observation data point.
+
+    Args:
+        t: The observation time.
+        variables: The dict mapping variable names to observed values.
+        locations: The dict mapping process names to observed location names.
+
+    Returns:
+        The observation data point.
+    """
+    return {"t": t, "vars": dict(variables or {}),
+            "locs": {proc_name: {"name": loc_name} for proc_name, loc_name in (locations or {}).items()}}
+
+
+# A process which increments "g" (with range [0,2]) and "h" exactly once per time unit
+overflow_model = model_xml(
+    declaration="int[0,2] g; int h;",
+    templates=[template_xml(
+        name="P", declaration="clock x;",
+        locations=[("p0", "A", "x <= 1", None)],
+        transitions=[("p0", "p0", {"guard": "x >= 1", "assignment": "g = g + 1, h = h + 1, x = 0"})])],
+    system="system P;")
+
+# A sender which synchronizes on the binary channel "c" exactly at time 2 (setting "v" to 1), and a receiver which then
+# adds 10 to "v"
+sync_model = model_xml(
+    declaration="chan c; int v;",
+    templates=[
+        template_xml(
+            name="S", declaration="clock x;",
+            locations=[("s0", "A", "x <= 2", None), ("s1", "B", None, None)],
+            transitions=[("s0", "s1", {"guard": "x >= 2", "synchronisation": "c!", "assignment": "v = 1"})]),
+        template_xml(
+            name="R",
+            locations=[("r0", "Idle", None, None), ("r1", "Done", None, None)],
+            transitions=[("r0", "r1", {"synchronisation": "c?", "assignment": "v = v + 10"})])],
+    system="system S, R;")
+
+# A sender which broadcasts on "b" exactly at time 1 (adding 1 to "v"), a receiver "R" which can only receive from time
+# 5 on (adding 10), and a receiver "Q" which can always receive (adding 100)
+broadcast_model = model_xml(
+    declaration="broadcast chan b; int v;",
+    templates=[
+        template_xml(
+            name="S", declaration="clock x;",
+            locations=[("s0", "A", "x <= 1", None), ("s1", "B", None, None)],
+            transitions=[("s0", "s1", {"guard": "x >= 1", "synchronisation": "b!", "assignment": "v = v + 1"})]),
+        template_xml(
+            name="R", declaration="clock y;",
+            locations=[("r0", "Idle", None, None), ("r1", "Done", None, None)],
+            transitions=[("r0", "r1", {"guard": "y >= 5", "synchronisation": "b?", "assignment": "v = v + 10"})]),
+        template_xml(
+            name="Q",
+            locations=[("q0", "Idle", None, None), ("q1", "Done", None, None)],
+            transitions=[("q0", "q1", {"synchronisation": "b?", "assignment": "v = v + 100"})])],
+    system="system S, R, Q;")
+
+# A process "P" which passes the committed location "C" at time 1 (setting "v" to 1 and then 2), and a process "Q"
+# which could only react to the intermediate value 1 of "v" (setting "w" to 1)
+committed_model = model_xml(
+    declaration="int v; int w;",
+    templates=[
+        template_xml(
+            name="P", declaration="clock x;",
+            locations=[("p0", "A", "x <= 1", None), ("p1", "C", None, "committed"), ("p2", "D", None, None)],
+            transitions=[("p0", "p1", {"guard": "x >= 1", "assignment": "v = 1"}),
+                         ("p1", "p2", {"assignment": "v = 2"})]),
+        template_xml(
+            name="Q",
+            locations=[("q0", "Idle", None, None), ("q1", "Done", None, None)],
+            transitions=[("q0", "q1", {"guard": "v == 1", "assignment": "w = 1"})])],
+    system="system P, Q;")
+
+# A process which enters the urgent location "U" at time 1, and leaves it to "E" (setting "v" to 3) without delay
+urgent_model = model_xml(
+    declaration="int v;",
+    templates=[template_xml(
+        name="P", declaration="clock x;",
+        locations=[("p0", "A", "x <= 1", None), ("p1", "U", None, "urgent"), ("p2", "E", None, None)],
+        transitions=[("p0", "p1", {"guard": "x >= 1"}),
+                     ("p1", "p2", {"assignment": "v = 3"})])],
+    system="system P;")
+
+# A process which increments the counter "n" (modulo 10) exactly once per time unit
+counter_model = model_xml(
+    declaration="int[0,9] n;",
+    templates=[template_xml(
+        name="P", declaration="clock x;",
+        locations=[("p0", "A", "x <= 1", None)],
+        transitions=[("p0", "p0", {"guard": "x >= 1", "assignment": "n = (n + 1) % 10, x = 0"})])],
+    system="system P;")
+
+# A process which walks from "A" over "B" to "C" (setting "a" to 1, and incrementing "k" in a clock reset); the variable
+# "c" is never assigned
+validator_model = model_xml(
+    declaration="int[0,5] a; int c = 3; int k;",
+    templates=[template_xml(
+        name="T", declaration="clock x;",
+        locations=[("t0", "A", None, None), ("t1", "B", None, None), ("t2", "C", None, None)],
+        transitions=[("t0", "t1", {"assignment": "a = 1"}),
+                     ("t1", "t2", {"assignment": "x = k++"})])],
+    system="P = T();\nsystem P;")
@@ -0,0 +1,96 @@
+import pytest
+
+from uppyyl_observation_matcher.backend.native.monitor import ObservationMonitor
+from tests.matcher_test_models import load_preprocessed_model, observation, sync_model
+
+
+@pytest.fixture
+def monitor():
+    model, _ = load_preprocessed_model(sync_model)
+    return ObservationMonitor(config={"allowed_deviations": {}}, model=model)
+
+
+def test_feed_consistent_observations(monitor):
+    res = monitor.feed(observation(t=0, variables={"v": 0}))
+    assert res == {"is_consistent": True, "is_timeout": False, "index": 0, "states": 1}
+    res = monitor.feed(observation(t=2, variables={"v": 11}, locations={"S": "B", "R": "Done"}))
+    assert res["is_consistent"] is True
+    assert res["index"] == 1
+    assert monitor.fed_count == 2
+
+    states = monitor.get_states()
+    assert len(states) == res["states"]
+    assert all(state.vars == {"sys.v": 11} for state in states)
+
+
+def test_feed_violation_is_kept(monitor):
+    monitor.feed(observation(t=1, variables={"v": 0}))
+    res = monitor.feed(observation(t=2, variables={"v": 1}))
+    assert res["is_consistent"] is False
+    assert res["states"] == 0
+    assert monitor.violation_index == 1
+
+    # Further data points are not matched anymore, but still counted
+    res = monitor.feed(observation(t=3, variables={"v": 11}))
+    assert res["is_consistent"] is False
+    assert res["index"] == 2
+    assert monitor.violation_index == 1
+
+
+def test_feed_keeps_only_current_observation(monitor):
+    for t in range(10):
+        res = monitor.feed(observation(t=t, variables={"v": 0 if t < 2 else 11}))
+        assert res["is_consistent"] is True
+    assert monitor.matcher.obs_count == 10
+    assert len(monitor.matcher.obs_times) == 1
+    assert len(monitor.matcher.obs_checks) == 1
+
+
+def test_feed_rejected_data_point_is_not_counted(monitor):
+    monitor.feed(observation(t=2, variables={"v": 11}))
+    with pytest.raises(Exception):
+        monitor.feed(observation(t=1, variables={"v": 11}))
+    with pytest.raises(Exception):
+        monitor.feed(observation(t=3, variables={"v": None}))
+    assert monitor.fed_count == 1
+    assert monitor.last_time == 2
+
+    res = monitor.feed(observation(t=3, variables={"v": 11}))
+    assert res["is_consistent"] is True
+    assert res["index"] == 1
+
+
+def test_feed_all_stops_at_first_violation(monitor):
+    res = monitor.feed_all([observation(t=0, variables={"v": 0}), observation(t=1, variables={"v": 11}),
+                            observation(t=2, variables={"v": 11})])
+    assert res["is_consistent"] is False
+    assert res["index"] == 1
+    assert monitor.fed_count == 2
+
+
+def test_feed_all_consistent_sequence(monitor):
+    res = monitor.feed_all([observation(t=t, variables={"v": 0 if t < 2 else 11}) for t in range(5)])
+    assert res["is_consistent"] is True
+    assert res["index"] == 4
+
+
+def test_feed_all_empty_sequence(monitor):
+    assert monitor.feed_all([]) is None
+    assert monitor.fed_count == 0
+
+
+def test_reset(monitor):
+    monitor.feed_all([observation(t=1, variables={"v": 0}), observation(t=2, variables={"v": 1})])
+    assert monitor.violation_index == 1
+
+    monitor.reset()
+    assert monitor.fed_count == 0
+    assert monitor.last_time is None
+    assert monitor.violation_index is None
+    assert monitor.matcher.obs_count == 0
+    assert len(monitor.get_states()) == 1
+
+    # Earlier times are accepted again after the reset
+    res = monitor.feed(observation(t=0, variables={"v": 0}))
+    assert res["is_consistent"] is True
+    assert res["index"] == 0
@@ -0,0 +1,171 @@
+import os
+import shutil
+
+import pytest
+
+from uppyyl_observation_matcher.__main__ import set_output_paths
+from uppyyl_observation_matcher.backend.matching import ObservationMatcher
+from tests.matcher_test_models import load_preprocessed_model, observation, overflow_model, sync_model, \
+    broadcast_model, committed_model, urgent_model
+
+verifyta_path = os.environ.get("VERIFYTA_PATH") or shutil.which("verifyta")
+
+
+def native_match(xml, observation_data, return_trace=False, **config):
+    model, instance_data = load_preprocessed_model(xml)
+    matcher_config = {"allowed_deviations": {}, "support_location_matching": True}
+    matcher_config.update(config)
+    matcher = ObservationMatcher(config=matcher_config, model=model, instance_data=instance_data, backend="native")
+    return matcher.match(observation_data, return_trace=return_trace)
+
+
+@pytest.fixture(scope="module")
+def overflow():
+    return load_preprocessed_model(overflow_model)
+
+
+#########
+# Match #
+#########
+@pytest.mark.parametrize("observed_h, is_matching", [(2, True), (3, False), (5, False)])
+def test_out_of_range_update_has_no_successor(overflow, observed_h, is_matching):
+    model, instance_data = overflow
+    matcher = ObservationMatcher(config={"allowed_deviations": {}}, model=model, instance_data=instance_data,
+                                 backend="native")
+    res = matcher.match([observation(t=observed_h, variables={"h": observed_h})])
+    assert res["is_matching"] is is_matching
+
+
+@pytest.mark.parametrize("observation_data, is_matching", [
+    ([observation(t=0, variables={"v": 0}, locations={"S": "A", "R": "Idle"}),
+      observation(t=2, variables={"v": 11}, locations={"S": "B", "R": "Done"})], True),
+    ([observation(t=2, variables={"v": 0}, locations={"S": "A", "R": "Idle"})], True),
+    ([observation(t=1, variables={"v": 11})], False),
+    ([observation(t=2, variables={"v": 1})], False),
+    ([observation(t=3, variables={"v": 0})], False),
+    ([observation(t=2, variables={"v": 11}, locations={"S": "B", "R": "Idle"})], False),
+])
+def test_binary_synchronization(observation_data, is_matching):
+    res = native_match(sync_model, observation_data)
+    assert res["is_matching"] is is_matching
+    assert res["is_timeout"] is False
+
+
+@pytest.mark.parametrize("observation_data, is_matching", [
+    ([observation(t=1, variables={"v": 101}, locations={"S": "B", "R": "Idle", "Q": "Done"})], True),
+    ([observation(t=1, variables={"v": 1})], False),
+    ([observation(t=1, variables={"v": 111})], False),
+    ([observation(t=1, variables={"v": 101}, locations={"R": "Done"})], False),
+])
+def test_broadcast_receiver_with_false_guard_does_not_participate(observation_data, is_matching):
+    res = native_match(broadcast_model, observation_data)
+    assert res["is_matching"] is is_matching
+
+
+@pytest.mark.parametrize("observation_data, is_matching", [
+    ([observation(t=1, variables={"v": 2, "w": 0}, locations={"P": "D", "Q": "Idle"})], True),
+    ([observation(t=1, variables={"v": 1})], False),
+    ([observation(t=1, locations={"P": "C"})], False),
+    ([observation(t=1, variables={"w": 1})], False),
+])
+def test_committed_location_blocks_checks_and_other_processes(observation_data, is_matching):
+    res = native_match(committed_model, observation_data)
+    assert res["is_matching"] is is_matching
+
+
+@pytest.mark.parametrize("observation_data, is_matching", [
+    ([observation(t=1, variables={"v": 0}, locations={"P": "U"})], True),
+    ([observation(t=1, variables={"v": 3}, locations={"P": "E"})], True),
+    ([observation(t=2, variables={"v": 3}, locations={"P": "E"})], True),
+    ([observation(t=2, locations={"P": "U"})], False),
+    ([observation(t=1, variables={"v": 0}), observation(t=2, variables={"v": 0})], False),
+])
+def test_urgent_location_forbids_delay(observation_data, is_matching):
+    res = native_match(urgent_model, observation_data)
+    assert res["is_matching"] is is_matching
+
+
+@pytest.mark.parametrize("maximum_initial_delay, first_h, is_matching", [
+    (0, 0, True), (0, 1, False), (1, 1, True), (1, 2, False), (2, 2, True)
+])
+def test_shifted_matching(maximum_initial_delay, first_h, is_matching):
+    observation_data = [observation(t=0, variables={"h": first_h}), observation(t=1, variables={"h": first_h})]
+    res = native_match(overflow_model, observation_data, support_shifted_matching=True,
+                       maximum_initial_delay=maximum_initial_delay)
+    assert res["is_matching"] is is_matching
+
+
+def test_unshifted_matching_starts_at_time_zero():
+    observation_data = [observation(t=0, variables={"h": 1})]
+    assert native_match(overflow_model, observation_data)["is_matching"] is False
+    assert native_match(overflow_model, observation_data, support_shifted_matching=True,
+                        maximum_initial_delay=1)["is_matching"] is True
+
+
+def test_empty_observation_sequence_is_rejected():
+    model, instance_data = load_preprocessed_model(sync_model)
+    matcher = ObservationMatcher(config={"allowed_deviations": {}}, model=model, instance_data=instance_data,
+                                 backend="native")
+    with pytest.raises(Exception):
+        matcher.get_native_matcher().match([])
+
+
+#########
+# Trace #
+#########
+def test_matching_trace():
+    observation_data = [observation(t=0, variables={"v": 0}), observation(t=2, variables={"v": 11})]
+    res = native_match(sync_model, observation_data, return_trace=True)
+    trace = res["matching_trace"]
+
+    # The matcher actions (i.e., the observation checks) are merged into the states of the model actions
+    assert len(trace.transitions) == 1
+    transition = trace.transitions[0]
+    assert set(transition.triggered_edges.keys()) == {"S", "R"}
+    assert transition.source_state is trace.init_state
+
+    init_state, final_state = trace.get_states()
+    assert {proc_name: loc.name for proc_name, loc in init_state.locs.items()} == {"S": "A", "R": "Idle"}
+    assert {proc_name: loc.name for proc_name, loc in final_state.locs.items()} == {"S": "B", "R": "Done"}
+    assert init_state.vars == {"sys.v": 0}
+    assert final_state.vars == {"sys.v": 11}
+
+    # The matcher clock is removed from the zones
+    assert "Trace_Matcher.tt" not in final_state.dbm.clocks
+    clock = next(clock for clock in final_state.dbm.clocks if clock.endswith("x"))
+    init_interval = init_state.dbm.get_interval(clock)
+    final_interval = final_state.dbm.get_interval(clock)
+    assert (init_interval.lower_val, init_interval.upper_val) == (0, 2)
+    assert (final_interval.lower_val, final_interval.upper_val) == (2, 2)
+
+
+def test_no_trace_without_match():
+    res = native_match(sync_model, [observation(t=1, variables={"v": 11})], return_trace=True)
+    assert res["matching_trace"] is None
+
+
+###########################
+# Agreement with verifyta #
+###########################
+@pytest.mark.skipif(verifyta_path is None, reason="Uppaal verifyta is not available (set VERIFYTA_PATH).")
+@pytest.mark.parametrize("xml, observation_data", [
+    (sync_model, [observation(t=0, variables={"v": 0}), observation(t=2, variables={"v": 11})]),
+    (sync_model, [observation(t=2, variables={"v": 1})]),
+    (broadcast_model, [observation(t=1, variables={"v": 101})]),
+    (broadcast_model, [observation(t=1, variables={"v": 111})]),
+    (committed_model, [observation(t=1, variables={"v": 2, "w": 0})]),
+    (committed_model, [observation(t=1, variables={"v": 1})]),
+    (urgent_model, [observation(t=1, variables={"v": 3})]),
+    (urgent_model, [observation(t=1, variables={"v": 0}), observation(t=2, variables={"v": 0})]),
+])
+def test_native_and_verifyta_verdicts_agree(tmp_path, xml, observation_data):
+    config = {"verifyta_path": verifyta_path, "allowed_deviations": {}, "support_location_matching": False,
+              "support_committed_matching": False, "support_partial_matching": False,
+              "support_shifted_matching": False, "maximum_initial_delay": 0}
+    set_output_paths(config, tmp_path)
+    verdicts = {}
+    for backend in ["verifyta", "native"]:
+        model, instance_data = load_preprocessed_model(xml)
+        matcher = ObservationMatcher(config=dict(config), model=model, instance_data=instance_data, backend=backend)
+        verdicts[backend] = matcher.match(observation_data, prevalidate=False)["is_matching"]
+    assert verdicts["native"] == verdicts["verifyta"]
@@ -0,0 +1,102 @@
+import pytest
+
+from uppyyl_observation_matcher.backend.matching import ObservationMatcher
+from uppyyl_observation_matcher.backend.native.native_matcher import NativeMatcher
+from uppyyl_observation_matcher.backend.native.prescreen import split_into_windows, prescreen_observation, \
+    summarize_window_results
+from tests.matcher_test_models import load_preprocessed_model, observation, counter_model
+
+# The counter is incremented at times 1, ..., 8
+matching_observation_data = [observation(t=t, variables={"n": t}) for t in range(9)]
+
+# The counter cannot be incremented from 3 to 7 between the observations 3 and 4
+impossible_observation_data = [observation(t=t, variables={"n": 7 if t == 4 else t}) for t in range(9)]
+
+
+@pytest.fixture(scope="module")
+def counter():
+    return load_preprocessed_model(counter_model)
+
+
+@pytest.fixture
+def native_matcher(counter):
+    model, _ = counter
+    return NativeMatcher(config={"allowed_deviations": {}}, model=model)
+
+
+####################
+# Window Splitting #
+####################
+@pytest.mark.parametrize("observation_count", range(1, 13))
+@pytest.mark.parametrize("window_count", range(1, 7))
+@pytest.mark.parametrize("overlap", [0, 1, 2])
+def test_split_into_windows_covers_sequence_with_overlap(observation_count, window_count, overlap):
+    observation_data = list(range(observation_count))
+    windows = split_into_windows(observation_data, window_count=window_count, overlap=overlap)
+
+    assert 1 <= len(windows) <= min(window_count, observation_count)
+    assert windows[0][0] == 0
+    last_start, last_window = windows[-1]
+    assert last_start + len(last_window) == observation_count
+    for start, window_data in windows:
+        assert window_data == observation_data[start:start + len(window_data)]
+
+    # Consecutive windows share exactly the overlapping data points at their boundaries
+    for (start, window_data), (next_start, next_window_data) in zip(windows, windows[1:]):
+        assert next_start > start
+        assert start + len(window_data) - next_start == overlap
+        assert window_data[len(window_data) - overlap:] == next_window_data[:overlap]
+
+
+def test_split_into_windows_examples():
+    observation_data = list(range(9))
+    assert split_into_windows(observation_data, window_count=3) == [(0, [0, 1, 2, 3]), (3, [3, 4, 5, 6]),
+                                                                     (6, [6, 7, 8])]
+    assert split_into_windows(observation_data, window_count=3, overlap=0) == [(0, [0, 1, 2]), (3, [3, 4, 5]),
+                                                                               (6, [6, 7, 8])]
+    assert split_into_windows(observation_data, window_count=1) == [(0, observation_data)]
+    assert split_into_windows(observation_data[:2], window_count=5) == [(0, [0, 1])]
+
+
+##############
+# Pre-Screen #
+##############
+@pytest.mark.parametrize("window_count", range(1, len(matching_observation_data) + 1))
+def test_prescreen_never_rejects_matching_sequence(native_matcher, window_count):
+    res = prescreen_observation(native_matcher, matching_observation_data, window_count=window_count)
+    assert res["is_rejected"] is False
+    assert res["rejected_window"] is None
+
+
+def test_prescreen_rejects_impossible_middle_window(native_matcher):
+    res = prescreen_observation(native_matcher, impossible_observation_data, window_count=3)
+    assert res["is_rejected"] is True
+    assert res["rejected_window"] == 3
+    assert res["windows"] == [{"start": 0, "result": "consistent"}, {"start": 3, "result": "rejected"}]
+
+
+def test_prescreen_in_worker_processes(counter):
+    model, instance_data = counter
+    matcher = ObservationMatcher(config={"allowed_deviations": {}}, model=model, instance_data=instance_data,
+                                 backend="native")
+    res = matcher.prescreen(impossible_observation_data, window_count=3, workers=2)
+    assert res["is_rejected"] is True
+    assert res["rejected_window"] == 3
+    assert [window["result"] for window in res["windows"]] == ["consistent", "rejected", "consistent"]
+
+
+def test_match_with_prescreen(counter):
+    model, instance_data = counter
+    matcher = ObservationMatcher(config={"allowed_deviations": {}}, model=model, instance_data=instance_data,
+                                 backend="native")
+    res = matcher.match(impossible_observation_data, prescreen_windows=3, prevalidate=False)
+    assert res["is_matching"] is False
+    assert res["reason"] == "Window starting at observation 3 cannot be matched."
+    assert matcher.match(matching_observation_data, prescreen_windows=3, prevalidate=False)["is_matching"] is True
+
+
+def test_summarize_window_results():
+    res = summarize_window_results([(4, "rejected"), (0, "consistent"), (2, "rejected")])
+    assert res["is_rejected"] is True
+    assert res["rejected_window"] == 2
+    assert summarize_window_results([(0, "inconclusive")])["is_rejected"] is False
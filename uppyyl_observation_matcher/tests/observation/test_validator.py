@@ -0,0 +1,96 @@
+import pytest
+
+from uppaal_model.backend.parsers.uppaal_xml_model_parser import uppaal_xml_to_system
+from uppyyl_observation_matcher.backend.observation.validator import ObservationValidator
+from tests.matcher_test_models import load_preprocessed_model, observation, validator_model
+
+
+@pytest.fixture(scope="module")
+def validator():
+    model, _ = load_preprocessed_model(validator_model)
+    return ObservationValidator(config={"allowed_deviations": {}}, model=model)
+
+
+def test_valid_observation_passes(validator):
+    res = validator.validate([observation(t=0, variables={"a": 0, "c": 3, "k": 0}, locations={"P": "A"}),
+                              observation(t=1, variables={"a": 1, "k": 1}, locations={"P": "C"}),
+                              observation(t=1, variables={"a": 5, "k": -7})])
+    assert res == {"is_valid": True, "index": None, "reason": None, "processes": {}}
+
+
+def test_out_of_range_value_is_rejected(validator):
+    res = validator.validate([observation(t=0, variables={"a": 0}), observation(t=1, variables={"a": 6})])
+    assert res["is_valid"] is False
+    assert res["index"] == 1
+    assert res["reason"] == 'Observation 1: value 6 of "a" is outside of its declared range [0, 5].'
+
+
+def test_out_of_range_value_within_deviation_passes():
+    model, _ = load_preprocessed_model(validator_model)
+    validator = ObservationValidator(config={"allowed_deviations": {"a": 1}}, model=model)
+    assert validator.validate([observation(t=0, variables={"a": 6})])["is_valid"] is True
+    assert validator.validate([observation(t=0, variables={"a": 7})])["is_valid"] is False
+
+
+def test_unknown_location_is_rejected(validator):
+    res = validator.validate([observation(t=0, locations={"P": "Z"})])
+    assert res["is_valid"] is False
+    assert res["index"] == 0
+    assert res["reason"] == 'Observation 0: location "Z" does not exist in process "P".'
+
+
+@pytest.mark.parametrize("times, index, reason", [
+    ([0, 2, 1], 2, "Observation 2: time 1 precedes the previous time 2."),
+    ([-1], 0, "Observation 0: time -1 is negative."),
+])
+def test_non_monotonic_time_is_rejected(validator, times, index, reason):
+    res = validator.validate([observation(t=t) for t in times])
+    assert res["is_valid"] is False
+    assert res["index"] == index
+    assert res["reason"] == reason
+
+
+def test_change_of_never_assigned_variable_is_rejected(validator):
+    res = validator.validate([observation(t=0, variables={"c": 3}), observation(t=1, variables={"c": 4})])
+    assert res["is_valid"] is False
+    assert res["index"] == 1
+    assert res["reason"] == 'Observation 1: value 4 of "c" differs from its never-assigned value 3.'
+
+
+def test_variable_assigned_in_clock_reset_is_not_constant(validator):
+    assert "k" not in validator.var_constants
+    assert validator.var_constants == {"c": 3}
+
+
+def test_unobserved_values_are_not_checked(validator):
+    res = validator.validate([observation(t=0, variables={"a": None, "c": "NOB"}, locations={"P": None})])
+    assert res["is_valid"] is True
+
+
+##################
+# Location Walks #
+##################
+def test_processes_are_resolved_from_instantiations(validator):
+    assert set(validator.loc_names) == {"P"}
+    assert validator.loc_names["P"] == {"A", "B", "C"}
+
+    # Without preprocessing, the instance and template names are unrelated
+    model = uppaal_xml_to_system(validator_model.replace("P = T();\nsystem P;", "Proc = T();\nsystem Proc;"))
+    unprocessed_validator = ObservationValidator(config={"allowed_deviations": {}}, model=model)
+    assert set(unprocessed_validator.loc_names) == {"Proc"}
+
+
+def test_impossible_location_succession_is_rejected(validator):
+    res = validator.validate([observation(t=0, locations={"P": "B"}), observation(t=1, locations={"P": "C"}),
+                              observation(t=2, locations={"P": "A"})])
+    assert res["is_valid"] is False
+    assert res["index"] == 2
+    assert res["reason"] == 'Observation 2: location "A" of process "P" is not reachable from location "C".'
+    assert res["processes"] == {"P": {"index": 2, "reason": res["reason"][len("Observation 2: "):-1]}}
+
+
+def test_walk_through_unobserved_steps_is_accepted(validator):
+    res = validator.validate([observation(t=0, locations={"P": "A"}), observation(t=1, locations={"P": None}),
+                              observation(t=2, locations={"P": "C"}), observation(t=3, locations={"P": "C"})])
+    assert res["is_valid"] is True
+    assert validator.check_location_walks([observation(t=0, locations={"P": "C"})]) == {}
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from uppaal_model.backend.parsers.uppaal_xml_model_parser import uppaal_xml_to_system
+from uppyyl_observation_matcher.backend.clock_bounds import derive_clock_bounds, get_max_clock_bounds
+from tests.matcher_test_models import template_xml, model_xml
+
+inf = np.inf
+
+# The template T compares its clocks in invariants and guards, and the template D uses a difference constraint
+bounds_model = model_xml(
+    declaration="const int N = 3;\nclock x, z, u;",
+    templates=[
+        template_xml("T", [("id0", "A", "y <= 5", None), ("id1", "B", None, None), ("id2", "C", None, None)],
+                     [("id0", "id1", {"guard": "x > N && y >= 2"}),
+                      ("id1", "id2", {"guard": "!(w < 4) && x == 1", "assignment": "w = 7"}),
+                      ("id2", "id0", {"guard": "y < N + i"})],
+                     declaration="clock y, w;", parameters="const int[0,1] i"),
+        template_xml("D", [("id0", "A", "v <= 2", None), ("id1", "B", None, None)],
+                     [("id0", "id1", {"guard": "z - v <= 1"})],
+                     declaration="clock v;"),
+    ],
+    system="system T, D;")
+
+
+@pytest.fixture(scope="module")
+def clock_bounds():
+    return derive_clock_bounds(uppaal_xml_to_system(bounds_model))
+
+
+def test_guard_and_invariant_bounds(clock_bounds):
+    assert clock_bounds["lower"]["sys.x"] == 3
+    assert clock_bounds["upper"]["sys.x"] == 1
+    assert clock_bounds["lower"]["T_0.y"] == 2
+    assert clock_bounds["upper"]["T_0.y"] == 5
+    assert clock_bounds["upper"]["T_1.y"] == 5
+
+
+def test_parameters_are_bound_per_instance():
+    model = uppaal_xml_to_system(bounds_model.replace(">y &lt;= 5<", ">y &lt;= 2<"))
+    clock_bounds = derive_clock_bounds(model)
+    assert clock_bounds["upper"]["T_0.y"] == 3
+    assert clock_bounds["upper"]["T_1.y"] == 4
+
+
+def test_negations_and_resets_bound_both_directions(clock_bounds):
+    assert clock_bounds["lower"]["T_0.w"] == 7
+    assert clock_bounds["upper"]["T_0.w"] == 7
+
+
+def test_difference_constraint_disables_extrapolation(clock_bounds):
+    for kind in ["lower", "upper"]:
+        assert clock_bounds[kind]["sys.z"] == inf
+        assert clock_bounds[kind]["D.v"] == inf
+
+
+def test_uncompared_clock_has_no_bound(clock_bounds):
+    assert clock_bounds["lower"]["sys.u"] == -inf
+    assert clock_bounds["upper"]["sys.u"] == -inf
+
+
+def test_bounds_of_dbm_clocks(clock_bounds):
+    model = uppaal_xml_to_system(bounds_model)
+    dbm_clock_bounds = derive_clock_bounds(model, clocks=["sys.x", "T(1).y", "T(0).w", "sys.unknown"])
+    assert dbm_clock_bounds["lower"] == {"sys.x": 3, "T(1).y": 2, "T(0).w": 7, "sys.unknown": inf}
+    assert dbm_clock_bounds["upper"] == {"sys.x": 1, "T(1).y": 5, "T(0).w": 7, "sys.unknown": inf}
+
+
+def test_max_clock_bounds(clock_bounds):
+    max_bounds = get_max_clock_bounds(clock_bounds)
+    assert max_bounds["sys.x"] == 3
+    assert max_bounds["T_0.y"] == 5
+    assert max_bounds["sys.u"] == -inf
+
+
+def test_parameters_shadow_global_constants_in_template_constants():
+    template = template_xml("T", [("id0", "A", "y <= M", None)], [("id0", "id0", {"guard": "x >= N * 2"})],
+                            declaration="clock y;\nconst int M = N + 1;", parameters="const int[0,1] N")
+    model = uppaal_xml_to_system(model_xml(declaration="const int N = 3;\nclock x;", templates=[template],
+                                           system="system T;"))
+    clock_bounds = derive_clock_bounds(model)
+    assert clock_bounds["upper"]["T_0.y"] == 1
+    assert clock_bounds["upper"]["T_1.y"] == 2
+    assert clock_bounds["lower"]["sys.x"] == 2
@@ -0,0 +1,133 @@
+import pytest
+
+from uppaal_model.backend.parsers.uppaal_xml_model_parser import uppaal_xml_to_system
+from uppyyl_observation_matcher.backend import helper
+from uppyyl_observation_matcher.backend.instance_resolver import resolve_instance_data, clear_instance_data_cache, \
+    model_instance_hash, UnsupportedInstanceConstruct, _instance_data_cache
+from tests.matcher_test_models import template_xml, model_xml
+
+declaration = "const int N = 3;\ntypedef int[0,N-1] id_t;"
+
+
+def load_model(parameters, system):
+    template = template_xml("P", [("id0", "A", None, None)], [], parameters=parameters)
+    return uppaal_xml_to_system(model_xml(declaration, [template], system))
+
+
+def integer(val):
+    return {"astType": "Integer", "val": val}
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_instance_data_cache()
+    yield
+    clear_instance_data_cache()
+
+
+###############
+# Resolutions #
+###############
+def test_explicit_instantiations():
+    model = load_model("int i, int j", "A = P(1, N);\nB = P(2, 0);\nsystem A, B;")
+    instance_data = resolve_instance_data(model)
+    assert list(instance_data) == ["A", "B"]
+    assert instance_data["A"]["template_name"] == "P"
+    assert instance_data["A"]["args"][0] == integer(1)
+    assert instance_data["A"]["args"][1]["astType"] == "Variable"
+    assert instance_data["B"] == {"template_name": "P", "args": [integer(2), integer(0)]}
+
+
+def test_explicit_instantiation_without_parameters():
+    model = load_model("", "Proc = P();\nsystem Proc;")
+    assert resolve_instance_data(model) == {"Proc": {"template_name": "P", "args": []}}
+
+
+def test_partial_instantiation():
+    model = load_model("int i, int j", "Q(const id_t k) = P(k, 5);\nsystem Q;")
+    assert resolve_instance_data(model) == {
+        f'Q_{k}': {"template_name": "P", "args": [integer(k), integer(5)]} for k in range(3)}
+
+
+@pytest.mark.parametrize("parameters", ["int[0,2] i", "const id_t i", "int[0,N-1] i"])
+def test_implicit_instantiation_over_bounded_int_parameter(parameters):
+    model = load_model(parameters, "system P;")
+    instance_data = resolve_instance_data(model)
+    assert list(instance_data) == ["P_0", "P_1", "P_2"]
+    assert all(instance_data[f'P_{k}'] == {"template_name": "P", "args": [integer(k)]} for k in range(3))
+
+
+@pytest.mark.parametrize("parameters, system", [
+    ("int i", "system P;"),
+    ("id_t &i", "system P;"),
+    ("id_t i, id_t j", "system P;"),
+    ("int i", "Q(int k) = P(k);\nsystem Q;"),
+    ("", "system R;"),
+])
+def test_unsupported_construct_is_raised(parameters, system):
+    model = load_model(parameters, system)
+    with pytest.raises(UnsupportedInstanceConstruct):
+        resolve_instance_data(model)
+
+
+def test_get_instance_data_falls_back_to_verifyta(monkeypatch):
+    calls = []
+
+    def get_instance_data_from_verifyta(model, config):
+        calls.append((model, config))
+        return {"P": {"template_name": "P", "args": []}}
+
+    monkeypatch.setattr(helper, "get_instance_data_from_verifyta", get_instance_data_from_verifyta)
+    model = load_model("int i", "system P;")
+    assert helper.get_instance_data(model=model, config={}) == {"P": {"template_name": "P", "args": []}}
+    assert calls == [(model, {})]
+
+    calls.clear()
+    helper.get_instance_data(model=load_model("int[0,2] i", "system P;"), config={})
+    assert calls == []
+
+
+###########
+# Caching #
+###########
+def test_cache_hit_returns_equal_copy():
+    model = load_model("int[0,2] i", "system P;")
+    instance_data = resolve_instance_data(model)
+    assert list(_instance_data_cache) == [model_instance_hash(model)]
+
+    # Changes of the returned data do not leak into the cache
+    instance_data["P_0"]["args"].clear()
+    assert resolve_instance_data(model)["P_0"]["args"] == [integer(0)]
+    assert len(_instance_data_cache) == 1
+
+
+def test_equal_models_share_cache_entry():
+    model = load_model("int[0,2] i", "system P;")
+    other_model = load_model("int[0,2] i", "system P;")
+    assert model_instance_hash(model) == model_instance_hash(other_model)
+    resolve_instance_data(model)
+    resolve_instance_data(other_model)
+    assert len(_instance_data_cache) == 1
+
+
+@pytest.mark.parametrize("parameters, system", [
+    ("int[0,3] i", "system P;"),
+    ("int[0,2] j", "system P;"),
+    ("int[0,2] i", "Q(const id_t k) = P(k);\nsystem Q;"),
+])
+def test_cache_miss_on_instance_relevant_change(parameters, system):
+    model = load_model("int[0,2] i", "system P;")
+    changed_model = load_model(parameters, system)
+    assert model_instance_hash(model) != model_instance_hash(changed_model)
+    resolve_instance_data(model)
+    resolve_instance_data(changed_model)
+    assert len(_instance_data_cache) == 2
+
+
+def test_clear_instance_data_cache():
+    model = load_model("int[0,2] i", "system P;")
+    resolve_instance_data(model)
+    assert _instance_data_cache
+    clear_instance_data_cache()
+    assert not _instance_data_cache
+    assert list(resolve_instance_data(model)) == ["P_0", "P_1", "P_2"]
@@ -0,0 +1,103 @@
+import math
+
+import pytest
+
+from uppyyl_observation_matcher.backend.matching import ObservationMatcher, bisect_matching_prefix
+from tests.matcher_test_models import load_preprocessed_model, observation, counter_model
+
+
+class StubProbe:
+    """A probe which matches all prefixes up to a given length, and records the probed lengths per round."""
+
+    def __init__(self, matching_length, timeout_lengths=()):
+        self.matching_length = matching_length
+        self.timeout_lengths = set(timeout_lengths)
+        self.rounds = []
+
+    def __call__(self, lengths):
+        self.rounds.append(lengths)
+        return [{"is_matching": length <= self.matching_length and length not in self.timeout_lengths,
+                 "is_timeout": length in self.timeout_lengths} for length in lengths]
+
+
+####################
+# Prefix Bisection #
+####################
+def test_bisection_bookkeeping():
+    probe = StubProbe(matching_length=3)
+    assert bisect_matching_prefix(lower=0, upper=11, workers=1, probe=probe) == (3, 4, 4, False)
+    assert probe.rounds == [[5], [2], [3], [4]]
+
+    probe = StubProbe(matching_length=3)
+    assert bisect_matching_prefix(lower=0, upper=11, workers=3, probe=probe) == (3, 2, 5, False)
+    assert probe.rounds == [[2, 5, 8], [3, 4]]
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3, 5])
+@pytest.mark.parametrize("observation_count", [0, 1, 2, 7, 20])
+def test_bisection_finds_longest_matching_prefix(workers, observation_count):
+    for matching_length in range(observation_count + 1):
+        probe = StubProbe(matching_length=matching_length)
+        length, rounds, probes, is_timeout = bisect_matching_prefix(
+            lower=0, upper=observation_count + 1, workers=workers, probe=probe)
+        assert length == matching_length
+        assert rounds == len(probe.rounds)
+        assert probes == sum(map(len, probe.rounds))
+        assert rounds <= math.ceil(math.log(observation_count + 1, workers + 1) - 1e-9)
+        assert is_timeout is False
+
+        # Each round only probes lengths strictly within the remaining interval
+        lower, upper = 0, observation_count + 1
+        for lengths in probe.rounds:
+            assert 1 <= len(lengths) <= workers
+            assert all(lower < length < upper for length in lengths)
+            lower = max([lower] + [length for length in lengths if length <= matching_length])
+            upper = min([upper] + [length for length in lengths if length > matching_length])
+
+
+def test_bisection_within_known_interval():
+    probe = StubProbe(matching_length=6)
+    assert bisect_matching_prefix(lower=4, upper=8, workers=1, probe=probe) == (6, 2, 2, False)
+    assert probe.rounds == [[6], [7]]
+    assert bisect_matching_prefix(lower=4, upper=5, workers=1, probe=probe) == (4, 0, 0, False)
+
+
+def test_bisection_counts_timeouts_as_non_matching():
+    probe = StubProbe(matching_length=8, timeout_lengths=[5])
+    length, _, _, is_timeout = bisect_matching_prefix(lower=0, upper=11, workers=1, probe=probe)
+    assert length == 4
+    assert is_timeout is True
+
+
+###########################
+# Longest Matching Prefix #
+###########################
+@pytest.fixture
+def verifyta_matcher(tmp_path):
+    model, instance_data = load_preprocessed_model(counter_model)
+    config = {"verifyta_path": tmp_path.joinpath("verifyta"), "output_dir_path": tmp_path,
+              "allowed_deviations": {}, "support_location_matching": False, "support_committed_matching": False,
+              "support_partial_matching": False, "support_shifted_matching": False, "maximum_initial_delay": 0}
+    return ObservationMatcher(config=config, model=model, instance_data=instance_data)
+
+
+def test_statically_rejected_prefix_needs_no_probes(verifyta_matcher):
+    observation_data = [observation(t=t, variables={"n": 50 if t == 0 else t}) for t in range(5)]
+    res = verifyta_matcher.find_longest_matching_prefix(observation_data, workers=2)
+    assert res == {"length": 0, "is_matching": False, "diverging_index": 0, "rounds": 0, "probes": 0,
+                   "is_timeout": False}
+
+
+def test_shortest_rejected_prefix_length(verifyta_matcher):
+    matching_data = [observation(t=t, variables={"n": t}) for t in range(9)]
+    assert verifyta_matcher._shortest_rejected_prefix_length(matching_data) is None
+
+    # The validation rejects the out-of-range value at index 2
+    invalid_data = [observation(t=t, variables={"n": 50 if t == 2 else t}) for t in range(9)]
+    assert verifyta_matcher._shortest_rejected_prefix_length(invalid_data) == 3
+
+    # The pre-screen rejects the window [3, 6] (containing the impossible value at index 4)
+    impossible_data = [observation(t=t, variables={"n": 7 if t == 4 else t}) for t in range(9)]
+    assert verifyta_matcher._shortest_rejected_prefix_length(impossible_data) is None
+    verifyta_matcher.config["prescreen_windows"] = 3
+    assert verifyta_matcher._shortest_rejected_prefix_length(impossible_data) == 7
@@ -0,0 +1,45 @@
+import pytest
+
+from uppaal_model.backend.helper import set_unique_id_seed
+from uppaal_model.backend.parsers.uppaal_xml_model_parser import uppaal_system_to_xml
+from uppyyl_observation_matcher.backend.transformer.model.concrete.preprocessed_model_transformer import \
+    PreprocessedModelTransformer
+from uppyyl_observation_matcher.benchmark.synthetic_models import generate_instance_model
+
+
+def expand_instance_model(jobs, instance_count=6):
+    set_unique_id_seed(0)
+    model, instance_data = generate_instance_model(instance_count=instance_count, local_var_count=3, edge_count=4,
+                                                   clock_count=2)
+    transformer = PreprocessedModelTransformer(jobs=jobs)
+    transformer.set_instance_data(instance_data)
+    transformer.finalize(model=model)
+    set_unique_id_seed()
+    return model
+
+
+def printed_templates(model):
+    return [(tmpl.name, tmpl.declaration.text, sorted(str(edge) for edge in tmpl.edges.values()))
+            for tmpl in model.templates.values()]
+
+
+@pytest.fixture(scope="module")
+def sequential_model():
+    return expand_instance_model(jobs=1)
+
+
+@pytest.mark.parametrize("jobs", [2, 4])
+def test_parallel_expansion_equals_sequential_expansion(sequential_model, jobs):
+    parallel_model = expand_instance_model(jobs=jobs)
+
+    assert parallel_model.declaration.text == sequential_model.declaration.text
+    assert parallel_model.system_declaration.text == sequential_model.system_declaration.text
+    assert printed_templates(parallel_model) == printed_templates(sequential_model)
+    assert uppaal_system_to_xml(parallel_model) == uppaal_system_to_xml(sequential_model)
+
+
+def test_sequential_expansion_instantiates_all_instances(sequential_model):
+    assert [tmpl.name for tmpl in sequential_model.templates.values()] == [f'P_{i}_Tmpl' for i in range(6)]
+    assert all(not tmpl.parameters and not tmpl.declaration.text.strip()
+               for tmpl in sequential_model.templates.values())
+    assert "const id_t P_5_Tmpl_pid = 5;" in sequential_model.declaration.text
@@ -1,16 +1,42 @@
-"""The main entry point of the Uppaal trace matcher module."""
+"""The main entry point of the Uppaal trace matcher module.
+
+The model is loaded, preprocessed and prepared for matching once per invocation. Afterwards, all given observations
+(CSV files, directories of CSV files, glob patterns, or a single literal trace) are matched, optionally in several
+worker processes, and one JSON line per observation is written to stdout. All log output is written to stderr.
+
+Usage:
+    python -m uppyyl_observation_matcher --verifyta /path/to/verifyta -m model.xml --csv 'observations/*.csv' \
+        -o out --perform-match --jobs 4
+"""
 
 import argparse
 import ast
+import contextlib
+import glob
+import json
+import os
 import pathlib
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 import uppyyl_observation_matcher.config as conf
-from uppyyl_observation_matcher.backend.helper import parse_config_value
+from uppyyl_observation_matcher.backend.helper import parse_config_value, load_model_from_file, get_instance_data, \
+    load_observation_data_from_csv, observation_data_from_rows
+from uppyyl_observation_matcher.backend.logger.instrumentation import Instrumentation, enable_instrumentation, span
+from uppyyl_observation_matcher.backend.logger.logger import configure_logging
+from uppyyl_observation_matcher.backend.matching import ObservationMatcher
+from uppyyl_observation_matcher.backend.transformer.model.concrete.preprocessed_model_transformer import \
+    PreprocessedModelTransformer
 
 
-def parse_arguments():
+def parse_arguments(argv=None):
     """Parses the main input arguments.
 
+    Args:
+        argv: The command line arguments (default: sys.argv[1:]).
+
     Returns:
         The parsed input arguments.
     """
@@ -21,8 +47,10 @@ def parse_arguments():
     parser.add_argument('-m', '--model', dest="original_model_file_path", type=pathlib.Path)
 
     group = parser.add_mutually_exclusive_group()
-    group.add_argument('--csv', dest="csv_data_file_path", type=pathlib.Path)
-    group.add_argument('--trace', type=ast.literal_eval)
+    group.add_argument('--csv', dest="csv_data_file_path", nargs='+',
+                       help="The observation CSV files, directories containing CSV files, or glob patterns.")
+    group.add_argument('--trace', type=ast.literal_eval,
+                       help="A single observation as list of rows (with column names given via --header).")
 
     parser.add_argument('--header', type=ast.literal_eval)
 
@@ -31,16 +59,39 @@ def parse_arguments():
     parser.add_argument('--config')
 
     parser.add_argument('--perform-match', action='store_true')
+    parser.add_argument('--backend', choices=["verifyta", "native"],
+                        help="The matching backend (default: verifyta, or the \"backend\" config entry).")
+    parser.add_argument('--prescreen-windows', type=int,
+                        help="Pre-screen each observation by matching the given number of overlapping windows from "
+                             "relaxed initial states, and only match observations completely which are not rejected.")
+    parser.add_argument('--no-prevalidate', action='store_true',
+                        help="Disable the static validation which rejects impossible observations (e.g., with values "
+                             "outside of the declared variable ranges) without matching run.")
     parser.add_argument('--check-locations', action='store_true')
     parser.add_argument('--check-committed', action='store_true')
     parser.add_argument('--allow-partial-observations', action='store_true')
     parser.add_argument('--allowed-delay', type=int)
     parser.add_argument('--allowed-deviation', type=ast.literal_eval)
 
-    args = vars(parser.parse_args())
-    print(args)
+    parser.add_argument('--profile', nargs='?', const=True, type=pathlib.Path,
+                        help="Write cProfile profiles of all runs (to the given directory, or to the \"profiles\" "
+                             "subdirectory of the output directory).")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="The number of worker processes used for matching the observations.")
 
-    return args
+    args = parser.parse_args(argv)
+    if args.original_model_file_path is None:
+        parser.error("a model (-m/--model) is required")
+    if args.perform_match and args.verifyta_path is None and args.backend != "native":
+        parser.error("the verifyta path (--verifyta) is required for matching")
+    if not args.perform_match and args.output_dir_path is None:
+        parser.error("an output directory (-o/--outdir) for the matcher models is required without --perform-match")
+    if args.trace is not None and args.header is None:
+        parser.error("the column names (--header) are required for a literal trace")
+    if args.jobs < 1:
+        parser.error("the number of jobs (--jobs) must be positive")
+
+    return vars(args)
 
 
 def compose_config(args):
@@ -53,21 +104,209 @@ def compose_config(args):
         The composed config dict.
     """
     config = {}  # copy.deepcopy(args)
-    for key, val in conf.config["config"].items():
-        config[key] = parse_config_value(val)
+    if conf.config.has_section("config"):
+        for key, val in conf.config["config"].items():
+            config[key] = parse_config_value(val)
     config.update((k, v) for k, v in args.items() if (v not in [None, False]))
+
+    # Translate the command line options to the matcher configuration
+    config.setdefault("support_location_matching", args["check_locations"])
+    config.setdefault("support_committed_matching", args["check_committed"])
+    config.setdefault("support_partial_matching", args["allow_partial_observations"])
+    config.setdefault("support_shifted_matching", args["allowed_delay"] is not None)
+    config.setdefault("maximum_initial_delay", args["allowed_delay"] or 0)
+    config.setdefault("allowed_deviations", args["allowed_deviation"] or {})
+    config.setdefault("prevalidate", not args["no_prevalidate"])
     return config
 
 
-def main():
-    """The main function."""
-    args = parse_arguments()
+def set_output_paths(config, output_dir_path):
+    """Sets the output directory and the paths of all intermediate model and trace files in a config.
+
+    Args:
+        config: The config dict.
+        output_dir_path: The output directory path.
+    """
+    output_dir_path = pathlib.Path(output_dir_path)
+    config["output_dir_path"] = output_dir_path
+    config["matcher_model_file_path"] = output_dir_path.joinpath("matcher_model.xml")
+    config["matcher_model_trace_file_path"] = output_dir_path.joinpath("matcher_model_trace_1.xml")
+    config["details_model_file_path"] = output_dir_path.joinpath("details_model.xml")
+    config["details_model_trace_file_path"] = output_dir_path.joinpath("details_model_trace_1.xml")
+
+
+def collect_observation_sources(args):
+    """Collects all observation sources given as input arguments.
+
+    Args:
+        args: The input arguments object.
+
+    Returns:
+        The list of (index, name, CSV file path or None, literal rows or None) tuples.
+    """
+    if args["trace"] is not None:
+        return [(0, "trace", None, args["trace"])]
+
+    sources = []
+    for pattern in args["csv_data_file_path"] or []:
+        path = pathlib.Path(pattern)
+        if path.is_dir():
+            paths = sorted(path.glob("*.csv"))
+        elif glob.has_magic(pattern):
+            paths = sorted(map(pathlib.Path, glob.glob(pattern, recursive=True)))
+        else:
+            paths = [path]
+        for csv_path in paths:
+            sources.append((len(sources), str(csv_path), csv_path, None))
+    return sources
+
+
+###########
+# Workers #
+###########
+_matcher = None
+_args = None
+
+
+def init_worker(matcher, args, worker_output_dirs=True):
+    """Initializes a (worker) process with the prepared matcher.
+
+    Args:
+        matcher: The observation matcher with a prepared matcher model.
+        args: The input arguments object.
+        worker_output_dirs: Choose whether each worker process writes its models and traces to a separate
+                            subdirectory of the output directory.
+    """
+    global _matcher, _args
+    configure_logging(stream=sys.stderr)
+    sys.stdout = sys.stderr
+    _matcher = matcher
+    _args = args
+    if worker_output_dirs:
+        # The config dict is shared with the matcher model transformer, and therefore adapted in place
+        set_output_paths(config=matcher.config,
+                         output_dir_path=matcher.config["output_dir_path"].joinpath(f'worker_{os.getpid()}'))
+        matcher.config["output_dir_path"].mkdir(parents=True, exist_ok=True)
+
+
+def match_observation(source):
+    """Matches a single observation with the prepared matcher of the process.
+
+    Args:
+        source: The (index, name, CSV file path or None, literal rows or None) tuple of the observation.
+
+    Returns:
+        The result dict.
+    """
+    index, name, csv_data_file_path, rows = source
+    instrumentation = enable_instrumentation(Instrumentation(record_spans=False))
+    start_time = time.perf_counter()
+    res = {"observation": name}
+    try:
+        with span("observation_load"):
+            if csv_data_file_path is not None:
+                observation_data = load_observation_data_from_csv(
+                    csv_data_file_path=csv_data_file_path, instance_data=_matcher.instance_data)
+            else:
+                observation_data = observation_data_from_rows(
+                    header=_args["header"], rows=rows, instance_data=_matcher.instance_data)
+        res["observations"] = len(observation_data)
+
+        if _args["perform_match"]:
+            match_res = _matcher.match(observation_data=observation_data, use_prepared=True)
+            res["is_matching"] = match_res["is_matching"]
+            res["is_timeout"] = match_res["is_timeout"]
+            if "reason" in match_res:
+                res["reason"] = match_res["reason"]
+        else:
+            # Only create the matcher model (one file per observation)
+            config = _matcher.config
+            default_model_file_path = config["matcher_model_file_path"]
+            config["matcher_model_file_path"] = default_model_file_path.with_name(f'matcher_model_{index}.xml')
+            try:
+                _matcher.set_observation_data(observation_data=observation_data)
+                _matcher.create_matcher_model(use_prepared=True)
+                res["matcher_model_file_path"] = str(config["matcher_model_file_path"])
+            finally:
+                config["matcher_model_file_path"] = default_model_file_path
+    except Exception as e:
+        res["error"] = f'{type(e).__name__}: {e}'
+
+    res["phases_s"] = {span_name: span_summary["total_s"]
+                       for span_name, span_summary in instrumentation.summary().items()}
+    res["total_s"] = time.perf_counter() - start_time
+    return res
+
+
+########
+# Main #
+########
+def prepare_matcher(config):
+    """Loads and preprocesses the model, and prepares the matcher model.
+
+    Args:
+        config: The config dict.
+
+    Returns:
+        The observation matcher with a prepared matcher model.
+    """
+    model = load_model_from_file(model_path=config["original_model_file_path"])
+    instance_data = get_instance_data(model=model, config=config)
+    preprocessor = PreprocessedModelTransformer()
+    preprocessor.set_instance_data(instance_data)
+    preprocessor.transform(model=model)
+
+    matcher = ObservationMatcher(config=config, model=model, instance_data=instance_data)
+    if matcher.backend == "native" and config.get("perform_match"):
+        matcher.get_native_matcher()
+    else:
+        matcher.prepare_matcher_model()
+    return matcher
+
+
+def main(argv=None):
+    """The main function.
+
+    Args:
+        argv: The command line arguments (default: sys.argv[1:]).
+
+    Returns:
+        The exit code (1 if any observation could not be processed, 0 otherwise).
+    """
+    args = parse_arguments(argv)
     if args["config"]:
         conf.config.read(args["config"])
     conf.inject_config_to_dependencies()
 
-    _config = compose_config(args)
+    result_stream = sys.stdout
+    configure_logging(stream=sys.stderr)
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(contextlib.redirect_stdout(sys.stderr))
+        config = compose_config(args)
+        if "output_dir_path" not in config:
+            config["output_dir_path"] = stack.enter_context(tempfile.TemporaryDirectory(prefix="uppyyl_matcher_"))
+        set_output_paths(config=config, output_dir_path=config["output_dir_path"])
+        config["output_dir_path"].mkdir(parents=True, exist_ok=True)
+
+        matcher = prepare_matcher(config=config)
+        sources = collect_observation_sources(args)
+
+        has_errors = False
+        if args["jobs"] == 1 or len(sources) <= 1:
+            init_worker(matcher=matcher, args=args, worker_output_dirs=False)
+            results = map(match_observation, sources)
+        else:
+            executor = stack.enter_context(ProcessPoolExecutor(
+                max_workers=args["jobs"], initializer=init_worker, initargs=(matcher, args)))
+            results = executor.map(match_observation, sources)
+
+        for res in results:
+            has_errors = has_errors or "error" in res
+            result_stream.write(json.dumps(res, default=str) + "\n")
+            result_stream.flush()
+
+    return 1 if has_errors else 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""A static analysis of the clock bounds of a model (i.e., the maximal constants to which clocks are compared).
+
+The derived lower and upper bounds (see "derive_clock_bounds") are the parameters of the extrapolation of DBMs (see
+"DBM.extrapolate_lu_bounds" and "DBM.extrapolate_max_bounds"). A lower bound L(x) is the maximal constant c of all
+constraints "x > c" and "x >= c", and an upper bound U(x) is the maximal constant c of all constraints "x < c" and
+"x <= c" in the invariants and guards of the model. Constraints "x == c" and "x != c", constraints below a negation, and
+clock resets "x = c" contribute to both bounds. A clock which is never compared has bounds of -inf.
+
+If a clock occurs in a construct which cannot be analyzed statically (e.g., a difference constraint "x - y <= c", a
+non-constant bound, or a function call), both of its bounds are set to inf, i.e., the clock is never extrapolated.
+"""
+
+import re
+
+import numpy as np
+
+from uppyyl_observation_matcher.backend.instance_resolver import resolve_instance_data, ConstantEvaluator, \
+    UnsupportedInstanceConstruct
+
+_upper_bound_ops = {"LessThan", "LessEqual"}
+_lower_bound_ops = {"GreaterThan", "GreaterEqual"}
+_comparison_ops = _upper_bound_ops | _lower_bound_ops | {"Equal", "NotEqual"}
+_switched_ops = {"LessThan": "GreaterThan", "LessEqual": "GreaterEqual", "GreaterThan": "LessThan",
+                 "GreaterEqual": "LessEqual", "Equal": "Equal", "NotEqual": "NotEqual"}
+
+# The constructs below which the direction of a clock constraint is preserved
+_monotone_ast_types = {"Guard", "Guards", "Invariant", "BracketExpr"}
+_monotone_ops = {"LogAnd", "LogOr"}
+
+
+def derive_clock_bounds(model, instance_data=None, clocks=None):
+    """Derives the lower and upper bounds of all clocks from the invariants, guards and resets of a model.
+
+    Args:
+        model: The model.
+        instance_data: The template and argument data of all instances (default: the statically resolved instances).
+        clocks: The DBM clock names (e.g., "sys.x", "P(0).y[1]") to which the bounds are assigned (default: the clock
+                ids "sys.<clock>" of all global clocks, and "<instance>.<clock>" of all local clocks).
+
+    Returns:
+        The dict of lower bounds ("lower") and upper bounds ("upper"), each mapping clock names to bounds.
+    """
+    if instance_data is None:
+        instance_data = resolve_instance_data(model)
+
+    global_clocks = {clock: f'sys.{clock}' for clock in model.declaration.clocks}
+    lower_bounds = {clock_id: -np.inf for clock_id in global_clocks.values()}
+    upper_bounds = lower_bounds.copy()
+    bounds = {"lower": lower_bounds, "upper": upper_bounds}
+
+    for inst_name, inst_data in instance_data.items():
+        tmpl = model.get_template_by_name(inst_data["template_name"])
+        constants = ConstantEvaluator(decls=model.declaration.ast["decls"] + model.system_declaration.ast["decls"],
+                                      params=[param.ast for param in tmpl.parameters], args=inst_data["args"])
+        constants.add_declarations(decls=tmpl.declaration.ast["decls"])
+
+        clock_scope = dict(global_clocks)
+        for clock in tmpl.declaration.clocks:
+            clock_scope[clock] = f'{inst_name}.{clock}'
+            lower_bounds[clock_scope[clock]] = -np.inf
+            upper_bounds[clock_scope[clock]] = -np.inf
+
+        for param, arg in zip(tmpl.parameters, inst_data["args"]):
+            param_ast = param.ast
+            param_name = param_ast["varData"]["varName"]
+            clock_scope.pop(param_name, None)
+            type_id = param_ast["type"]["typeId"]
+            if type_id["astType"] == "CustomType" and type_id["type"] == "clock":
+                if arg["astType"] == "Variable" and arg["name"] in global_clocks:
+                    clock_scope[param_name] = global_clocks[arg["name"]]
+                else:
+                    # The referenced clock is unknown, so that no global clock can be extrapolated
+                    clock_scope[param_name] = None
+
+        analyzer = _ClockBoundAnalyzer(clock_scope=clock_scope, constants=constants, bounds=bounds)
+        for loc in tmpl.locations.values():
+            for inv in loc.invariants:
+                analyzer.analyze(inv.ast)
+        for edge in tmpl.edges.values():
+            for grd in edge.clock_guards + edge.variable_guards:
+                analyzer.analyze(grd.ast)
+            for rst in edge.resets:
+                analyzer.analyze(rst.ast)
+
+    if clocks is not None:
+        bounds = {kind: {clock: _get_clock_bound(kind_bounds, clock) for clock in clocks}
+                  for kind, kind_bounds in bounds.items()}
+    return bounds
+
+
+def get_max_clock_bounds(clock_bounds):
+    """Merges lower and upper clock bounds into maximal bounds (i.e., the maximal constant of each clock).
+
+    Args:
+        clock_bounds: The dict of lower bounds ("lower") and upper bounds ("upper").
+
+    Returns:
+        The dict mapping clock names to maximal bounds.
+    """
+    return {clock: max(lower, clock_bounds["upper"][clock]) for clock, lower in clock_bounds["lower"].items()}
+
+
+def _get_clock_bound(bounds, clock):
+    """Gets the bound of a DBM clock (e.g., "P(0).y[1]" is assigned the bound of clock array "P_0.y").
+
+    Args:
+        bounds: The dict mapping clock ids to bounds.
+        clock: The DBM clock name.
+
+    Returns:
+        The bound (or inf if the clock is unknown).
+    """
+    clock_id = re.sub(r'\((\d+)\)', r'_\1', re.sub(r'\[[^\]]*\]$', '', clock))
+    return bounds.get(clock_id, np.inf)
+
+
+class _ClockBoundAnalyzer:
+    """An analyzer collecting the clock bounds of invariant, guard and update ASTs."""
+
+    def __init__(self, clock_scope, constants, bounds):
+        """Initializes _ClockBoundAnalyzer.
+
+        Args:
+            clock_scope: The dict mapping clock names in scope to clock ids (or None if the clock id is unknown).
+            constants: The constant evaluator of the scope.
+            bounds: The dict of lower bounds ("lower") and upper bounds ("upper"), which is updated in place.
+        """
+        self.clock_scope = clock_scope
+        self.constants = constants
+        self.lower_bounds = bounds["lower"]
+        self.upper_bounds = bounds["upper"]
+
+    def analyze(self, ast, is_monotone=True):
+        """Collects the clock bounds of an AST.
+
+        Args:
+            ast: The AST.
+            is_monotone: A flag indicating whether the direction of constraints is preserved (i.e., not negated).
+        """
+        if isinstance(ast, list):
+            for elem in ast:
+                self.analyze(elem, is_monotone=is_monotone)
+            return
+        if not isinstance(ast, dict):
+            return
+
+        ast_type = ast.get("astType")
+        op = ast.get("op")
+        if ast_type == "BinaryExpr" and op in _comparison_ops:
+            self._analyze_comparison(ast, is_monotone=is_monotone)
+            return
+        if ast_type == "AssignExpr" and op == "Assign" and self._clock_id(ast["left"]) is not False:
+            self._add_bound(self._clock_id(ast["left"]), ast["right"], ["lower", "upper"])
+            return
+        if ast_type in {"Variable", "BinaryExpr"} and self._clock_id(ast) is not False:
+            # A clock used in any other construct (e.g., an arithmetic expression or a function call)
+            self._set_unknown(self._clock_id(ast))
+            return
+
+        is_monotone = is_monotone and (ast_type in _monotone_ast_types or op in _monotone_ops)
+        for val in ast.values():
+            if isinstance(val, (dict, list)):
+                self.analyze(val, is_monotone=is_monotone)
+
+    def _analyze_comparison(self, ast, is_monotone):
+        """Collects the clock bounds of a comparison (e.g., "x <= 5" or "N > x").
+
+        Args:
+            ast: The comparison AST.
+            is_monotone: A flag indicating whether the direction of the constraint is preserved.
+        """
+        op = ast["op"]
+        clock_id, bound_ast = self._clock_id(ast["left"]), ast["right"]
+        if clock_id is False:
+            clock_id, bound_ast = self._clock_id(ast["right"]), ast["left"]
+            op = _switched_ops[op]
+        if clock_id is False:
+            # No single clock is compared, so that all nested clocks (e.g., in "x - y <= 2") are analyzed separately
+            for val in (ast["left"], ast["right"]):
+                self.analyze(val, is_monotone=False)
+            return
+
+        if not is_monotone or op in {"Equal", "NotEqual"}:
+            kinds = ["lower", "upper"]
+        elif op in _upper_bound_ops:
+            kinds = ["upper"]
+        else:
+            kinds = ["lower"]
+        self._add_bound(clock_id, bound_ast, kinds)
+
+    def _add_bound(self, clock_id, bound_ast, kinds):
+        """Adds the bound of a clock constraint (or clock reset).
+
+        Args:
+            clock_id: The clock id (or None if unknown).
+            bound_ast: The AST of the constant bound.
+            kinds: The bound kinds ("lower" and/or "upper").
+        """
+        try:
+            val = self.constants.evaluate(bound_ast)
+        except UnsupportedInstanceConstruct:
+            self._set_unknown(clock_id)
+            self.analyze(bound_ast, is_monotone=False)
+            return
+        if clock_id is None:
+            self._set_unknown(clock_id)
+            return
+        for kind in kinds:
+            bounds = self.lower_bounds if kind == "lower" else self.upper_bounds
+            bounds[clock_id] = max(bounds.get(clock_id, -np.inf), val)
+
+    def _set_unknown(self, clock_id):
+        """Sets the bounds of a clock to inf (i.e., the clock is never extrapolated).
+
+        Args:
+            clock_id: The clock id (or None if unknown, in which case all global clocks are affected).
+        """
+        for bounds in (self.lower_bounds, self.upper_bounds):
+            for other_clock_id in bounds:
+                if other_clock_id == clock_id or (clock_id is None and other_clock_id.startswith("sys.")):
+                    bounds[other_clock_id] = np.inf
+
+    def _clock_id(self, ast):
+        """Gets the clock id if an AST is a clock reference (i.e., a clock variable or a clock array element).
+
+        Args:
+            ast: The AST.
+
+        Returns:
+            The clock id (None if the referenced clock is unknown), or False if the AST is no clock reference.
+        """
+        if ast["astType"] == "BracketExpr":
+            return self._clock_id(ast["expr"])
+        if ast["astType"] == "BinaryExpr" and ast["op"] == "ArrayAccess":
+            return self._clock_id(ast["left"])
+        if ast["astType"] == "Variable" and ast["name"] in self.clock_scope:
+            return self.clock_scope[ast["name"]]
+        return False
@@ -0,0 +1,255 @@
+"""A columnar (i.e., array-based) representation of a trace of the Uppaal system.
+
+Instead of state objects with location dicts, variable dicts and DBMs of DBMEntry objects, all states of a trace are
+stored in three arrays:
+    - locations: an int matrix (states x processes) of location ordinals (i.e., indices in "Template.locations"),
+    - variables: an int matrix (states x variables) of variable values,
+    - dbms: an int array (states x clocks x clocks) of encoded DBM bounds (as in "DBM.key", i.e., 2c+1 for "(c, <=)",
+      2c for "(c, <)", and +-KEY_INF for infinite bounds).
+The triggered edges of the transitions are stored as an int matrix (transitions x processes) of edge ordinals (i.e.,
+indices in "Template.edges"). Row 0 holds the initial state, row i the target state of transition i-1, and the
+remaining rows hold the intermediate states of transitions (see "intermediate").
+
+Columnar traces can be saved to and loaded from compressed ".npz" files, and converted back to trace objects given the
+system whose templates hold the locations and edges.
+"""
+
+import numpy as np
+
+from uppyyl_observation_matcher.backend.data.dbm import DBM, DBMEntry, KEY_INF
+from uppyyl_observation_matcher.backend.data.state import State
+from uppyyl_observation_matcher.backend.data.trace import Trace
+from uppyyl_observation_matcher.backend.data.transition import Transition
+
+# The ordinal of a process without location (or triggered edge), and the value of a missing variable
+NO_ORDINAL = -1
+NO_VALUE = np.iinfo(np.int64).min
+
+
+def encode_dbm(dbm):
+    """Encodes the bounds of a DBM as int matrix.
+
+    Args:
+        dbm: The DBM.
+
+    Returns:
+        The encoded bound matrix (as nested lists).
+    """
+    rows = []
+    for row in dbm.matrix:
+        raw_row = []
+        for entry in row:
+            val = entry.val
+            if val == np.inf:
+                raw_row.append(KEY_INF)
+            elif val == -np.inf:
+                raw_row.append(-KEY_INF)
+            else:
+                raw_row.append(2 * int(val) + (entry.rel == '<='))
+        rows.append(raw_row)
+    return rows
+
+
+def decode_dbm(raw_matrix, clocks):
+    """Decodes an encoded bound matrix into a DBM.
+
+    Args:
+        raw_matrix: The encoded bound matrix.
+        clocks: The clock names (including the reference clock).
+
+    Returns:
+        The DBM.
+    """
+    dbm = DBM(clocks=clocks, add_ref_clock=False)
+    matrix = []
+    for raw_row in raw_matrix.tolist():
+        row = []
+        for raw in raw_row:
+            if raw == KEY_INF:
+                row.append(DBMEntry(np.inf, '<'))
+            elif raw == -KEY_INF:
+                row.append(DBMEntry(-np.inf, '<'))
+            else:
+                row.append(DBMEntry(raw >> 1, '<=' if raw & 1 else '<'))
+        matrix.append(row)
+    dbm.matrix = matrix
+    return dbm
+
+
+class ColumnarTrace:
+    """A columnar trace of the Uppaal system."""
+
+    def __init__(self, process_names, template_names, var_names, clocks, locations, variables, dbms, edges,
+                 intermediate=None, intermediate_names=None):
+        """Initializes ColumnarTrace.
+
+        Args:
+            process_names: The process names (i.e., the columns of "locations" and "edges").
+            template_names: The template names of the processes.
+            var_names: The variable names (i.e., the columns of "variables").
+            clocks: The clock names of the DBMs (including the reference clock).
+            locations: The location ordinal matrix (states x processes).
+            variables: The variable value matrix (states x variables).
+            dbms: The encoded DBM bound array (states x clocks x clocks).
+            edges: The triggered edge ordinal matrix (transitions x processes).
+            intermediate: The matrix of intermediate states, with one (transition index, name ordinal, state row) row
+                          per intermediate state.
+            intermediate_names: The names of the intermediate states (e.g., "delay_state").
+        """
+        self.process_names = list(process_names)
+        self.template_names = list(template_names)
+        self.var_names = list(var_names)
+        self.clocks = list(clocks)
+        self.locations = locations
+        self.variables = variables
+        self.dbms = dbms
+        self.edges = edges
+        self.intermediate = intermediate if intermediate is not None else np.zeros((0, 3), dtype=np.int64)
+        self.intermediate_names = list(intermediate_names or [])
+
+    @property
+    def transition_count(self):
+        """The number of transitions of the trace."""
+        return len(self.edges)
+
+    @property
+    def nbytes(self):
+        """The number of bytes of all arrays of the trace."""
+        return self.locations.nbytes + self.variables.nbytes + self.dbms.nbytes + self.edges.nbytes + \
+            self.intermediate.nbytes
+
+    ##############
+    # Conversion #
+    ##############
+    @staticmethod
+    def from_trace(trace):
+        """Converts a trace into a columnar trace.
+
+        Args:
+            trace: The trace.
+
+        Returns:
+            The columnar trace.
+        """
+        states = [trace.init_state] + [tr.target_state for tr in trace.transitions]
+        intermediate_names = []
+        intermediate = []
+        for tr_idx, transition in enumerate(trace.transitions):
+            for name, state in transition.intermediate_states.items():
+                if name not in intermediate_names:
+                    intermediate_names.append(name)
+                intermediate.append((tr_idx, intermediate_names.index(name), len(states)))
+                states.append(state)
+
+        process_names = []
+        template_names = []
+        var_names = []
+        loc_ordinals = {}
+        for state in states:
+            for proc_name, loc in state.locs.items():
+                if proc_name not in process_names:
+                    process_names.append(proc_name)
+                    template_names.append(loc.parent.name)
+                if loc.parent.name not in loc_ordinals:
+                    loc_ordinals[loc.parent.name] = {id(tmpl_loc): i for i, tmpl_loc
+                                                     in enumerate(loc.parent.locations.values())}
+            for var_name in state.vars:
+                if var_name not in var_names:
+                    var_names.append(var_name)
+
+        clocks = trace.init_state.dbm.clocks
+        locations = np.full((len(states), len(process_names)), NO_ORDINAL, dtype=np.int32)
+        variables = np.full((len(states), len(var_names)), NO_VALUE, dtype=np.int64)
+        dbms = np.empty((len(states), len(clocks), len(clocks)), dtype=np.int64)
+        proc_indices = {proc_name: i for i, proc_name in enumerate(process_names)}
+        var_indices = {var_name: i for i, var_name in enumerate(var_names)}
+        for state_idx, state in enumerate(states):
+            for proc_name, loc in state.locs.items():
+                locations[state_idx, proc_indices[proc_name]] = loc_ordinals[loc.parent.name][id(loc)]
+            for var_name, val in state.vars.items():
+                variables[state_idx, var_indices[var_name]] = int(val)
+            if state.dbm.clocks != clocks:
+                raise Exception(f'State {state_idx} has a DBM over other clocks ({state.dbm.clocks}) than the initial '
+                                f'state ({clocks}).')
+            dbms[state_idx] = encode_dbm(state.dbm)
+
+        edge_ordinals = {}
+        edges = np.full((len(trace.transitions), len(process_names)), NO_ORDINAL, dtype=np.int32)
+        for tr_idx, transition in enumerate(trace.transitions):
+            for proc_name, edge in transition.triggered_edges.items():
+                if edge.parent.name not in edge_ordinals:
+                    edge_ordinals[edge.parent.name] = {id(tmpl_edge): i for i, tmpl_edge
+                                                       in enumerate(edge.parent.edges.values())}
+                edges[tr_idx, proc_indices[proc_name]] = edge_ordinals[edge.parent.name][id(edge)]
+
+        return ColumnarTrace(
+            process_names=process_names, template_names=template_names, var_names=var_names, clocks=clocks,
+            locations=locations, variables=variables, dbms=dbms, edges=edges,
+            intermediate=np.array(intermediate, dtype=np.int64).reshape((-1, 3)),
+            intermediate_names=intermediate_names)
+
+    def to_trace(self, system):
+        """Converts the columnar trace into a trace (whose locations and edges are those of a given system).
+
+        Args:
+            system: The system (i.e., the model) holding the templates of the processes.
+
+        Returns:
+            The trace.
+        """
+        templates = [system.get_template_by_name(tmpl_name) for tmpl_name in self.template_names]
+        tmpl_locations = [list(tmpl.locations.values()) for tmpl in templates]
+        tmpl_edges = [list(tmpl.edges.values()) for tmpl in templates]
+
+        states = []
+        for loc_row, var_row, raw_dbm in zip(self.locations.tolist(), self.variables.tolist(), self.dbms):
+            locs = {proc_name: tmpl_locations[proc_idx][loc_ordinal]
+                    for proc_idx, (proc_name, loc_ordinal) in enumerate(zip(self.process_names, loc_row))
+                    if loc_ordinal != NO_ORDINAL}
+            variables = {var_name: val for var_name, val in zip(self.var_names, var_row) if val != NO_VALUE}
+            states.append(State(locs=locs, dbm=decode_dbm(raw_dbm, clocks=self.clocks), variables=variables))
+
+        transitions = []
+        for tr_idx, edge_row in enumerate(self.edges.tolist()):
+            triggered_edges = {proc_name: tmpl_edges[proc_idx][edge_ordinal]
+                               for proc_idx, (proc_name, edge_ordinal) in enumerate(zip(self.process_names, edge_row))
+                               if edge_ordinal != NO_ORDINAL}
+            transitions.append(Transition(source_state=states[tr_idx], target_state=states[tr_idx + 1],
+                                          triggered_edges=triggered_edges))
+        for tr_idx, name_idx, state_row in self.intermediate.tolist():
+            transitions[tr_idx].intermediate_states[self.intermediate_names[name_idx]] = states[state_row]
+
+        return Trace(init_state=states[0], transitions=transitions)
+
+    ###############
+    # Persistence #
+    ###############
+    def save(self, file_path):
+        """Saves the columnar trace to a compressed ".npz" file.
+
+        Args:
+            file_path: The file path.
+        """
+        np.savez_compressed(
+            file_path, process_names=np.array(self.process_names, dtype=str),
+            template_names=np.array(self.template_names, dtype=str), var_names=np.array(self.var_names, dtype=str),
+            clocks=np.array(self.clocks, dtype=str), locations=self.locations, variables=self.variables,
+            dbms=self.dbms, edges=self.edges, intermediate=self.intermediate,
+            intermediate_names=np.array(self.intermediate_names, dtype=str))
+
+    @staticmethod
+    def load(file_path):
+        """Loads a columnar trace from a ".npz" file.
+
+        Args:
+            file_path: The file path.
+
+        Returns:
+            The columnar trace.
+        """
+        with np.load(file_path, allow_pickle=False) as data:
+            return ColumnarTrace(
+                process_names=data["process_names"].tolist(), template_names=data["template_names"].tolist(),
+                var_names=data["var_names"].tolist(), clocks=data["clocks"].tolist(), locations=data["locations"],
+                variables=data["variables"], dbms=data["dbms"], edges=data["edges"],
+                intermediate=data["intermediate"], intermediate_names=data["intermediate_names"].tolist())
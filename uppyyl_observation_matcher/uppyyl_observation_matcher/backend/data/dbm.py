@@ -1,10 +1,14 @@
 """A difference bound matrix (DBM) implementation."""
 
+import array
 import random
 import re
 
 import numpy as np
 
+# The encoding of an infinite bound in DBM keys (exceeds all encoded finite bounds)
+KEY_INF = 2 ** 62
+
 
 ##########
 # Helper #
@@ -55,6 +59,8 @@ def switch_relation(rel):
 class DBMEntry:
     """A DBM entry."""
 
+    __slots__ = ("val", "rel")
+
     def __init__(self, val, rel):
         """Initializes DBMEntry.
 
@@ -114,6 +120,8 @@ class DBMEntry:
 class DBMConstraint:
     """A DBM constraint of the form "clock - clock2 (<|<=|>=|>) val"."""
 
+    __slots__ = ("clock1", "clock2", "rel", "val")
+
     constr_pattern = re.compile(r"([\w.()\[\]]*)? *(?:[+-]* *([\w.()\[\]]*)? *)?(<=|>=|==|<|>) *([\w-]*)")
 
     def __init__(self, constr_text=None):
@@ -130,6 +138,30 @@ class DBMConstraint:
         if constr_text:
             self.parse(constr_text)
 
+    @staticmethod
+    def from_parts(clock1, clock2, rel, val):
+        """Creates a DBMConstraint from its parts (without parsing a constraint text).
+
+        Args:
+            clock1: The name of the first clock.
+            clock2: The name of the second clock (or None for the reference clock "T0_REF").
+            rel: The relation string (i.e., "<", "<=", ">=", or ">").
+            val: The constraint value.
+
+        Returns:
+            The DBMConstraint instance (with the relation "<" or "<=", as if parsed from text).
+        """
+        constraint = DBMConstraint()
+        constraint.clock1 = clock1
+        constraint.clock2 = "T0_REF" if clock2 is None else clock2
+        constraint.rel = rel
+        constraint.val = val
+
+        if constraint.rel == ">" or constraint.rel == ">=":
+            constraint.invert()
+
+        return constraint
+
     def parse(self, constr_text):
         """Parses the constraint text and extracts clock names, relation, and value.
 
@@ -191,6 +223,8 @@ class DBMConstraint:
 class Interval:
     """A value interval."""
 
+    __slots__ = ("lower_val", "lower_incl", "upper_val", "upper_incl")
+
     def __init__(self, lower_incl, lower_val, upper_val, upper_incl):
         """Initializes Interval.
 
@@ -309,6 +343,7 @@ class DBM:
         if add_ref_clock:
             self.clocks.insert(0, "T0_REF")
         self.matrix = None
+        self._clock_indices = None
         self.init_matrix(zero_init=zero_init)
 
     def init_matrix(self, zero_init=False):
@@ -325,6 +360,22 @@ class DBM:
             for i in range(clock_num):
                 self.matrix[i][i] = DBMEntry(0, '<=')
 
+    def clock_index(self, clock):
+        """Provides the index of a given clock (via a name-to-index map which is built once per clock list).
+
+        Args:
+            clock: The clock name.
+
+        Returns:
+            The clock index.
+        """
+        if self._clock_indices is None:
+            self._clock_indices = {clock_name: i for i, clock_name in enumerate(self.clocks)}
+        try:
+            return self._clock_indices[clock]
+        except KeyError:
+            raise ValueError(f'Clock "{clock}" is not contained in the DBM.') from None
+
     def get_interval(self, clock):
         """Provides the value interval for a given clock.
 
@@ -334,7 +385,7 @@ class DBM:
         Returns:
             The value interval.
         """
-        clock_index = self.clocks.index(clock)
+        clock_index = self.clock_index(clock)
 
         lower = self.matrix[0][clock_index]
         upper = self.matrix[clock_index][0]
@@ -356,13 +407,9 @@ class DBM:
             clocks: The target list of clocks.
         """
         # Get mapping between old and new clock indices
-        index_mapping = []
-        for old_index, clock in enumerate(self.clocks):
-            try:
-                new_index = clocks.index(clock)
-                index_mapping.append((old_index, new_index))
-            except ValueError:
-                pass
+        new_indices = {clock: i for i, clock in enumerate(clocks)}
+        index_mapping = [(old_index, new_indices[clock]) for old_index, clock in enumerate(self.clocks)
+                         if clock in new_indices]
 
         # Initialize new inf-matrix and set entries which were already contained in the original matrix
         new_clock_count = len(clocks)
@@ -374,6 +421,7 @@ class DBM:
         # Replace original clock list and DBM entry matrix
         self.clocks = clocks
         self.matrix = new_matrix
+        self._clock_indices = None
 
     def transpose(self):
         """Transposes the DBM (i.e., swaps rows and columns (DBM^T))
@@ -509,14 +557,30 @@ class DBM:
         Returns:
             The constrained DBM.
         """
-        clock_1_index = self.clocks.index(constraint.clock1)
-        clock_2_index = self.clocks.index(constraint.clock2)
+        clock_1_index = self.clock_index(constraint.clock1)
+        clock_2_index = self.clock_index(constraint.clock2)
         new_entry = DBMEntry(constraint.val, constraint.rel)
         curr_entry = self.matrix[clock_1_index][clock_2_index]
         if new_entry < curr_entry:
             self.matrix[clock_1_index][clock_2_index] = new_entry
         return self
 
+    def conjugate_all(self, constraints, close=True):
+        """Conjugates the DBM with a batch of constraints, and transforms it into closed form only once afterwards.
+
+        Args:
+            constraints: The constraints that should be applied to the DBM.
+            close: Choose whether the constrained DBM is transformed into closed form.
+
+        Returns:
+            The constrained DBM.
+        """
+        for constraint in constraints:
+            self.conjugate(constraint)
+        if close:
+            self.close()
+        return self
+
     def reset(self, clock, val=0):
         """Resets a given clock of the DBM, adapting the differences to the remaining clocks.
 
@@ -527,13 +591,84 @@ class DBM:
         Returns:
             The DBM after reset.
         """
-        clock_index = self.clocks.index(clock)
+        clock_index = self.clock_index(clock)
         for i in range(0, len(self.matrix)):
             self.matrix[i][clock_index] = DBMEntry(-val, '<=') + self.matrix[i][0]
         for j in range(0, len(self.matrix[0])):
             self.matrix[clock_index][j] = DBMEntry(val, '<=') + self.matrix[0][j]
         return self
 
+    def extrapolate_max_bounds(self, max_bounds, close=True):
+        """Extrapolates the DBM based on the maximal constant of each clock (Extra_M).
+
+        All bounds above the maximal constant of a clock are removed, and all lower bounds above the maximal constant
+        are relaxed to it (i.e., "x > M(x)"). The extrapolated DBM includes the original DBM, and the number of
+        distinct extrapolated DBMs is finite.
+
+        Args:
+            max_bounds: A dict mapping clock names to maximal constants (a missing clock is never extrapolated, and a
+                        clock with bound -inf is never compared).
+            close: Choose whether the extrapolated DBM is transformed into closed form.
+
+        Returns:
+            The extrapolated DBM.
+        """
+        return self.extrapolate_lu_bounds(lower_bounds=max_bounds, upper_bounds=max_bounds, close=close)
+
+    def extrapolate_lu_bounds(self, lower_bounds, upper_bounds, close=True):
+        """Extrapolates the DBM based on the maximal lower bound and upper bound constants of each clock (Extra_LU).
+
+        An entry "x_i - x_j (<|<=) c" is removed if c > L(x_i), and relaxed to "x_i - x_j < -U(x_j)" if -c > U(x_j).
+        The DBM should be in closed form before extrapolation.
+
+        Args:
+            lower_bounds: A dict mapping clock names to the maximal constants c of lower bound constraints "x (>|>=) c"
+                          (a missing clock is never extrapolated, and a clock with bound -inf is never compared).
+            upper_bounds: A dict mapping clock names to the maximal constants c of upper bound constraints "x (<|<=) c"
+                          (a missing clock is never extrapolated, and a clock with bound -inf is never compared).
+            close: Choose whether the extrapolated DBM is transformed into closed form.
+
+        Returns:
+            The extrapolated DBM.
+        """
+        # The reference clock (at index 0) has bounds 0
+        lower = [0] + [lower_bounds.get(clock, np.inf) for clock in self.clocks[1:]]
+        upper = [0] + [upper_bounds.get(clock, np.inf) for clock in self.clocks[1:]]
+        for i, row in enumerate(self.matrix):
+            for j, entry in enumerate(row):
+                if i == j:
+                    continue
+                if entry.val > lower[i]:
+                    if entry.val != np.inf:
+                        row[j] = DBMEntry(np.inf, '<')
+                elif entry.val < -upper[j]:
+                    # Clocks are never negative, even if never compared (i.e., with upper bound -inf)
+                    row[j] = DBMEntry(0, '<=') if i == 0 and upper[j] == -np.inf else DBMEntry(-upper[j], '<')
+        if close:
+            self.close()
+        return self
+
+    def key(self):
+        """Encodes the DBM as canonical, immutable bytes (e.g., as key for hashing, deduplication or interning).
+
+        Each entry "(c, <=)" is encoded as 2c+1, and each entry "(c, <)" as 2c (as in Uppaal). As different matrices
+        may represent the same zone, the DBM should be in closed form to obtain a canonical key.
+
+        Returns:
+            The DBM key.
+        """
+        raw_entries = array.array('q')
+        for row in self.matrix:
+            for entry in row:
+                val = entry.val
+                if val == np.inf:
+                    raw_entries.append(KEY_INF)
+                elif val == -np.inf:
+                    raw_entries.append(-KEY_INF)
+                else:
+                    raw_entries.append(2 * int(val) + (entry.rel == '<='))
+        return "\0".join(self.clocks).encode() + b'\0\0' + raw_entries.tobytes()
+
     def copy_matrix(self):
         """Copies the value matrix of the DBM.
 
@@ -556,6 +691,7 @@ class DBM:
         """
         copy_obj = DBM(clocks=self.clocks, add_ref_clock=False)
         copy_obj.matrix = self.copy_matrix()
+        copy_obj._clock_indices = self._clock_indices
         return copy_obj
 
     def __repr__(self):
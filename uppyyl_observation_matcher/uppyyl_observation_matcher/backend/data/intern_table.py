@@ -0,0 +1,56 @@
+"""An interning table for DBMs and states."""
+
+
+class InternTable:
+    """An interning table, which maps equal objects (i.e., objects with equal keys) to a single shared instance.
+
+    Objects are identified by the bytes returned by their "key" method (see "DBM.key" and "State.key"). As interned
+    objects are shared, they must not be modified afterwards (i.e., copy an interned object before modifying it).
+    """
+
+    def __init__(self):
+        """Initializes InternTable."""
+        self.objects = {}
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, obj):
+        """Gets the shared instance of an object (which is the object itself if no equal object was interned before).
+
+        Args:
+            obj: The object (e.g., a closed DBM or a state).
+
+        Returns:
+            The shared instance.
+        """
+        key = obj.key()
+        shared_obj = self.objects.get(key)
+        if shared_obj is None:
+            self.objects[key] = obj
+            self.misses += 1
+            return obj
+        self.hits += 1
+        return shared_obj
+
+    def contains(self, obj):
+        """Checks if an equal object was already interned.
+
+        Args:
+            obj: The object.
+
+        Returns:
+            The boolean containment result.
+        """
+        return obj.key() in self.objects
+
+    def clear(self):
+        """Removes all interned objects."""
+        self.objects.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __str__(self):
+        return f'InternTable(objects={len(self.objects)}, hits={self.hits}, misses={self.misses})'
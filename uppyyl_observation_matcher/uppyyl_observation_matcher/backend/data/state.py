@@ -1,9 +1,14 @@
 """A state of the Uppaal system."""
 
+import array
+import struct
+
 
 class State:
     """A state of the Uppaal system."""
 
+    __slots__ = ("locs", "dbm", "vars")
+
     def __init__(self, locs, dbm, variables):
         """Initializes State.
 
@@ -31,7 +36,8 @@ class State:
                     f'Location of process "{proc_id}" does not match. '
                     f'({self.locs[proc_id].name}, {state.locs[proc_id].name})')
                 return False
-        if not self.dbm.includes(other=state.dbm):
+        # Interned DBMs (see "InternTable") are shared, so that the inclusion check can be skipped for equal zones
+        if self.dbm is not state.dbm and not self.dbm.includes(other=state.dbm):
             print(f'DBM not included:')
             print(self.dbm)
             print(state.dbm)
@@ -42,6 +48,21 @@ class State:
                 return False
         return True
 
+    def key(self):
+        """Encodes the state as canonical, immutable bytes (e.g., as key for hashing, deduplication or interning).
+
+        The key consists of the location vector (i.e., the location ids), the variable vector, and the DBM key (see
+        "DBM.key"). The DBM should be in closed form to obtain a canonical key.
+
+        Returns:
+            The state key.
+        """
+        loc_key = "\0".join(f'{proc_id}\0{loc.id}' for proc_id, loc in sorted(self.locs.items())).encode()
+        var_names = sorted(self.vars.keys())
+        var_key = "\0".join(var_names).encode() + array.array('q', [self.vars[var] for var in var_names]).tobytes()
+        dbm_key = self.dbm.key()
+        return struct.pack('<QQ', len(loc_key), len(var_key)) + loc_key + var_key + dbm_key
+
     def copy(self):
         """Copies the state.
 
@@ -6,6 +6,8 @@ from uppyyl_observation_matcher.backend.data.transition import Transition
 class Trace:
     """A trace of the Uppaal system."""
 
+    __slots__ = ("init_state", "transitions")
+
     def __init__(self, init_state, transitions):
         """Initializes Trace.
 
@@ -33,6 +35,35 @@ class Trace:
             states.append(transition.target_state)
         return states
 
+    def intern_dbms(self, intern_table):
+        """Replaces the DBMs of all states by the shared instances of an interning table (e.g., to share identical zones
+           across traces).
+
+        Args:
+            intern_table: The interning table.
+
+        Returns:
+            The trace.
+        """
+        for state in self.get_states():
+            state.dbm = intern_table.intern(state.dbm)
+        return self
+
+    def get_unique_states(self, include_intermediate_states=True):
+        """Gets the list of distinct states of the trace (i.e., states with equal keys are only included once).
+
+        Args:
+            include_intermediate_states: A flag indicating whether intermediate states should be included in the list
+                                         of states.
+
+        Returns:
+            The list of distinct states (in order of first occurrence).
+        """
+        unique_states = {}
+        for state in self.get_states(include_intermediate_states=include_intermediate_states):
+            unique_states.setdefault(state.key(), state)
+        return list(unique_states.values())
+
     def includes(self, trace):
         """Checks if another symbolic trace is included in this trace.
 
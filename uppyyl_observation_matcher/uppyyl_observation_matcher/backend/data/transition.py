@@ -4,6 +4,8 @@
 class Transition:
     """A transition of the Uppaal system."""
 
+    __slots__ = ("source_state", "target_state", "intermediate_states", "triggered_edges")
+
     def __init__(self, source_state, target_state, triggered_edges):
         """Initializes Transition.
 
@@ -5,13 +5,14 @@ import csv
 import ast
 import pathlib
 
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
-from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
-from uppaal_model.backend.parsers.uppaal_xml_model_parser import uppaal_xml_to_system, uppaal_system_to_xml
+from uppyyl_observation_matcher.backend.instance_resolver import resolve_instance_data, UnsupportedInstanceConstruct
+from uppyyl_observation_matcher.backend.logger.instrumentation import span
 from uppyyl_observation_matcher.backend.logger.logger import matcher_log
-from uppyyl_observation_matcher.backend.trace.parser import trace_xml_to_dict, trace_dict_to_trace
 from uppyyl_observation_matcher.backend.interface.verifyta import VerifyTAInterface
 
+# Note: The Uppaal C parser, the XML model parser (lxml) and the trace parser (numpy, lxml) are imported on first use,
+# as importing them takes a significant part of the startup time of the CLI and of worker processes.
+
 
 def parse_config_value(string):
     """Parses a configuration value.
@@ -86,6 +87,8 @@ def load_model_from_file(model_path):
     Args:
         model_path: The model path.
     """
+    from uppaal_model.backend.parsers.uppaal_xml_model_parser import uppaal_xml_to_system
+
     matcher_log.debug(f'Loading model: {model_path}')
     with open(model_path) as file:
         system_xml_str = file.read()
@@ -100,10 +103,13 @@ def save_model_to_file(model, model_path):
         model: The given model.
         model_path: The model path.
     """
+    from uppaal_model.backend.parsers.uppaal_xml_model_parser import uppaal_system_to_xml
+
     matcher_log.debug(f'Saving model: {model_path}')
-    model_xml_str = uppaal_system_to_xml(model)
-    with open(model_path, "w") as file:
-        file.write(model_xml_str)
+    with span("xml_write"):
+        model_xml_str = uppaal_system_to_xml(model)
+        with open(model_path, "w") as file:
+            file.write(model_xml_str)
 
 
 def load_trace_from_file(trace_file_path, system):
@@ -116,14 +122,34 @@ def load_trace_from_file(trace_file_path, system):
     Returns:
         The loaded trace.
     """
-    with open(trace_file_path, 'r') as file:
-        trace_xml_str = file.read()
-    trace_dict = trace_xml_to_dict(trace_xml_str=trace_xml_str)
-    trace = trace_dict_to_trace(trace_dict=trace_dict, system=system)
+    from uppyyl_observation_matcher.backend.trace.parser import trace_xml_to_dict, trace_dict_to_trace
+
+    with span("trace_parse"):
+        with open(trace_file_path, 'r') as file:
+            trace_xml_str = file.read()
+        trace_dict = trace_xml_to_dict(trace_xml_str=trace_xml_str)
+        trace = trace_dict_to_trace(trace_dict=trace_dict, system=system)
     return trace
 
 
 def get_instance_data(model, config):
+    """Extract the instance data of a model, either statically or (for unsupported constructs) via verifyta.
+
+    Args:
+        model: The model for which instance data should be extracted.
+        config: The configuration file containing path information.
+
+    Returns:
+        The extracted instance data.
+    """
+    try:
+        return resolve_instance_data(model=model)
+    except UnsupportedInstanceConstruct as e:
+        matcher_log.debug(f'Falling back to verifyta for instance data extraction ({e}).')
+    return get_instance_data_from_verifyta(model=model, config=config)
+
+
+def get_instance_data_from_verifyta(model, config):
     """Extract the instance data of a model from a dummy query to verifyta.
 
     Args:
@@ -133,6 +159,10 @@ def get_instance_data(model, config):
     Returns:
         The extracted instance data.
     """
+    from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+    from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
+    from uppyyl_observation_matcher.backend.trace.parser import trace_xml_to_dict
+
     verifyta = VerifyTAInterface(verifyta_path=config["verifyta_path"], do_print=False)
     uppaal_c_parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
 
@@ -211,22 +241,36 @@ def load_observation_data_from_csv(csv_data_file_path, instance_data):
     Returns:
         The loaded observation data.
     """
-    instance_names = list(instance_data.keys())
-    observation_data = []
     with open(csv_data_file_path, 'r') as file:
         data = list(csv.reader(file, delimiter=',', quotechar='|'))
-        header = data[0]
-        for d in data[1:]:
-            parsed_values = list(map(parse_obs_csv_value, d))
-            data_point_raw = dict(zip(header, parsed_values))
-            data_point = {"t": None, "vars": {}, "locs": {}}
-            for var_name, val in data_point_raw.items():
-                if var_name == "t":
-                    data_point["t"] = val
-                elif var_name in instance_names:
-                    data_point["locs"][var_name] = {"name": val}
-                else:
-                    data_point["vars"][var_name] = val
-            observation_data.append(data_point)
+    header = data[0]
+    rows = [list(map(parse_obs_csv_value, d)) for d in data[1:]]
+    return observation_data_from_rows(header=header, rows=rows, instance_data=instance_data)
+
+
+def observation_data_from_rows(header, rows, instance_data):
+    """Converts rows of observed values into observation data.
+
+    Args:
+        header: The column names (i.e., "t", instance names for observed locations, and variable names).
+        rows: The rows of (parsed) observed values.
+        instance_data: The template and argument data of all instances.
+
+    Returns:
+        The observation data.
+    """
+    instance_names = list(instance_data.keys())
+    observation_data = []
+    for parsed_values in rows:
+        data_point_raw = dict(zip(header, parsed_values))
+        data_point = {"t": None, "vars": {}, "locs": {}}
+        for var_name, val in data_point_raw.items():
+            if var_name == "t":
+                data_point["t"] = val
+            elif var_name in instance_names:
+                data_point["locs"][var_name] = {"name": val}
+            else:
+                data_point["vars"][var_name] = val
+        observation_data.append(data_point)
 
     return observation_data
@@ -0,0 +1,215 @@
+"""A resolver for the template instances of a model, based on its (system) declarations only (i.e., without verifyta)."""
+
+import copy
+import hashlib
+
+from uppaal_c_language.backend.evaluators.uppaal_c_compiler import UppaalCCompiler, UppaalCCompilerError, \
+    UppaalCRuntimeError
+from uppaal_c_language.backend.modifiers.ast_modifier import replace_variables_in_ast
+
+
+class UnsupportedInstanceConstruct(Exception):
+    """Raised if the instances of a model cannot be resolved statically (e.g., due to non-constant arguments)."""
+
+
+_instance_data_cache = {}
+
+
+def resolve_instance_data(model):
+    """Resolves the instance data of a model directly from the system declaration.
+
+    Explicit instantiations, partial instantiations with a single bounded integer parameter, and implicit
+    instantiations of templates with a single bounded integer parameter are supported. The instance names and
+    arguments match those derived from a verifyta trace (e.g., "P_0" for the implicit instance "P(0)").
+
+    Args:
+        model: The model for which instance data should be resolved.
+
+    Returns:
+        The resolved instance data.
+
+    Raises:
+        UnsupportedInstanceConstruct: If the instances cannot be resolved statically.
+    """
+    key = model_instance_hash(model)
+    if key not in _instance_data_cache:
+        _instance_data_cache[key] = _resolve_instance_data(model)
+    return copy.deepcopy(_instance_data_cache[key])
+
+
+def clear_instance_data_cache():
+    """Clears the cache of resolved instance data.
+
+    Returns:
+        None
+    """
+    _instance_data_cache.clear()
+
+
+def model_instance_hash(model):
+    """Calculates a hash of all model parts which determine the instances of the model.
+
+    Args:
+        model: The model.
+
+    Returns:
+        The hash as hex string.
+    """
+    sha = hashlib.sha256()
+    sha.update(model.declaration.text.encode())
+    sha.update(b'\0')
+    sha.update(model.system_declaration.text.encode())
+    for tmpl in model.templates.values():
+        sha.update(b'\0')
+        sha.update(tmpl.name.encode())
+        for param in tmpl.parameters:
+            sha.update(b'\0')
+            sha.update(param.text.encode())
+    return sha.hexdigest()
+
+
+def _resolve_instance_data(model):
+    """Resolves the instance data of a model (without caching).
+
+    Args:
+        model: The model.
+
+    Returns:
+        The resolved instance data.
+    """
+    system_decl_ast = model.system_declaration.ast
+    decls = model.declaration.ast["decls"] + system_decl_ast["decls"]
+    constants = ConstantEvaluator(decls=decls)
+    templates = dict((tmpl.name, tmpl) for tmpl in model.templates.values())
+    instantiations = dict((decl["instanceName"], decl) for decl in system_decl_ast["decls"]
+                          if decl["astType"] == "Instantiation")
+
+    instance_data = {}
+    for process_block in system_decl_ast["systemDecl"]["processNames"]:
+        for process_name in process_block:
+            if process_name in instantiations:
+                inst = instantiations[process_name]
+                tmpl_name = inst["templateName"]
+                if tmpl_name not in templates:
+                    raise UnsupportedInstanceConstruct(f'Instantiation "{process_name}" does not refer to a template.')
+                params = inst["params"] or []
+                args = inst["args"] or []
+            elif process_name in templates:
+                tmpl_name = process_name
+                params = [param.ast for param in templates[tmpl_name].parameters]
+                args = [{"astType": 'Variable', "name": param["varData"]["varName"]} for param in params]
+            else:
+                raise UnsupportedInstanceConstruct(f'Process "{process_name}" cannot be resolved.')
+
+            if not params:
+                instance_data[process_name] = {"template_name": tmpl_name, "args": copy.deepcopy(args)}
+                continue
+
+            if len(params) > 1:
+                raise UnsupportedInstanceConstruct(
+                    f'Implicit instantiation of "{process_name}" with multiple parameters is not supported.')
+            param = params[0]
+            param_name = param["varData"]["varName"]
+            lower, upper = constants.bounded_int_range(param=param)
+            for val in range(lower, upper + 1):
+                val_ast = {"astType": 'Integer', "val": val}
+                val_args = [replace_variables_in_ast(copy.deepcopy(arg), {param_name: val_ast})[0] for arg in args]
+                instance_data[f'{process_name}_{val}'] = {"template_name": tmpl_name, "args": val_args}
+
+    return instance_data
+
+
+class ConstantEvaluator:
+    """An evaluator for constant integer expressions, based on the constant folding of the Uppaal C compiler."""
+
+    def __init__(self, decls, params=None, args=None):
+        """Initializes ConstantEvaluator.
+
+        Args:
+            decls: The declaration ASTs (in declaration order), of which the typedefs and constants are used.
+            params: The template parameter ASTs, which are bound to the arguments after the declarations are added.
+            args: The argument ASTs of the parameters.
+        """
+        self.compiler = UppaalCCompiler()
+        self.add_declarations(decls=decls)
+        for param, arg in zip(params or [], args or []):
+            self.bind_parameter(param=param, arg=arg)
+
+    def add_declarations(self, decls):
+        """Adds the typedefs and constants of declarations (skipping constants which cannot be evaluated statically).
+
+        Args:
+            decls: The declaration ASTs.
+        """
+        for decl in decls:
+            if decl["astType"] == "TypeDecls" or (decl["astType"] == "VariableDecls" and
+                                                  "const" in decl["type"]["prefixes"]):
+                try:
+                    self.compiler.add_declarations([decl])
+                except (UppaalCCompilerError, UppaalCRuntimeError):
+                    pass
+
+    def bind_parameter(self, param, arg):
+        """Binds a template parameter to its argument, so that it shadows other declarations of the same name.
+
+        A constant integer parameter is declared as constant with the argument value, and any other parameter (e.g., a
+        clock, reference or array parameter) as variable, so that its value is not constant.
+
+        Args:
+            param: The parameter AST.
+            arg: The argument AST.
+        """
+        var_data = {"varName": param["varData"]["varName"], "arrayDecl": [], "astType": "VariableID"}
+        if not param["isRef"] and not param["varData"]["arrayDecl"]:
+            try:
+                self.compiler.add_declarations([{
+                    "type": {**param["type"], "prefixes": ["const"]},
+                    "varData": [{**var_data, "initData": {"astType": "Integer", "val": self.evaluate(arg)}}],
+                    "astType": "VariableDecls"}])
+                return
+            except (UnsupportedInstanceConstruct, UppaalCCompilerError, UppaalCRuntimeError):
+                pass
+        self.compiler.add_declarations([{
+            "type": {"prefixes": [], "typeId": {"type": "int", "astType": "CustomType"}, "astType": "Type"},
+            "varData": [{**var_data, "initData": None}], "astType": "VariableDecls"}])
+
+    def bounded_int_range(self, param):
+        """Gets the (inclusive) value range of a bounded integer parameter.
+
+        Args:
+            param: The parameter AST.
+
+        Returns:
+            The lower and upper bound of the range.
+        """
+        if param["isRef"] or param["varData"]["arrayDecl"]:
+            raise UnsupportedInstanceConstruct(
+                f'Parameter "{param["varData"]["varName"]}" cannot be instantiated implicitly.')
+        type_id = param["type"]["typeId"]
+        seen_types = set()
+        while type_id["astType"] == "CustomType" and type_id["type"] in self.compiler.types:
+            if type_id["type"] in seen_types:
+                break
+            seen_types.add(type_id["type"])
+            type_id = self.compiler.types[type_id["type"]]
+        if type_id["astType"] != "BoundedIntType":
+            raise UnsupportedInstanceConstruct(
+                f'Parameter "{param["varData"]["varName"]}" is not of a bounded integer type.')
+        return self.evaluate(type_id["lower"]), self.evaluate(type_id["upper"])
+
+    def evaluate(self, ast):
+        """Evaluates a constant integer expression.
+
+        Args:
+            ast: The expression AST.
+
+        Returns:
+            The integer value.
+        """
+        try:
+            val = self.compiler.evaluate_constant(ast)
+        except (UppaalCCompilerError, UppaalCRuntimeError) as e:
+            raise UnsupportedInstanceConstruct(f'Expression cannot be evaluated statically ({e}).') from None
+        if not isinstance(val, (bool, int)):
+            raise UnsupportedInstanceConstruct(f'Expression value {val} is not an integer.')
+        return int(val)
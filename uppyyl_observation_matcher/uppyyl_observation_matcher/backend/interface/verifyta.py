@@ -4,7 +4,9 @@ import pathlib
 import subprocess
 from timeit import default_timer
 
+from uppyyl_observation_matcher.backend.logger.instrumentation import span
 from uppyyl_observation_matcher.backend.logger.logger import verifyta_log
+from uppyyl_observation_matcher.backend.logger.profiler import pause_profiling
 
 
 class VerifyTAInterface:
@@ -24,17 +26,19 @@ class VerifyTAInterface:
             The stdout results of the command execution.
         """
         # Spawn verifyta process
-        process = subprocess.Popen(
-            command_parts, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        with span("verifyta_spawn"):
+            process = subprocess.Popen(
+                command_parts, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
         # Obtain stdout and stderr output from the verifyta process
         is_timeout = False
-        try:
-            out, err = process.communicate(timeout=self.timeout)
-        except subprocess.TimeoutExpired:
-            process.kill()
-            out, err = process.communicate()
-            is_timeout = True
+        with span("verifyta_wait"), pause_profiling():
+            try:
+                out, err = process.communicate(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                out, err = process.communicate()
+                is_timeout = True
         out = out.decode("UTF-8")
         err = err.decode("UTF-8")
 
@@ -0,0 +1,362 @@
+"""The instrumentation of hot paths via named spans.
+
+Spans are opened via the module function "span" (e.g., "with span("finalize"): ..."). As long as no instrumentation is
+enabled, "span" returns a shared no-op context manager, i.e., no clock is read and nothing is recorded. After calling
+"enable_instrumentation", the durations of all spans are aggregated in histograms per span name, and (optionally) the
+individual spans are recorded for an export to a local file in the OpenTelemetry (OTLP/JSON) format.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+
+from uppyyl_observation_matcher.version import __version__
+
+
+##############
+# Histograms #
+##############
+class SpanHistogram:
+    """A histogram of the durations of all spans with the same name.
+
+    The histogram keeps the count, total, minimum and maximum of the durations, and counts the durations in fixed
+    log-scale buckets (i.e., its memory does not grow with the number of spans). Percentiles are approximated by the
+    geometric centers of the buckets, with a relative error of at most 6% (within the bucket range from 1 ns to 10^4 s).
+    """
+
+    buckets_per_decade = 20
+    min_bucket_duration = 1e-9
+    max_bucket_duration = 1e4
+
+    def __init__(self):
+        """Initializes SpanHistogram."""
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        decade_count = round(math.log10(self.max_bucket_duration / self.min_bucket_duration))
+        self.buckets = [0] * (decade_count * self.buckets_per_decade + 1)
+
+    def _bucket_index(self, duration):
+        """Gets the index of the bucket of a duration (durations outside of the bucket range are clamped)."""
+        if duration <= self.min_bucket_duration:
+            return 0
+        index = int(math.log10(duration / self.min_bucket_duration) * self.buckets_per_decade) + 1
+        return min(index, len(self.buckets) - 1)
+
+    def _bucket_center(self, index):
+        """Gets the geometric center of a bucket."""
+        if index == 0:
+            return self.min_bucket_duration
+        return self.min_bucket_duration * 10 ** ((index - 0.5) / self.buckets_per_decade)
+
+    def add(self, duration):
+        """Adds a span duration.
+
+        Args:
+            duration: The duration in seconds.
+        """
+        self.count += 1
+        self.total += duration
+        if self.min is None or duration < self.min:
+            self.min = duration
+        if self.max is None or duration > self.max:
+            self.max = duration
+        self.buckets[self._bucket_index(duration)] += 1
+
+    def percentile(self, percent):
+        """Approximates a percentile of the durations (via the nearest-rank method on the buckets).
+
+        Args:
+            percent: The percentile (between 0 and 100).
+
+        Returns:
+            The percentile duration in seconds (or None if no duration was added).
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        if rank >= self.count:
+            return self.max
+        cumulative_count = 0
+        for index, bucket_count in enumerate(self.buckets):
+            cumulative_count += bucket_count
+            if cumulative_count >= rank:
+                return min(max(self._bucket_center(index), self.min), self.max)
+        return self.max
+
+    def summary(self):
+        """Summarizes the durations.
+
+        Returns:
+            The dict of count, total, mean, minimum, p50, p99 and maximum duration (in seconds).
+        """
+        return {
+            "count": self.count,
+            "total_s": self.total,
+            "mean_s": self.total / self.count if self.count else None,
+            "min_s": self.min,
+            "p50_s": self.percentile(50),
+            "p99_s": self.percentile(99),
+            "max_s": self.max,
+        }
+
+
+#########
+# Spans #
+#########
+class _NullSpan:
+    """A span which does nothing (used if no instrumentation is enabled)."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """A span measuring the time between entering and exiting its context."""
+
+    __slots__ = ("instrumentation", "name", "attributes", "span_id", "parent", "trace_id", "start_time_ns",
+                 "start_counter_ns")
+
+    def __init__(self, instrumentation, name, attributes):
+        self.instrumentation = instrumentation
+        self.name = name
+        self.attributes = attributes
+        self.span_id = None
+        self.parent = None
+        self.trace_id = None
+        self.start_time_ns = None
+        self.start_counter_ns = None
+
+    def __enter__(self):
+        self.instrumentation.open_span(self)
+        self.start_time_ns = time.time_ns()
+        self.start_counter_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration_ns = time.perf_counter_ns() - self.start_counter_ns
+        self.instrumentation.close_span(self, duration_ns=duration_ns, error=exc_type is not None)
+        return False
+
+
+###################
+# Instrumentation #
+###################
+class Instrumentation:
+    """A sink collecting span durations (and, optionally, the individual spans for an export)."""
+
+    def __init__(self, record_spans=True, max_recorded_spans=100000):
+        """Initializes Instrumentation.
+
+        Args:
+            record_spans: Choose whether the individual spans are recorded (required for the OpenTelemetry export).
+            max_recorded_spans: The maximum number of recorded spans (further spans are only added to histograms).
+        """
+        self.record_spans = record_spans
+        self.max_recorded_spans = max_recorded_spans
+        self.histograms = {}
+        self.spans = []
+        self._local = threading.local()
+
+    def span(self, name, **attributes):
+        """Creates a span.
+
+        Args:
+            name: The span name.
+            **attributes: The span attributes.
+
+        Returns:
+            The span context manager.
+        """
+        return _Span(self, name, attributes)
+
+    def open_span(self, span_):
+        """Registers an entered span as child of the currently open span of the thread.
+
+        Args:
+            span_: The span.
+        """
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        span_.parent = stack[-1] if stack else None
+        span_.trace_id = span_.parent.trace_id if span_.parent else os.urandom(16).hex()
+        span_.span_id = os.urandom(8).hex()
+        stack.append(span_)
+
+    def close_span(self, span_, duration_ns, error=False):
+        """Records an exited span.
+
+        Args:
+            span_: The span.
+            duration_ns: The span duration in nanoseconds.
+            error: A flag indicating whether the span was exited due to an exception.
+        """
+        stack = self._local.stack
+        if stack and stack[-1] is span_:
+            stack.pop()
+
+        histogram = self.histograms.get(span_.name)
+        if histogram is None:
+            histogram = self.histograms.setdefault(span_.name, SpanHistogram())
+        histogram.add(duration_ns / 1e9)
+
+        if self.record_spans and len(self.spans) < self.max_recorded_spans:
+            self.spans.append({
+                "trace_id": span_.trace_id,
+                "span_id": span_.span_id,
+                "parent_span_id": span_.parent.span_id if span_.parent else None,
+                "name": span_.name,
+                "start_time_ns": span_.start_time_ns,
+                "end_time_ns": span_.start_time_ns + duration_ns,
+                "attributes": span_.attributes,
+                "error": error,
+            })
+
+    def summary(self):
+        """Summarizes the span durations per span name.
+
+        Returns:
+            The dict of histogram summaries.
+        """
+        return {name: histogram.summary() for name, histogram in self.histograms.items()}
+
+    def reset(self):
+        """Removes all collected durations and spans."""
+        self.histograms = {}
+        self.spans = []
+
+    def to_otlp_dict(self, service_name="uppyyl_observation_matcher"):
+        """Converts the recorded spans to an OpenTelemetry trace export request (OTLP/JSON).
+
+        Args:
+            service_name: The service name of the exporting resource.
+
+        Returns:
+            The export request dict.
+        """
+        otlp_spans = []
+        for span_data in self.spans:
+            otlp_span = {
+                "traceId": span_data["trace_id"],
+                "spanId": span_data["span_id"],
+                "name": span_data["name"],
+                "kind": 1,
+                "startTimeUnixNano": str(span_data["start_time_ns"]),
+                "endTimeUnixNano": str(span_data["end_time_ns"]),
+                "attributes": [_otlp_attribute(key, val) for key, val in span_data["attributes"].items()],
+                "status": {"code": 2} if span_data["error"] else {},
+            }
+            if span_data["parent_span_id"]:
+                otlp_span["parentSpanId"] = span_data["parent_span_id"]
+            otlp_spans.append(otlp_span)
+
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "uppyyl_observation_matcher", "version": __version__},
+                    "spans": otlp_spans,
+                }],
+            }],
+        }
+
+    def export_otlp_json(self, file_path, service_name="uppyyl_observation_matcher"):
+        """Appends the recorded spans to a local file in the OpenTelemetry file exporter format (i.e., one OTLP/JSON
+           export request per line).
+
+        Args:
+            file_path: The path of the export file.
+            service_name: The service name of the exporting resource.
+        """
+        with open(file_path, "a") as file:
+            file.write(json.dumps(self.to_otlp_dict(service_name=service_name)))
+            file.write("\n")
+
+
+def _otlp_attribute(key, val):
+    """Converts a key-value pair to an OTLP/JSON attribute.
+
+    Args:
+        key: The attribute key.
+        val: The attribute value.
+
+    Returns:
+        The attribute dict.
+    """
+    if isinstance(val, bool):
+        otlp_val = {"boolValue": val}
+    elif isinstance(val, int):
+        otlp_val = {"intValue": str(val)}
+    elif isinstance(val, float):
+        otlp_val = {"doubleValue": val}
+    else:
+        otlp_val = {"stringValue": str(val)}
+    return {"key": key, "value": otlp_val}
+
+
+##########################
+# Active Instrumentation #
+##########################
+_instrumentation = None
+
+
+def span(name, **attributes):
+    """Creates a span in the enabled instrumentation (or a no-op span if instrumentation is disabled).
+
+    Args:
+        name: The span name.
+        **attributes: The span attributes.
+
+    Returns:
+        The span context manager.
+    """
+    if _instrumentation is None:
+        return NULL_SPAN
+    return _instrumentation.span(name, **attributes)
+
+
+def enable_instrumentation(instrumentation=None):
+    """Enables the instrumentation of all spans.
+
+    Args:
+        instrumentation: The instrumentation sink (default: a new Instrumentation instance).
+
+    Returns:
+        The enabled instrumentation sink.
+    """
+    global _instrumentation
+    _instrumentation = instrumentation if instrumentation is not None else Instrumentation()
+    return _instrumentation
+
+
+def disable_instrumentation():
+    """Disables the instrumentation of all spans.
+
+    Returns:
+        The previously enabled instrumentation sink (or None).
+    """
+    global _instrumentation
+    instrumentation = _instrumentation
+    _instrumentation = None
+    return instrumentation
+
+
+def get_instrumentation():
+    """Gets the enabled instrumentation sink.
+
+    Returns:
+        The enabled instrumentation sink (or None if instrumentation is disabled).
+    """
+    return _instrumentation
@@ -1,4 +1,8 @@
-"""A logger decorator for time logging."""
+"""A logger decorator for time logging.
+
+The decorator is kept for callers passing "log_time_to=(dict, name)". For the instrumentation of hot paths, named spans
+(see instrumentation.py) should be used instead.
+"""
 
 import inspect
 from timeit import default_timer
@@ -6,6 +10,8 @@ from timeit import default_timer
 
 def log_time(func):
     """A logger decorator for time logging."""
+    func_has_explicit_log = 'time_log' in inspect.getfullargspec(func)[0]
+
     def logged_func(*args, **kwargs):
         """The logged function.
 
@@ -26,7 +32,6 @@ def log_time(func):
                 func_return = func(*args, **kwargs)
                 return func_return
 
-            func_has_explicit_log = 'time_log' in inspect.getfullargspec(func)[0]
             if func_has_explicit_log:
                 time_log = {}
                 kwargs['time_log'] = time_log
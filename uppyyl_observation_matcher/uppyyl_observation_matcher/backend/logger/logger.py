@@ -1,11 +1,13 @@
-"""The loggers."""
+"""The loggers.
+
+The loggers are created without handlers, i.e., importing this module has no side effects on the output. The handlers
+(with colored stream output) are installed via an explicit call of "configure_logging".
+"""
 
 import logging
 import sys
 import pprint
 
-from colorama import Fore
-
 ##################
 # Pretty Printer #
 ##################
@@ -17,23 +19,41 @@ pp = pprint.PrettyPrinter(indent=4)
 matcher_log = logging.getLogger('TraceMatcher')
 matcher_log.setLevel(logging.DEBUG)
 
-std_out_msg_formatter = logging.Formatter(f'[%(asctime)s]{Fore.CYAN}[%(name)6s]{Fore.RESET} %(message)s', "%H:%M:%S")
-std_out_handler = logging.StreamHandler(sys.stdout)
-std_out_handler.setFormatter(std_out_msg_formatter)
-matcher_log.addHandler(std_out_handler)
-
 gen_log = logging.getLogger('TraceGen')
 gen_log.setLevel(logging.DEBUG)
 
-std_out_msg_formatter = logging.Formatter(f'[%(asctime)s]{Fore.YELLOW}[%(name)6s]{Fore.RESET} %(message)s', "%H:%M:%S")
-std_out_handler = logging.StreamHandler(sys.stdout)
-std_out_handler.setFormatter(std_out_msg_formatter)
-gen_log.addHandler(std_out_handler)
-
 verifyta_log = logging.getLogger('VerifyTA')
 verifyta_log.setLevel(logging.DEBUG)
 
-std_out_msg_formatter = logging.Formatter(f'[%(asctime)s]{Fore.GREEN}[%(name)6s]{Fore.RESET} %(message)s', "%H:%M:%S")
-std_out_handler = logging.StreamHandler(sys.stdout)
-std_out_handler.setFormatter(std_out_msg_formatter)
-verifyta_log.addHandler(std_out_handler)
+_log_colors = {
+    matcher_log: "CYAN",
+    gen_log: "YELLOW",
+    verifyta_log: "GREEN",
+}
+_handlers = {}
+
+
+def configure_logging(stream=None, level=logging.DEBUG, colored=True):
+    """Installs (or replaces) the stream handlers of all loggers.
+
+    Args:
+        stream: The output stream (default: sys.stdout).
+        level: The logging level of the handlers.
+        colored: Choose whether the logger names are colored (via colorama).
+    """
+    stream = stream if stream is not None else sys.stdout
+    if colored:
+        from colorama import Fore
+    for log, color in _log_colors.items():
+        if colored:
+            name_str = f'{getattr(Fore, color)}[%(name)6s]{Fore.RESET}'
+        else:
+            name_str = '[%(name)6s]'
+        std_out_msg_formatter = logging.Formatter(f'[%(asctime)s]{name_str} %(message)s', "%H:%M:%S")
+        std_out_handler = logging.StreamHandler(stream)
+        std_out_handler.setFormatter(std_out_msg_formatter)
+        std_out_handler.setLevel(level)
+        if log in _handlers:
+            log.removeHandler(_handlers[log])
+        log.addHandler(std_out_handler)
+        _handlers[log] = std_out_handler
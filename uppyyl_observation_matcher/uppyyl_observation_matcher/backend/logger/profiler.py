@@ -0,0 +1,112 @@
+"""The profiling of matcher, generator and simulator runs via cProfile.
+
+A profiled run (see "profile_run") writes a ".prof" file (loadable via pstats, snakeviz, etc.) and a text summary of the
+top-N functions into a profile directory. Waiting for external processes (i.e., verifyta) is excluded from the profile
+by pausing the active profiler (see "pause_profiling").
+"""
+
+import contextlib
+import cProfile
+import io
+import pathlib
+import pstats
+import time
+
+_active_profiler = None
+
+
+def get_profile_dir_path(profile, output_dir_path):
+    """Determines the directory of the profile files for a given profile option.
+
+    Args:
+        profile: The profile option (True for the default directory, or a custom directory path).
+        output_dir_path: The output directory path (the default directory is its "profiles" subdirectory).
+
+    Returns:
+        The profile directory path.
+    """
+    if profile is True:
+        return pathlib.Path(output_dir_path if output_dir_path else ".").joinpath("profiles")
+    return pathlib.Path(profile)
+
+
+@contextlib.contextmanager
+def profile_run(name, profile, output_dir_path=None, top_n=30):
+    """Profiles the enclosed code, and writes the profile files afterwards.
+
+    If another run is already profiled (e.g., a match within a profiled batch), the enclosed code is only part of the
+    outer profile.
+
+    Args:
+        name: The name of the run (used as file name prefix).
+        profile: The profile option (a false value disables profiling, True uses the default directory, or a custom
+                 directory path).
+        output_dir_path: The output directory path.
+        top_n: The number of functions listed in the text summary.
+
+    Yields:
+        The cProfile profiler (or None if the enclosed code is not profiled separately).
+    """
+    global _active_profiler
+    if not profile or _active_profiler is not None:
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    _active_profiler = profiler
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        _active_profiler = None
+        write_profile(profiler=profiler, name=name,
+                      profile_dir_path=get_profile_dir_path(profile=profile, output_dir_path=output_dir_path),
+                      top_n=top_n)
+
+
+@contextlib.contextmanager
+def pause_profiling():
+    """Pauses the active profiler (if any) for the enclosed code (e.g., while waiting for verifyta)."""
+    profiler = _active_profiler
+    if profiler is None:
+        yield
+        return
+
+    profiler.disable()
+    try:
+        yield
+    finally:
+        profiler.enable()
+
+
+def write_profile(profiler, name, profile_dir_path, top_n=30):
+    """Writes the ".prof" file and the top-N text summary of a profile.
+
+    Args:
+        profiler: The cProfile profiler.
+        name: The name of the run (used as file name prefix).
+        profile_dir_path: The profile directory path.
+        top_n: The number of functions listed in the text summary.
+
+    Returns:
+        The paths of the ".prof" file and the text summary.
+    """
+    profile_dir_path = pathlib.Path(profile_dir_path)
+    profile_dir_path.mkdir(parents=True, exist_ok=True)
+    file_name = f'{name}_{time.strftime("%Y%m%d-%H%M%S")}_{time.perf_counter_ns() % 1000000:06d}'
+    prof_file_path = profile_dir_path.joinpath(f'{file_name}.prof')
+    summary_file_path = profile_dir_path.joinpath(f'{file_name}.txt')
+
+    profiler.dump_stats(str(prof_file_path))
+
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.strip_dirs()
+    for sort_key in ["cumulative", "tottime"]:
+        summary.write(f'Top {top_n} functions by {sort_key} time (verifyta wait time excluded):\n')
+        stats.sort_stats(sort_key).print_stats(top_n)
+    with open(summary_file_path, "w") as file:
+        file.write(summary.getvalue())
+
+    return prof_file_path, summary_file_path
@@ -1,8 +1,15 @@
 """The observation matcher."""
+import copy
+import os
+import pathlib
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 from uppyyl_observation_matcher.backend.helper import load_trace_from_file, save_model_to_file
+from uppyyl_observation_matcher.backend.logger.instrumentation import span
 from uppyyl_observation_matcher.backend.logger.log_time import log_time
+from uppyyl_observation_matcher.backend.logger.logger import matcher_log
+from uppyyl_observation_matcher.backend.logger.profiler import profile_run
 from uppyyl_observation_matcher.backend.interface.verifyta import VerifyTAInterface
 from uppyyl_observation_matcher.backend.transformer.model.concrete.extended_matcher_model_transformer import \
     ExtendedMatcherModelTransformer
@@ -15,8 +22,27 @@ from uppyyl_observation_matcher.backend.transformer.trace.concrete.extended_matc
 class ObservationMatcher:
     """The observation matcher."""
 
-    def __init__(self, config, model, instance_data, observation_data=None, matcher_type="B", timeout=None):
+    def __init__(self, config, model, instance_data, observation_data=None, matcher_type="B", timeout=None,
+                 backend=None):
+        """Initializes ObservationMatcher.
+
+        Args:
+            config: The matcher configuration.
+            model: The (preprocessed) source model.
+            instance_data: The instance data of the model.
+            observation_data: The observation data.
+            matcher_type: The matcher type (see "set_matcher_type").
+            timeout: A timeout after which the matching process should be aborted.
+            backend: The matching backend, i.e., "verifyta" (model checking of the matcher model with Uppaal verifyta)
+                     or "native" (in-process exploration of the zone graph, see "NativeMatcher") (default: the
+                     "backend" config entry, or "verifyta").
+        """
         self.config = config
+        self.backend = backend if backend is not None else config.get("backend", "verifyta")
+        if self.backend not in ["verifyta", "native"]:
+            raise Exception(f'Unknown matching backend "{self.backend}".')
+        self.native_matcher = None
+        self.observation_validator = None
         self.input_model = None
         self.instance_data = None
         self.observation_data = None
@@ -35,55 +61,232 @@ class ObservationMatcher:
 
     @log_time
     def match(self, observation_data=None, return_trace=False, use_existing_matcher=False, use_prepared=False,
-              time_log=None):
+              time_log=None, profile=None, prescreen_windows=None, prevalidate=None):
         """Performs matching of given observation data on the traces of a model.
 
         Args:
             observation_data: The observation sequence.
             return_trace: A flag indicating whether the matched trace should be returned.
             use_existing_matcher: A flag indicating whether an existing matcher should be used (or whether it should
-                                  be generated anew).
+                                  be generated anew). Ignored by the native backend.
             use_prepared: A flag indicating whether the initially prepared version of the matcher should be used
-                          (or whether it should be generated anew).
+                          (or whether it should be generated anew). Ignored by the native backend.
             time_log: An optional dict used for logging time data.
+            profile: An optional profile option (True, or a directory path) for writing a cProfile profile of the
+                     matching (default: the "profile" config entry).
+            prescreen_windows: An optional number of windows for pre-screening the observation sequence, which is only
+                               matched completely if the pre-screen does not reject it (default: the
+                               "prescreen_windows" config entry).
+            prevalidate: Choose whether the observation sequence is validated statically against the declared
+                         variable ranges, never-assigned variables, location names and location graphs of the model,
+                         and rejected without matching run if it is impossible (default: the "prevalidate" config
+                         entry, or True).
 
         Returns:
 
         """
-        if observation_data is not None:
-            self.set_observation_data(observation_data=observation_data)
-        if use_existing_matcher and self.matcher_model is None:
-            warnings.warn("Instructed to use existing matcher model, but model was not generated yet. "
-                          "Generating matcher model.")
-            self.create_matcher_model(use_prepared=use_prepared)
-        if not use_existing_matcher:
-            self.create_matcher_model(use_prepared=use_prepared)
-
-        is_matching, is_timeout = perform_matching_with_uppaal(
-            config=self.config, timeout=self.timeout, log_time_to=(time_log, "matching"))
-
-        if is_matching and return_trace:
-            matcher_model_trace = load_trace_from_file(
-                trace_file_path=self.config["matcher_model_trace_file_path"], system=self.matcher_model)
-            matching_trace = transform_matcher_model_trace_to_original_domain(
-                matcher_model_trace=matcher_model_trace, matcher_model=self.matcher_model,
-                original_model=self.input_model
-            )
-        else:
-            matching_trace = None
+        profile = profile if profile is not None else self.config.get("profile")
+        with span("match"), profile_run("match", profile=profile, output_dir_path=self.config.get("output_dir_path")):
+            if observation_data is not None:
+                self.set_observation_data(observation_data=observation_data)
+            prevalidate = prevalidate if prevalidate is not None else self.config.get("prevalidate", True)
+            if prevalidate:
+                with span("prevalidate"):
+                    validation_res = self.get_observation_validator().validate(observation_data=self.observation_data)
+                if not validation_res["is_valid"]:
+                    matcher_log.debug(f'Observation rejected by static validation: {validation_res["reason"]}')
+                    return {"is_matching": False, "is_timeout": False, "matching_trace": None,
+                            "reason": validation_res["reason"]}
+            prescreen_windows = (prescreen_windows if prescreen_windows is not None
+                                 else self.config.get("prescreen_windows"))
+            if prescreen_windows:
+                prescreen_res = self.prescreen(observation_data=self.observation_data, window_count=prescreen_windows,
+                                               workers=self.config.get("prescreen_workers", 1))
+                if prescreen_res["is_rejected"]:
+                    return {"is_matching": False, "is_timeout": False, "matching_trace": None,
+                            "reason": f'Window starting at observation {prescreen_res["rejected_window"]} '
+                                      f'cannot be matched.'}
+            if self.backend == "native":
+                with span("native"):
+                    return self.get_native_matcher().match(observation_data=self.observation_data,
+                                                           return_trace=return_trace)
+            if use_existing_matcher and self.matcher_model is None:
+                warnings.warn("Instructed to use existing matcher model, but model was not generated yet. "
+                              "Generating matcher model.")
+                self.create_matcher_model(use_prepared=use_prepared)
+            if not use_existing_matcher:
+                self.create_matcher_model(use_prepared=use_prepared)
+
+            is_matching, is_timeout = perform_matching_with_uppaal(
+                config=self.config, timeout=self.timeout, log_time_to=(time_log, "matching"))
+
+            if is_matching and return_trace:
+                matcher_model_trace = load_trace_from_file(
+                    trace_file_path=self.config["matcher_model_trace_file_path"], system=self.matcher_model)
+                matching_trace = transform_matcher_model_trace_to_original_domain(
+                    matcher_model_trace=matcher_model_trace, matcher_model=self.matcher_model,
+                    original_model=self.input_model
+                )
+            else:
+                matching_trace = None
+
+            res = {
+                "is_matching": is_matching,
+                "is_timeout": is_timeout,
+                "matching_trace": matching_trace
+            }
+            return res
+
+    def prescreen(self, observation_data, window_count, workers=1, overlap=1, max_states=1000):
+        """Pre-screens an observation sequence by matching K overlapping windows independently (and in parallel), each
+           from a relaxed initial state (see "NativeMatcher.match_window"). The pre-screen can only reject: if it does
+           not reject, the full matching run is still required.
 
-        res = {
-            "is_matching": is_matching,
+        Args:
+            observation_data: The observation sequence.
+            window_count: The number of windows (K).
+            workers: The number of worker processes matching windows concurrently.
+            overlap: The number of observation data points shared by consecutive windows.
+            max_states: The maximal number of relaxed initial states per window (larger windows are inconclusive).
+
+        Returns:
+            The pre-screen result (see "summarize_window_results").
+        """
+        from uppyyl_observation_matcher.backend.native.prescreen import split_into_windows, prescreen_observation, \
+            summarize_window_results, init_window_worker, match_window_task
+
+        with span("prescreen"):
+            if workers <= 1:
+                return prescreen_observation(
+                    matcher=self.get_native_matcher(), observation_data=observation_data, window_count=window_count,
+                    overlap=overlap, max_states=max_states)
+
+            windows = split_into_windows(observation_data, window_count=window_count, overlap=overlap)
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_window_worker,
+                                     initargs=(self.config, self.input_model, self.timeout)) as executor:
+                window_results = list(executor.map(
+                    match_window_task, [(start, window_data, max_states) for start, window_data in windows]))
+            return summarize_window_results(window_results)
+
+    def find_longest_matching_prefix(self, observation_data, workers=1):
+        """Finds the longest prefix of an observation sequence which matches the traces of the model (e.g., to locate
+           where a non-matching observation sequence diverges from the model).
+
+        As all prefixes of a matching prefix match as well, the prefix length is searched by k-ary bisection: in each
+        round, up to k prefix lengths within the remaining interval are matched concurrently (each by a separate
+        verifyta process, based on the shared prepared matcher model), so that O(log_k n) rounds are required. The static
+        validation and the pre-screen (see "match") are performed once for the whole sequence, and only bound the
+        search interval (i.e., the matching runs of the probed prefixes skip them). With the native backend, the
+        observations are instead fed once to an online monitor (see "create_monitor"), which detects the first
+        inconsistent observation directly.
+
+        Args:
+            observation_data: The observation sequence.
+            workers: The number of concurrent matching runs per round (k).
+
+        Returns:
+            The dict of the length of the longest matching prefix ("length"), the matching result of the whole sequence
+            ("is_matching"), the index of the first non-matching observation ("diverging_index", or None), the number of
+            rounds ("rounds") and matching runs ("probes"), and a flag indicating whether any run timed out and was
+            counted as non-matching ("is_timeout").
+        """
+        observation_count = len(observation_data)
+        if self.backend == "native":
+            res = self.create_monitor().feed_all(observation_data) if observation_data else None
+            length = observation_count if res is None or res["is_consistent"] else res["index"]
+            return {
+                "length": length,
+                "is_matching": length == observation_count,
+                "diverging_index": length if length < observation_count else None,
+                "rounds": 1,
+                "probes": 1,
+                "is_timeout": res is not None and res["is_timeout"],
+            }
+
+        if workers < 1:
+            raise Exception("The number of workers must be positive.")
+
+        # The longest known matching prefix length, and the shortest known non-matching prefix length
+        lower, upper = 0, observation_count + 1
+        rejected_length = self._shortest_rejected_prefix_length(observation_data)
+        if rejected_length is not None:
+            upper = rejected_length
+
+        length, rounds, probes, is_timeout = lower, 0, 0, False
+        if upper - lower > 1:
+            if not self._prepared_matcher_model:
+                self.prepare_matcher_model()
+            with span("prefix_search"), ProcessPoolExecutor(max_workers=workers, initializer=_init_probe_worker,
+                                                            initargs=(self,)) as executor:
+                length, rounds, probes, is_timeout = bisect_matching_prefix(
+                    lower=lower, upper=upper, workers=workers,
+                    probe=lambda lengths: list(executor.map(
+                        _match_probe, [observation_data[:prefix_length] for prefix_length in lengths])))
+
+        return {
+            "length": length,
+            "is_matching": length == observation_count,
+            "diverging_index": length if length < observation_count else None,
+            "rounds": rounds,
+            "probes": probes,
             "is_timeout": is_timeout,
-            "matching_trace": matching_trace
         }
-        return res
+
+    def _shortest_rejected_prefix_length(self, observation_data):
+        """Gets the length of the shortest prefix of an observation sequence which is rejected by the static validation
+           or the pre-screen (if enabled in the config, see "match").
+
+        Args:
+            observation_data: The observation sequence.
+
+        Returns:
+            The prefix length (or None if the sequence is not rejected).
+        """
+        if self.config.get("prevalidate", True):
+            with span("prevalidate"):
+                validation_res = self.get_observation_validator().validate(observation_data=observation_data)
+            if not validation_res["is_valid"]:
+                return validation_res["index"] + 1
+        prescreen_windows = self.config.get("prescreen_windows")
+        if prescreen_windows and observation_data:
+            from uppyyl_observation_matcher.backend.native.prescreen import split_into_windows
+            prescreen_res = self.prescreen(observation_data=observation_data, window_count=prescreen_windows,
+                                           workers=self.config.get("prescreen_workers", 1))
+            if prescreen_res["is_rejected"]:
+                # All prefixes which contain the rejected window are rejected
+                windows = dict(split_into_windows(observation_data, window_count=prescreen_windows))
+                return prescreen_res["rejected_window"] + len(windows[prescreen_res["rejected_window"]])
+        return None
+
+    def _create_probe_matcher(self, probe_idx):
+        """Creates a matcher for concurrent matching runs, which shares the prepared matcher model, but uses separate
+           model and trace files (in the subdirectory "probe_<idx>" of the output directory).
+
+        Args:
+            probe_idx: The index of the probe matcher.
+
+        Returns:
+            The probe matcher.
+        """
+        probe_matcher = copy.copy(self)
+        probe_matcher.config = dict(self.config)
+        output_dir_path = pathlib.Path(self.config["output_dir_path"]).joinpath(f'probe_{probe_idx}')
+        output_dir_path.mkdir(parents=True, exist_ok=True)
+        probe_matcher.config["output_dir_path"] = output_dir_path
+        for key in ["matcher_model_file_path", "matcher_model_trace_file_path"]:
+            probe_matcher.config[key] = output_dir_path.joinpath(pathlib.Path(self.config[key]).name)
+        probe_matcher.matcher_model = None
+        probe_matcher.observation_data = None
+        probe_matcher.set_matcher_type(matcher_type=self.matcher_type)
+        return probe_matcher
 
     def prepare_matcher_model(self):
         """Prepares the matcher model."""
         self.matcher_model = None
-        self._prepared_matcher_model = self.input_model.copy()
-        self.matcher_model_transformer.prepare(model=self._prepared_matcher_model)
+        with span("model_copy"):
+            self._prepared_matcher_model = self.input_model.copy()
+        with span("prepare"):
+            self.matcher_model_transformer.prepare(model=self._prepared_matcher_model)
 
     def create_matcher_model(self, use_prepared=False):
         """Creates the matcher model (potentially based on the prepared version of the matcher model).
@@ -97,12 +300,46 @@ class ObservationMatcher:
         if not use_prepared or not self._prepared_matcher_model:
             self.prepare_matcher_model()
         else:
-            print("Using prepared matcher model.")
+            matcher_log.debug("Using prepared matcher model.")
 
-        self.matcher_model = self._prepared_matcher_model.copy()
-        self.matcher_model_transformer.finalize(model=self.matcher_model)
+        with span("model_copy"):
+            self.matcher_model = self._prepared_matcher_model.copy()
+        with span("finalize"):
+            self.matcher_model_transformer.finalize(model=self.matcher_model)
         save_model_to_file(model=self.matcher_model, model_path=self.config["matcher_model_file_path"])
 
+    def get_native_matcher(self):
+        """Gets the native matcher of the model (which is created on first use).
+
+        Returns:
+            The native matcher.
+        """
+        if self.native_matcher is None:
+            from uppyyl_observation_matcher.backend.native.native_matcher import NativeMatcher
+            with span("prepare"):
+                self.native_matcher = NativeMatcher(config=self.config, model=self.input_model, timeout=self.timeout)
+        return self.native_matcher
+
+    def get_observation_validator(self):
+        """Gets the static observation validator of the model (which is created on first use).
+
+        Returns:
+            The observation validator.
+        """
+        if self.observation_validator is None:
+            from uppyyl_observation_matcher.backend.observation.validator import ObservationValidator
+            self.observation_validator = ObservationValidator(config=self.config, model=self.input_model)
+        return self.observation_validator
+
+    def create_monitor(self):
+        """Creates an online monitor of the model, which matches observations incrementally (see "feed").
+
+        Returns:
+            The observation monitor.
+        """
+        from uppyyl_observation_matcher.backend.native.monitor import ObservationMonitor
+        return ObservationMonitor(config=self.config, model=self.input_model, timeout=self.timeout)
+
     def set_model(self, model, instance_data):
         """Sets the model against which the observations should be matched.
 
@@ -114,6 +351,8 @@ class ObservationMatcher:
         self.instance_data = instance_data
         self._prepared_matcher_model = None
         self.matcher_model = None
+        self.native_matcher = None
+        self.observation_validator = None
         self.observation_data = None
         if self.matcher_type:
             self.set_matcher_type(self.matcher_type)
@@ -152,6 +391,66 @@ class ObservationMatcher:
 # Functions #
 ########################################################################################################################
 
+def bisect_matching_prefix(lower, upper, workers, probe):
+    """Searches the length of the longest matching prefix of an observation sequence by k-ary bisection (see
+       "ObservationMatcher.find_longest_matching_prefix").
+
+    Args:
+        lower: The longest known matching prefix length.
+        upper: The shortest known non-matching prefix length (or the observation count + 1).
+        workers: The maximal number of prefix lengths probed per round (k).
+        probe: The function which matches the prefixes of a list of lengths (returning one matching result per length).
+
+    Returns:
+        The length of the longest matching prefix, the number of rounds and probes, and a flag indicating whether any
+        probe timed out (and was counted as non-matching).
+    """
+    rounds = 0
+    probes = 0
+    is_timeout = False
+    while upper - lower > 1:
+        probe_count = min(workers, upper - lower - 1)
+        lengths = sorted({lower + ((i + 1) * (upper - lower)) // (probe_count + 1) for i in range(probe_count)})
+        results = probe(lengths)
+        rounds += 1
+        probes += len(lengths)
+        for length, res in zip(lengths, results):
+            is_timeout = is_timeout or res["is_timeout"]
+            if res["is_matching"]:
+                lower = max(lower, length)
+            else:
+                upper = min(upper, length)
+        matcher_log.debug(f'Prefix search round {rounds}: lengths {lengths}, interval ({lower}, {upper}).')
+    return lower, rounds, probes, is_timeout
+
+
+_probe_matcher = None
+
+
+def _init_probe_worker(matcher):
+    """Initializes a worker process of the longest matching prefix search with a probe matcher.
+
+    Args:
+        matcher: The observation matcher with a prepared matcher model.
+    """
+    global _probe_matcher
+    _probe_matcher = matcher._create_probe_matcher(probe_idx=os.getpid())
+
+
+def _match_probe(observation_data):
+    """Matches an observation sequence with the probe matcher of the worker process (without the static validation and
+       the pre-screen, which are performed once for the whole sequence).
+
+    Args:
+        observation_data: The observation sequence.
+
+    Returns:
+        The matching result.
+    """
+    return _probe_matcher.match(observation_data=observation_data, use_prepared=True, prevalidate=False,
+                                prescreen_windows=0)
+
+
 @log_time
 def perform_matching_with_uppaal(config, timeout=None):
     """Performs matching with Uppaal verifyta.
@@ -163,17 +462,19 @@ def perform_matching_with_uppaal(config, timeout=None):
     Returns:
         The matching result.
     """
-    verifyta = VerifyTAInterface(verifyta_path=config["verifyta_path"], do_print=False, timeout=timeout)
+    with span("verifyta"):
+        verifyta = VerifyTAInterface(verifyta_path=config["verifyta_path"], do_print=False, timeout=timeout)
 
-    trace_file_path = config["matcher_model_trace_file_path"]
-    trace_file_path_base = trace_file_path.parent.joinpath(str(trace_file_path.stem)[:-1])
-    settings = ['-t', '0', '-X', str(trace_file_path_base)]
-    trace_file_path.unlink(missing_ok=True)
+        trace_file_path = config["matcher_model_trace_file_path"]
+        trace_file_path_base = trace_file_path.parent.joinpath(str(trace_file_path.stem)[:-1])
+        settings = ['-t', '0', '-X', str(trace_file_path_base)]
+        trace_file_path.unlink(missing_ok=True)
 
-    output, is_timeout = verifyta.execute_verifyta(
-        model_file_path=config["matcher_model_file_path"], output_dir_path=config["output_dir_path"], settings=settings)
-    is_satisfied = "-- Formula is satisfied." in output
-    return is_satisfied, is_timeout
+        output, is_timeout = verifyta.execute_verifyta(
+            model_file_path=config["matcher_model_file_path"], output_dir_path=config["output_dir_path"],
+            settings=settings)
+        is_satisfied = "-- Formula is satisfied." in output
+        return is_satisfied, is_timeout
 
 
 def transform_matcher_model_trace_to_original_domain(matcher_model_trace, matcher_model, original_model):
@@ -187,7 +488,9 @@ def transform_matcher_model_trace_to_original_domain(matcher_model_trace, matche
     Returns:
         The transformed trace.
     """
-    original_domain_trace = matcher_model_trace.copy()
-    trace_transformer = ExtendedMatcherModelTraceTransformer(source_system=matcher_model, target_system=original_model)
-    trace_transformer.transform(trace=original_domain_trace)
+    with span("trace_transform"):
+        original_domain_trace = matcher_model_trace.copy()
+        trace_transformer = ExtendedMatcherModelTraceTransformer(source_system=matcher_model,
+                                                                 target_system=original_model)
+        trace_transformer.transform(trace=original_domain_trace)
     return original_domain_trace
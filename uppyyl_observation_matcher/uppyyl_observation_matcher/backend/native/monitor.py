@@ -0,0 +1,104 @@
+"""An online observation monitor, which checks observations incrementally (i.e., one data point at a time).
+
+The monitor keeps the set of symbolic states (i.e., discrete states with DBM zones) which are consistent with all
+observations fed so far, exactly at the time of the last observation. Each fed data point is matched by exploring the
+state space from these states only (see "NativeMatcher.explore"), so that the cost per data point does not grow with
+the length of the observation sequence. States whose zones are included in zones of other states with the same
+discrete part are pruned, and no history is kept (i.e., neither previous states nor previous observations, so that the
+memory is bounded by the number of consistent states).
+"""
+
+from uppyyl_observation_matcher.backend.native.native_matcher import NativeMatcher
+
+
+class ObservationMonitor:
+    """An online observation monitor."""
+
+    def __init__(self, config, model, timeout=None):
+        """Initializes ObservationMonitor.
+
+        Args:
+            config: The matcher configuration (i.e., the enabled matching features and allowed deviations).
+            model: The preprocessed model.
+            timeout: A timeout (in seconds) for the matching of a single data point.
+        """
+        self.matcher = NativeMatcher(config=config, model=model, timeout=timeout)
+        self.nodes = None
+        self.fed_count = 0
+        self.last_time = None
+        self.violation_index = None
+        self.is_timeout = False
+        self.reset()
+
+    def reset(self):
+        """Resets the monitor to the initial state of the model (i.e., before the first observation)."""
+        self.matcher.set_observation_data(observation_data=[])
+        init_node = self.matcher.finalize(self.matcher.init_node())
+        self.nodes = [init_node] if init_node is not None else []
+        self.fed_count = 0
+        self.last_time = None
+        self.violation_index = None
+        self.is_timeout = False
+
+    def feed(self, data_point):
+        """Feeds the next observation data point to the monitor.
+
+        Args:
+            data_point: The observation data point (e.g., {"t": 3, "vars": {"x": 1}, "locs": {}}).
+
+        Returns:
+            The dict of the consistency result ("is_consistent", i.e., whether all observations so far can be matched),
+            the timeout flag ("is_timeout"), the index of the data point ("index"), and the number of consistent
+            symbolic states ("states").
+        """
+        index = self.fed_count
+        if self.violation_index is None and not self.is_timeout:
+            if self.last_time is not None and data_point["t"] < self.last_time:
+                raise Exception(f'Observation {index} at time {data_point["t"]} precedes the previous observation '
+                                f'at time {self.last_time}.')
+            # Only the current observation is kept, as all monitored nodes have matched the previous ones
+            self.matcher.discard_observations()
+            self.matcher.add_observation(data_point)
+            self.fed_count += 1
+            self.last_time = data_point["t"]
+
+            start_nodes = [node for node in map(self.matcher.finalize, self.nodes) if node is not None]
+            self.nodes, self.is_timeout = self.matcher.explore(start_nodes=start_nodes)
+            for node in self.nodes:
+                node.parent = None
+            if not self.nodes and not self.is_timeout:
+                self.violation_index = index
+        else:
+            self.fed_count += 1
+
+        return {
+            "is_consistent": self.violation_index is None and not self.is_timeout,
+            "is_timeout": self.is_timeout,
+            "index": index,
+            "states": len(self.nodes),
+        }
+
+    def feed_all(self, observation_data):
+        """Feeds a sequence of observation data points to the monitor (stopping at the first violation).
+
+        Args:
+            observation_data: The observation data points.
+
+        Returns:
+            The result of the last fed data point.
+        """
+        res = None
+        for data_point in observation_data:
+            res = self.feed(data_point)
+            if not res["is_consistent"]:
+                break
+        return res
+
+    def get_states(self):
+        """Gets the symbolic states which are consistent with all observations so far (at the time of the last
+           observation).
+
+        Returns:
+            The list of states.
+        """
+        return [self.matcher.create_state(node) for node in self.nodes]
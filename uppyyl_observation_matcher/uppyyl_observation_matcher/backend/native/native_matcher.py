@@ -0,0 +1,896 @@
+"""An in-process, zone-based observation matcher (i.e., the "native" alternative to matching with Uppaal verifyta).
+
+The matcher explores the symbolic state space (i.e., discrete states with DBM zones) of the network of timed automata
+synchronized with the observation sequence, which corresponds to the state space of the matcher model checked by
+verifyta (see "ExtendedMatcherModelTransformer"). The observation time is tracked by an additional clock, and the
+"check" of an observation is an action which is only enabled if no model process is in a committed location.
+
+Supported features: internal edges, binary and broadcast channels (incl. urgent channels and arrays of channels),
+committed and urgent locations, selects, functions, and the shifted, partial and location matching of observations
+(with allowed deviations). Observed locations are compared with the last named location of each process (as tracked
+by the matcher model with location matching). The model must be preprocessed (see "PreprocessedModelTransformer"), i.e.,
+all templates are instantiated, and have neither parameters nor local declarations. Committed matching, channel and
+process priorities, and non-convex clock constraints (e.g., "x != 5") are not supported.
+
+The data part of the model is evaluated by closures of the "UppaalCCompiler", i.e., the variables of a symbolic state
+are a flat list of slots (see "UppaalCCompiler.new_slots"), with the same type and range semantics as in the static
+observation validator. An action whose updates assign a value out of the declared range of a variable (or access an
+array out of bounds) is an error in Uppaal, and has no successor.
+"""
+
+import itertools
+import time
+
+from uppaal_c_language.backend.evaluators.uppaal_c_compiler import UppaalCCompiler, UppaalCCompilerError, \
+    UppaalCRuntimeError
+from uppyyl_observation_matcher.backend.data.dbm import DBM, DBMEntry
+from uppyyl_observation_matcher.backend.data.state import State
+from uppyyl_observation_matcher.backend.data.trace import Trace
+from uppyyl_observation_matcher.backend.data.transition import Transition
+from uppyyl_observation_matcher.backend.helper import dbm_union
+
+MATCHER_CLOCK = "Trace_Matcher.tt"
+
+_comparison_ops = {"LessThan", "LessEqual", "GreaterThan", "GreaterEqual", "Equal"}
+_switched_ops = {"LessThan": "GreaterThan", "LessEqual": "GreaterEqual", "GreaterThan": "LessThan",
+                 "GreaterEqual": "LessEqual", "Equal": "Equal"}
+
+
+##########
+# Helper #
+##########
+def _root_name(elem_name):
+    """Gets the variable name of a scalar variable element name (e.g., "a" for "a[1].f")."""
+    return elem_name.split("[", 1)[0].split(".", 1)[0]
+
+
+def _split_conjunction(ast, atoms):
+    """Splits an expression into its top-level conjuncts."""
+    if ast["astType"] in ["Guard", "Invariant", "BracketExpr"]:
+        _split_conjunction(ast["expr"], atoms)
+    elif ast["astType"] == "BinaryExpr" and ast["op"] == "LogAnd":
+        _split_conjunction(ast["left"], atoms)
+        _split_conjunction(ast["right"], atoms)
+    else:
+        atoms.append(ast)
+    return atoms
+
+
+def _is_zone_empty(dbm):
+    """Checks if a closed DBM is empty (i.e., it contains a negative cycle)."""
+    matrix = dbm.matrix
+    zero = DBMEntry(0, '<=')
+    for i in range(len(matrix)):
+        for j in range(i + 1, len(matrix)):
+            if matrix[i][j] + matrix[j][i] < zero:
+                return True
+    return False
+
+
+###########################
+# Compiled Model Elements #
+###########################
+class _Edge:
+    """A compiled edge of a process."""
+
+    __slots__ = ("edge", "proc_idx", "source", "target", "selects", "clock_atoms", "data_atoms", "sync", "updates",
+                 "resets")
+
+    def __init__(self, edge, proc_idx, source, target):
+        self.edge = edge
+        self.proc_idx = proc_idx
+        self.source = source
+        self.target = target
+        self.selects = []
+        self.clock_atoms = []
+        self.data_atoms = []
+        self.sync = None
+        self.updates = []
+        self.resets = []
+
+
+class _Process:
+    """A compiled process (i.e., a template instance)."""
+
+    def __init__(self, name, template):
+        self.name = name
+        self.template = template
+        self.locations = list(template.locations.values())
+        self.init_idx = self.locations.index(template.init_loc)
+        self.loc_names = [loc.name or None for loc in self.locations]
+        self.committed = [bool(loc.committed) for loc in self.locations]
+        self.urgent = [bool(loc.urgent) for loc in self.locations]
+        self.inv_clock_atoms = [[] for _ in self.locations]
+        self.inv_data_atoms = [[] for _ in self.locations]
+        self.out_edges = [[] for _ in self.locations]
+
+
+class _Node:
+    """A symbolic state of the matcher state space (with the action by which it was reached)."""
+
+    __slots__ = ("locs", "loc_names", "variables", "phase", "index", "dbm", "parent", "edges")
+
+    def __init__(self, locs, loc_names, variables, phase, index, dbm, parent=None, edges=None):
+        self.locs = locs
+        self.loc_names = loc_names
+        self.variables = variables
+        self.phase = phase
+        self.index = index
+        self.dbm = dbm
+        self.parent = parent
+        self.edges = edges
+
+    def discrete_key(self):
+        """Gets the hashable key of the discrete part of the node."""
+        return self.locs, self.loc_names, tuple(self.variables), self.phase, self.index
+
+
+##################
+# Native Matcher #
+##################
+class NativeMatcher:
+    """An in-process, zone-based observation matcher."""
+
+    def __init__(self, config, model, timeout=None):
+        """Initializes NativeMatcher.
+
+        Args:
+            config: The matcher configuration (i.e., the enabled matching features and allowed deviations).
+            model: The preprocessed model.
+            timeout: A timeout (in seconds) after which the matching is aborted.
+        """
+        self.config = config
+        self.model = model
+        self.timeout = timeout
+        if config.get("support_committed_matching"):
+            raise Exception("Committed matching is not supported by the native matcher backend.")
+
+        from uppaal_c_language.backend.parsers.uppaal_c_language_fast_parser import UppaalCLanguageFastParser
+        self.parser = UppaalCLanguageFastParser()
+
+        sys_decls = model.system_declaration.ast["decls"]
+        self.compiler = UppaalCCompiler(
+            decls=model.declaration.ast["decls"] + [decl for decl in sys_decls if decl["astType"] != "Instantiation"])
+        self.constant_slots = {i for i, elem_name in enumerate(self.compiler.slot_names)
+                               if _root_name(elem_name) in self.compiler.constant_names}
+        self.clocks = ["T0_REF"] + [f'sys.{clock}' for clock in self._expand_clock_names()] + [MATCHER_CLOCK]
+        self.clock_indices = {clock: i for i, clock in enumerate(self.clocks)}
+        self.has_urgent_channels = any(chan["urgent"] for chan in self.compiler.channels.values())
+
+        self.processes = []
+        self._compile_processes()
+        self.proc_indices = {proc.name: i for i, proc in enumerate(self.processes)}
+        self._observed_exprs = {}
+
+        deviations = config.get("allowed_deviations", {}) or {}
+        self.obs_time_deviation = deviations.get("t", 0) or 0
+        self.is_shifted = config.get("support_shifted_matching", False)
+        self.max_initial_delay = config.get("maximum_initial_delay", 0) or 0
+        self.obs_count = 0
+        self.obs_offset = 0
+        self.obs_times = []
+        self.obs_checks = []
+
+    ###############
+    # Compilation #
+    ###############
+    def _expand_clock_names(self):
+        """Expands the declared clocks (incl. clock arrays) into the list of clock names (e.g., "x", "y[0]")."""
+        clock_names = []
+        for name, dims in self.compiler.clocks.items():
+            for indices in itertools.product(*(range(dim) for dim in dims)):
+                clock_names.append(name + "".join(f'[{i}]' for i in indices))
+        return clock_names
+
+    def _compile_processes(self):
+        """Compiles the processes of the system declaration."""
+        sys_decl_ast = self.model.system_declaration.ast
+        inst_templates = {decl["instanceName"]: decl for decl in sys_decl_ast["decls"]
+                          if decl["astType"] == "Instantiation"}
+        process_groups = sys_decl_ast["systemDecl"]["processNames"]
+        if len(process_groups) > 1:
+            raise Exception("Process priorities are not supported by the native matcher backend.")
+
+        for proc_name in process_groups[0]:
+            inst = inst_templates.get(proc_name)
+            if inst is not None and (inst["params"] or inst["args"]):
+                raise Exception(f'Instance "{proc_name}" is not resolved (the model must be preprocessed).')
+            tmpl = self.model.get_template_by_name(inst["templateName"] if inst is not None else proc_name)
+            if tmpl.parameters or tmpl.declaration.ast["decls"]:
+                raise Exception(f'Template "{tmpl.name}" has parameters or local declarations '
+                                f'(the model must be preprocessed).')
+
+            proc_idx = len(self.processes)
+            proc = _Process(name=proc_name, template=tmpl)
+            for loc_idx, loc in enumerate(proc.locations):
+                for inv in loc.invariants:
+                    self._compile_condition(inv.ast, [], proc.inv_clock_atoms[loc_idx], proc.inv_data_atoms[loc_idx])
+            for edge in tmpl.edges.values():
+                source_idx = proc.locations.index(edge.source)
+                target_idx = proc.locations.index(edge.target)
+                compiled_edge = _Edge(edge=edge, proc_idx=proc_idx, source=source_idx, target=target_idx)
+                select_names = [sel.ast["name"] for sel in edge.selects]
+                compiled_edge.selects = [range(lower, upper + 1) for lower, upper in
+                                         (self.compiler.int_range(sel.ast["type"]) for sel in edge.selects)]
+                for grd in edge.clock_guards + edge.variable_guards:
+                    self._compile_condition(grd.ast, select_names, compiled_edge.clock_atoms,
+                                            compiled_edge.data_atoms)
+                if edge.sync:
+                    compiled_edge.sync = (self._compile_channel_ref(edge.sync.ast["channel"], select_names),
+                                          edge.sync.ast["op"])
+                compiled_edge.updates = [self.compiler.compile_expression(updt.ast, bound_vars=select_names)
+                                         for updt in edge.updates]
+                compiled_edge.resets = [self._compile_reset(rst.ast, select_names) for rst in edge.resets]
+                proc.out_edges[source_idx].append(compiled_edge)
+            self.processes.append(proc)
+
+    def _compile_condition(self, ast, bound_vars, clock_atoms, data_atoms):
+        """Splits a guard or invariant into clock constraints and data conditions, and compiles them.
+
+        Args:
+            ast: The guard or invariant AST.
+            bound_vars: The names of the bound variables (i.e., of the selects of an edge).
+            clock_atoms: The list to which the clock constraints (left clock, right clock, op, bound) are added.
+            data_atoms: The list to which the compiled data conditions are added.
+        """
+        for atom in _split_conjunction(ast, []):
+            if not self._contains_clock(atom):
+                data_atoms.append(self.compiler.compile_expression(atom, bound_vars=bound_vars))
+                continue
+            clock_atom = None
+            if atom["astType"] == "BinaryExpr" and atom["op"] in _comparison_ops:
+                clock_atom = self._compile_clock_comparison(atom["left"], atom["right"], atom["op"], bound_vars)
+                if clock_atom is None:
+                    clock_atom = self._compile_clock_comparison(atom["right"], atom["left"], _switched_ops[atom["op"]],
+                                                                bound_vars)
+            if clock_atom is None:
+                raise Exception(f'Clock constraint "{atom}" is not supported by the native matcher backend.')
+            clock_atoms.append(clock_atom)
+
+    def _compile_clock_comparison(self, clock_side, bound_side, op, bound_vars):
+        """Compiles a comparison "x op c" or "x - y op c" (or returns None if the comparison has another form)."""
+        if self._contains_clock(bound_side):
+            return None
+        while clock_side["astType"] == "BracketExpr":
+            clock_side = clock_side["expr"]
+        if self._is_clock_ref(clock_side):
+            bound_fn = self.compiler.compile_expression(bound_side, bound_vars=bound_vars)
+            return self._compile_clock_ref(clock_side, bound_vars), None, op, bound_fn
+        if (clock_side["astType"] == "BinaryExpr" and clock_side["op"] == "Sub" and
+                self._is_clock_ref(clock_side["left"]) and self._is_clock_ref(clock_side["right"])):
+            bound_fn = self.compiler.compile_expression(bound_side, bound_vars=bound_vars)
+            return (self._compile_clock_ref(clock_side["left"], bound_vars),
+                    self._compile_clock_ref(clock_side["right"], bound_vars), op, bound_fn)
+        return None
+
+    def _compile_reset(self, ast, bound_vars):
+        """Compiles a clock reset "x = val" into the clock reference and the compiled value."""
+        expr = ast["expr"] if ast["astType"] == "Update" else ast
+        if expr["astType"] != "AssignExpr" or expr["op"] != "Assign" or not self._is_clock_ref(expr["left"]):
+            raise Exception(f'Clock update "{ast}" is not supported by the native matcher backend.')
+        return (self._compile_clock_ref(expr["left"], bound_vars),
+                self.compiler.compile_expression(expr["right"], bound_vars=bound_vars))
+
+    def _compile_clock_ref(self, ast, bound_vars):
+        """Compiles a clock reference into a closure "fn(slots, binding)" returning the DBM index of the clock."""
+        name, index_fns = self._compile_array_ref(ast, bound_vars)
+        if not index_fns:
+            clock = f'sys.{name}'
+            if clock not in self.clock_indices:
+                raise UppaalCCompilerError(f'Clock "{clock}" does not exist.')
+            clock_index = self.clock_indices[clock]
+            return lambda slots, binding: clock_index
+
+        def clock_index_fn(slots, binding):
+            clock = "sys." + name + "".join(f'[{index_fn(slots, *binding)}]' for index_fn in index_fns)
+            if clock not in self.clock_indices:
+                raise UppaalCRuntimeError(f'Clock "{clock}" does not exist.')
+            return self.clock_indices[clock]
+        return clock_index_fn
+
+    def _compile_channel_ref(self, ast, bound_vars):
+        """Compiles a channel reference into the channel name and the compiled array indices."""
+        name, index_fns = self._compile_array_ref(ast, bound_vars)
+        if name not in self.compiler.channels:
+            raise UppaalCCompilerError(f'Channel "{name}" is not declared.')
+        return name, index_fns
+
+    def _compile_array_ref(self, ast, bound_vars):
+        """Compiles a reference to a (clock or channel) array element into the base name and the compiled indices."""
+        while ast["astType"] == "BracketExpr":
+            ast = ast["expr"]
+        index_fns = []
+        while ast["astType"] == "BinaryExpr" and ast["op"] == "ArrayAccess":
+            index_fns.insert(0, self.compiler.compile_expression(ast["right"], bound_vars=bound_vars))
+            ast = ast["left"]
+            while ast["astType"] == "BracketExpr":
+                ast = ast["expr"]
+        return ast["name"], index_fns
+
+    def _is_clock_ref(self, ast):
+        """Checks if an AST references a clock (i.e., a clock variable or a clock array element)."""
+        while ast["astType"] == "BracketExpr" or (ast["astType"] == "BinaryExpr" and ast["op"] == "ArrayAccess"):
+            ast = ast["expr"] if ast["astType"] == "BracketExpr" else ast["left"]
+        return ast["astType"] == "Variable" and ast["name"] in self.compiler.clocks
+
+    def _contains_clock(self, ast):
+        """Checks if an AST contains a clock reference."""
+        if isinstance(ast, list):
+            return any(self._contains_clock(elem) for elem in ast)
+        if not isinstance(ast, dict):
+            return False
+        if ast.get("astType") == "Variable":
+            return ast["name"] in self.compiler.clocks
+        return any(self._contains_clock(val) for val in ast.values() if isinstance(val, (dict, list)))
+
+    ##############
+    # Evaluation #
+    ##############
+    @staticmethod
+    def _channel_key(channel_ref, slots, binding):
+        """Evaluates a compiled channel reference to the channel name and indices."""
+        name, index_fns = channel_ref
+        return name, tuple(index_fn(slots, *binding) for index_fn in index_fns)
+
+    @staticmethod
+    def _clock_constraints(clock_atoms, slots, binding=()):
+        """Evaluates clock constraints to DBM constraints (i, j, entry), i.e., "x_i - x_j (<|<=) c"."""
+        constraints = []
+        for left, right, op, bound_fn in clock_atoms:
+            i = left(slots, binding)
+            j = right(slots, binding) if right is not None else 0
+            bound = bound_fn(slots, *binding)
+            if op in ["LessThan", "LessEqual", "Equal"]:
+                constraints.append((i, j, DBMEntry(bound, '<' if op == "LessThan" else '<=')))
+            if op in ["GreaterThan", "GreaterEqual", "Equal"]:
+                constraints.append((j, i, DBMEntry(-bound, '<' if op == "GreaterThan" else '<=')))
+        return constraints
+
+    @staticmethod
+    def _negated_constraints(constraints):
+        """Negates DBM constraints (i.e., a disjunction of the negations of the single constraints)."""
+        return [(j, i, DBMEntry(-entry.val, '<' if entry.rel == '<=' else '<=')) for i, j, entry in constraints]
+
+    @staticmethod
+    def _constrain(dbm, constraints):
+        """Applies DBM constraints to a DBM in place (without closing it)."""
+        matrix = dbm.matrix
+        for i, j, entry in constraints:
+            if entry < matrix[i][j]:
+                matrix[i][j] = entry
+
+    def _constrained_zone(self, dbm, constraints):
+        """Gets the closed and non-empty copy of a DBM restricted by constraints (or None if the zone is empty)."""
+        if not constraints:
+            return dbm.copy()
+        new_dbm = dbm.copy()
+        self._constrain(new_dbm, constraints)
+        new_dbm.close()
+        return None if _is_zone_empty(new_dbm) else new_dbm
+
+    @staticmethod
+    def _conditions_hold(data_atoms, slots, binding=()):
+        """Checks if all compiled data conditions hold."""
+        for atom in data_atoms:
+            if not atom(slots, *binding):
+                return False
+        return True
+
+    def _compile_observed(self, text):
+        """Compiles an observed variable name (e.g., "g[0]") into an expression."""
+        if text not in self._observed_exprs:
+            self._observed_exprs[text] = self.compiler.compile_expression(self.parser.parse(text, rule_name="Expression"))
+        return self._observed_exprs[text]
+
+    ############
+    # Matching #
+    ############
+    def match(self, observation_data, return_trace=False):
+        """Matches an observation sequence against the traces of the model.
+
+        Args:
+            observation_data: The observation sequence.
+            return_trace: A flag indicating whether the matched trace should be returned.
+
+        Returns:
+            The dict of the matching result ("is_matching"), the timeout flag ("is_timeout"), and the matched trace
+            ("matching_trace").
+        """
+        if not observation_data:
+            raise Exception("The observation sequence is empty.")
+        self.set_observation_data(observation_data)
+
+        init_node = self.finalize(self.init_node())
+        start_nodes = [init_node] if init_node is not None else []
+        matched_nodes, is_timeout = self.explore(start_nodes=start_nodes, find_first=True)
+        if not matched_nodes:
+            return {"is_matching": False, "is_timeout": is_timeout, "matching_trace": None}
+        matching_trace = self._create_trace(matched_nodes[0]) if return_trace else None
+        return {"is_matching": True, "is_timeout": False, "matching_trace": matching_trace}
+
+    def explore(self, start_nodes, find_first=False):
+        """Explores the state space from given nodes until all currently set observations are matched.
+
+        Args:
+            start_nodes: The (finalized) start nodes.
+            find_first: Choose whether the exploration stops at the first node which matches all observations.
+
+        Returns:
+            The list of nodes which match all observations (which are not explored further), and the timeout flag.
+        """
+        start_time = time.perf_counter()
+        passed = {}
+        matched_passed = {}
+        matched_nodes = []
+        waiting = [node for node in start_nodes if self._add_to_passed(passed, node)]
+
+        steps = 0
+        while waiting:
+            steps += 1
+            if self.timeout is not None and steps % 100 == 0 and time.perf_counter() - start_time > self.timeout:
+                return matched_nodes, True
+
+            node = waiting.pop()
+            for succ in self._successors(node):
+                if succ.phase == "match" and succ.index == self.obs_count:
+                    if self._add_to_passed(matched_passed, succ):
+                        matched_nodes.append(succ)
+                        if find_first:
+                            return matched_nodes, False
+                elif self._add_to_passed(passed, succ):
+                    waiting.append(succ)
+
+        # Nodes which are included in later matched zones were removed from the passed list
+        matched_nodes = [node for node in matched_nodes
+                         if any(zone is node.dbm for zone in matched_passed[node.discrete_key()])]
+        return matched_nodes, False
+
+    def set_observation_data(self, observation_data):
+        """Sets the observation sequence which should be matched.
+
+        Args:
+            observation_data: The observation sequence.
+        """
+        self.obs_count = 0
+        self.obs_offset = 0
+        self.obs_times = []
+        self.obs_checks = []
+        for data_point in observation_data:
+            self.add_observation(data_point)
+
+    def add_observation(self, data_point):
+        """Appends an observation to the observation sequence, compiling it into a time bound and variable and
+           location checks.
+
+        Args:
+            data_point: The observation data point.
+        """
+        obs_idx = self.obs_count
+        is_partial = self.config.get("support_partial_matching", False)
+        deviations = self.config.get("allowed_deviations", {}) or {}
+
+        var_checks = []
+        for var_name, val in data_point["vars"].items():
+            if val in [None, "NOB"]:
+                if not is_partial:
+                    raise Exception(f'Observation {obs_idx} has no value for "{var_name}" '
+                                    f'(partial matching is disabled).')
+                continue
+            var_checks.append((self._compile_observed(var_name), val, deviations.get(var_name, 0) or 0))
+        loc_checks = []
+        for proc_name, loc_data in data_point["locs"].items():
+            if loc_data["name"] in [None, "NOB"]:
+                if not is_partial:
+                    raise Exception(f'Observation {obs_idx} has no location for "{proc_name}" '
+                                    f'(partial matching is disabled).')
+                continue
+            if proc_name not in self.proc_indices:
+                raise Exception(f'Process "{proc_name}" does not exist.')
+            loc_checks.append((self.proc_indices[proc_name], loc_data["name"]))
+
+        self.obs_times.append(data_point["t"])
+        self.obs_checks.append((var_checks, loc_checks))
+        self.obs_count += 1
+
+    def discard_observations(self):
+        """Discards the time bounds and checks of all observations added so far (e.g., if all explored nodes have
+           already matched them), keeping only the observations added afterwards. The observation indices of nodes
+           are not changed.
+        """
+        self.obs_offset = self.obs_count
+        self.obs_times = []
+        self.obs_checks = []
+
+    def init_node(self):
+        """Creates the initial node (with all clocks set to 0)."""
+        locs = tuple(proc.init_idx for proc in self.processes)
+        loc_names = tuple(proc.loc_names[proc.init_idx] for proc in self.processes)
+        return _Node(locs=locs, loc_names=loc_names, variables=self.compiler.new_slots(),
+                     phase="delay" if self.is_shifted else "match", index=0,
+                     dbm=DBM(clocks=self.clocks, add_ref_clock=False, zero_init=True))
+
+    def _add_to_passed(self, passed, node):
+        """Adds a node to the passed list (or returns False if it is included in an already passed zone)."""
+        zones = passed.setdefault(node.discrete_key(), [])
+        for zone in zones:
+            if zone.includes(node.dbm):
+                return False
+        zones[:] = [zone for zone in zones if not node.dbm.includes(zone)]
+        zones.append(node.dbm)
+        return True
+
+    def _invariant_constraints(self, node):
+        """Gets the DBM constraints of the invariants of a node (or None if a data condition is violated)."""
+        constraints = []
+        for proc, loc_idx in zip(self.processes, node.locs):
+            if not self._conditions_hold(proc.inv_data_atoms[loc_idx], node.variables):
+                return None
+            constraints.extend(self._clock_constraints(proc.inv_clock_atoms[loc_idx], node.variables))
+        tt = self.clock_indices[MATCHER_CLOCK]
+        if node.phase == "delay":
+            constraints.append((tt, 0, DBMEntry(self.max_initial_delay, '<=')))
+        elif node.index < self.obs_count:
+            constraints.append((tt, 0, DBMEntry(self.obs_times[node.index - self.obs_offset] + self.obs_time_deviation, '<=')))
+        return constraints
+
+    def finalize(self, node):
+        """Applies the invariants and (if allowed) the delay to the zone of a node (or returns None if it is empty)."""
+        constraints = self._invariant_constraints(node)
+        if constraints is None:
+            return None
+        dbm = self._constrained_zone(node.dbm, constraints)
+        if dbm is None:
+            return None
+        if self._can_delay(node):
+            dbm.delay_future()
+            self._constrain(dbm, constraints)
+            dbm.close()
+        node.dbm = dbm
+        return node
+
+    def _can_delay(self, node):
+        """Checks if time may pass in a node (i.e., no committed or urgent location, and no enabled urgent sync)."""
+        for proc, loc_idx in zip(self.processes, node.locs):
+            if proc.committed[loc_idx] or proc.urgent[loc_idx]:
+                return False
+        if self.has_urgent_channels:
+            _, senders, receivers = self._enabled_edges(node, only_urgent=True)
+            for chan_key, chan_senders in senders.items():
+                if self.compiler.channels[chan_key[0]]["broadcast"]:
+                    return False
+                for sender in chan_senders:
+                    if any(receiver[0].proc_idx != sender[0].proc_idx for receiver in receivers.get(chan_key, [])):
+                        return False
+        return True
+
+    def _enabled_edges(self, node, only_urgent=False):
+        """Gets all edges (with select values) whose data guards hold, grouped into internal edges and senders and
+           receivers per channel."""
+        internal = []
+        senders = {}
+        receivers = {}
+        for proc, loc_idx in zip(self.processes, node.locs):
+            for edge in proc.out_edges[loc_idx]:
+                if only_urgent and edge.sync is None:
+                    continue
+                for binding in itertools.product(*edge.selects):
+                    if not self._conditions_hold(edge.data_atoms, node.variables, binding):
+                        continue
+                    if edge.sync is None:
+                        internal.append((edge, binding))
+                        continue
+                    chan_key = self._channel_key(edge.sync[0], node.variables, binding)
+                    if only_urgent and not self.compiler.channels[chan_key[0]]["urgent"]:
+                        continue
+                    target = senders if edge.sync[1] == "!" else receivers
+                    target.setdefault(chan_key, []).append((edge, binding))
+        return internal, senders, receivers
+
+    def _successors(self, node):
+        """Generates all successor nodes of a node (i.e., of matcher actions and model actions)."""
+        committed_procs = {i for i, (proc, loc_idx) in enumerate(zip(self.processes, node.locs))
+                           if proc.committed[loc_idx]}
+
+        # Matcher actions (i.e., the start of matching after an initial delay, and the check of an observation)
+        if not committed_procs:
+            tt = self.clock_indices[MATCHER_CLOCK]
+            if node.phase == "delay":
+                dbm = node.dbm.copy()
+                dbm.reset(MATCHER_CLOCK, 0)
+                succ = self.finalize(_Node(locs=node.locs, loc_names=node.loc_names, variables=node.variables,
+                                            phase="match", index=0, dbm=dbm, parent=node))
+                if succ is not None:
+                    yield succ
+            elif node.index < self.obs_count and self._observation_holds(node):
+                time_bound = self.obs_times[node.index - self.obs_offset] - self.obs_time_deviation
+                dbm = self._constrained_zone(node.dbm, [(0, tt, DBMEntry(-time_bound, '<='))])
+                if dbm is not None:
+                    succ = _Node(locs=node.locs, loc_names=node.loc_names, variables=node.variables, phase="match",
+                                 index=node.index + 1, dbm=dbm, parent=node)
+                    if succ.index == self.obs_count:
+                        yield succ
+                    else:
+                        succ = self.finalize(succ)
+                        if succ is not None:
+                            yield succ
+
+        # Model actions (i.e., internal edges, binary synchronizations, and broadcast synchronizations)
+        internal, senders, receivers = self._enabled_edges(node)
+        actions = [([participant], []) for participant in internal]
+        for chan_key, chan_senders in senders.items():
+            chan_receivers = receivers.get(chan_key, [])
+            if self.compiler.channels[chan_key[0]]["broadcast"]:
+                for sender in chan_senders:
+                    actions.extend(self._broadcast_actions(sender, chan_receivers, node))
+            else:
+                for sender in chan_senders:
+                    for receiver in chan_receivers:
+                        if receiver[0].proc_idx != sender[0].proc_idx:
+                            actions.append(([sender, receiver], []))
+
+        for participants, excluded_constraints in actions:
+            if committed_procs and not any(edge.proc_idx in committed_procs for edge, _ in participants):
+                continue
+            yield from self._action_successors(node, participants, excluded_constraints)
+
+    def _broadcast_actions(self, sender, receivers, node):
+        """Gets all broadcast actions of a sender, i.e., combinations of participating receivers (one edge per
+           process), where the clock guards of the edges of non-participating receivers must not be satisfied."""
+        receivers_per_proc = {}
+        for receiver in receivers:
+            if receiver[0].proc_idx != sender[0].proc_idx:
+                receivers_per_proc.setdefault(receiver[0].proc_idx, []).append(receiver)
+
+        options_per_proc = []
+        for proc_idx in sorted(receivers_per_proc):
+            proc_receivers = receivers_per_proc[proc_idx]
+            options = [(receiver, None) for receiver in proc_receivers]
+            # Non-participation is only possible if the clock guards of all enabled receiving edges are violated
+            negations = []
+            for edge, binding in proc_receivers:
+                constraints = self._clock_constraints(edge.clock_atoms, node.variables, binding)
+                if not constraints:
+                    negations = None
+                    break
+                negations.append(self._negated_constraints(constraints))
+            if negations is not None:
+                options.append((None, negations))
+            options_per_proc.append(options)
+
+        actions = []
+        for combination in itertools.product(*options_per_proc):
+            participants = [sender] + [receiver for receiver, _ in combination if receiver is not None]
+            excluded_constraints = [negations for _, negations in combination if negations is not None]
+            actions.append((participants, [alternatives for negations in excluded_constraints
+                                           for alternatives in negations]))
+        return actions
+
+    def _action_successors(self, node, participants, excluded_constraints):
+        """Generates the successor nodes of a model action.
+
+        Args:
+            node: The source node.
+            participants: The list of participating (edge, select binding) pairs (sender first).
+            excluded_constraints: A list of constraint alternatives, of which at least one must hold per entry (i.e.,
+                                  the negated clock guards of non-participating broadcast receivers).
+        """
+        constraints = []
+        for edge, binding in participants:
+            constraints.extend(self._clock_constraints(edge.clock_atoms, node.variables, binding))
+        guard_dbm = self._constrained_zone(node.dbm, constraints)
+        if guard_dbm is None:
+            return
+
+        zones = [guard_dbm]
+        for alternatives in excluded_constraints:
+            zones = [zone for zone in (self._constrained_zone(dbm, [alternative])
+                                       for dbm in zones for alternative in alternatives) if zone is not None]
+
+        for dbm in zones:
+            variables = list(node.variables)
+            locs = list(node.locs)
+            loc_names = list(node.loc_names)
+            edges = {}
+            try:
+                for edge, binding in participants:
+                    self._apply_updates(edge, binding, variables, dbm)
+            except UppaalCRuntimeError:
+                # Updates which assign values out of the declared ranges (or access arrays out of bounds) are errors
+                # in Uppaal, so that the action has no successor
+                continue
+            for edge, binding in participants:
+                proc = self.processes[edge.proc_idx]
+                locs[edge.proc_idx] = edge.target
+                if edge.source != edge.target and proc.loc_names[edge.target] is not None:
+                    loc_names[edge.proc_idx] = proc.loc_names[edge.target]
+                edges[proc.name] = edge.edge
+            succ = self.finalize(_Node(locs=tuple(locs), loc_names=tuple(loc_names), variables=variables,
+                                        phase=node.phase, index=node.index, dbm=dbm, parent=node, edges=edges))
+            if succ is not None:
+                yield succ
+
+    def _apply_updates(self, edge, binding, variables, dbm):
+        """Applies the updates and clock resets of an edge to the variables and the DBM of a successor in place."""
+        for updt in edge.updates:
+            updt(variables, *binding)
+        for clock_ref, value_fn in edge.resets:
+            dbm.reset(self.clocks[clock_ref(variables, binding)], value_fn(variables, *binding))
+
+    def _observation_holds(self, node):
+        """Checks if the variables and locations of a node match the current observation."""
+        var_checks, loc_checks = self.obs_checks[node.index - self.obs_offset]
+        for var_expr, val, deviation in var_checks:
+            if abs(var_expr(node.variables) - val) > deviation:
+                return False
+        for proc_idx, loc_name in loc_checks:
+            if node.loc_names[proc_idx] != loc_name:
+                return False
+        return True
+
+    #####################
+    # Window Pre-Screen #
+    #####################
+    def match_window(self, window_data, is_initial=False, max_states=1000):
+        """Matches a window (i.e., a contiguous segment) of an observation sequence from a relaxed initial state.
+
+        Unless the window is the initial one, the window is matched from all states which are consistent with its
+        first observation: the locations are unconstrained, the variables range over their declared domains (as far as
+        they are not observed), the clocks are free, and the time is shifted so that the window starts at 0. As the
+        relaxed initial states include all states reachable at the time of the first observation, a non-matching window
+        implies that the whole observation sequence does not match (the converse does not hold).
+
+        Args:
+            window_data: The observation data points of the window.
+            is_initial: Choose whether the window starts with the first observation (so that it is matched from the
+                        initial state of the model).
+            max_states: The maximal number of relaxed initial states (if exceeded, the window is inconclusive).
+
+        Returns:
+            The window result, i.e., "rejected", "consistent", or "inconclusive" (e.g., on timeout).
+        """
+        if is_initial:
+            self.set_observation_data(window_data)
+            init_node = self.finalize(self.init_node())
+            start_nodes = [init_node] if init_node is not None else []
+            matched_nodes, is_timeout = self.explore(start_nodes=start_nodes, find_first=True)
+        else:
+            # The relative times of the observations deviate by up to twice the allowed time deviation
+            start_time = window_data[0]["t"]
+            shifted_data = [dict(data_point, t=data_point["t"] - start_time) for data_point in window_data]
+            obs_time_deviation = self.obs_time_deviation
+            self.obs_time_deviation = 2 * obs_time_deviation
+            try:
+                self.set_observation_data(shifted_data)
+                start_nodes = self.relaxed_init_nodes(window_data, max_states=max_states)
+                if start_nodes is None:
+                    return "inconclusive"
+                matched_nodes, is_timeout = self.explore(start_nodes=start_nodes, find_first=True)
+            finally:
+                self.obs_time_deviation = obs_time_deviation
+
+        if matched_nodes:
+            return "consistent"
+        return "inconclusive" if is_timeout else "rejected"
+
+    def relaxed_init_nodes(self, window_data, max_states=1000):
+        """Creates the (finalized) relaxed initial nodes of a window (see "match_window").
+
+        Args:
+            window_data: The observation data points of the window.
+            max_states: The maximal number of relaxed initial states.
+
+        Returns:
+            The list of relaxed initial nodes, or None if the number of relaxed initial states exceeds the maximum (or a
+            variable has no integer domain).
+        """
+        first_data_point = window_data[0]
+        deviations = self.config.get("allowed_deviations", {}) or {}
+
+        # Observed variables are restricted to the observed values (within the allowed deviations), whereas observed
+        # expressions which are no variable elements (e.g., "a[i]") do not restrict the relaxed states
+        observed_ranges = {}
+        for var_name, val in first_data_point["vars"].items():
+            if val in [None, "NOB"]:
+                continue
+            slot_index = self.compiler.slot_indices.get("".join(var_name.split()))
+            if slot_index is not None:
+                deviation = deviations.get(var_name, 0) or 0
+                observed_ranges[slot_index] = (val - deviation, val + deviation)
+
+        # Constants keep their values, and all other variables range over the value ranges of their types
+        initial_slots = self.compiler.new_slots()
+        slot_ranges = []
+        for slot_index, slot_type in enumerate(self.compiler.slot_types):
+            if slot_index in self.constant_slots:
+                slot_ranges.append([initial_slots[slot_index]])
+                continue
+            lower, upper = observed_ranges.get(slot_index, (-float('inf'), float('inf')))
+            if slot_type.kind in ["int", "bool"]:
+                lower, upper = max(lower, slot_type.lower), min(upper, slot_type.upper)
+            elif slot_index not in observed_ranges:
+                return None
+            slot_ranges.append(range(int(lower), int(upper) + 1))
+
+        # Locations are unconstrained, and the last named locations are only relevant if observed in the window
+        observed_procs = {proc_name for data_point in window_data for proc_name, loc_data in data_point["locs"].items()
+                          if loc_data["name"] not in [None, "NOB"]}
+        loc_options = []
+        for proc in self.processes:
+            if proc.name not in observed_procs:
+                loc_options.append([(loc_idx, None) for loc_idx in range(len(proc.locations))])
+                continue
+            observed_name = first_data_point["locs"].get(proc.name, {}).get("name")
+            if observed_name in [None, "NOB"]:
+                loc_names = sorted({name for name in proc.loc_names if name is not None}) + [None]
+            else:
+                loc_names = [observed_name]
+            loc_options.append([(loc_idx, name) for loc_idx in range(len(proc.locations)) for name in loc_names])
+
+        state_count = 1
+        for options in slot_ranges + loc_options:
+            state_count *= len(options)
+        if state_count > max_states:
+            return None
+
+        tt = self.clock_indices[MATCHER_CLOCK]
+        dbm = DBM(clocks=self.clocks, add_ref_clock=False)
+        for i in range(1, len(self.clocks)):
+            dbm.matrix[0][i] = DBMEntry(0, '<=')
+        dbm.matrix[tt][0] = DBMEntry(0, '<=')
+        dbm.close()
+
+        nodes = []
+        for loc_combination in itertools.product(*loc_options):
+            locs = tuple(loc_idx for loc_idx, _ in loc_combination)
+            loc_names = tuple(name for _, name in loc_combination)
+            for vals in itertools.product(*slot_ranges):
+                node = self.finalize(_Node(locs=locs, loc_names=loc_names, variables=list(vals),
+                                           phase="match", index=0, dbm=dbm.copy()))
+                if node is not None:
+                    nodes.append(node)
+        return nodes
+
+    #########
+    # Trace #
+    #########
+    def _create_trace(self, final_node):
+        """Creates the matched trace in the domain of the model (i.e., without matcher states and clocks).
+
+        Consecutive nodes connected by matcher actions are merged into a single state (as for traces of verifyta).
+        """
+        nodes = []
+        node = final_node
+        while node is not None:
+            nodes.insert(0, node)
+            node = node.parent
+
+        states = []
+        edges_between_states = []
+        for node in nodes:
+            state = self.create_state(node)
+            if states and node.edges is None:
+                dbm_union(states[-1].dbm, state.dbm)
+                continue
+            if node.edges is not None:
+                edges_between_states.append(node.edges)
+            states.append(state)
+
+        transitions = [Transition(source_state=s_1, target_state=s_2, triggered_edges=edges)
+                       for s_1, s_2, edges in zip(states[:-1], states[1:], edges_between_states)]
+        return Trace(init_state=states[0], transitions=transitions)
+
+    def create_state(self, node):
+        """Creates the state of a node in the domain of the model (i.e., without matcher clocks).
+
+        Args:
+            node: The node.
+
+        Returns:
+            The state.
+        """
+        dbm = node.dbm.copy()
+        dbm.update_clocks(clocks=self.clocks[:-1])
+        locs = {proc.name: proc.locations[loc_idx] for proc, loc_idx in zip(self.processes, node.locs)}
+        variables = {f'sys.{elem_name}': int(val) for slot_index, (elem_name, val)
+                     in enumerate(zip(self.compiler.slot_names, node.variables)) if slot_index not in self.constant_slots}
+        return State(locs=locs, dbm=dbm, variables=variables)
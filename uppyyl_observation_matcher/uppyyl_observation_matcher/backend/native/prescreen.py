@@ -0,0 +1,106 @@
+"""A sound pre-screen which rejects non-matching observation sequences based on independent window checks.
+
+A matching observation sequence has every contiguous window matchable from some reachable state. The pre-screen splits
+the sequence into K overlapping windows, and matches each window from a relaxed initial state (see
+"NativeMatcher.match_window"). If any window does not match, the whole sequence does not match. Otherwise, the result is
+inconclusive, and the full matching run is still required.
+"""
+
+from uppyyl_observation_matcher.backend.native.native_matcher import NativeMatcher
+
+
+def split_into_windows(observation_data, window_count, overlap=1):
+    """Splits an observation sequence into overlapping windows (i.e., contiguous segments).
+
+    Args:
+        observation_data: The observation sequence.
+        window_count: The (maximal) number of windows.
+        overlap: The number of observation data points shared by consecutive windows.
+
+    Returns:
+        The list of (start index, window data) tuples.
+    """
+    observation_count = len(observation_data)
+    window_count = max(1, min(window_count, observation_count))
+    length = -(-(observation_count + (window_count - 1) * overlap) // window_count)
+    step = max(1, length - overlap)
+
+    windows = []
+    start = 0
+    while True:
+        windows.append((start, observation_data[start:start + length]))
+        if start + length >= observation_count:
+            break
+        start += step
+    return windows
+
+
+def prescreen_observation(matcher, observation_data, window_count, overlap=1, max_states=1000):
+    """Pre-screens an observation sequence by matching its windows one after another.
+
+    Args:
+        matcher: The native matcher.
+        observation_data: The observation sequence.
+        window_count: The number of windows.
+        overlap: The number of observation data points shared by consecutive windows.
+        max_states: The maximal number of relaxed initial states per window.
+
+    Returns:
+        The pre-screen result (see "summarize_window_results").
+    """
+    window_results = []
+    for start, window_data in split_into_windows(observation_data, window_count=window_count, overlap=overlap):
+        window_res = matcher.match_window(window_data, is_initial=(start == 0), max_states=max_states)
+        window_results.append((start, window_res))
+        if window_res == "rejected":
+            break
+    return summarize_window_results(window_results)
+
+
+def summarize_window_results(window_results):
+    """Summarizes the results of window checks.
+
+    Args:
+        window_results: The list of (start index, window result) tuples.
+
+    Returns:
+        The dict of the rejection flag ("is_rejected"), the start index of the first rejected window
+        ("rejected_window", or None), and the window results ("windows").
+    """
+    rejected_starts = [start for start, window_res in window_results if window_res == "rejected"]
+    return {
+        "is_rejected": bool(rejected_starts),
+        "rejected_window": min(rejected_starts) if rejected_starts else None,
+        "windows": [{"start": start, "result": window_res} for start, window_res in window_results],
+    }
+
+
+###########
+# Workers #
+###########
+_window_matcher = None
+
+
+def init_window_worker(config, model, timeout=None):
+    """Initializes a worker process of the pre-screen with a native matcher.
+
+    Args:
+        config: The matcher configuration.
+        model: The preprocessed model.
+        timeout: A timeout (in seconds) for the matching of a single window.
+    """
+    global _window_matcher
+    _window_matcher = NativeMatcher(config=config, model=model, timeout=timeout)
+
+
+def match_window_task(args):
+    """Matches a window with the native matcher of the worker process.
+
+    Args:
+        args: The (start index, window data, max states) tuple.
+
+    Returns:
+        The (start index, window result) tuple.
+    """
+    start, window_data, max_states = args
+    return start, _window_matcher.match_window(window_data, is_initial=(start == 0), max_states=max_states)
@@ -12,6 +12,7 @@ from uppyyl_observation_matcher.backend.data.transition import Transition
 from uppyyl_observation_matcher.backend.transformer.model.concrete.trace_generator_model_transformer import \
     TraceGeneratorModelTransformer
 from uppyyl_observation_matcher.backend.interface.verifyta import VerifyTAInterface
+from uppyyl_observation_matcher.backend.logger.profiler import profile_run
 from uppyyl_observation_matcher.backend.transformer.observation.concrete.generated_observation_transformer import \
     GeneratedObservationTransformer
 from uppyyl_observation_matcher.backend.transformer.observation.concrete.negative_observation_transformer import \
@@ -29,28 +30,34 @@ class ObservationGenerator:
         self.set_model(model=model)
         self.trace_transformer = None
 
-    def generate(self):
+    def generate(self, profile=None):
         """Generates a single observation sequence of a model.
 
+        Args:
+            profile: An optional profile option (True, or a directory path) for writing a cProfile profile of the
+                     generation (default: the "profile" config entry).
+
         Returns:
             The generated observation.
         """
-        if not self.trace_generator_model:
-            self.create_trace_generator_model()
-        is_success, symbolic_trace = self.generate_trace()
-        self.trace_transformer.transform(symbolic_trace)
-        process_names = list(symbolic_trace.init_state.locs.keys())
+        profile = profile if profile is not None else self.config.get("profile")
+        with profile_run("generate", profile=profile, output_dir_path=self.config.get("output_dir_path")):
+            if not self.trace_generator_model:
+                self.create_trace_generator_model()
+            is_success, symbolic_trace = self.generate_trace()
+            self.trace_transformer.transform(symbolic_trace)
+            process_names = list(symbolic_trace.init_state.locs.keys())
 
-        semi_concrete_trace = extract_deterministic_trace(config=self.config, symbolic_trace=symbolic_trace)
-        raw_data_trace = extract_data_points_from_deterministic_trace(deterministic_trace=semi_concrete_trace)
+            semi_concrete_trace = extract_deterministic_trace(config=self.config, symbolic_trace=symbolic_trace)
+            raw_data_trace = extract_data_points_from_deterministic_trace(deterministic_trace=semi_concrete_trace)
 
-        observation_transformer = GeneratedObservationTransformer(config=self.config, process_names=process_names)
-        adapted_data_trace = copy.deepcopy(raw_data_trace)
-        observation_transformer.transform(adapted_data_trace)
+            observation_transformer = GeneratedObservationTransformer(config=self.config, process_names=process_names)
+            adapted_data_trace = copy.deepcopy(raw_data_trace)
+            observation_transformer.transform(adapted_data_trace)
 
-        observation_data = adapted_data_trace
+            observation_data = adapted_data_trace
 
-        return observation_data
+            return observation_data
 
     def generate_negative(self):
         """Generates a negative observation (i.e., an observation that is not contained in the model).
@@ -157,7 +164,7 @@ def extract_deterministic_trace(config, symbolic_trace):
     do_print = False
     current_dbm = symbolic_trace.init_state.dbm.copy()
     concrete_states = []
-    global_tr_clock_index = current_dbm.clocks.index(f'sys._TR')
+    global_tr_clock_index = current_dbm.clock_index(f'sys._TR')
 
     for transition in symbolic_trace.transitions:
         source_dbm = transition.source_state.dbm
@@ -201,7 +208,7 @@ def extract_deterministic_trace(config, symbolic_trace):
                 print(f'Selected leaving time: {selected_leaving_time}')
 
             # Apply the selected leaving time as upper bound to the current DBM to get the semi-symbolic state
-            current_dbm.conjugate(DBMConstraint(constr_text=f'sys._TG <= {selected_leaving_time}'))
+            current_dbm.conjugate(DBMConstraint.from_parts("sys._TG", None, "<=", selected_leaving_time))
         current_dbm.close()
         assert not current_dbm.is_empty(), f'The following DBM is empty:\n{current_dbm}'
         assert source_dbm.includes(current_dbm), f'The following DBM:\n{source_dbm}\ndoes not include:\n{current_dbm}'
@@ -211,11 +218,8 @@ def extract_deterministic_trace(config, symbolic_trace):
         concrete_state.dbm = current_dbm.copy()
         concrete_states.append(concrete_state)
 
-        # Set the current DBM to the helper DBM (to which the guards were already applied), and apply the selected
-        # leaving time as upper bound here as well
+        # Set the current DBM to the helper DBM (to which the guards were already applied)
         current_dbm = helper_dbm
-        if selected_leaving_time:
-            current_dbm.conjugate(DBMConstraint(constr_text=f'sys._TG <= {selected_leaving_time}'))
 
         # Determine the clocks that are reset during the transition
         relevant_reset_clock_indices = [i for i in range(2, len(target_dbm.matrix))
@@ -223,11 +227,14 @@ def extract_deterministic_trace(config, symbolic_trace):
                                             target_dbm.matrix[global_tr_clock_index][i].val == 0)]
         relevant_reset_clocks = [source_dbm.clocks[i] for i in relevant_reset_clock_indices]
 
-        # Apply selected leaving time as lower bound for transitions, perform resets accordingly, perform delay,
-        # and intersect with the original target DBM to include the invariant constraints of the target locations
+        # Apply the selected leaving time as upper and lower bound for transitions (closing the DBM once), perform
+        # resets accordingly, perform delay, and intersect with the original target DBM to include the invariant
+        # constraints of the target locations
+        leaving_time_constraints = []
         if selected_leaving_time:
-            current_dbm.conjugate(DBMConstraint(constr_text=f'sys._TG >= {selected_leaving_time}'))
-        current_dbm.close()
+            leaving_time_constraints = [DBMConstraint.from_parts("sys._TG", None, "<=", selected_leaving_time),
+                                        DBMConstraint.from_parts("sys._TG", None, ">=", selected_leaving_time)]
+        current_dbm.conjugate_all(leaving_time_constraints, close=True)
         if do_print:
             print(f'Current DBM after TG lower bound (and close):\n{current_dbm}')
         assert not current_dbm.is_empty(), f'The following DBM is empty:\n{current_dbm}'
@@ -0,0 +1,251 @@
+"""A static validator which rejects observation sequences that are impossible for a model, without any matching run.
+
+The validator derives the following static information from the model ASTs once:
+    - the value ranges of all variable elements (from the declared types, e.g., "int[0,5]"),
+    - the initial values of all variable elements which are never assigned (i.e., which are constant over all traces),
+    - the names of the (named) locations of each process,
+    - the reachability index of the location graph of each template (i.e., its reflexive-transitive closure, stored as
+      one bitset per location).
+
+An observation sequence is rejected if a data point has a time before 0 or before the previous data point (within the
+allowed time deviation), a variable value outside of the declared range of the variable, a value of a never-assigned
+variable other than its initial value, or a location which does not exist in the process (all within the allowed
+deviations). It is also rejected if the observed locations of a process are not a walk in the location graph of its
+template, i.e., if an observed location is not reachable from the previously observed location (or the initial
+location), ignoring all guards and intermediate steps. Observed variables or processes which cannot be resolved are not
+checked (i.e., the validation is sound, but not complete).
+"""
+
+from uppaal_c_language.backend.evaluators.uppaal_c_compiler import UppaalCCompiler, UppaalCCompilerError, \
+    UppaalCRuntimeError
+
+_place_ops = ["ArrayAccess", "Dot"]
+_assign_expr_types = ["AssignExpr", "PreIncrAssignExpr", "PostIncrAssignExpr", "PreDecrAssignExpr",
+                      "PostDecrAssignExpr"]
+
+
+def _root_variable_name(ast):
+    """Gets the name of the variable accessed by an assignable expression (e.g., "a" for "a[i].f")."""
+    while ast["astType"] == "BracketExpr" or (ast["astType"] == "BinaryExpr" and ast["op"] in _place_ops):
+        ast = ast["expr"] if ast["astType"] == "BracketExpr" else ast["left"]
+    return ast["name"] if ast["astType"] == "Variable" else None
+
+
+def _collect_assigned_names(ast, names):
+    """Collects the names of all variables which are (potentially) assigned in an AST.
+
+    Variables passed to functions are considered as assigned, as they may be bound to reference parameters.
+    """
+    if isinstance(ast, list):
+        for elem in ast:
+            _collect_assigned_names(elem, names)
+        return names
+    if not isinstance(ast, dict):
+        return names
+
+    ast_type = ast.get("astType")
+    if ast_type == "AssignExpr":
+        names.add(_root_variable_name(ast["left"]))
+    elif ast_type in _assign_expr_types:
+        names.add(_root_variable_name(ast["expr"]))
+    elif ast_type == "FuncCallExpr":
+        for arg in ast["args"]:
+            names.add(_root_variable_name(arg))
+    for val in ast.values():
+        _collect_assigned_names(val, names)
+    return names
+
+
+class LocationReachability:
+    """The reachability index of the location graph of a template (ignoring guards, invariants and synchronizations)."""
+
+    def __init__(self, template):
+        """Initializes LocationReachability.
+
+        Args:
+            template: The template.
+        """
+        locations = list(template.locations.values())
+        loc_indices = {id(loc): i for i, loc in enumerate(locations)}
+        self.name_indices = {loc.name: i for i, loc in enumerate(locations) if loc.name}
+        self.init_idx = loc_indices[id(template.init_loc)]
+
+        # Each location reaches itself and its direct successors; the closure is built by Warshall's algorithm
+        self.reach = [1 << i for i in range(len(locations))]
+        for i, loc in enumerate(locations):
+            for edge in loc.out_edges.values():
+                self.reach[i] |= 1 << loc_indices[id(edge.target)]
+        for k in range(len(locations)):
+            bit_k, reach_k = 1 << k, self.reach[k]
+            for i in range(len(locations)):
+                if self.reach[i] & bit_k:
+                    self.reach[i] |= reach_k
+
+    def is_reachable(self, source_idx, target_idx):
+        """Checks if a location is reachable from another location (in zero or more steps).
+
+        Args:
+            source_idx: The index of the source location.
+            target_idx: The index of the target location.
+
+        Returns:
+            True if the target location is reachable, False otherwise.
+        """
+        return bool(self.reach[source_idx] >> target_idx & 1)
+
+
+class ObservationValidator:
+    """A static validator of observation sequences."""
+
+    def __init__(self, config, model):
+        """Initializes ObservationValidator.
+
+        Args:
+            config: The matcher configuration (i.e., the enabled matching features and allowed deviations).
+            model: The preprocessed model.
+        """
+        self.config = config
+        self.model = model
+        self.var_ranges = {}
+        self.var_constants = {}
+        self.loc_names = {}
+        self.loc_reachability = {}
+
+        self._derive_variable_data()
+        self._derive_location_data()
+
+    def _derive_variable_data(self):
+        """Derives the value ranges and the constant values of all variable elements."""
+        sys_decls = [decl for decl in self.model.system_declaration.ast["decls"] if decl["astType"] != "Instantiation"]
+        try:
+            compiler = UppaalCCompiler(decls=self.model.declaration.ast["decls"] + sys_decls)
+        except (UppaalCCompilerError, UppaalCRuntimeError):
+            # Variables are not checked if the declarations cannot be compiled
+            return
+
+        assigned_names = set()
+        _collect_assigned_names(self.model.declaration.ast, assigned_names)
+        _collect_assigned_names(sys_decls, assigned_names)
+        for tmpl in self.model.templates.values():
+            _collect_assigned_names(tmpl.declaration.ast, assigned_names)
+            for edge in tmpl.edges.values():
+                # Updates which contain clocks (e.g., "x = k++") are parsed as clock resets
+                _collect_assigned_names([updt.ast for updt in [*edge.updates, *edge.resets]], assigned_names)
+
+        initial_slots = compiler.new_slots()
+        for index, (elem_name, elem_type) in enumerate(zip(compiler.slot_names, compiler.slot_types)):
+            if elem_type.kind in ["int", "bool"]:
+                self.var_ranges[elem_name] = (elem_type.lower, elem_type.upper)
+            root_name = elem_name.split("[", 1)[0].split(".", 1)[0]
+            if root_name not in assigned_names:
+                self.var_constants[elem_name] = initial_slots[index]
+
+    def _derive_location_data(self):
+        """Derives the names of the named locations and the location reachability indices of all processes."""
+        sys_decl_ast = self.model.system_declaration.ast
+        inst_templates = {decl["instanceName"]: decl["templateName"] for decl in sys_decl_ast["decls"]
+                          if decl["astType"] == "Instantiation"}
+        tmpl_reachability = {tmpl.name: LocationReachability(tmpl) for tmpl in self.model.templates.values()}
+        for proc_names in sys_decl_ast["systemDecl"]["processNames"]:
+            for proc_name in proc_names:
+                # A process is either an instantiation of a template, or a template without parameters
+                tmpl_name = inst_templates.get(proc_name, proc_name)
+                if tmpl_name in tmpl_reachability:
+                    self.loc_reachability[proc_name] = tmpl_reachability[tmpl_name]
+                    self.loc_names[proc_name] = set(tmpl_reachability[tmpl_name].name_indices)
+
+    def validate(self, observation_data):
+        """Validates an observation sequence.
+
+        Args:
+            observation_data: The observation sequence.
+
+        Returns:
+            The dict of the validation result ("is_valid"), the index of the first impossible data point ("index", or
+            None), the reason of the rejection ("reason", or None), and the impossible location successions per process
+            ("processes", see "check_location_walks").
+        """
+        deviations = self.config.get("allowed_deviations", {}) or {}
+        time_deviation = deviations.get("t", 0) or 0
+        walk_rejections = self.check_location_walks(observation_data)
+        walk_rejection_idx = min((rejection["index"] for rejection in walk_rejections.values()), default=None)
+
+        prev_time = None
+        for obs_idx, data_point in enumerate(observation_data):
+            reason = None
+            if data_point["t"] + time_deviation < 0:
+                reason = f'time {data_point["t"]} is negative'
+            elif prev_time is not None and data_point["t"] + 2 * time_deviation < prev_time:
+                reason = f'time {data_point["t"]} precedes the previous time {prev_time}'
+            else:
+                reason = self._check_vars(data_point, deviations) or self._check_locs(data_point)
+            if reason is None and obs_idx == walk_rejection_idx:
+                reason = "; ".join(rejection["reason"] for rejection in walk_rejections.values()
+                                   if rejection["index"] == obs_idx)
+            if reason is not None:
+                return {"is_valid": False, "index": obs_idx, "reason": f'Observation {obs_idx}: {reason}.',
+                        "processes": walk_rejections}
+            prev_time = data_point["t"]
+        return {"is_valid": True, "index": None, "reason": None, "processes": walk_rejections}
+
+    def check_location_walks(self, observation_data):
+        """Checks for each process that its observed locations are a walk in the location graph of its template (i.e.,
+           that each observed location is reachable from the previously observed one, or from the initial location).
+
+        Args:
+            observation_data: The observation sequence.
+
+        Returns:
+            The dict mapping the names of processes with an impossible location succession to the index of the first
+            impossible data point ("index") and the reason ("reason").
+        """
+        rejections = {}
+        prev_loc_indices = {proc_name: reachability.init_idx
+                            for proc_name, reachability in self.loc_reachability.items()}
+        prev_loc_names = {}
+        for obs_idx, data_point in enumerate(observation_data):
+            for proc_name, loc_data in data_point["locs"].items():
+                loc_name = loc_data["name"]
+                if loc_name in [None, "NOB"] or proc_name in rejections or proc_name not in self.loc_reachability:
+                    continue
+                reachability = self.loc_reachability[proc_name]
+                loc_idx = reachability.name_indices.get(loc_name)
+                if loc_idx is None:
+                    continue
+                if not reachability.is_reachable(prev_loc_indices[proc_name], loc_idx):
+                    prev_loc_str = (f'location "{prev_loc_names[proc_name]}"' if proc_name in prev_loc_names
+                                    else "the initial location")
+                    rejections[proc_name] = {
+                        "index": obs_idx,
+                        "reason": f'location "{loc_name}" of process "{proc_name}" is not reachable from {prev_loc_str}'
+                    }
+                    continue
+                prev_loc_indices[proc_name] = loc_idx
+                prev_loc_names[proc_name] = loc_name
+        return rejections
+
+    def _check_vars(self, data_point, deviations):
+        """Checks the observed variable values of a data point (or returns the reason why they are impossible)."""
+        for var_name, val in data_point["vars"].items():
+            if val in [None, "NOB"]:
+                continue
+            elem_name = "".join(var_name.split())
+            deviation = deviations.get(var_name, 0) or 0
+            if elem_name in self.var_ranges:
+                lower, upper = self.var_ranges[elem_name]
+                if val + deviation < lower or val - deviation > upper:
+                    return f'value {val} of "{var_name}" is outside of its declared range [{lower}, {upper}]'
+            if elem_name in self.var_constants:
+                const_val = self.var_constants[elem_name]
+                if abs(val - const_val) > deviation:
+                    return f'value {val} of "{var_name}" differs from its never-assigned value {const_val}'
+        return None
+
+    def _check_locs(self, data_point):
+        """Checks the observed locations of a data point (or returns the reason why they are impossible)."""
+        for proc_name, loc_data in data_point["locs"].items():
+            if loc_data["name"] in [None, "NOB"] or proc_name not in self.loc_names:
+                continue
+            if loc_data["name"] not in self.loc_names[proc_name]:
+                return f'location "{loc_data["name"]}" does not exist in process "{proc_name}"'
+        return None
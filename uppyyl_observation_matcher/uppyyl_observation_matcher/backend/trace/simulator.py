@@ -2,6 +2,7 @@
 
 from uppyyl_observation_matcher.backend.helper import save_model_to_file, load_trace_from_file
 from uppyyl_observation_matcher.backend.interface.verifyta import VerifyTAInterface
+from uppyyl_observation_matcher.backend.logger.profiler import profile_run
 from uppyyl_observation_matcher.backend.transformer.model.concrete.transition_simulator_model_transformer import \
     TransitionSimulatorModelTransformer
 from uppyyl_observation_matcher.backend.transformer.trace.concrete.transition_simulator_model_trace_transformer import \
@@ -18,29 +19,33 @@ class EdgeTraceSimulator:
         self.transition_simulator_model = None
         self.set_model(model=model, instance_data=instance_data)
 
-    def simulate_edge_trace(self, edge_trace):
+    def simulate_edge_trace(self, edge_trace, profile=None):
         """Simulated an edge trace, i.e., performs a model run based on given edge activation data.
 
         Args:
             edge_trace: The edge trace containing the activation data of edges.
+            profile: An optional profile option (True, or a directory path) for writing a cProfile profile of the
+                     simulation (default: the "profile" config entry).
 
         Returns:
             The simulated trace.
         """
-        self.create_transition_simulator_model(edge_trace=edge_trace)
-        is_success = perform_trace_simulation_with_uppaal(self.config)
-        if is_success:
-            transition_simulator_model_trace = load_trace_from_file(
-                trace_file_path=self.config["transition_simulator_trace_file_path"],
-                system=self.transition_simulator_model)
-            simulated_trace = transform_transition_simulator_model_trace_to_original_domain(
-                transition_simulator_model_trace=transition_simulator_model_trace,
-                transition_simulator_model=self.transition_simulator_model, original_model=self.input_model
-            )
-        else:
-            simulated_trace = None
-
-        return is_success, simulated_trace
+        profile = profile if profile is not None else self.config.get("profile")
+        with profile_run("simulate_edge_trace", profile=profile, output_dir_path=self.config.get("output_dir_path")):
+            self.create_transition_simulator_model(edge_trace=edge_trace)
+            is_success = perform_trace_simulation_with_uppaal(self.config)
+            if is_success:
+                transition_simulator_model_trace = load_trace_from_file(
+                    trace_file_path=self.config["transition_simulator_trace_file_path"],
+                    system=self.transition_simulator_model)
+                simulated_trace = transform_transition_simulator_model_trace_to_original_domain(
+                    transition_simulator_model_trace=transition_simulator_model_trace,
+                    transition_simulator_model=self.transition_simulator_model, original_model=self.input_model
+                )
+            else:
+                simulated_trace = None
+
+            return is_success, simulated_trace
 
     def create_transition_simulator_model(self, edge_trace):
         """Creates the transition simulator model.
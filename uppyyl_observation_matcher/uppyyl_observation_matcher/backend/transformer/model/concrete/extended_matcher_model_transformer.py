@@ -2,7 +2,6 @@
 
 import re
 
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
 from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppaal_model.backend.models.ta.modifiers.ta_modifier import TemplateModifier
 from uppyyl_observation_matcher.backend.helper import load_model_from_file, print_atomic_val
@@ -21,6 +20,7 @@ class ExtendedMatcherModelTransformer(ModelTransformer):
         self.loaded_matcher_tmpl = None
         self.instance_data = None
         self.observation_data = None
+        from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
         self.uppaal_c_parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
 
     def prepare(self, model):
@@ -1,20 +1,30 @@
 """The preprocessed model transformer."""
 
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppaal_model.backend.models.nta.modifiers.nta_modifier import SystemModifier
+from uppaal_model.backend.models.nta.nta import System
 from uppyyl_observation_matcher.backend.transformer.model.base_model_transformer import ModelTransformer
 
 
 class PreprocessedModelTransformer(ModelTransformer):
     """A model transformer for model preprocessing."""
 
-    def __init__(self):
-        """Initializes PreprocessedModelTransformer."""
+    def __init__(self, jobs=1):
+        """Initializes PreprocessedModelTransformer.
+
+        Args:
+            jobs: The number of worker processes used for the per-instance expansion (1 for sequential expansion,
+                None for one process per CPU).
+        """
         super().__init__()
 
+        from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
         self.uppaal_c_parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
         self.instance_data = None
+        self.jobs = jobs
 
     def prepare(self, model):
         """Performs preparing transformation steps to the input model.
@@ -41,10 +51,46 @@ class PreprocessedModelTransformer(ModelTransformer):
         SystemModifier.convert_instances_to_templates(
             system=model, instance_data=self.instance_data, keep_original_templates=False)
 
-        for inst_name, inst_data in self.instance_data.items():
+        if (self.jobs is not None and self.jobs <= 1) or len(self.instance_data) <= 1:
+            for inst_name, inst_data in self.instance_data.items():
+                tmpl = model.get_template_by_name(name=f'{inst_name}_Tmpl')
+                SystemModifier.resolve_parameters(system=model, tmpl=tmpl)
+                SystemModifier.convert_local_decl_to_global_decl(system=model, tmpl=tmpl)
+        else:
+            self._expand_instances_in_parallel(model=model)
+
+    def _expand_instances_in_parallel(self, model):
+        """Expands all instance templates in a process pool, and merges the results back in instance order.
+
+        Args:
+            model: The model containing one template per instance.
+
+        Returns:
+            None
+        """
+        instantiations = {}
+        system_decl_stmts = model.system_declaration.ast["decls"]
+        for i, stmt in enumerate(system_decl_stmts):
+            if stmt["astType"] == "Instantiation":
+                instantiations[stmt["instanceName"]] = i
+
+        tasks = []
+        for inst_name in self.instance_data:
             tmpl = model.get_template_by_name(name=f'{inst_name}_Tmpl')
-            SystemModifier.resolve_parameters(system=model, tmpl=tmpl)
-            SystemModifier.convert_local_decl_to_global_decl(system=model, tmpl=tmpl)
+            tasks.append((tmpl, system_decl_stmts[instantiations[inst_name]]))
+
+        workers = self.jobs or os.cpu_count() or 1
+        chunk_size = max(1, len(tasks) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_expand_instance, tasks, chunksize=chunk_size))
+
+        for inst_name, (tmpl, instantiation_ast, global_decls) in zip(self.instance_data, results):
+            model.templates[tmpl.id] = tmpl
+            system_decl_stmts[instantiations[inst_name]] = instantiation_ast
+            model.declaration.ast["decls"].extend(global_decls)
+
+        model.declaration.update_text()
+        model.system_declaration.update_text()
 
     def set_instance_data(self, instance_data):
         """Sets the instance data.
@@ -53,3 +99,24 @@ class PreprocessedModelTransformer(ModelTransformer):
             None
         """
         self.instance_data = instance_data
+
+
+def _expand_instance(task):
+    """Resolves the parameters and globalizes the local declarations of a single instance template.
+
+    The template is expanded inside an otherwise empty system, so that only the instance-specific results (i.e., the
+    expanded template, the adapted instantiation, and the new global declarations) need to be transferred back.
+
+    Args:
+        task: The instance template and its instantiation AST.
+
+    Returns:
+        The expanded template, the adapted instantiation AST, and the new global declaration ASTs.
+    """
+    tmpl, instantiation_ast = task
+    system = System()
+    system.add_template(tmpl)
+    system.system_declaration.ast["decls"].append(instantiation_ast)
+    SystemModifier.resolve_parameters(system=system, tmpl=tmpl)
+    SystemModifier.convert_local_decl_to_global_decl(system=system, tmpl=tmpl)
+    return tmpl, instantiation_ast, system.declaration.ast["decls"]
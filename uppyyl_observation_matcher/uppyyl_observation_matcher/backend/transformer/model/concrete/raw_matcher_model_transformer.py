@@ -1,6 +1,5 @@
 """The raw matcher model transformer."""
 
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
 from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppaal_model.backend.helper import unique_id
 from uppaal_model.backend.models.ta.ta import Template
@@ -16,6 +15,7 @@ class RawMatcherModelTransformer(ModelTransformer):
 
         self.config = config
         self.observation_data = None
+        from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
         self.uppaal_c_parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
 
     def prepare(self, model):
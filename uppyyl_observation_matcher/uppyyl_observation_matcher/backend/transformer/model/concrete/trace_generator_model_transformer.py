@@ -1,7 +1,6 @@
 """The trace generator model transformer."""
 
-from uppaal_c_language.backend.modifiers.ast_modifier import apply_func_to_ast
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+from uppaal_c_language.backend.modifiers.ast_modifier import ASTVisitor
 from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppaal_c_language.backend.printers.uppaal_c_language_printer import UppaalCPrinter
 from uppaal_model.backend.models.ta.modifiers.ta_modifier import TemplateModifier
@@ -16,6 +15,7 @@ class TraceGeneratorModelTransformer(ModelTransformer):
         super().__init__()
 
         self.step_count = None
+        from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
         self.uppaal_c_parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
 
     def prepare(self, model):
@@ -122,6 +122,7 @@ class TraceGeneratorModelTransformer(ModelTransformer):
                     new_edge.set_sync(f'step{edge.sync.ast["op"]}')
 
                 # Introduce explicit variables to store "select" values
+                select_var_map = {}
                 for select in edge.selects:
                     select_var_name = select.ast["name"]
                     select_var_type_ast = select.ast["type"]
@@ -129,21 +130,25 @@ class TraceGeneratorModelTransformer(ModelTransformer):
                     temp_var_type_ast = select_var_type_ast
                     local_decl_ext_str += f'{printer.ast_to_string(temp_var_type_ast)} {temp_var_name};\n'
                     edge.new_update(f'{temp_var_name} = {select_var_name}')
+                    select_var_map[select_var_name] = temp_var_name
+
+                if select_var_map:
+                    def edge_var_id_adapt_func(ast, _acc):
+                        """Helper function for variable name adaption."""
+                        ast["varName"] = select_var_map.get(ast["varName"], ast["varName"])
 
                     def edge_var_adapt_func(ast, _acc):
                         """Helper function for variable name adaption."""
-                        if ast["astType"] == 'VariableID' and ast["varName"] == select_var_name:
-                            ast["varName"] = temp_var_name
-                        elif ast["astType"] == 'Variable' and ast["name"] == select_var_name:
-                            ast["name"] = temp_var_name
-                        return ast
+                        ast["name"] = select_var_map.get(ast["name"], ast["name"])
 
+                    visitor = ASTVisitor(handlers={"VariableID": edge_var_id_adapt_func,
+                                                   "Variable": edge_var_adapt_func})
                     for reset in new_edge.resets:
-                        reset.ast, _ = apply_func_to_ast(ast=reset.ast, func=edge_var_adapt_func)
+                        reset.ast, _ = visitor.visit(ast=reset.ast)
                         reset.update_text()
 
                     for update in new_edge.updates:
-                        update.ast, _ = apply_func_to_ast(ast=update.ast, func=edge_var_adapt_func)
+                        update.ast, _ = visitor.visit(ast=update.ast)
                         update.update_text()
 
             local_decl_ext_ast = self.uppaal_c_parser.parse(text=local_decl_ext_str, rule_name="UppaalDeclaration")
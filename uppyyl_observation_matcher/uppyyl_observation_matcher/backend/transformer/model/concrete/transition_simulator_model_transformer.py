@@ -1,6 +1,5 @@
 """The transition simulator model transformer."""
 
-from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
 from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
 from uppyyl_observation_matcher.backend.transformer.model.base_model_transformer import ModelTransformer
 
@@ -12,6 +11,7 @@ class TransitionSimulatorModelTransformer(ModelTransformer):
         """Initializes TransitionSimulatorModelTransformer."""
         super().__init__()
 
+        from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
         self.uppaal_c_parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
         self.edge_trace = None
         self.instance_data = None
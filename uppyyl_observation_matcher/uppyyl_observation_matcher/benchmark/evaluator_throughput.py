@@ -0,0 +1,358 @@
+"""Benchmark of the Uppaal C evaluation throughput of the compiler (as used by the native matcher backend) against a
+naive tree-walking evaluator.
+
+For each case, a synthetic declaration and a list of expressions of scaled size are generated, and the following
+operations are timed:
+    - reference: ReferenceEvaluator.evaluate (walking the ASTs on each evaluation)
+    - compile: UppaalCCompiler.compile_expression (once per expression)
+    - compiled: the evaluation of the compiled expressions (on the flat slot list)
+
+Both evaluators are applied to the same sequence of states, and their results are compared.
+
+Usage:
+    python -m uppyyl_observation_matcher.benchmark.evaluator_throughput --sizes 10 100 --evaluations 1000
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from uppaal_c_language.backend.evaluators.uppaal_c_compiler import UppaalCCompiler
+from uppaal_c_language.backend.parsers.generated.uppaal_c_language_parser import UppaalCLanguageParser
+from uppaal_c_language.backend.parsers.uppaal_c_language_semantics import UppaalCLanguageSemantics
+
+
+#####################
+# Synthetic Sources #
+#####################
+def generate_declaration(size):
+    """Generates a global declaration with scalar variables, arrays, structs and functions.
+
+    Args:
+        size: The number of variables and array elements.
+
+    Returns:
+        The declaration text.
+    """
+    return (f'const int N = {size};\n'
+            f'typedef int[0,N-1] id_t;\n'
+            f'typedef struct {{ int lo; int hi; }} range_t;\n'
+            f'int[0,N] v[N];\n'
+            f'range_t r[N];\n'
+            f'int i;\n'
+            f'int total(int &a[N]) {{\n'
+            f'    int s = 0;\n'
+            f'    for (j : id_t) {{\n'
+            f'        s += a[j];\n'
+            f'    }}\n'
+            f'    return s;\n'
+            f'}}')
+
+
+def generate_guards(size):
+    """Generates data guards on array elements and struct fields."""
+    return [f'v[{k}] <= r[{k}].hi && (v[{k}] >= r[{k}].lo || i != {k})' for k in range(size)]
+
+
+def generate_updates(size):
+    """Generates updates with dynamic array indices."""
+    return [f'v[(i + {k}) % N] = (v[(i + {k}) % N] + 1) % (N + 1)' for k in range(size)] + ["i = (i + 1) % N"]
+
+
+def generate_quantifier(size):
+    """Generates a quantified expression over all array elements."""
+    return ["forall (k : id_t) v[k] <= r[k].hi"]
+
+
+def generate_function(size):
+    """Generates a call of a function with a loop over a reference array parameter."""
+    return ["total(v) + sum (k : id_t) r[k].hi"]
+
+
+benchmark_cases = {
+    "guards": generate_guards,
+    "updates": generate_updates,
+    "quantifier": generate_quantifier,
+    "function": generate_function,
+}
+
+
+#######################
+# Reference Evaluator #
+#######################
+class _Alias:
+    """A reference parameter, which is bound to the element name of the argument (e.g., "v")."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class _Return(Exception):
+    """Raised by a return statement to leave the executed function."""
+
+    def __init__(self, val):
+        super().__init__()
+        self.val = val
+
+
+class ReferenceEvaluator:
+    """A naive tree-walking evaluator for the subset of Uppaal C used by the benchmark cases.
+
+    Variable values are stored by element name (e.g., "r[1].hi", as in UppaalCCompiler.get_values), and each access
+    walks the AST to build the element name. Range checks are omitted.
+    """
+
+    def __init__(self, decls):
+        """Initializes ReferenceEvaluator.
+
+        Args:
+            decls: The declaration ASTs (whose constants, typedefs and functions are used).
+        """
+        self.constants = {}
+        self.types = {}
+        self.functions = {}
+        for decl in decls:
+            if decl["astType"] == "TypeDecls":
+                for name in decl["names"]:
+                    self.types[name["varName"]] = decl["type"]["typeId"]
+            elif decl["astType"] == "FunctionDef":
+                self.functions[decl["name"]] = decl
+            elif decl["astType"] == "VariableDecls" and "const" in decl["type"]["prefixes"]:
+                for var_data in decl["varData"]:
+                    self.constants[var_data["varName"]] = self.evaluate(var_data["initData"], {}, {})
+
+    def int_range(self, type_ast, values, frame):
+        """Evaluates the (inclusive) value range of a bounded integer type."""
+        type_id = type_ast["typeId"]
+        while type_id["astType"] == "CustomType":
+            type_id = self.types[type_id["type"]]
+        return self.evaluate(type_id["lower"], values, frame), self.evaluate(type_id["upper"], values, frame)
+
+    def element_name(self, ast, values, frame):
+        """Builds the element name of an assignable expression (e.g., "v[3]" for "v[i + 1]")."""
+        if ast["astType"] == "Variable":
+            val = frame.get(ast["name"])
+            return val.name if type(val) is _Alias else ast["name"]
+        if ast["astType"] == "BracketExpr":
+            return self.element_name(ast["expr"], values, frame)
+        if ast["op"] == "ArrayAccess":
+            return f'{self.element_name(ast["left"], values, frame)}[{self.evaluate(ast["right"], values, frame)}]'
+        return f'{self.element_name(ast["left"], values, frame)}.{ast["right"]["name"]}'
+
+    def evaluate(self, ast, values, frame):
+        """Evaluates an expression (including the side effects of assignments and function calls).
+
+        Args:
+            ast: The expression AST.
+            values: The dict mapping element names to values.
+            frame: The dict of local variables.
+
+        Returns:
+            The value of the expression.
+        """
+        ast_type = ast["astType"]
+        if ast_type in ["Integer", "Boolean"]:
+            return ast["val"]
+        elif ast_type == "Variable":
+            name = ast["name"]
+            if name in frame:
+                return frame[name]
+            if name in self.constants:
+                return self.constants[name]
+            return values[name]
+        elif ast_type == "BracketExpr":
+            return self.evaluate(ast["expr"], values, frame)
+        elif ast_type == "BinaryExpr":
+            op = ast["op"]
+            if op in ["ArrayAccess", "Dot"]:
+                return values[self.element_name(ast, values, frame)]
+            elif op == "LogAnd":
+                return bool(self.evaluate(ast["left"], values, frame)) and bool(
+                    self.evaluate(ast["right"], values, frame))
+            elif op == "LogOr":
+                return bool(self.evaluate(ast["left"], values, frame)) or bool(
+                    self.evaluate(ast["right"], values, frame))
+            return _binary_funcs[op](self.evaluate(ast["left"], values, frame),
+                                     self.evaluate(ast["right"], values, frame))
+        elif ast_type == "AssignExpr":
+            val = self.evaluate(ast["right"], values, frame)
+            left = ast["left"]
+            if left["astType"] == "Variable" and left["name"] in frame:
+                container, key = frame, left["name"]
+            else:
+                container, key = values, self.element_name(left, values, frame)
+            if ast["op"] != "Assign":
+                val = _binary_funcs[ast["op"][:-len("Assign")]](container[key], val)
+            container[key] = val
+            return val
+        elif ast_type in ["ForAllExpr", "SumExpr"]:
+            lower, upper = self.int_range(ast["type"], values, frame)
+            vals = (self.evaluate(ast["expr"], values, {**frame, ast["varName"]: k}) for k in range(lower, upper + 1))
+            return all(vals) if ast_type == "ForAllExpr" else sum(vals)
+        elif ast_type == "FuncCallExpr":
+            func = self.functions[ast["funcName"]]
+            local_frame = {}
+            for param, arg in zip(func["params"], ast["args"]):
+                if param["isRef"]:
+                    local_frame[param["varData"]["varName"]] = _Alias(self.element_name(arg, values, frame))
+                else:
+                    local_frame[param["varData"]["varName"]] = self.evaluate(arg, values, frame)
+            try:
+                self.execute(func["body"], values, local_frame)
+            except _Return as ret:
+                return ret.val
+            return None
+        raise Exception(f'Expression of type "{ast_type}" is not supported by the reference evaluator.')
+
+    def execute(self, stmt, values, frame):
+        """Executes a statement.
+
+        Args:
+            stmt: The statement AST.
+            values: The dict mapping element names to values.
+            frame: The dict of local variables.
+        """
+        stmt_type = stmt["astType"]
+        if stmt_type == "ExprStatement":
+            self.evaluate(stmt["expr"], values, frame)
+        elif stmt_type == "StatementBlock":
+            for decl in stmt["decls"]:
+                for var_data in decl["varData"]:
+                    frame[var_data["varName"]] = self.evaluate(var_data["initData"], values, frame)
+            for sub_stmt in stmt["stmts"]:
+                self.execute(sub_stmt, values, frame)
+        elif stmt_type == "Iteration":
+            lower, upper = self.int_range(stmt["type"], values, frame)
+            for k in range(lower, upper + 1):
+                frame[stmt["name"]] = k
+                self.execute(stmt["body"], values, frame)
+        elif stmt_type == "ReturnStatement":
+            raise _Return(self.evaluate(stmt["expr"], values, frame))
+        else:
+            raise Exception(f'Statement of type "{stmt_type}" is not supported by the reference evaluator.')
+
+
+def _c_mod(left, right):
+    """Calculates the remainder of a C integer division (i.e., with truncation towards zero)."""
+    return left - right * int(left / right)
+
+
+_binary_funcs = {
+    "Add": lambda left, right: left + right,
+    "Sub": lambda left, right: left - right,
+    "Mult": lambda left, right: left * right,
+    "Mod": _c_mod,
+    "GreaterEqual": lambda left, right: left >= right,
+    "GreaterThan": lambda left, right: left > right,
+    "LessEqual": lambda left, right: left <= right,
+    "LessThan": lambda left, right: left < right,
+    "Equal": lambda left, right: left == right,
+    "NotEqual": lambda left, right: left != right,
+}
+
+
+##############
+# Operations #
+##############
+def time_operation(func, repeat):
+    """Times a function call repeatedly.
+
+    Args:
+        func: The function to call.
+        repeat: The number of repetitions.
+
+    Returns:
+        The minimum duration in seconds, and the result of the last call.
+    """
+    durations = []
+    res = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        res = func()
+        durations.append(time.perf_counter() - start_time)
+    return min(durations), res
+
+
+def run_case(case_name, size, evaluations, repeat, parser):
+    """Runs the reference evaluator, the compiler and the compiled evaluation for a single benchmark case and size.
+
+    Args:
+        case_name: The name of the benchmark case.
+        size: The scaling size of the synthetic declaration and expressions.
+        evaluations: The number of evaluations (of all expressions) per timed run.
+        repeat: The number of timed runs.
+        parser: The Uppaal C parser.
+
+    Returns:
+        The result record.
+    """
+    decls = parser.parse(generate_declaration(size), rule_name="UppaalDeclaration")["decls"]
+    asts = [parser.parse(text, rule_name="Expression") for text in benchmark_cases[case_name](size)]
+
+    compiler = UppaalCCompiler(decls=decls)
+    initial_slots = compiler.new_slots()
+    for k in range(size):
+        initial_slots[compiler.slot_index(f'r[{k}].lo')] = k % 3
+        initial_slots[compiler.slot_index(f'r[{k}].hi')] = size - k % 2
+
+    reference_evaluator = ReferenceEvaluator(decls=decls)
+
+    def evaluate_reference():
+        values = compiler.get_values(initial_slots)
+        return [[reference_evaluator.evaluate(ast, values, {}) for ast in asts] for _ in range(evaluations)], values
+
+    compile_s, compiled_exprs = time_operation(lambda: [compiler.compile_expression(ast) for ast in asts], 1)
+
+    def evaluate_compiled():
+        slots = list(initial_slots)
+        return [[compiled_expr(slots) for compiled_expr in compiled_exprs] for _ in range(evaluations)], slots
+
+    reference_s, (reference_vals, values) = time_operation(evaluate_reference, repeat)
+    compiled_s, (compiled_vals, slots) = time_operation(evaluate_compiled, repeat)
+    if reference_vals != compiled_vals or values != compiler.get_values(slots):
+        raise Exception(f'Compiled evaluation differs from the reference evaluator for case "{case_name}".')
+
+    return {
+        "case": case_name,
+        "size": size,
+        "evaluations": evaluations,
+        "reference_s": reference_s,
+        "compile_s": compile_s,
+        "compiled_s": compiled_s,
+        "evaluations_per_s": evaluations * len(asts) / compiled_s if compiled_s > 0 else None,
+        "speedup": reference_s / compiled_s if compiled_s > 0 else None,
+    }
+
+
+def main():
+    """The main function of the benchmark."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark of the Uppaal C compiler against a naive evaluator.")
+    arg_parser.add_argument('--cases', nargs='+', choices=list(benchmark_cases), default=list(benchmark_cases))
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50])
+    arg_parser.add_argument('--evaluations', type=int, default=1000)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--output', type=str, default=None,
+                            help="The JSON output file (default: standard output).")
+    args = arg_parser.parse_args()
+
+    parser = UppaalCLanguageParser(semantics=UppaalCLanguageSemantics())
+    results = []
+    for case_name in args.cases:
+        for size in args.sizes:
+            results.append(run_case(case_name=case_name, size=size, evaluations=args.evaluations,
+                                    repeat=args.repeat, parser=parser))
+
+    report = {"benchmark": "evaluator_throughput", "python": sys.version.split()[0], "results": results}
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
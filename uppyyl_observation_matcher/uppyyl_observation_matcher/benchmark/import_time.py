@@ -0,0 +1,127 @@
+"""Import time benchmark of the entry points of the observation matcher (e.g., the CLI and its worker processes).
+
+Each module is imported in a fresh interpreter via "python -X importtime". The report contains the cumulative import
+time of each module, the slowest transitively imported modules, and the heavy modules (e.g., the TatSu parser, numpy,
+lxml) which were loaded, although they should only be imported on first use. If the import time of any module exceeds
+the given budget, or a heavy module is loaded, the benchmark exits with a non-zero code (e.g., for use in CI).
+
+Usage:
+    python -m uppyyl_observation_matcher.benchmark.import_time --budget-ms 150 --repeat 5 --output report.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+default_modules = [
+    "uppyyl_observation_matcher.__main__",
+    "uppyyl_observation_matcher.backend.matching",
+    "uppyyl_observation_matcher.backend.helper",
+]
+
+heavy_modules = ["tatsu", "numpy", "lxml", "colorama"]
+
+
+def measure_import_time(module_name):
+    """Imports a module in a fresh interpreter and collects the import times of all (transitively) imported modules.
+
+    Args:
+        module_name: The module name.
+
+    Returns:
+        The dict of cumulative import times (in microseconds) per imported module.
+    """
+    res = subprocess.run([sys.executable, "-X", "importtime", "-c", f'import {module_name}'],
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True,
+                         env=os.environ.copy())
+    if res.returncode != 0:
+        raise Exception(f'Importing module "{module_name}" failed:\n{res.stderr}')
+
+    cumulative_times = {}
+    for line in res.stderr.splitlines():
+        # Line format: "import time: <self [us]> | <cumulative [us]> | <indentation><module name>"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative_times[parts[2].strip()] = int(parts[1].strip())
+    return cumulative_times
+
+
+def run_import_time_benchmark(module_name, repeat=5, top_n=10):
+    """Measures the import time of a module repeatedly.
+
+    Args:
+        module_name: The module name.
+        repeat: The number of measurements.
+        top_n: The number of slowest imported modules listed in the result.
+
+    Returns:
+        The result dict.
+    """
+    runs = [measure_import_time(module_name) for _ in range(repeat)]
+    total_times_ms = [run.get(module_name, 0) / 1000 for run in runs]
+    best_run = runs[total_times_ms.index(min(total_times_ms))]
+
+    top_modules = sorted(((name, time_us) for name, time_us in best_run.items() if name != module_name),
+                         key=lambda item: item[1], reverse=True)[:top_n]
+    loaded_heavy_modules = [name for name in heavy_modules if name in best_run]
+    return {
+        "module": module_name,
+        "min_ms": min(total_times_ms),
+        "median_ms": statistics.median(total_times_ms),
+        "max_ms": max(total_times_ms),
+        "top_modules_ms": {name: time_us / 1000 for name, time_us in top_modules},
+        "heavy_modules": loaded_heavy_modules,
+    }
+
+
+def main():
+    """The main function of the benchmark.
+
+    Returns:
+        The exit code (1 if any module exceeds the budget or loads a heavy module, 0 otherwise).
+    """
+    arg_parser = argparse.ArgumentParser(description="Import time benchmark of the observation matcher.")
+    arg_parser.add_argument('--modules', nargs='+', default=default_modules)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--top', type=int, default=10,
+                            help="The number of slowest imported modules listed per module.")
+    arg_parser.add_argument('--budget-ms', type=float, default=None,
+                            help="The maximum (minimal over all repetitions) import time of each module.")
+    arg_parser.add_argument('--allow-heavy-modules', action='store_true',
+                            help="Do not fail if a heavy module (e.g., tatsu, numpy, lxml) is loaded.")
+    arg_parser.add_argument('--output', type=str, default=None,
+                            help="The JSON report file (default: standard output).")
+    args = arg_parser.parse_args()
+
+    results = []
+    for module_name in args.modules:
+        res = run_import_time_benchmark(module_name=module_name, repeat=args.repeat, top_n=args.top)
+        res["within_budget"] = args.budget_ms is None or res["min_ms"] <= args.budget_ms
+        results.append(res)
+
+    is_passed = all(res["within_budget"] and (args.allow_heavy_modules or not res["heavy_modules"])
+                    for res in results)
+    report = {
+        "benchmark": "import_time",
+        "budget_ms": args.budget_ms,
+        "passed": is_passed,
+        "results": results,
+    }
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    return 0 if is_passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
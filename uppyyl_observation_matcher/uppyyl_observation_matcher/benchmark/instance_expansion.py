@@ -0,0 +1,80 @@
+"""Benchmark of the (parallel) per-instance expansion in PreprocessedModelTransformer.
+
+Usage:
+    python -m uppyyl_observation_matcher.benchmark.instance_expansion --instances 10 50 100 --jobs 1 2 4
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from uppaal_model.backend.helper import set_unique_id_seed
+from uppaal_model.backend.parsers.uppaal_xml_model_parser import uppaal_system_to_xml
+from uppyyl_observation_matcher.backend.transformer.model.concrete.preprocessed_model_transformer import \
+    PreprocessedModelTransformer
+from uppyyl_observation_matcher.benchmark.synthetic_models import generate_instance_model
+
+
+def run_instance_expansion(instance_count, jobs, local_var_count, edge_count):
+    """Runs the finalizing transformation on a synthetic model once.
+
+    Args:
+        instance_count: The number of template instances.
+        jobs: The number of worker processes.
+        local_var_count: The number of local template variables.
+        edge_count: The number of template edges.
+
+    Returns:
+        The transformation time in seconds, and the resulting model as XML string.
+    """
+    set_unique_id_seed(0)
+    model, instance_data = generate_instance_model(
+        instance_count=instance_count, local_var_count=local_var_count, edge_count=edge_count)
+    transformer = PreprocessedModelTransformer(jobs=jobs)
+    transformer.set_instance_data(instance_data)
+
+    start_time = time.perf_counter()
+    transformer.finalize(model=model)
+    duration = time.perf_counter() - start_time
+
+    return duration, uppaal_system_to_xml(model)
+
+
+def main():
+    """The main function of the benchmark."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark of the per-instance model expansion.")
+    arg_parser.add_argument('--instances', type=int, nargs='+', default=[10, 50, 100, 200])
+    arg_parser.add_argument('--jobs', type=int, nargs='+', default=[1, 2, 4])
+    arg_parser.add_argument('--local-vars', type=int, default=20)
+    arg_parser.add_argument('--edges', type=int, default=20)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    results = []
+    for instance_count in args.instances:
+        reference_xml = None
+        for jobs in args.jobs:
+            durations = []
+            for _ in range(args.repeat):
+                duration, model_xml = run_instance_expansion(
+                    instance_count=instance_count, jobs=jobs, local_var_count=args.local_vars, edge_count=args.edges)
+                durations.append(duration)
+                if reference_xml is None:
+                    reference_xml = model_xml
+                elif model_xml != reference_xml:
+                    raise Exception(f'Expansion result for {instance_count} instances with {jobs} jobs differs '
+                                    f'from the reference result.')
+            results.append({
+                "instances": instance_count,
+                "jobs": jobs,
+                "min_s": min(durations),
+                "mean_s": sum(durations) / len(durations),
+            })
+
+    json.dump({"benchmark": "instance_expansion", "results": results}, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == '__main__':
+    main()
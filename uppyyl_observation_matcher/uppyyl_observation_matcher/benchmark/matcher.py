@@ -0,0 +1,225 @@
+"""End-to-end benchmark of the observation matcher on synthetic models and observations.
+
+The model checking step is performed by the stub verifyta (see stub_verifyta.py), unless a real verifyta executable
+is given. The following phases are timed separately:
+    - instance_data: resolve_instance_data
+    - preprocess: PreprocessedModelTransformer.transform
+    - prepare_matcher_model: ObservationMatcher.prepare_matcher_model
+    - create_matcher_model: ObservationMatcher.create_matcher_model based on the prepared matcher model (i.e., the
+      model copy, the finalizing matcher model transformation, and the export of the matcher model)
+    - verifyta: perform_matching_with_uppaal
+    - load_trace_from_file: the import of the matcher model trace
+    - transform_trace: transform_matcher_model_trace_to_original_domain
+
+In addition, the report contains the histograms (count, p50, p99, ...) of all instrumentation spans over all runs, which
+can also be exported to a local OpenTelemetry (OTLP/JSON) file.
+
+Usage:
+    python -m uppyyl_observation_matcher.benchmark.matcher --processes 2 4 --observations 10 100 --output report.json
+"""
+
+import argparse
+import json
+import os
+import pathlib
+import stat
+import sys
+import tempfile
+import time
+
+from uppaal_model.backend.helper import set_unique_id_seed
+from uppyyl_observation_matcher.backend.helper import load_trace_from_file
+from uppyyl_observation_matcher.backend.instance_resolver import resolve_instance_data
+from uppyyl_observation_matcher.backend.logger.instrumentation import Instrumentation, enable_instrumentation, \
+    disable_instrumentation
+from uppyyl_observation_matcher.backend.matching import ObservationMatcher, perform_matching_with_uppaal, \
+    transform_matcher_model_trace_to_original_domain
+from uppyyl_observation_matcher.backend.transformer.model.concrete.preprocessed_model_transformer import \
+    PreprocessedModelTransformer
+from uppyyl_observation_matcher.benchmark.synthetic_models import generate_instance_model, generate_observation_data
+
+
+def create_stub_verifyta(dir_path):
+    """Creates an executable launcher of the stub verifyta in a given directory.
+
+    Args:
+        dir_path: The directory path.
+
+    Returns:
+        The path of the launcher.
+    """
+    stub_path = pathlib.Path(__file__).parent.joinpath("stub_verifyta.py").resolve()
+    launcher_path = pathlib.Path(dir_path).joinpath("verifyta")
+    with open(launcher_path, "w") as file:
+        file.write(f'#!{sys.executable}\n'
+                   f'import runpy\n'
+                   f'runpy.run_path({str(stub_path)!r}, run_name="__main__")\n')
+    launcher_path.chmod(launcher_path.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    return launcher_path
+
+
+def create_config(output_dir_path, verifyta_path, location_matching=True):
+    """Creates the matcher configuration for a benchmark run.
+
+    Args:
+        output_dir_path: The output directory path.
+        verifyta_path: The path of the (stub) verifyta executable.
+        location_matching: A flag indicating whether location matching is enabled.
+
+    Returns:
+        The configuration dict.
+    """
+    output_dir_path = pathlib.Path(output_dir_path)
+    return {
+        "verifyta_path": pathlib.Path(verifyta_path),
+        "output_dir_path": output_dir_path,
+        "matcher_model_file_path": output_dir_path.joinpath("matcher_model.xml"),
+        "matcher_model_trace_file_path": output_dir_path.joinpath("matcher_model_trace_1.xml"),
+        "support_location_matching": location_matching,
+        "support_committed_matching": False,
+        "support_shifted_matching": False,
+        "support_partial_matching": False,
+        "maximum_initial_delay": 0,
+        "allowed_deviations": {},
+    }
+
+
+class PhaseTimer:
+    """A collector of the durations of named phases."""
+
+    def __init__(self):
+        """Initializes PhaseTimer."""
+        self.durations = {}
+
+    def run(self, phase, func, *args, **kwargs):
+        """Runs a function and adds its duration to the given phase.
+
+        Args:
+            phase: The phase name.
+            func: The function.
+            *args: The positional function arguments.
+            **kwargs: The keyword function arguments.
+
+        Returns:
+            The function result.
+        """
+        start_time = time.perf_counter()
+        res = func(*args, **kwargs)
+        self.durations[phase] = self.durations.get(phase, 0) + time.perf_counter() - start_time
+        return res
+
+
+def run_matcher_benchmark(config, process_count, clock_count, edge_count, observation_length):
+    """Runs all matcher phases once on a synthetic model and observation.
+
+    Args:
+        config: The matcher configuration.
+        process_count: The number of processes of the model.
+        clock_count: The number of clocks per process.
+        edge_count: The number of edges per process.
+        observation_length: The number of observation data points.
+
+    Returns:
+        The phase durations in seconds, and the matching result.
+    """
+    set_unique_id_seed(0)
+    model, _ = generate_instance_model(
+        instance_count=process_count, local_var_count=edge_count, edge_count=edge_count, clock_count=clock_count)
+    timer = PhaseTimer()
+
+    instance_data = timer.run("instance_data", resolve_instance_data, model=model)
+    observation_data = generate_observation_data(
+        instance_data=instance_data, length=observation_length, edge_count=edge_count)
+
+    preprocessor = PreprocessedModelTransformer()
+    preprocessor.set_instance_data(instance_data)
+    timer.run("preprocess", preprocessor.transform, model=model)
+
+    matcher = ObservationMatcher(config=config, model=model, instance_data=instance_data,
+                                 observation_data=observation_data)
+    timer.run("prepare_matcher_model", matcher.prepare_matcher_model)
+    timer.run("create_matcher_model", matcher.create_matcher_model, use_prepared=True)
+
+    is_matching, is_timeout = timer.run("verifyta", perform_matching_with_uppaal, config=config)
+    trace_length = None
+    if is_matching:
+        matcher_model_trace = timer.run(
+            "load_trace_from_file", load_trace_from_file,
+            trace_file_path=config["matcher_model_trace_file_path"], system=matcher.matcher_model)
+        matching_trace = timer.run(
+            "transform_trace", transform_matcher_model_trace_to_original_domain,
+            matcher_model_trace=matcher_model_trace, matcher_model=matcher.matcher_model, original_model=model)
+        trace_length = len(matching_trace.transitions)
+
+    res = {"is_matching": is_matching, "is_timeout": is_timeout, "trace_length": trace_length}
+    return timer.durations, res
+
+
+def main():
+    """The main function of the benchmark."""
+    arg_parser = argparse.ArgumentParser(description="End-to-end benchmark of the observation matcher.")
+    arg_parser.add_argument('--processes', type=int, nargs='+', default=[2, 4, 8])
+    arg_parser.add_argument('--clocks', type=int, nargs='+', default=[1])
+    arg_parser.add_argument('--edges', type=int, nargs='+', default=[10])
+    arg_parser.add_argument('--observations', type=int, nargs='+', default=[10, 50])
+    arg_parser.add_argument('--repeat', type=int, default=1)
+    arg_parser.add_argument('--verifyta', type=pathlib.Path, default=None,
+                            help="A real verifyta executable (default: the stub verifyta).")
+    arg_parser.add_argument('--verdict', choices=["satisfied", "unsatisfied"], default="satisfied",
+                            help="The verdict of the stub verifyta.")
+    arg_parser.add_argument('--stub-delay', type=float, default=0,
+                            help="The simulated model checking time of the stub verifyta in seconds.")
+    arg_parser.add_argument('--no-location-matching', action='store_true')
+    arg_parser.add_argument('--output', type=str, default=None,
+                            help="The JSON report file (default: standard output).")
+    arg_parser.add_argument('--otel-output', type=str, default=None,
+                            help="The OpenTelemetry (OTLP/JSON) file to which all spans are exported.")
+    args = arg_parser.parse_args()
+
+    os.environ["STUB_VERIFYTA_VERDICT"] = args.verdict
+    os.environ["STUB_VERIFYTA_DELAY"] = str(args.stub_delay)
+
+    instrumentation = enable_instrumentation(Instrumentation(record_spans=args.otel_output is not None))
+    results = []
+    with tempfile.TemporaryDirectory(prefix="matcher_benchmark_") as tmp_dir_path:
+        verifyta_path = args.verifyta if args.verifyta else create_stub_verifyta(dir_path=tmp_dir_path)
+        config = create_config(output_dir_path=tmp_dir_path, verifyta_path=verifyta_path,
+                               location_matching=not args.no_location_matching)
+        for process_count in args.processes:
+            for clock_count in args.clocks:
+                for edge_count in args.edges:
+                    for observation_length in args.observations:
+                        for run in range(args.repeat):
+                            durations, res = run_matcher_benchmark(
+                                config=config, process_count=process_count, clock_count=clock_count,
+                                edge_count=edge_count, observation_length=observation_length)
+                            results.append({
+                                "processes": process_count,
+                                "clocks": clock_count,
+                                "edges": edge_count,
+                                "observations": observation_length,
+                                "run": run,
+                                "phases_s": durations,
+                                "total_s": sum(durations.values()),
+                                **res,
+                            })
+    disable_instrumentation()
+    if args.otel_output is not None:
+        instrumentation.export_otlp_json(file_path=args.otel_output)
+
+    report = {
+        "benchmark": "matcher",
+        "verifyta": str(args.verifyta) if args.verifyta else "stub",
+        "results": results,
+        "spans": instrumentation.summary(),
+    }
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
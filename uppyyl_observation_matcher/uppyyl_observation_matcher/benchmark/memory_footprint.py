@@ -0,0 +1,247 @@
+"""Benchmark of the memory footprint of traces and models (i.e., of the core data classes).
+
+The following footprints are measured with tracemalloc (as the difference of the traced memory before and after the
+construction, after garbage collection):
+    - trace: a synthetic trace whose states hold DBMs over the given number of clocks (per state, and per DBM entry),
+    - model: a synthetic instance model (see "generate_instance_model") after preprocessing (per model, and per
+      location and edge).
+
+With "--unslotted", all objects of slotted classes of this project (e.g., DBMEntry, State, Location) are replaced by
+equivalent objects holding their attributes in a "__dict__" (see "unslot_objects"), so that the footprint before the
+introduction of "__slots__" can be reproduced.
+
+Usage:
+    python -m uppyyl_observation_matcher.benchmark.memory_footprint --states 1000 --clocks 30 --instances 50
+    python -m uppyyl_observation_matcher.benchmark.memory_footprint --unslotted
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import tracemalloc
+
+from uppaal_model.backend.helper import set_unique_id_seed
+from uppyyl_observation_matcher.backend.data.dbm import DBM, DBMEntry
+from uppyyl_observation_matcher.backend.data.state import State
+from uppyyl_observation_matcher.backend.data.trace import Trace
+from uppyyl_observation_matcher.backend.data.transition import Transition
+from uppyyl_observation_matcher.backend.transformer.model.concrete.preprocessed_model_transformer import \
+    PreprocessedModelTransformer
+from uppyyl_observation_matcher.benchmark.synthetic_models import generate_instance_model
+
+
+def measure_memory(func):
+    """Measures the memory retained by the result of a function call.
+
+    Args:
+        func: The function to call.
+
+    Returns:
+        The retained memory in bytes, and the result of the call.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start_mem = tracemalloc.get_traced_memory()[0]
+    res = func()
+    gc.collect()
+    end_mem = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return end_mem - start_mem, res
+
+
+###################
+# Unslotted Twins #
+###################
+# The packages whose slotted classes are replaced by unslotted twins
+_project_packages = ("uppaal_model", "uppyyl_observation_matcher")
+
+_unslotted_classes = {}
+
+
+def _slot_names(cls):
+    """Gets the slot names of a class (across its MRO)."""
+    slots = [name for base in cls.__mro__ for name in base.__dict__.get("__slots__", ())
+             if name not in ("__dict__", "__weakref__")]
+    return list(dict.fromkeys(slots))
+
+
+def _is_project_object(obj):
+    """Checks whether an object is an instance of a class of this project."""
+    return type(obj).__module__.split(".")[0] in _project_packages
+
+
+def _unslotted_class(cls):
+    """Gets the unslotted twin of a slotted class (i.e., a class whose instances hold all attributes in a dict).
+
+    The twin assigns all slot attributes in "__init__", so that CPython shares the dict keys of its instances (as for
+    classes without "__slots__").
+    """
+    if cls not in _unslotted_classes:
+        slot_names = _slot_names(cls)
+        init_code = (f'def __init__(self, {", ".join(slot_names)}):\n' +
+                     "".join(f'    self.{name} = {name}\n' for name in slot_names)) if slot_names else ""
+        namespace = {}
+        exec(init_code, namespace)
+        _unslotted_classes[cls] = type(f'Unslotted{cls.__name__}', (), namespace)
+    return _unslotted_classes[cls]
+
+
+def unslot_objects(root):
+    """Replaces all reachable objects of slotted project classes by unslotted twins holding the same attributes.
+
+    The object graph is traversed via lists, dicts and project objects. References in lists, dicts and attributes are
+    replaced in place, so that the containers keep their sizes, and the dicts of unslotted objects are only accessed if
+    they reference a replaced object. The twins have no methods, and only serve the memory measurement.
+
+    Args:
+        root: The root object (e.g., a trace or a model).
+
+    Returns:
+        The root object (or its twin).
+    """
+    visited = {}
+    twins = {}
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in visited or not (isinstance(obj, (list, dict)) or _is_project_object(obj)):
+            continue
+        visited[id(obj)] = obj
+        if not isinstance(obj, (list, dict)) and _slot_names(type(obj)):
+            twin_cls = _unslotted_class(type(obj))
+            twins[id(obj)] = twin_cls(*[None] * len(_slot_names(type(obj))))
+        stack.extend(gc.get_referents(obj))
+
+    def replace(val):
+        return twins.get(id(val), val)
+
+    for obj in visited.values():
+        if isinstance(obj, list):
+            for i, val in enumerate(obj):
+                obj[i] = replace(val)
+        elif isinstance(obj, dict):
+            for key, val in list(obj.items()):
+                obj[key] = replace(val)
+        elif id(obj) in twins:
+            twin = twins[id(obj)]
+            for name in _slot_names(type(obj)):
+                setattr(twin, name, replace(getattr(obj, name, None)))
+            if hasattr(obj, "__dict__"):
+                for name, val in vars(obj).items():
+                    setattr(twin, name, replace(val))
+        elif hasattr(obj, "__dict__") and any(id(val) in twins for val in gc.get_referents(obj)):
+            attrs = vars(obj)
+            for name, val in list(attrs.items()):
+                attrs[name] = replace(val)
+    return replace(root)
+
+
+##############
+# Generators #
+##############
+def generate_trace(state_count, clock_count, var_count, model):
+    """Generates a synthetic trace with random (finite and infinite) DBM bounds.
+
+    Args:
+        state_count: The number of states.
+        clock_count: The number of clocks (excluding the reference clock).
+        var_count: The number of variables.
+        model: The model whose locations and edges are referenced by the trace.
+
+    Returns:
+        The trace.
+    """
+    clocks = ["T0_REF"] + [f'sys.x{i}' for i in range(clock_count)]
+    templates = list(model.templates.values())
+    rng = random.Random(0)
+
+    def random_state():
+        dbm = DBM(clocks=clocks, add_ref_clock=False)
+        dbm.matrix = [[DBMEntry(rng.randint(-100, 100), rng.choice(['<', '<='])) if rng.random() < 0.9
+                       else DBMEntry(float("inf"), '<') for _ in clocks] for _ in clocks]
+        locs = {tmpl.name: rng.choice(list(tmpl.locations.values())) for tmpl in templates}
+        variables = {f'sys.v{i}': rng.randint(0, 100) for i in range(var_count)}
+        return State(locs=locs, dbm=dbm, variables=variables)
+
+    states = [random_state() for _ in range(state_count)]
+    transitions = []
+    for source_state, target_state in zip(states[:-1], states[1:]):
+        tmpl = rng.choice(templates)
+        transitions.append(Transition(source_state=source_state, target_state=target_state,
+                                      triggered_edges={tmpl.name: rng.choice(list(tmpl.edges.values()))}))
+    return Trace(init_state=states[0], transitions=transitions)
+
+
+def generate_preprocessed_model(instance_count, local_var_count, edge_count):
+    """Generates a synthetic instance model and preprocesses it (i.e., expands all instances into templates).
+
+    Args:
+        instance_count: The number of template instances.
+        local_var_count: The number of local template variables.
+        edge_count: The number of template edges.
+
+    Returns:
+        The preprocessed model.
+    """
+    set_unique_id_seed(0)
+    model, instance_data = generate_instance_model(
+        instance_count=instance_count, local_var_count=local_var_count, edge_count=edge_count)
+    transformer = PreprocessedModelTransformer()
+    transformer.set_instance_data(instance_data)
+    transformer.transform(model=model)
+    return model
+
+
+##########
+# Runner #
+##########
+def main():
+    """The main function of the benchmark."""
+    arg_parser = argparse.ArgumentParser(description="Benchmark of the memory footprint of traces and models.")
+    arg_parser.add_argument('--states', type=int, default=1000)
+    arg_parser.add_argument('--clocks', type=int, default=30)
+    arg_parser.add_argument('--vars', type=int, default=20)
+    arg_parser.add_argument('--instances', type=int, default=50)
+    arg_parser.add_argument('--local-vars', type=int, default=10)
+    arg_parser.add_argument('--edges', type=int, default=20)
+    arg_parser.add_argument('--unslotted', action='store_true',
+                            help="Measure equivalent objects without __slots__ (i.e., the footprint before).")
+    args = arg_parser.parse_args()
+    finalize = unslot_objects if args.unslotted else (lambda obj: obj)
+
+    model_bytes, model = measure_memory(lambda: finalize(generate_preprocessed_model(
+        instance_count=args.instances, local_var_count=args.local_vars, edge_count=args.edges)))
+    location_count = sum(len(tmpl.locations) for tmpl in model.templates.values())
+    edge_count = sum(len(tmpl.edges) for tmpl in model.templates.values())
+
+    trace_bytes, _ = measure_memory(lambda: finalize(generate_trace(
+        state_count=args.states, clock_count=args.clocks, var_count=args.vars, model=model)))
+    entry_count = args.states * (args.clocks + 1) ** 2
+
+    results = {
+        "unslotted": args.unslotted,
+        "trace": {
+            "states": args.states,
+            "clocks": args.clocks,
+            "vars": args.vars,
+            "bytes": trace_bytes,
+            "bytes_per_state": trace_bytes / args.states,
+            "bytes_per_dbm_entry": trace_bytes / entry_count,
+        },
+        "model": {
+            "instances": args.instances,
+            "locations": location_count,
+            "edges": edge_count,
+            "bytes": model_bytes,
+            "bytes_per_location_and_edge": model_bytes / (location_count + edge_count),
+        },
+    }
+    json.dump({"benchmark": "memory_footprint", "python": sys.version.split()[0], "results": results}, sys.stdout,
+              indent=2)
+    sys.stdout.write("\n")
+
+
+if __name__ == '__main__':
+    main()
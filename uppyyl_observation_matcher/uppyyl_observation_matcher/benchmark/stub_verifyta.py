@@ -0,0 +1,191 @@
+"""A stub of the verifyta executable which emits canned verdicts and traces for matcher models.
+
+The stub accepts the command line used by perform_matching_with_uppaal (i.e., "[-t 0] -X <trace prefix> <model file>").
+It writes a symbolic trace in which every original process repeatedly takes the first outgoing edge of its active
+location (one process per transition), while the trace matcher stays in its observation matching location. The trace
+has one transition per observation data point (i.e., "OBS_COUNT" of the model).
+
+The stub only depends on the standard library and lxml, so that it can be started as a separate process without
+importing the package. The verdict and an additional (simulated) model checking delay can be set via the environment
+variables STUB_VERIFYTA_VERDICT ("satisfied" or "unsatisfied") and STUB_VERIFYTA_DELAY (in seconds).
+
+Usage:
+    python stub_verifyta.py -t 0 -X /path/to/trace_ /path/to/model.xml
+"""
+
+import os
+import re
+import sys
+import time
+
+from lxml import etree
+
+
+def parse_model(model_xml_str):
+    """Extracts the process, clock, location and edge data from a matcher model.
+
+    Args:
+        model_xml_str: The XML string of the matcher model.
+
+    Returns:
+        The dict of model data.
+    """
+    nta_element = etree.fromstring(model_xml_str.encode('utf-8'))
+    global_decl = nta_element.findtext("declaration") or ""
+    obs_count_match = re.search(r'OBS_COUNT\s*=\s*(\d+)', global_decl)
+
+    processes = {}
+    for template_element in nta_element.findall("template"):
+        tmpl_name = template_element.findtext("name")
+        proc_name = tmpl_name[:-len("_Tmpl")] if tmpl_name.endswith("_Tmpl") else tmpl_name
+        locations = {}
+        for location_element in template_element.findall("location"):
+            locations[location_element.attrib["id"]] = location_element.findtext("name") or ""
+        edges = []
+        for transition_element in template_element.findall("transition"):
+            assignment = "".join(label.text or "" for label in transition_element.findall("label")
+                                 if label.attrib.get("kind") == "assignment")
+            idx_match = re.search(r'__e\s*=\s*(\d+)', assignment)
+            edges.append({
+                "source": transition_element.find("source").attrib["ref"],
+                "target": transition_element.find("target").attrib["ref"],
+                "idx": int(idx_match.group(1)) if idx_match else len(edges),
+            })
+        processes[proc_name] = {
+            "clocks": _declared_clocks(template_element.findtext("declaration") or ""),
+            "locations": locations,
+            "init": template_element.find("init").attrib["ref"],
+            "edges": edges,
+        }
+
+    return {
+        "clocks": _declared_clocks(global_decl),
+        "processes": processes,
+        "obs_count": int(obs_count_match.group(1)) if obs_count_match else 1,
+    }
+
+
+def _declared_clocks(decl_str):
+    """Extracts the names of all clocks declared in a declaration string.
+
+    Args:
+        decl_str: The declaration string.
+
+    Returns:
+        The list of clock names.
+    """
+    clocks = []
+    for clock_decl in re.findall(r'\bclock\s+([^;]+);', decl_str):
+        clocks.extend(name.strip() for name in clock_decl.split(","))
+    return clocks
+
+
+def generate_trace_xml(model_data):
+    """Generates the trace XML for a matcher model.
+
+    Args:
+        model_data: The model data as returned by parse_model.
+
+    Returns:
+        The trace XML string.
+    """
+    processes = model_data["processes"]
+    matcher_proc_name = "Trace_Matcher"
+    original_proc_names = [proc_name for proc_name in processes if proc_name != matcher_proc_name]
+
+    trace_element = etree.Element("trace")
+    system_element = etree.SubElement(trace_element, "system")
+
+    clock_ids = ["sys.t(0)"]
+    etree.SubElement(system_element, "clock", id="sys.t(0)", name="t(0)")
+    for clock_name in model_data["clocks"]:
+        clock_ids.append(f'sys.{clock_name}')
+        etree.SubElement(system_element, "clock", id=f'sys.{clock_name}', name=clock_name)
+    for proc_name, proc_data in processes.items():
+        process_element = etree.SubElement(system_element, "process", id=proc_name, name=proc_name)
+        for clock_name in proc_data["clocks"]:
+            clock_ids.append(f'{proc_name}.{clock_name}')
+            etree.SubElement(process_element, "clock", id=f'{proc_name}.{clock_name}', name=clock_name)
+        for i, edge in enumerate(proc_data["edges"]):
+            edge_element = etree.SubElement(process_element, "edge", id=f'{proc_name}.e{i}')
+            etree.SubElement(edge_element, "update").text = f'__e := {edge["idx"]}'
+
+    # A single zone (all clocks non-negative and unbounded) is shared by all states
+    dbm_element = etree.SubElement(trace_element, "dbm_instance", id="dbm0")
+    for i, clock1 in enumerate(clock_ids):
+        for j, clock2 in enumerate(clock_ids):
+            bound, comp = ("0", "<=") if (i == j or i == 0) else ("inf", "<")
+            etree.SubElement(dbm_element, "clockbound", clock1=clock1, clock2=clock2, bound=bound, comp=comp)
+
+    if matcher_proc_name in processes:
+        matcher_data = processes[matcher_proc_name]
+        matcher_loc_id = next((loc_id for loc_id, loc_name in matcher_data["locations"].items()
+                               if loc_name.startswith("m_i")), matcher_data["init"])
+        active_locs = {matcher_proc_name: matcher_loc_id}
+    else:
+        active_locs = {}
+    for proc_name in original_proc_names:
+        active_locs[proc_name] = processes[proc_name]["init"]
+
+    step_count = model_data["obs_count"]
+    for step in range(step_count + 1):
+        state_id = f'State{step + 1}'
+        locations_str = " ".join(f'{proc_name}.{processes[proc_name]["locations"][loc_id]}'
+                                 for proc_name, loc_id in active_locs.items())
+        etree.SubElement(trace_element, "location_vector", id=f'lv{step}', locations=locations_str)
+        variable_vector_element = etree.SubElement(trace_element, "variable_vector", id=f'vv{step}')
+        etree.SubElement(variable_vector_element, "variable_state",
+                         variable=f'{matcher_proc_name}.i', value=str(min(step, step_count)))
+        etree.SubElement(trace_element, "node", id=state_id, location_vector=f'lv{step}', dbm_instance="dbm0",
+                         variable_vector=f'vv{step}')
+
+        if step == step_count or not original_proc_names:
+            continue
+        proc_name = original_proc_names[step % len(original_proc_names)]
+        proc_data = processes[proc_name]
+        out_edges = [(i, edge) for i, edge in enumerate(proc_data["edges"])
+                     if edge["source"] == active_locs[proc_name]]
+        if not out_edges:
+            edges_str = ""
+        else:
+            edge_pos, edge = out_edges[0]
+            active_locs[proc_name] = edge["target"]
+            edges_str = f'{proc_name}.e{edge_pos}'
+        etree.SubElement(trace_element, "transition", edges=edges_str, **{"from": state_id, "to": f'State{step + 2}'})
+
+    return etree.tostring(trace_element, pretty_print=True, encoding="unicode")
+
+
+def main(argv=None):
+    """The main function of the stub.
+
+    Args:
+        argv: The command line arguments (default: sys.argv[1:]).
+
+    Returns:
+        The exit code.
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    trace_prefix = None
+    if "-X" in argv:
+        trace_prefix = argv[argv.index("-X") + 1]
+    model_file_path = argv[-1]
+
+    delay = float(os.environ.get("STUB_VERIFYTA_DELAY", "0"))
+    if delay > 0:
+        time.sleep(delay)
+
+    is_satisfied = os.environ.get("STUB_VERIFYTA_VERDICT", "satisfied") == "satisfied"
+    if is_satisfied and trace_prefix is not None:
+        with open(model_file_path) as file:
+            model_data = parse_model(file.read())
+        with open(f'{trace_prefix}1.xml', "w") as file:
+            file.write(generate_trace_xml(model_data))
+
+    sys.stdout.write(f'Verifying formula 1 at {os.path.basename(model_file_path)}\n')
+    sys.stdout.write(" -- Formula is satisfied.\n" if is_satisfied else " -- Formula is NOT satisfied.\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Generators for synthetic Uppaal models and observations used in benchmarks."""
+
+import random
+
+from uppaal_model.backend.models.nta.nta import System
+
+
+###################
+# Instance models #
+###################
+def generate_instance_model(instance_count, local_var_count=10, edge_count=10, clock_count=1):
+    """Generates a system with a single parameterized template, which is instantiated via a bounded integer ID range.
+
+    Args:
+        instance_count: The number of implicit template instances (i.e., the size of the ID range).
+        local_var_count: The number of local variables declared in the template.
+        edge_count: The number of edges of the template (forming a cycle).
+        clock_count: The number of local clocks declared in the template.
+
+    Returns:
+        The generated system, and the corresponding instance data (as returned by get_instance_data).
+    """
+    system = System()
+    system.set_declaration(f'const int N = {instance_count};\n'
+                           f'typedef int[0, N - 1] id_t;\n'
+                           f'int g[N];\n'
+                           f'broadcast chan step;\n')
+
+    tmpl = system.new_template("P")
+    tmpl.new_parameter("const id_t pid")
+    clock_names = ["x"] + [f'x{i}' for i in range(1, clock_count)]
+    local_decl = f'clock {", ".join(clock_names)};\n' + "".join(f'int v{i} = {i};\n' for i in range(local_var_count))
+    tmpl.set_declaration(local_decl)
+
+    locs = [tmpl.new_location(f'L{i}') for i in range(edge_count)]
+    tmpl.set_init_location(locs[0])
+    for i in range(edge_count):
+        loc = locs[i]
+        clock_name = clock_names[i % clock_count]
+        loc.new_invariant(f'{clock_name} <= {i + 1}')
+        edge = tmpl.new_edge(loc, locs[(i + 1) % edge_count])
+        var_name = f'v{i % local_var_count}'
+        edge.new_variable_guard(f'{var_name} < g[pid] + {i}')
+        edge.new_clock_guard(f'{clock_name} >= {i}')
+        edge.new_update(f'{var_name} = {var_name} + pid')
+        edge.new_update(f'g[pid] = {var_name}')
+        edge.new_reset(f'{clock_name} = 0')
+        edge.set_sync("step!" if i == 0 else "step?")
+
+    system.set_system_declaration("system P;")
+
+    instance_data = {}
+    for i in range(instance_count):
+        instance_data[f'P_{i}'] = {
+            "template_name": "P",
+            "args": [{"astType": 'Integer', "val": i}]
+        }
+
+    return system, instance_data
+
+
+################
+# Observations #
+################
+def generate_observation_data(instance_data, length, edge_count=10, observed_instance_count=2, time_step=1,
+                              seed=0):
+    """Generates a synthetic observation sequence for a model generated by generate_instance_model.
+
+    The observation contains the global variables "g[i]" and the active locations of the first observed instances.
+    The observed values are not guaranteed to be matchable by the model.
+
+    Args:
+        instance_data: The instance data of the model.
+        length: The number of data points.
+        edge_count: The number of edges (and locations) of the template.
+        observed_instance_count: The number of instances whose variables and locations are observed.
+        time_step: The time difference between two subsequent data points.
+        seed: The random seed.
+
+    Returns:
+        The observation data (in the format of load_observation_data_from_csv).
+    """
+    rng = random.Random(seed)
+    observed_instances = list(instance_data.keys())[:observed_instance_count]
+    observation_data = []
+    for k in range(length):
+        data_point = {"t": k * time_step, "vars": {}, "locs": {}}
+        for i, inst_name in enumerate(observed_instances):
+            data_point["vars"][f'g[{i}]'] = rng.randrange(edge_count)
+            data_point["locs"][inst_name] = {"name": f'L{k % edge_count}'}
+        observation_data.append(data_point)
+    return observation_data